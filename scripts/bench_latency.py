@@ -0,0 +1,157 @@
+"""
+Mesure de latence de bout en bout contre le faux Binance (scripts.fake_binance).
+
+Chaque scénario passe par la vraie pile de l'application (BinanceLogic, limiteur de débit,
+index des marchés, journal des ordres, worker DCA) et relève p50, p99 et débit :
+    - balance : get_balance ;
+    - order : place_order d'un ordre LIMIT ;
+    - dca-N : échelle DCA de N niveaux placée par BatchDcaOrderWorker (exécuté dans le thread
+      courant, signaux compris), puis annulée hors mesure.
+Exemple :
+    python -m scripts.bench_latency --env futures --latency 0.02 --runs 20 --levels 10 50 100
+"""
+import argparse
+import itertools
+import statistics
+import time
+from typing import Callable, Dict, List
+from scripts.fake_binance import FakeBinanceServer
+from src.app_logic import BinanceLogic
+from src.constants import ui_strings
+from src.models.market_environment import MarketEnvironment
+from src.services.exchange_factory import ExchangeFactory
+from src.services.leverage_brackets import LeverageBracketIndex
+from src.services.market_index import MarketIndex
+from src.services.metrics import Metrics
+from src.services.order_journal import OrderJournal
+from src.services.rate_limiter import RateLimiter
+from src.services.retry_policy import RetryPolicy
+from src.workers.batch_dca_worker import BatchDcaOrderWorker
+
+ENVIRONMENTS = {"spot": MarketEnvironment.SPOT, "futures": MarketEnvironment.FUTURES_TESTNET}
+SYMBOL = "BTC/USDT"
+# Prix de départ et pas de l'échelle ; 0.001 BTC à ~50 000 dépasse le notionnel minimal de 5 USDT.
+LADDER_PRICE = 50000.0
+LADDER_STEP = 10.0
+LADDER_AMOUNT = 0.001
+LEVERAGE = 5
+# Sans latence ajoutée, un appel ne coûte que le travail du client : au-delà, un délai fixe
+# (comme le limiteur intégré de ccxt, 50 ms par requête) s'est glissé dans la pile.
+CLIENT_OVERHEAD_BUDGET = 0.02
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def ladder_levels(count: int) -> List[Dict[str, float]]:
+    return [{'amount': LADDER_AMOUNT, 'price': LADDER_PRICE - i * LADDER_STEP} for i in range(count)]
+
+
+def measure(runs: int, action: Callable[[], int], cleanup: Callable[[], None] = lambda: None) -> Dict[str, float]:
+    """Exécute ``action`` ``runs`` fois ; elle retourne le nombre d'ordres placés (0 pour une lecture)."""
+    durations, orders = [], 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        orders += action()
+        durations.append(time.perf_counter() - start)
+        cleanup()
+    total = sum(durations)
+    return {"p50": statistics.median(durations), "p99": percentile(durations, 0.99), "runs": runs,
+            "per_second": (orders or runs) / total if total else 0.0}
+
+
+def overhead_warnings(results: Dict[str, Dict[str, float]]) -> List[str]:
+    """Scénarios à une requête dont la médiane, sans latence ajoutée, dépasse CLIENT_OVERHEAD_BUDGET."""
+    return [f"{name} : p50 {results[name]['p50'] * 1000:.1f} ms sans latence réseau, attente côté client ?"
+            for name in ("balance", "order")
+            if name in results and results[name]['p50'] > CLIENT_OVERHEAD_BUDGET]
+
+
+def run_benchmarks(server: FakeBinanceServer, market_env: MarketEnvironment, runs: int, level_counts: List[int],
+                   use_batch_orders: bool = True) -> Dict[str, Dict[str, float]]:
+    logic = BinanceLogic(rate_limiter=RateLimiter(), market_index=MarketIndex(cache_dir=None),
+                         retry_policy=RetryPolicy(base_delay=0), leverage_brackets=LeverageBracketIndex(cache_dir=None))
+    journal = OrderJournal(path=None)
+    api_key, secret_key = "bench-key", "bench-secret"
+    ids = itertools.count()
+    # Premiers appels hors mesure : création du client, chargement des marchés et des paliers de marge.
+    logic.get_balance(api_key, secret_key, market_env)
+    logic.margin_brackets(api_key, secret_key, market_env, SYMBOL)
+
+    def place_one() -> int:
+        result = logic.place_order(api_key, secret_key, market_env, SYMBOL, ui_strings.ORDER_TYPE_LIMIT, "BUY",
+                                   LADDER_AMOUNT, LADDER_PRICE, ui_strings.MERGE_MODE_CROSS, LEVERAGE,
+                                   client_order_id=f"bench-{next(ids)}")
+        logic.cancel_orders(api_key, secret_key, market_env, SYMBOL, [result['id']])
+        return 1
+
+    results = {
+        "balance": measure(runs, lambda: logic.get_balance(api_key, secret_key, market_env) and 0),
+        "order": measure(runs, place_one),
+    }
+    for count in level_counts:
+        workers: List[BatchDcaOrderWorker] = []
+
+        def deploy() -> int:
+            worker = BatchDcaOrderWorker(logic, api_key, secret_key, market_env, SYMBOL, ladder_levels(count),
+                                         ui_strings.MERGE_MODE_CROSS, LEVERAGE, use_batch_orders=use_batch_orders,
+                                         journal=journal)
+            workers.append(worker)
+            worker.run()
+            return len(worker.placed_entries())
+
+        def cancel() -> None:
+            workers[-1].ladder.rollback()
+            workers.clear()
+
+        results[f"dca-{count}"] = measure(runs, deploy, cancel)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latence de bout en bout contre le faux Binance.")
+    parser.add_argument("--env", choices=sorted(ENVIRONMENTS), default="futures")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--levels", type=int, nargs="+", default=[10, 50, 100], help="Tailles d'échelle DCA")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latence ajoutée par requête (secondes)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Latence aléatoire supplémentaire (secondes)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Part des requêtes en erreur 503")
+    parser.add_argument("--sequential", action="store_true", help="Ordres un par un au lieu des lots")
+    parser.add_argument("--spans", action="store_true", help="Affiche le temps passé par section instrumentée")
+    args = parser.parse_args(argv)
+
+    with FakeBinanceServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                           balance=1e9, seed=0) as server:
+        ExchangeFactory.api_base_url = server.url
+        try:
+            results = run_benchmarks(server, ENVIRONMENTS[args.env], args.runs, args.levels,
+                                     use_batch_orders=not args.sequential)
+        finally:
+            ExchangeFactory.api_base_url = None
+        requests = len(server.requests)
+
+    for name, stats in results.items():
+        print(f"{name:>8}: p50 {stats['p50'] * 1000:8.1f} ms, p99 {stats['p99'] * 1000:8.1f} ms, "
+              f"{stats['per_second']:7.1f}/s ({stats['runs']} essais)")
+    print(f"{requests} requêtes servies")
+    if args.latency == 0 and args.jitter == 0 and args.error_rate == 0:
+        for warning in overhead_warnings(results):
+            print(f"ATTENTION {warning}")
+    if args.spans:
+        print_spans(Metrics.shared())
+
+
+def print_spans(metrics: Metrics) -> None:
+    """Sections instrumentées triées par temps total : exchange, code de l'application ou attentes."""
+    for summary in sorted(metrics.spans(), key=lambda s: s.total, reverse=True):
+        print(f"{summary.name:>32}: {summary.count:6d} appels, total {summary.total:8.3f} s, "
+              f"p50 {summary.p50 * 1000:7.1f} ms, p99 {summary.p99 * 1000:7.1f} ms")
+    for (name, labels), value in metrics.counters().items():
+        print(f"{name:>32}: {value:g} {dict(labels) or ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Mesure du démarrage à froid de l'application PyQt5.
+
+Chaque essai lance un nouvel interpréteur et relève trois instants depuis son début :
+fin des imports de src.main_pyqt, fenêtre affichée (premier passage de la boucle Qt)
+et couche d'échange prête (signal du BackendLoader). Exemple :
+    python -m scripts.bench_startup --runs 5 --offscreen
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Script exécuté dans l'interpréteur mesuré ; écrit les temps (secondes) en JSON sur la sortie standard.
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
+app = QApplication(sys.argv)
+from src.main_pyqt import BinanceAppPyQt
+t_import = time.perf_counter()
+window = BinanceAppPyQt()
+window.show()
+app.processEvents()
+t_shown = time.perf_counter()
+times = {"import": t_import - t0, "shown": t_shown - t0}
+
+def on_ready(state):
+    times["ready"] = time.perf_counter() - t0
+    QTimer.singleShot(0, app.quit)
+
+window.backend_loader.ready.connect(on_ready)
+if window.backend_ready:
+    on_ready(None)
+QTimer.singleShot(60000, app.quit)
+app.exec_()
+window.close()
+print(json.dumps(times))
+"""
+
+
+def run_once(env) -> dict:
+    result = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT, env=env, capture_output=True, text=True,
+                            check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesure du démarrage à froid de l'application.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--offscreen", action="store_true", help="Plateforme Qt offscreen (sans affichage)")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    if args.offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+
+    runs = [run_once(env) for _ in range(args.runs)]
+    for key in ("import", "shown", "ready"):
+        values = [run[key] for run in runs if key in run]
+        if values:
+            print(f"{key:>6}: médiane {statistics.median(values) * 1000:7.1f} ms, "
+                  f"min {min(values) * 1000:7.1f} ms ({len(values)} essais)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,619 @@
+"""
+Serveur local qui imite l'API Binance (spot /api/v3 et futures /fapi) pour les tests de bout
+en bout et les mesures de latence : exchangeInfo, paliers de marge, solde, ordres (simples,
+groupés, annulation, consultation), listenKey et flux utilisateur WebSocket.
+
+Les clients ccxt de l'application y sont redirigés par ExchangeFactory.api_base_url
+(ou la variable BINANCE_MULTIAPP_API_URL). Les signatures ne sont pas vérifiées.
+Latence, erreurs et réponses 429 s'injectent à la construction ou à chaud :
+    with FakeBinanceServer(latency=0.02) as server:
+        ExchangeFactory.api_base_url = server.url
+        server.fail_next(2)           # deux réponses 503
+        server.rate_limit_next(1)     # une réponse 429
+Lancé seul, il reste à l'écoute jusqu'à Ctrl+C :
+    python -m scripts.fake_binance --port 18080 --latency 0.02
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from aiohttp import web, WSMsgType
+from src.services.async_runner import AsyncLoopThread
+
+# Symboles exposés : (base, quote, tickSize, stepSize, notionnel minimal, prix de référence).
+DEFAULT_SYMBOLS = (
+    ("BTC", "USDT", "0.10", "0.001", "5", 60000.0),
+    ("ETH", "USDT", "0.01", "0.001", "5", 3000.0),
+    ("SOL", "USDT", "0.01", "0.01", "5", 150.0),
+)
+MAX_NUM_ORDERS = 200
+# Paliers de marge futures, communs à tous les symboles : (plancher, plafond, levier maximal, taux, cum).
+LEVERAGE_BRACKETS = (
+    (0, 50_000, 125, 0.004, 0.0),
+    (50_000, 250_000, 100, 0.005, 50.0),
+    (250_000, 1_000_000, 50, 0.01, 1_300.0),
+    (1_000_000, 10_000_000, 20, 0.025, 16_300.0),
+)
+SPOT, FUTURES = "spot", "futures"
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _number(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _error(status: int, code: int, msg: str, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    return web.json_response({"code": code, "msg": msg}, status=status, headers=headers)
+
+
+def _gateway_error(status: int) -> web.Response:
+    """Erreur de la passerelle, sans corps JSON : le sort de la requête est inconnu (erreur réseau pour ccxt)."""
+    return web.Response(status=status, text="Service Unavailable")
+
+
+class _Book:
+    """Ordres et soldes d'une famille d'API (spot ou futures)."""
+
+    def __init__(self, balance: float):
+        self.balance = balance
+        self.orders: Dict[int, Dict[str, Any]] = {}
+        self.by_client_id: Dict[Tuple[str, str], int] = {}
+        self.listen_keys: Dict[str, List[web.WebSocketResponse]] = {}
+        self.leverage: Dict[str, int] = {}
+        self.margin_type: Dict[str, str] = {}
+
+
+class FakeBinanceServer:
+    """
+    Faux Binance sur 127.0.0.1, servi par aiohttp sur sa propre boucle asyncio.
+
+    Args:
+        latency: Délai ajouté à chaque requête REST (secondes).
+        jitter: Délai supplémentaire tiré uniformément dans [0, jitter].
+        error_rate: Probabilité qu'une requête reçoive une réponse 503 sans traitement (erreur réseau pour ccxt).
+        requests_per_second: Au-delà, les requêtes reçoivent 429 (code -1003) ; None pour ne pas limiter.
+        fill_market_orders: Un ordre MARKET est exécuté immédiatement au prix de référence.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, requests_per_second: Optional[int] = None, balance: float = 10000.0,
+                 symbols=DEFAULT_SYMBOLS, fill_market_orders: bool = True, seed: Optional[int] = None):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests_per_second = requests_per_second
+        self.fill_market_orders = fill_market_orders
+        self.symbols = {f"{base}{quote}": (base, quote, tick, step, notional, price)
+                        for base, quote, tick, step, notional, price in symbols}
+        self.books = {SPOT: _Book(balance), FUTURES: _Book(balance)}
+        self.requests: List[Tuple[str, str]] = []
+        self._rng = random.Random(seed)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._failures: Deque[int] = deque()
+        self._rate_limited = 0
+        self._recent: Deque[float] = deque()
+        self._weight_window: Deque[float] = deque()
+        self._order_window: Deque[float] = deque()
+        self._runner: Optional[AsyncLoopThread] = None
+        self._site_runner: Optional[web.AppRunner] = None
+
+    # -- cycle de vie -------------------------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def ws_url(self, family: str = FUTURES) -> str:
+        """URL de base du flux utilisateur, à passer comme ``ws_base_url`` à UserDataStream."""
+        return f"ws://{self.host}:{self.port}/{'ws' if family == FUTURES else 'spot-ws'}"
+
+    def start(self) -> 'FakeBinanceServer':
+        self._runner = AsyncLoopThread(name="fake-binance")
+        self._runner.run(self._start(), timeout=10)
+        return self
+
+    def stop(self) -> None:
+        if self._runner is None:
+            return
+        try:
+            self._runner.run(self._stop(), timeout=10)
+        finally:
+            self._runner.stop()
+            self._runner = None
+
+    def __enter__(self) -> 'FakeBinanceServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    async def _start(self) -> None:
+        app = web.Application(middlewares=[self._middleware])
+        self._routes(app)
+        self._site_runner = web.AppRunner(app, access_log=None)
+        await self._site_runner.setup()
+        site = web.TCPSite(self._site_runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def _stop(self) -> None:
+        for book in self.books.values():
+            for sockets in book.listen_keys.values():
+                for ws in list(sockets):
+                    await ws.close()
+        await self._site_runner.cleanup()
+
+    # -- injection de fautes ------------------------------------------------------------
+
+    def fail_next(self, count: int = 1, status: int = 503) -> None:
+        """Les ``count`` prochaines requêtes REST reçoivent ``status`` sans être traitées."""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def rate_limit_next(self, count: int = 1) -> None:
+        """Les ``count`` prochaines requêtes REST reçoivent 429 (Too many requests)."""
+        with self._lock:
+            self._rate_limited += count
+
+    def open_orders(self, family: str = FUTURES) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(o) for o in self.books[family].orders.values() if o["status"] in ("NEW", "PARTIALLY_FILLED")]
+
+    def count(self, method: str, path: str) -> int:
+        """Nombre de requêtes reçues pour cette méthode et ce chemin."""
+        with self._lock:
+            return sum(1 for entry in self.requests if entry == (method, path))
+
+    def _injected_fault(self) -> Optional[web.Response]:
+        with self._lock:
+            if self._failures:
+                return _gateway_error(self._failures.popleft())
+            if self._rate_limited:
+                self._rate_limited -= 1
+                return _error(429, -1003, "Too many requests.", {"Retry-After": "1"})
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] > 1.0:
+                self._recent.popleft()
+            self._recent.append(now)
+            if self.requests_per_second is not None and len(self._recent) > self.requests_per_second:
+                return _error(429, -1003, "Too many requests.", {"Retry-After": "1"})
+        if self.error_rate and self._rng.random() < self.error_rate:
+            return _gateway_error(503)
+        return None
+
+    def _usage_headers(self, orders: int) -> Dict[str, str]:
+        now = time.monotonic()
+        with self._lock:
+            self._weight_window.append(now)
+            self._order_window.extend([now] * orders)
+            while self._weight_window and now - self._weight_window[0] > 60.0:
+                self._weight_window.popleft()
+            while self._order_window and now - self._order_window[0] > 10.0:
+                self._order_window.popleft()
+            return {"x-mbx-used-weight-1m": str(len(self._weight_window)),
+                    "x-mbx-order-count-10s": str(len(self._order_window))}
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        if request.headers.get("Upgrade", "").lower() == "websocket":
+            return await handler(request)
+        with self._lock:
+            self.requests.append((request.method, request.path))
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        fault = self._injected_fault()
+        if fault is not None:
+            return fault
+        response = await handler(request)
+        orders = 1 if request.method == "POST" and request.path.endswith("/order") else 0
+        if request.path.endswith("/batchOrders") and request.method == "POST":
+            orders = len(json.loads((await self._params(request)).get("batchOrders", "[]")))
+        response.headers.update(self._usage_headers(orders))
+        return response
+
+    # -- routes -------------------------------------------------------------------------
+
+    def _routes(self, app: web.Application) -> None:
+        r = app.router
+        for family, prefix in ((SPOT, "/api/v3"), (FUTURES, "/fapi/v1")):
+            r.add_get(f"{prefix}/time", self._time)
+            r.add_get(f"{prefix}/ping", self._ping)
+            r.add_get(f"{prefix}/exchangeInfo", self._bind(self._exchange_info, family))
+            r.add_get(f"{prefix}/depth", self._bind(self._depth, family))
+            r.add_post(f"{prefix}/order", self._bind(self._create_order, family))
+            r.add_get(f"{prefix}/order", self._bind(self._get_order, family))
+            r.add_delete(f"{prefix}/order", self._bind(self._cancel_order, family))
+            r.add_get(f"{prefix}/openOrders", self._bind(self._open_orders, family))
+        r.add_get("/api/v3/account", self._spot_account)
+        # Appelés par ccxt au chargement des marchés spot (devises, paires margin).
+        r.add_get("/sapi/v1/capital/config/getall", self._empty_list)
+        r.add_get("/sapi/v1/margin/allPairs", self._empty_list)
+        r.add_get("/sapi/v1/margin/isolated/allPairs", self._empty_list)
+        for version in ("v2", "v3"):
+            r.add_get(f"/fapi/{version}/account", self._futures_account)
+            r.add_get(f"/fapi/{version}/balance", self._futures_balance)
+        r.add_post("/fapi/v1/batchOrders", self._create_batch)
+        r.add_delete("/fapi/v1/batchOrders", self._cancel_batch)
+        r.add_post("/fapi/v1/leverage", self._leverage)
+        r.add_post("/fapi/v1/marginType", self._margin_type)
+        r.add_get("/fapi/v2/positionRisk", self._position_risk)
+        r.add_get("/fapi/v1/leverageBracket", self._leverage_bracket)
+        r.add_post("/fapi/v1/listenKey", self._bind(self._new_listen_key, FUTURES))
+        r.add_put("/fapi/v1/listenKey", self._listen_key_ok)
+        r.add_delete("/fapi/v1/listenKey", self._listen_key_ok)
+        r.add_post("/api/v3/userDataStream", self._bind(self._new_listen_key, SPOT))
+        r.add_put("/api/v3/userDataStream", self._listen_key_ok)
+        r.add_delete("/api/v3/userDataStream", self._listen_key_ok)
+        r.add_get("/ws/{listen_key}", self._bind(self._user_stream, FUTURES))
+        r.add_get("/spot-ws/{listen_key}", self._bind(self._user_stream, SPOT))
+
+    @staticmethod
+    def _bind(handler, family: str):
+        async def bound(request: web.Request):
+            return await handler(request, family)
+        return bound
+
+    @staticmethod
+    async def _params(request: web.Request) -> Dict[str, str]:
+        params = dict(request.query)
+        if request.can_read_body:
+            params.update(await request.post())
+        return params
+
+    # -- marché -------------------------------------------------------------------------
+
+    async def _time(self, request):
+        return web.json_response({"serverTime": _now_ms()})
+
+    async def _ping(self, request):
+        return web.json_response({})
+
+    async def _empty_list(self, request):
+        return web.json_response([])
+
+    def _symbol_info(self, symbol: str, family: str) -> Dict[str, Any]:
+        base, quote, tick, step, notional, _ = self.symbols[symbol]
+        filters = [
+            {"filterType": "PRICE_FILTER", "minPrice": tick, "maxPrice": "1000000", "tickSize": tick},
+            {"filterType": "LOT_SIZE", "minQty": step, "maxQty": "10000", "stepSize": step},
+            {"filterType": "MARKET_LOT_SIZE", "minQty": step, "maxQty": "10000", "stepSize": step},
+            {"filterType": "MAX_NUM_ORDERS", "limit": MAX_NUM_ORDERS},
+        ]
+        info = {"symbol": symbol, "status": "TRADING", "baseAsset": base, "quoteAsset": quote,
+                "baseAssetPrecision": 8, "quotePrecision": 8, "quoteAssetPrecision": 8,
+                "orderTypes": ["LIMIT", "MARKET"], "timeInForce": ["GTC", "IOC", "FOK"]}
+        if family == SPOT:
+            filters.append({"filterType": "NOTIONAL", "minNotional": notional, "applyMinToMarket": True,
+                            "maxNotional": "9000000", "applyMaxToMarket": False, "avgPriceMins": 5})
+            info.update({"isSpotTradingAllowed": True, "isMarginTradingAllowed": False,
+                         "permissions": ["SPOT"], "permissionSets": [["SPOT"]]})
+        else:
+            filters.append({"filterType": "MIN_NOTIONAL", "notional": notional})
+            info.update({"pair": symbol, "contractType": "PERPETUAL", "deliveryDate": 4133404800000,
+                         "onboardDate": 1569398400000, "marginAsset": quote, "pricePrecision": 2,
+                         "quantityPrecision": 3, "underlyingType": "COIN", "settlePlan": 0,
+                         "triggerProtect": "0.0500", "liquidationFee": "0.012500",
+                         "marketTakeBound": "0.05"})
+        info["filters"] = filters
+        return info
+
+    async def _exchange_info(self, request, family):
+        return web.json_response({"timezone": "UTC", "serverTime": _now_ms(), "rateLimits": [],
+                                  "symbols": [self._symbol_info(s, family) for s in self.symbols]})
+
+    async def _depth(self, request, family):
+        symbol = request.query.get("symbol", "")
+        if symbol not in self.symbols:
+            return _error(400, -1121, "Invalid symbol.")
+        price, tick = self.symbols[symbol][5], float(self.symbols[symbol][2])
+        return web.json_response({"lastUpdateId": next(self._ids), "E": _now_ms(), "T": _now_ms(),
+                                  "bids": [[f"{price - tick * (i + 1):.8f}", "1.000"] for i in range(5)],
+                                  "asks": [[f"{price + tick * (i + 1):.8f}", "1.000"] for i in range(5)]})
+
+    # -- compte -------------------------------------------------------------------------
+
+    async def _spot_account(self, request):
+        book = self.books[SPOT]
+        return web.json_response({"makerCommission": 10, "takerCommission": 10, "canTrade": True,
+                                  "canWithdraw": True, "canDeposit": True, "updateTime": _now_ms(),
+                                  "accountType": "SPOT", "permissions": ["SPOT"],
+                                  "balances": [{"asset": "USDT", "free": f"{book.balance:.8f}", "locked": "0.0"}]})
+
+    def _futures_asset(self) -> Dict[str, Any]:
+        balance = f"{self.books[FUTURES].balance:.8f}"
+        return {"asset": "USDT", "walletBalance": balance, "unrealizedProfit": "0.0", "marginBalance": balance,
+                "maintMargin": "0.0", "initialMargin": "0.0", "positionInitialMargin": "0.0",
+                "openOrderInitialMargin": "0.0", "crossWalletBalance": balance, "crossUnPnl": "0.0",
+                "availableBalance": balance, "maxWithdrawAmount": balance, "marginAvailable": True,
+                "updateTime": _now_ms(), "balance": balance}
+
+    async def _futures_account(self, request):
+        asset = self._futures_asset()
+        return web.json_response({"totalWalletBalance": asset["walletBalance"], "totalUnrealizedProfit": "0.0",
+                                  "totalMarginBalance": asset["marginBalance"],
+                                  "availableBalance": asset["availableBalance"], "canTrade": True,
+                                  "assets": [asset], "positions": []})
+
+    async def _futures_balance(self, request):
+        return web.json_response([self._futures_asset()])
+
+    async def _leverage(self, request):
+        params = await self._params(request)
+        symbol = params.get("symbol", "")
+        if symbol not in self.symbols:
+            return _error(400, -1121, "Invalid symbol.")
+        leverage = int(_number(params.get("leverage"), 1))
+        with self._lock:
+            self.books[FUTURES].leverage[symbol] = leverage
+        return web.json_response({"symbol": symbol, "leverage": leverage, "maxNotionalValue": "1000000"})
+
+    async def _margin_type(self, request):
+        params = await self._params(request)
+        symbol, margin_type = params.get("symbol", ""), params.get("marginType", "")
+        with self._lock:
+            book = self.books[FUTURES]
+            if book.margin_type.get(symbol) == margin_type:
+                return _error(400, -4046, "No need to change margin type.")
+            book.margin_type[symbol] = margin_type
+        return web.json_response({"code": 200, "msg": "success"})
+
+    async def _position_risk(self, request):
+        params = await self._params(request)
+        symbols = [params["symbol"]] if params.get("symbol") else sorted(self.symbols)
+        with self._lock:
+            book = self.books[FUTURES]
+            rows = [{"symbol": symbol, "positionAmt": "0.000", "entryPrice": "0.0", "markPrice": "0.0",
+                     "unRealizedProfit": "0.0", "liquidationPrice": "0", "leverage": str(book.leverage.get(symbol, 1)),
+                     "maxNotionalValue": "1000000",
+                     "marginType": "isolated" if book.margin_type.get(symbol) == "ISOLATED" else "cross",
+                     "isolatedMargin": "0.0", "isAutoAddMargin": "false", "positionSide": "BOTH",
+                     "notional": "0", "isolatedWallet": "0", "updateTime": 0}
+                    for symbol in symbols if symbol in self.symbols]
+        return web.json_response(rows)
+
+    async def _leverage_bracket(self, request):
+        params = await self._params(request)
+        brackets = [{"bracket": i + 1, "initialLeverage": leverage, "notionalCap": cap, "notionalFloor": floor,
+                     "maintMarginRatio": ratio, "cum": cum}
+                    for i, (floor, cap, leverage, ratio, cum) in enumerate(LEVERAGE_BRACKETS)]
+        if params.get("symbol"):
+            if params["symbol"] not in self.symbols:
+                return _error(400, -1121, "Invalid symbol.")
+            return web.json_response({"symbol": params["symbol"], "brackets": brackets})
+        return web.json_response([{"symbol": symbol, "brackets": brackets} for symbol in sorted(self.symbols)])
+
+    # -- ordres -------------------------------------------------------------------------
+
+    def _new_order(self, family: str, params: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[web.Response]]:
+        """Crée l'ordre sous le verrou ; retourne (ordre, None) ou (None, réponse d'erreur)."""
+        symbol = params.get("symbol", "")
+        if symbol not in self.symbols:
+            return None, _error(400, -1121, "Invalid symbol.")
+        order_type, side = params.get("type", "LIMIT"), params.get("side", "BUY")
+        quantity, price = _number(params.get("quantity")), _number(params.get("price"))
+        if quantity <= 0:
+            return None, _error(400, -1013, "Invalid quantity.")
+        if order_type == "LIMIT" and price <= 0:
+            return None, _error(400, -1013, "Invalid price.")
+        _, _, _, _, notional, reference = self.symbols[symbol]
+        fill_price = price if order_type == "LIMIT" else reference
+        if quantity * fill_price < float(notional):
+            return None, _error(400, -4164 if family == FUTURES else -1013, "Order's notional must be no smaller than "
+                                f"{notional}.")
+        book = self.books[family]
+        client_id = params.get("newClientOrderId") or f"fake-{next(self._ids)}"
+        if (symbol, client_id) in book.by_client_id:
+            return None, _error(400, -4116 if family == FUTURES else -2010, "Duplicate order sent.")
+        open_count = sum(1 for o in book.orders.values() if o["symbol"] == symbol and o["status"] == "NEW")
+        if open_count >= MAX_NUM_ORDERS:
+            return None, _error(400, -2010, "Reach max open order limit.")
+        cost = quantity * fill_price
+        leverage = book.leverage.get(symbol, 1) if family == FUTURES else 1
+        if side == "BUY" and cost / leverage > book.balance:
+            return None, _error(400, -2019 if family == FUTURES else -2010, "Margin is insufficient."
+                                if family == FUTURES else "Account has insufficient balance for requested action.")
+        filled = order_type == "MARKET" and self.fill_market_orders
+        now = _now_ms()
+        order = {"orderId": next(self._ids), "symbol": symbol, "clientOrderId": client_id, "side": side,
+                 "type": order_type, "price": price, "origQty": quantity,
+                 "executedQty": quantity if filled else 0.0, "avgPrice": fill_price if filled else 0.0,
+                 "status": "FILLED" if filled else "NEW", "timeInForce": params.get("timeInForce", "GTC"),
+                 "time": now, "updateTime": now}
+        book.orders[order["orderId"]] = order
+        book.by_client_id[(symbol, client_id)] = order["orderId"]
+        return order, None
+
+    @staticmethod
+    def _order_json(order: Dict[str, Any], family: str) -> Dict[str, Any]:
+        executed = order["executedQty"]
+        quote = executed * order["avgPrice"]
+        data = {"orderId": order["orderId"], "symbol": order["symbol"], "clientOrderId": order["clientOrderId"],
+                "price": f"{order['price']:.8f}", "origQty": f"{order['origQty']:.8f}",
+                "executedQty": f"{executed:.8f}", "status": order["status"], "timeInForce": order["timeInForce"],
+                "type": order["type"], "side": order["side"], "updateTime": order["updateTime"]}
+        if family == FUTURES:
+            data.update({"avgPrice": f"{order['avgPrice']:.8f}", "cumQty": f"{executed:.8f}",
+                         "cumQuote": f"{quote:.8f}", "reduceOnly": False, "closePosition": False,
+                         "positionSide": "BOTH", "stopPrice": "0", "workingType": "CONTRACT_PRICE",
+                         "priceProtect": False, "origType": order["type"], "time": order["time"]})
+        else:
+            data.update({"orderListId": -1, "transactTime": order["time"], "time": order["time"],
+                         "cummulativeQuoteQty": f"{quote:.8f}", "isWorking": True, "fills": []})
+        return data
+
+    def _order_event(self, order: Dict[str, Any], family: str, execution: str) -> Dict[str, Any]:
+        now = _now_ms()
+        quote = order["executedQty"] * order["avgPrice"]
+        if family == FUTURES:
+            return {"e": "ORDER_TRADE_UPDATE", "E": now, "T": now,
+                    "o": {"s": order["symbol"], "c": order["clientOrderId"], "S": order["side"],
+                          "o": order["type"], "f": order["timeInForce"], "q": str(order["origQty"]),
+                          "p": str(order["price"]), "ap": str(order["avgPrice"]), "x": execution,
+                          "X": order["status"], "i": order["orderId"], "z": str(order["executedQty"]),
+                          "T": now}}
+        return {"e": "executionReport", "E": now, "s": order["symbol"], "c": order["clientOrderId"],
+                "S": order["side"], "o": order["type"], "f": order["timeInForce"], "q": str(order["origQty"]),
+                "p": str(order["price"]), "x": execution, "X": order["status"], "i": order["orderId"],
+                "z": str(order["executedQty"]), "Z": str(quote), "T": now}
+
+    async def _publish(self, family: str, events: List[Dict[str, Any]]) -> None:
+        sockets = [ws for conns in self.books[family].listen_keys.values() for ws in conns]
+        for ws in sockets:
+            for event in events:
+                try:
+                    await ws.send_str(json.dumps(event))
+                except ConnectionError:
+                    pass
+
+    async def _create_order(self, request, family):
+        params = await self._params(request)
+        with self._lock:
+            order, error = self._new_order(family, params)
+        if error is not None:
+            return error
+        await self._publish(family, [self._order_event(order, family, "NEW" if order["status"] == "NEW" else "TRADE")])
+        return web.json_response(self._order_json(order, family))
+
+    async def _create_batch(self, request):
+        params = await self._params(request)
+        try:
+            batch = json.loads(params.get("batchOrders", "[]"))
+        except ValueError:
+            return _error(400, -1130, "Data sent for parameter 'batchOrders' is not valid.")
+        if len(batch) > 5:
+            return _error(400, -1130, "Data sent for parameter 'batchOrders' is not valid.")
+        results, created = [], []
+        with self._lock:
+            for item in batch:
+                order, error = self._new_order(FUTURES, {k: str(v) for k, v in item.items()})
+                if error is not None:
+                    results.append(json.loads(error.text))
+                else:
+                    results.append(self._order_json(order, FUTURES))
+                    created.append(order)
+        await self._publish(FUTURES, [self._order_event(o, FUTURES, "NEW") for o in created])
+        return web.json_response(results)
+
+    def _find(self, family: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        book = self.books[family]
+        if params.get("orderId"):
+            order = book.orders.get(int(_number(params["orderId"])))
+        else:
+            order_id = book.by_client_id.get((params.get("symbol", ""), params.get("origClientOrderId", "")))
+            order = book.orders.get(order_id) if order_id is not None else None
+        if order is None or order["symbol"] != params.get("symbol"):
+            return None
+        return order
+
+    async def _get_order(self, request, family):
+        params = await self._params(request)
+        with self._lock:
+            order = self._find(family, params)
+        if order is None:
+            return _error(400, -2013, "Order does not exist.")
+        return web.json_response(self._order_json(order, family))
+
+    def _cancel_locked(self, family: str, params: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[web.Response]]:
+        order = self._find(family, params)
+        if order is None or order["status"] != "NEW":
+            return None, _error(400, -2011, "Unknown order sent.")
+        order["status"] = "CANCELED"
+        order["updateTime"] = _now_ms()
+        return order, None
+
+    async def _cancel_order(self, request, family):
+        params = await self._params(request)
+        with self._lock:
+            order, error = self._cancel_locked(family, params)
+        if error is not None:
+            return error
+        await self._publish(family, [self._order_event(order, family, "CANCELED")])
+        return web.json_response(self._order_json(order, family))
+
+    async def _cancel_batch(self, request):
+        params = await self._params(request)
+        try:
+            order_ids = json.loads(params.get("orderIdList", "[]"))
+        except ValueError:
+            return _error(400, -1130, "Data sent for parameter 'orderIdList' is not valid.")
+        results, cancelled = [], []
+        with self._lock:
+            for order_id in order_ids:
+                order, error = self._cancel_locked(FUTURES, {"symbol": params.get("symbol"), "orderId": order_id})
+                if error is not None:
+                    results.append(json.loads(error.text))
+                else:
+                    results.append(self._order_json(order, FUTURES))
+                    cancelled.append(order)
+        await self._publish(FUTURES, [self._order_event(o, FUTURES, "CANCELED") for o in cancelled])
+        return web.json_response(results)
+
+    async def _open_orders(self, request, family):
+        symbol = request.query.get("symbol")
+        with self._lock:
+            orders = [self._order_json(o, family) for o in self.books[family].orders.values()
+                      if o["status"] == "NEW" and (symbol is None or o["symbol"] == symbol)]
+        return web.json_response(orders)
+
+    # -- flux utilisateur ---------------------------------------------------------------
+
+    async def _new_listen_key(self, request, family):
+        listen_key = f"fake{next(self._ids):012d}"
+        self.books[family].listen_keys[listen_key] = []
+        return web.json_response({"listenKey": listen_key})
+
+    async def _listen_key_ok(self, request):
+        return web.json_response({})
+
+    async def _user_stream(self, request, family):
+        listen_key = request.match_info["listen_key"]
+        sockets = self.books[family].listen_keys.get(listen_key)
+        if sockets is None:
+            return web.Response(status=404)
+        ws = web.WebSocketResponse(heartbeat=20.0)
+        await ws.prepare(request)
+        sockets.append(ws)
+        try:
+            async for message in ws:
+                if message.type in (WSMsgType.ERROR, WSMsgType.CLOSE):
+                    break
+        finally:
+            sockets.remove(ws)
+        return ws
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serveur local imitant l'API Binance.")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Délai ajouté à chaque requête (s)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probabilité d'une réponse 503")
+    parser.add_argument("--requests-per-second", type=int, help="Au-delà, réponses 429")
+    args = parser.parse_args(argv)
+
+    server = FakeBinanceServer(port=args.port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                               requests_per_second=args.requests_per_second)
+    with server:
+        print(f"Faux Binance sur {server.url} (BINANCE_MULTIAPP_API_URL={server.url}) ; Ctrl+C pour arrêter")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Risque d'une échelle DCA sur des chemins de prix simulés (Monte-Carlo).
+
+Les chemins suivent un mouvement brownien géométrique (--volatilite, --derive, par pas), ou
+rejouent par bootstrap les rendements d'un fichier de bougies (--bougies, CSV ou Parquet).
+Exemples :
+    python -m scripts.monte_carlo_dca --balance 1000 --prix-entree 40 --prix-catastrophique 4 \
+        --drop 10 --volatilite 0.02 --chemins 1000000 --leviers 1,5,10
+    python -m scripts.monte_carlo_dca --balance 1000 --prix-entree 40 --prix-catastrophique 4 \
+        --drop 10 --bougies btcusdt_1h.csv --longueur-bloc 24 --horizon 2000
+"""
+import argparse
+import sys
+import time
+from src.backtest import BacktestError, GenerateurBootstrap, GenerateurGbm, simuler_risque
+from src.simulation_logic import calculer_iterations, SimulationError
+
+def parse_leviers(texte: str):
+    return [int(part) for part in texte.split(",")]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte-Carlo du risque d'une échelle DCA.")
+    parser.add_argument("--balance", required=True, type=float)
+    parser.add_argument("--prix-entree", required=True, type=float)
+    parser.add_argument("--prix-catastrophique", required=True, type=float)
+    parser.add_argument("--drop", required=True, type=float, help="Pourcentage de drop par niveau")
+    parser.add_argument("--chemins", type=int, default=100_000)
+    parser.add_argument("--horizon", type=int, default=1_000, help="Nombre de pas par chemin")
+    parser.add_argument("--volatilite", type=float, default=0.02, help="Volatilité par pas (GBM)")
+    parser.add_argument("--derive", type=float, default=0.0, help="Dérive par pas (GBM)")
+    parser.add_argument("--bougies", help="Fichier de bougies dont les rendements sont rejoués (bootstrap)")
+    parser.add_argument("--longueur-bloc", type=int, default=1, help="Pas consécutifs tirés ensemble (bootstrap)")
+    parser.add_argument("--leviers", type=parse_leviers, default=[1], help="Effets de levier, ex. 1,5,10")
+    parser.add_argument("--take-profit", type=float, default=1.0, help="Sortie en %% au-dessus du prix moyen")
+    parser.add_argument("--taux-maintenance", type=float, default=0.004)
+    parser.add_argument("--graine", type=int)
+    parser.add_argument("--workers", type=int, help="Nombre de processus (tous les cœurs par défaut)")
+    args = parser.parse_args(argv)
+
+    try:
+        resultats = calculer_iterations(args.balance, args.prix_entree, args.prix_catastrophique, args.drop,
+                                        avec_details=False)
+        if args.bougies:
+            generateur = GenerateurBootstrap.depuis_bougies(args.bougies, longueur_bloc=args.longueur_bloc)
+        else:
+            generateur = GenerateurGbm(args.volatilite, args.derive)
+        debut = time.perf_counter()
+        risque = simuler_risque(resultats, generateur, nombre_chemins=args.chemins, horizon=args.horizon,
+                                leviers=args.leviers, take_profit_percent=args.take_profit,
+                                taux_maintenance=args.taux_maintenance, graine=args.graine,
+                                max_workers=args.workers)
+        duree = time.perf_counter() - debut
+    except (SimulationError, BacktestError) as e:
+        print(f"Erreur: {e}", file=sys.stderr)
+        return 1
+
+    print("\n".join(risque.resume()))
+    print(f"{risque.nombre_chemins} chemins simulés en {duree:.3f}s", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+Balayage de paramètres de la simulation DCA en ligne de commande.
+
+Chaque paramètre accepte une valeur, une liste (10,20,30) ou une plage debut:fin:pas.
+Exemple :
+    python -m scripts.sweep_simulation --balance 1000 --prix-entree 40 \
+        --prix-catastrophique 0:8:0.5 --drop 1:50:1 --output grille.csv
+"""
+import argparse
+import csv
+import sys
+import time
+from src.simulation_sweep import simuler_grille, plage
+
+COLONNES = ["balance", "prix_entree", "prix_catastrophique", "drop_percent", "valide", "nombre_niveaux",
+            "montant_par_niveau", "prix_moyen", "quantite_totale", "perte_max", "drawdown_max_percent"]
+
+def parse_valeurs(texte: str):
+    if ":" in texte:
+        debut, fin, pas = (float(part) for part in texte.split(":"))
+        return plage(debut, fin, pas)
+    return [float(part) for part in texte.split(",")]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Balayage de paramètres de la simulation DCA.")
+    parser.add_argument("--balance", required=True, type=parse_valeurs)
+    parser.add_argument("--prix-entree", required=True, type=parse_valeurs)
+    parser.add_argument("--prix-catastrophique", required=True, type=parse_valeurs)
+    parser.add_argument("--drop", required=True, type=parse_valeurs, help="Pourcentage de drop par niveau")
+    parser.add_argument("--output", help="Fichier CSV de sortie (sortie standard par défaut)")
+    parser.add_argument("--valides-seulement", action="store_true", help="N'écrit que les combinaisons valides")
+    args = parser.parse_args(argv)
+
+    debut = time.perf_counter()
+    grille = simuler_grille(args.balance, args.prix_entree, args.prix_catastrophique, args.drop)
+    duree = time.perf_counter() - debut
+
+    sortie = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(sortie, fieldnames=COLONNES)
+        writer.writeheader()
+        for ligne in grille.lignes():
+            if args.valides_seulement and not ligne["valide"]:
+                continue
+            writer.writerow(ligne)
+    finally:
+        if args.output:
+            sortie.close()
+
+    print(f"{grille.valide.size} combinaisons ({int(grille.valide.sum())} valides) calculées en {duree:.3f}s",
+          file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,40 @@
+import time
 import ccxt
+from concurrent.futures import ThreadPoolExecutor
 from ccxt.base.types import ConstructorArgs, OrderType, OrderSide
-from typing import Optional, Literal, cast
+from typing import Any, Callable, Dict, List, Optional, Literal, Tuple, TypeVar, cast
 from .constants import error_messages, ui_strings
-from .services.exchange_factory import ExchangeFactory
+from .services.exchange_factory import ExchangePool
+from .services.futures_config_cache import FuturesConfigCache, FuturesSymbolConfig, parse_position_risk
+from .services.leverage_brackets import LeverageBracketIndex
+from .services.market_index import MarketIndex
+from .services.metrics import Metrics, timed
+from .services.rate_limiter import RateLimiter
+from .services.retry_policy import RetryPolicy
+from .models.margin_brackets import MarginBrackets
 from .models.market_environment import MarketEnvironment
+from .models.order_state import to_market_id
+from .models.symbol_rules import SymbolRules
+from .models.rollback_report import RollbackReport
+
+# Binance futures accepts at most 5 orders per batchOrders request.
+MAX_FUTURES_BATCH_ORDERS = 5
+# Spot has no batch endpoint; orders of a batch are sent back to back on one client.
+MAX_SPOT_SEQUENTIAL_ORDERS = 5
+
+# Binance futures cancels at most 10 orders per cancel-multiple request.
+MAX_FUTURES_CANCEL_BATCH = 10
+# Upper bound on parallel single-order cancels when no cancel-multiple endpoint applies.
+MAX_CONCURRENT_CANCELS = 5
+# Binance error code returned when a symbol already uses the requested margin mode.
+MARGIN_MODE_UNCHANGED_CODE = "-4046"
+
+T = TypeVar('T')
+
+
+def margin_mode_unchanged(error: Exception) -> bool:
+    """True when Binance rejected set_margin_mode only because the mode is already set."""
+    return MARGIN_MODE_UNCHANGED_CODE in str(error)
 
 # Custom Exceptions
 class ApiKeyMissingError(Exception):
@@ -36,14 +67,43 @@ class InvalidOrderParamsError(Exception):
     pass
 
 class BinanceLogic:
-    def __init__(self):
+    def __init__(self, exchange_pool: Optional[ExchangePool] = None, rate_limiter: Optional[RateLimiter] = None,
+                 market_index: Optional[MarketIndex] = None, retry_policy: Optional[RetryPolicy] = None,
+                 metrics: Optional[Metrics] = None, futures_config: Optional[FuturesConfigCache] = None,
+                 leverage_brackets: Optional[LeverageBracketIndex] = None):
         """
         Initializes the BinanceLogic class.
-        For this design, API keys are passed directly to the get_balance method.
-        An exchange instance is not stored long-term here to allow for key changes.
+        For this design, API keys are passed directly to each method.
+        Exchange clients are leased from a pool keyed on (API key hash, environment),
+        so warm sessions are reused and a key or secret change gets a fresh client.
+        Every exchange call first acquires its request weight from the rate limiter.
+        Orders are snapped to the symbol's filters from the market index before being sent.
+        Orders that carry a client order id are retried after a network error, once a
+        lookup by that id has shown the exchange did not receive them.
+        Every public method, each phase of an order and each exchange call is timed as a
+        span in the metrics registry; retries and rate-limit waits are counted there too.
+        Futures margin mode and leverage are only sent when they differ from the values
+        cached for the account and symbol (seeded from the position-risk endpoint).
+
+        Args:
+            exchange_pool: The client pool to lease exchanges from. A private pool is created if omitted.
+            rate_limiter: The request budget to acquire from. Defaults to the process-wide limiter.
+            market_index: The symbol filter cache. Defaults to the process-wide index.
+            retry_policy: Backoff between retries after a network error. Defaults to RetryPolicy().
+            metrics: Where spans and counters are recorded. Defaults to the process-wide registry.
+            futures_config: Known margin mode and leverage per symbol. Defaults to the process-wide cache.
+            leverage_brackets: The futures maintenance-margin bracket cache. Defaults to the process-wide index.
         """
-        pass
+        self.metrics = metrics if metrics is not None else Metrics.shared()
+        self.exchange_pool = exchange_pool if exchange_pool is not None else ExchangePool(metrics=self.metrics)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter.shared()
+        self.market_index = market_index if market_index is not None else MarketIndex.shared()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.futures_config = futures_config if futures_config is not None else FuturesConfigCache.shared()
+        self.leverage_brackets = (leverage_brackets if leverage_brackets is not None
+                                  else LeverageBracketIndex.shared())
 
+    @timed('logic.get_balance')
     def get_balance(self, api_key: str, secret_key: str, market_environment: MarketEnvironment) -> float:
         """
         Fetches the total USDT balance from Binance.
@@ -66,8 +126,8 @@ class BinanceLogic:
             raise ApiKeyMissingError(error_messages.PARAM_API_KEYS_REQUIRED)
 
         try:
-            exchange = ExchangeFactory.create(api_key, secret_key, market_environment)
-            balance_data = exchange.fetch_balance()
+            with self.exchange_pool.lease(api_key, secret_key, market_environment) as exchange:
+                balance_data = self._throttled(exchange, market_environment, 'fetch_balance', exchange.fetch_balance)
             usdt_balance = balance_data.get('total', {}).get('USDT', 0.0)
             return float(usdt_balance)
 
@@ -78,6 +138,7 @@ class BinanceLogic:
         except Exception as e:
             raise AppLogicError(f"An unexpected error occurred in application logic: {str(e)}")
 
+    @timed('logic.place_order')
     def place_order(self,
                     api_key: str,
                     secret_key: str,
@@ -88,11 +149,482 @@ class BinanceLogic:
                     amount: float,
                     price: Optional[float] = None,
                     margin_mode: Optional[str] = None,
-                    leverage: Optional[int] = None):
+                    leverage: Optional[int] = None,
+                    client_order_id: Optional[str] = None):
+        """
+        Places one order.
+
+        Without a client order id the order is sent once and a network error is raised as
+        CustomNetworkError. With one, it is sent as newClientOrderId; after a network error the
+        order is looked up by that id and only resubmitted if the exchange does not have it,
+        with exponential backoff and jitter between attempts (see RetryPolicy).
+
+        Returns:
+            The ccxt order response (or the order found by the lookup).
+        """
+        if not api_key or not secret_key:
+            raise ApiKeyMissingError(error_messages.PARAM_API_KEYS_REQUIRED)
+        if not symbol:
+            raise InvalidOrderParamsError(error_messages.PARAM_SYMBOL_REQUIRED)
+        self._validate_order_params(order_type, side, amount, price)
+
+        try:
+            with self.exchange_pool.lease(api_key, secret_key, market_environment) as exchange:
+                with self.metrics.span('place_order.market_rules'):
+                    rules = self._market_rules(exchange, market_environment, symbol)
+                order = self._apply_market_rules(rules, symbol, {'order_type': order_type, 'side': side,
+                                                                 'amount': amount, 'price': price,
+                                                                 'client_order_id': client_order_id})
+                with self.metrics.span('place_order.configure'):
+                    self._configure_futures_symbol(exchange, market_environment, api_key, symbol, margin_mode, leverage)
+                with self.metrics.span('place_order.submit'):
+                    return self._create_order_with_retry(exchange, market_environment, symbol, order)
+        except Exception as e:
+            raise self._map_order_exception(e)
+
+    @timed('logic.configure_futures_symbol')
+    def configure_futures_symbol(self,
+                                 api_key: str,
+                                 secret_key: str,
+                                 market_environment: MarketEnvironment,
+                                 symbol: str,
+                                 margin_mode: Optional[str],
+                                 leverage: Optional[int]) -> None:
+        """
+        Applies the margin mode and leverage of a futures symbol ahead of a series of orders.
+
+        Values already in effect (according to the futures config cache) are not sent again,
+        so later place_order / place_orders_batch calls with the same settings only submit
+        orders. Does nothing on spot, or when margin_mode or leverage is missing.
+
+        Raises:
+            ApiKeyMissingError: If the keys are missing.
+            OrderPlacementError, CustomNetworkError: If the exchange refused or could not be reached.
+        """
+        if not api_key or not secret_key:
+            raise ApiKeyMissingError(error_messages.PARAM_API_KEYS_REQUIRED)
+        if not symbol:
+            raise InvalidOrderParamsError(error_messages.PARAM_SYMBOL_REQUIRED)
+
+        try:
+            with self.exchange_pool.lease(api_key, secret_key, market_environment) as exchange:
+                self._configure_futures_symbol(exchange, market_environment, api_key, symbol, margin_mode, leverage)
+        except Exception as e:
+            raise self._map_order_exception(e)
+
+    @timed('logic.prepare_orders')
+    def prepare_orders(self,
+                       api_key: str,
+                       secret_key: str,
+                       market_environment: MarketEnvironment,
+                       symbol: str,
+                       orders: List[Dict[str, Any]]) -> List[Tuple[bool, Any]]:
+        """
+        Checks orders against the symbol's exchange filters without placing them.
+
+        Prices are snapped to the tick size (down for buys, up for sells) and amounts down
+        to the step size. Orders that still break a filter (minimum quantity, minimum
+        notional, price bounds) or that exceed the symbol's maximum number of open orders
+        are rejected. Filters come from the market index; the only network call is an
+        occasional fetch_markets when the index is missing or stale. If the filters are
+        unavailable, orders are returned unchanged.
+
+        Args:
+            orders: Order dicts with 'order_type', 'side', 'amount' and optional 'price'.
+
+        Returns:
+            One (success, payload) tuple per order, in input order. payload is the adjusted
+            order dict on success, or an InvalidOrderParamsError on failure.
+        """
+        if not api_key or not secret_key:
+            raise ApiKeyMissingError(error_messages.PARAM_API_KEYS_REQUIRED)
+        if not symbol:
+            raise InvalidOrderParamsError(error_messages.PARAM_SYMBOL_REQUIRED)
+
+        try:
+            with self.exchange_pool.lease(api_key, secret_key, market_environment) as exchange:
+                rules = self._market_rules(exchange, market_environment, symbol)
+        except Exception:
+            rules = None
+        return self._prepare_with_rules(rules, symbol, orders)
+
+    @timed('logic.margin_brackets')
+    def margin_brackets(self,
+                        api_key: str,
+                        secret_key: str,
+                        market_environment: MarketEnvironment,
+                        symbol: str) -> Optional[MarginBrackets]:
+        """
+        Returns the maintenance-margin brackets of a futures symbol.
+
+        Brackets come from the local bracket index; the only network call is an occasional
+        leverageBracket request (all symbols at once) when the index is missing or stale.
+        Returns None on spot, or when the brackets are unavailable.
+        """
+        if not api_key or not secret_key:
+            raise ApiKeyMissingError(error_messages.PARAM_API_KEYS_REQUIRED)
+        if not self._is_futures(market_environment):
+            return None
+
+        try:
+            with self.exchange_pool.lease(api_key, secret_key, market_environment) as exchange:
+                return self.leverage_brackets.brackets(
+                    market_environment, symbol,
+                    lambda: self._throttled(exchange, market_environment, 'leverage_bracket',
+                                            exchange.fapiPrivateGetLeverageBracket))
+        except Exception:
+            return None
+
+    def _market_rules(self, exchange: ccxt.Exchange, market_environment: MarketEnvironment,
+                      symbol: str) -> Optional[SymbolRules]:
+        """Symbol filters from the market index, refreshed through this client when needed."""
+        return self.market_index.rules(
+            market_environment, symbol,
+            lambda: self._throttled(exchange, market_environment, 'fetch_markets', exchange.fetch_markets))
+
+    @staticmethod
+    def _apply_market_rules(rules: Optional[SymbolRules], symbol: str, order: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns the order snapped to the filters, or raises InvalidOrderParamsError if it cannot pass them."""
+        if rules is None:
+            return order
+        is_limit = order['order_type'].upper() == ui_strings.ORDER_TYPE_LIMIT
+        amount = rules.snap_amount(order['amount'])
+        price = rules.snap_price(order['price'], order['side']) if is_limit else order.get('price')
+        violation = rules.violation(amount, price if is_limit else None)
+        if violation:
+            raise InvalidOrderParamsError(error_messages.PARAM_MARKET_FILTER.format(symbol=symbol, detail=violation))
+        return {**order, 'amount': amount, 'price': price}
+
+    @classmethod
+    def _prepare_with_rules(cls, rules: Optional[SymbolRules], symbol: str,
+                            orders: List[Dict[str, Any]]) -> List[Tuple[bool, Any]]:
+        results: List[Tuple[bool, Any]] = []
+        accepted = 0
+        for order in orders:
+            if rules is not None and rules.max_num_orders and accepted >= rules.max_num_orders:
+                results.append((False, InvalidOrderParamsError(error_messages.PARAM_MAX_NUM_ORDERS.format(
+                    symbol=symbol, max_orders=rules.max_num_orders))))
+                continue
+            try:
+                results.append((True, cls._apply_market_rules(rules, symbol, order)))
+                accepted += 1
+            except InvalidOrderParamsError as e:
+                results.append((False, e))
+        return results
+
+    @timed('logic.place_orders_batch')
+    def place_orders_batch(self,
+                           api_key: str,
+                           secret_key: str,
+                           market_environment: MarketEnvironment,
+                           symbol: str,
+                           orders: List[Dict[str, Any]],
+                           margin_mode: Optional[str] = None,
+                           leverage: Optional[int] = None) -> List[Tuple[bool, Any]]:
+        """
+        Places several orders on one symbol with as few round trips as possible.
+
+        On futures, orders are sent through Binance's batchOrders endpoint, at most
+        MAX_FUTURES_BATCH_ORDERS per request. Spot has no batch endpoint, so the orders
+        are sent one after another on the same warm client. Margin mode and leverage are
+        applied once for the whole call.
+
+        Args:
+            orders: Order dicts with 'order_type', 'side', 'amount' and optional 'price' and
+                    'client_order_id'. At most max_batch_size(market_environment) orders.
+                    Orders with a client order id are retried after a network error, as in
+                    place_order; on futures only those the exchange does not have are resent.
+
+        Returns:
+            One (success, payload) tuple per order, in input order. payload is the ccxt
+            order response on success, or the mapped exception on failure. Orders that
+            fail the symbol filters (see prepare_orders) are reported without being sent.
+            A failure of the whole request (network, margin setup) is reported for every
+            order in it.
+
+        Raises:
+            ApiKeyMissingError, InvalidOrderParamsError: If the inputs are invalid; nothing is sent.
+        """
+        self._validate_batch(api_key, secret_key, market_environment, symbol, orders)
+        if not orders:
+            return []
+
+        try:
+            with self.exchange_pool.lease(api_key, secret_key, market_environment) as exchange:
+                with self.metrics.span('place_orders_batch.market_rules'):
+                    rules = self._market_rules(exchange, market_environment, symbol)
+                prepared = self._prepare_with_rules(rules, symbol, orders)
+                sendable = [payload for success, payload in prepared if success]
+                if not sendable:
+                    return prepared
+                with self.metrics.span('place_orders_batch.configure'):
+                    self._configure_futures_symbol(exchange, market_environment, api_key, symbol, margin_mode, leverage)
+                with self.metrics.span('place_orders_batch.submit'):
+                    if self._is_futures(market_environment):
+                        sent = self._create_orders_native_batch(exchange, market_environment, symbol, sendable)
+                    else:
+                        sent = self._create_orders_sequentially(exchange, market_environment, symbol, sendable)
+                return self._merge_prepared(prepared, sent)
+        except Exception as e:
+            mapped = self._map_order_exception(e)
+            return [(False, mapped) for _ in orders]
+
+    @classmethod
+    def _validate_batch(cls, api_key: str, secret_key: str, market_environment: MarketEnvironment, symbol: str,
+                        orders: List[Dict[str, Any]]) -> None:
         if not api_key or not secret_key:
             raise ApiKeyMissingError(error_messages.PARAM_API_KEYS_REQUIRED)
         if not symbol:
             raise InvalidOrderParamsError(error_messages.PARAM_SYMBOL_REQUIRED)
+        max_size = cls.max_batch_size(market_environment)
+        if len(orders) > max_size:
+            raise InvalidOrderParamsError(error_messages.PARAM_BATCH_TOO_LARGE.format(max_size=max_size))
+        for order in orders:
+            cls._validate_order_params(order['order_type'], order['side'], order['amount'], order.get('price'))
+
+    @staticmethod
+    def _merge_prepared(prepared: List[Tuple[bool, Any]], sent: List[Tuple[bool, Any]]) -> List[Tuple[bool, Any]]:
+        """Puts the results of the sent orders back in place of the orders that passed the filters."""
+        sent_results = iter(sent)
+        return [next(sent_results) if success else (success, payload) for success, payload in prepared]
+
+    @timed('logic.cancel_orders')
+    def cancel_orders(self,
+                      api_key: str,
+                      secret_key: str,
+                      market_environment: MarketEnvironment,
+                      symbol: str,
+                      order_ids: List[str]) -> RollbackReport:
+        """
+        Cancels the given orders on one symbol as fast as possible and checks the result.
+
+        On futures, orders are cancelled through the cancel-multiple endpoint, at most
+        MAX_FUTURES_CANCEL_BATCH per request. Orders it could not reach (spot, or a failed
+        request) are cancelled one by one with up to MAX_CONCURRENT_CANCELS requests in
+        flight. Open orders are then fetched to confirm none of the given orders is still
+        resting; any that are get one more cancel attempt. Cancel-all-for-symbol is never
+        used, since it would also cancel orders this application did not place.
+
+        Returns:
+            A RollbackReport describing what was cancelled, what failed and what is still open.
+            This method does not raise for exchange errors; they are recorded in the report.
+        """
+        if not api_key or not secret_key:
+            raise ApiKeyMissingError(error_messages.PARAM_API_KEYS_REQUIRED)
+
+        started = time.perf_counter()
+        report = self._new_rollback_report(symbol, order_ids)
+        if not report.requested:
+            return report
+
+        pending = report.requested
+        if self._is_futures(market_environment):
+            pending = self._cancel_orders_native_batch(api_key, secret_key, market_environment, symbol, pending, report)
+        self._cancel_orders_concurrently(api_key, secret_key, market_environment, symbol, pending, report)
+        self._verify_cancelled(api_key, secret_key, market_environment, symbol, report)
+
+        if report.still_open:
+            retry = list(report.still_open)
+            self._cancel_orders_concurrently(api_key, secret_key, market_environment, symbol, retry, report)
+            self._verify_cancelled(api_key, secret_key, market_environment, symbol, report)
+
+        report.duration = time.perf_counter() - started
+        return report
+
+    @timed('logic.fetch_open_orders')
+    def fetch_open_orders(self,
+                          api_key: str,
+                          secret_key: str,
+                          market_environment: MarketEnvironment,
+                          symbol: str) -> List[Dict[str, Any]]:
+        """
+        Fetches the orders still resting on one symbol.
+
+        Returns:
+            The ccxt order dictionaries.
+
+        Raises:
+            ApiKeyMissingError: If API key or secret key is not provided.
+            CustomNetworkError: If there's a network issue connecting to Binance.
+            CustomExchangeError: If Binance API returns an error.
+        """
+        if not api_key or not secret_key:
+            raise ApiKeyMissingError(error_messages.PARAM_API_KEYS_REQUIRED)
+
+        try:
+            with self.exchange_pool.lease(api_key, secret_key, market_environment) as exchange:
+                return self._throttled(exchange, market_environment, 'fetch_open_orders',
+                                       lambda: exchange.fetch_open_orders(symbol))
+        except ccxt.NetworkError as e:
+            raise CustomNetworkError(f"Network error connecting to Binance: {str(e)}")
+        except ccxt.ExchangeError as e:
+            raise CustomExchangeError(f"Binance API error: {str(e)}")
+
+    @timed('logic.fetch_orders_by_client_id')
+    def fetch_orders_by_client_id(self,
+                                  api_key: str,
+                                  secret_key: str,
+                                  market_environment: MarketEnvironment,
+                                  symbol: str,
+                                  client_order_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Looks orders up by client order id, whatever their status (open, filled or cancelled).
+
+        Returns:
+            The ccxt order per client id, or None when the exchange does not know the id.
+            Ids whose lookup failed (network or exchange error) are left out.
+        """
+        if not api_key or not secret_key:
+            raise ApiKeyMissingError(error_messages.PARAM_API_KEYS_REQUIRED)
+
+        found: Dict[str, Optional[Dict[str, Any]]] = {}
+        with self.exchange_pool.lease(api_key, secret_key, market_environment) as exchange:
+            for client_order_id in client_order_ids:
+                try:
+                    found[client_order_id] = self._fetch_order_by_client_id(exchange, market_environment, symbol,
+                                                                            client_order_id)
+                except ccxt.BaseError:
+                    continue
+        return found
+
+    def _cancel_orders_native_batch(self, api_key: str, secret_key: str, market_environment: MarketEnvironment,
+                                    symbol: str, order_ids: List[str], report: RollbackReport) -> List[str]:
+        """Cancels through cancel-multiple. Returns the ids whose request failed as a whole."""
+        unreached: List[str] = []
+        for start in range(0, len(order_ids), MAX_FUTURES_CANCEL_BATCH):
+            chunk = order_ids[start:start + MAX_FUTURES_CANCEL_BATCH]
+            try:
+                with self.exchange_pool.lease(api_key, secret_key, market_environment) as exchange:
+                    if not exchange.has.get('cancelOrders'):
+                        unreached.extend(order_ids[start:])
+                        break
+                    responses = self._throttled(exchange, market_environment, 'cancel_orders',
+                                                lambda: exchange.cancel_orders(chunk, symbol))
+            except Exception:
+                unreached.extend(chunk)
+                continue
+            self._record_cancel_responses(report, chunk, responses)
+        return unreached
+
+    def _cancel_orders_concurrently(self, api_key: str, secret_key: str, market_environment: MarketEnvironment,
+                                    symbol: str, order_ids: List[str], report: RollbackReport) -> None:
+        if not order_ids:
+            return
+
+        def cancel_one(order_id: str):
+            with self.exchange_pool.lease(api_key, secret_key, market_environment) as exchange:
+                return self._throttled(exchange, market_environment, 'cancel_order',
+                                       lambda: exchange.cancel_order(order_id, symbol))
+
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_CANCELS, len(order_ids))) as executor:
+            futures = [executor.submit(cancel_one, order_id) for order_id in order_ids]
+        self._record_cancel_outcomes(report, order_ids, [future.exception() or future.result() for future in futures])
+
+    def _verify_cancelled(self, api_key: str, secret_key: str, market_environment: MarketEnvironment,
+                          symbol: str, report: RollbackReport) -> None:
+        try:
+            with self.exchange_pool.lease(api_key, secret_key, market_environment) as exchange:
+                open_orders = self._throttled(exchange, market_environment, 'fetch_open_orders',
+                                              lambda: exchange.fetch_open_orders(symbol))
+        except Exception as e:
+            self._record_verification(report, error=e)
+            return
+        self._record_verification(report, open_orders)
+
+    # The helpers below hold no I/O: AsyncBinanceLogic shares them and only awaits the calls.
+
+    @staticmethod
+    def _new_rollback_report(symbol: str, order_ids: List[str]) -> RollbackReport:
+        """An empty rollback report; with nothing to cancel, it is already verified."""
+        report = RollbackReport(symbol=symbol, requested=[str(order_id) for order_id in order_ids])
+        report.verified = not report.requested
+        return report
+
+    @staticmethod
+    def _record_cancelled(report: RollbackReport, order_id: str) -> None:
+        report.failed.pop(order_id, None)
+        if order_id not in report.cancelled:
+            report.cancelled.append(order_id)
+
+    @classmethod
+    def _record_cancel_responses(cls, report: RollbackReport, order_ids: List[str],
+                                 responses: List[Dict[str, Any]]) -> None:
+        """Records the per-order responses of one cancel-multiple request."""
+        for i, order_id in enumerate(order_ids):
+            response = responses[i] if i < len(responses) else None
+            if response is not None and response.get('status') != 'rejected':
+                cls._record_cancelled(report, order_id)
+            else:
+                info = (response or {}).get('info') or {}
+                report.failed[order_id] = f"{info.get('code', 'N/A')} {info.get('msg', '')}".strip()
+
+    @classmethod
+    def _record_cancel_outcomes(cls, report: RollbackReport, order_ids: List[str], outcomes: List[Any]) -> None:
+        """Records single-order cancels; each outcome is the exchange response or the exception raised."""
+        for order_id, outcome in zip(order_ids, outcomes):
+            if isinstance(outcome, Exception):
+                report.failed[order_id] = str(outcome)
+            else:
+                cls._record_cancelled(report, order_id)
+
+    @staticmethod
+    def _record_verification(report: RollbackReport, open_orders: Optional[List[Dict[str, Any]]] = None,
+                             error: Optional[Exception] = None) -> None:
+        """Records which requested orders are still open, or why the open orders could not be read."""
+        if error is not None:
+            report.verified = False
+            report.verification_error = str(error)
+            return
+        open_ids = {str(order.get('id')) for order in open_orders}
+        report.still_open = [order_id for order_id in report.requested if order_id in open_ids]
+        report.verified = True
+        report.verification_error = None
+
+    @staticmethod
+    def max_batch_size(market_environment: MarketEnvironment) -> int:
+        """Number of orders a single place_orders_batch call accepts for the environment."""
+        if BinanceLogic._is_futures(market_environment):
+            return MAX_FUTURES_BATCH_ORDERS
+        return MAX_SPOT_SEQUENTIAL_ORDERS
+
+    def _throttled(self, exchange: ccxt.Exchange, market_environment: MarketEnvironment,
+                   operation: str, call: Callable[[], T], orders: int = 0) -> T:
+        """Runs one exchange call inside the shared rate budget, then feeds back the response headers."""
+        weight = self.rate_limiter.request_weight(operation, market_environment)
+        waited = self.rate_limiter.acquire(market_environment, weight=weight, orders=orders)
+        self._record_rate_limit_wait(self.metrics, market_environment, waited)
+        try:
+            with self.metrics.span(f'exchange.{operation}'):
+                return call()
+        finally:
+            self.rate_limiter.update_from_headers(market_environment, getattr(exchange, 'last_response_headers', None))
+
+    @staticmethod
+    def _record_rate_limit_wait(metrics: Metrics, market_environment: MarketEnvironment, waited: float) -> None:
+        if waited > 0:
+            metrics.increment('rate_limit_waits', env=market_environment.value)
+            metrics.observe('rate_limit.wait', waited)
+
+    @staticmethod
+    def _record_retry(metrics: Metrics, delay: float) -> None:
+        metrics.increment('order_retries')
+        metrics.observe('retry.backoff', delay)
+
+    @classmethod
+    def _retry_delay(cls, retry_policy: RetryPolicy, metrics: Metrics, attempt: int, error: Exception) -> float:
+        """Backoff before the next attempt, recorded as a retry; raises ``error`` once the policy gives up."""
+        if not retry_policy.allows(attempt):
+            raise error
+        delay = retry_policy.delay(attempt)
+        cls._record_retry(metrics, delay)
+        return delay
+
+    @staticmethod
+    def _is_futures(market_environment: MarketEnvironment) -> bool:
+        return market_environment in [MarketEnvironment.FUTURES_LIVE, MarketEnvironment.FUTURES_TESTNET]
+
+    @staticmethod
+    def _validate_order_params(order_type: str, side: str, amount: float, price: Optional[float]) -> None:
         if order_type.upper() not in [ui_strings.ORDER_TYPE_LIMIT, ui_strings.ORDER_TYPE_MARKET]:
             raise InvalidOrderParamsError(error_messages.PARAM_ORDER_TYPE_INVALID)
         if side.upper() not in [ui_strings.SIDE_BUY, ui_strings.SIDE_SELL]:
@@ -102,56 +634,292 @@ class BinanceLogic:
         if order_type.upper() == ui_strings.ORDER_TYPE_LIMIT and (price is None or price <= 0):
             raise InvalidOrderParamsError(error_messages.PARAM_PRICE_MUST_BE_POSITIVE_LIMIT)
 
+    @staticmethod
+    def _ccxt_margin_mode(margin_mode: Optional[str]) -> str:
+        if margin_mode == ui_strings.MERGE_MODE_ISOLATED:
+            return "ISOLATED"
+        if margin_mode == ui_strings.MERGE_MODE_CROSS:
+            return "CROSSED"
+        return ""
+
+    def _known_futures_config(self, exchange: ccxt.Exchange, market_environment: MarketEnvironment,
+                              api_key: str, symbol: str) -> FuturesSymbolConfig:
+        """
+        Cached margin mode and leverage of the symbol, read from the position-risk endpoint on a miss.
+        A failed read is not an error: the returned config is empty and both values get sent.
+        """
+        known = self.futures_config.get(api_key, market_environment, symbol)
+        if known is not None:
+            return known
         try:
-            exchange = ExchangeFactory.create(api_key, secret_key, market_environment)
-
-            # Futures-specific setup: Margin Mode and Leverage
-            if market_environment in [MarketEnvironment.FUTURES_LIVE, MarketEnvironment.FUTURES_TESTNET]:
-                if symbol and margin_mode and leverage is not None:
-                    ccxt_margin_mode = ""
-                    if margin_mode == ui_strings.MERGE_MODE_ISOLATED:
-                        ccxt_margin_mode = "ISOLATED"
-                    elif margin_mode == ui_strings.MERGE_MODE_CROSS:
-                        ccxt_margin_mode = "CROSSED"
-
-                    if ccxt_margin_mode:
-                        try:
-                            exchange.set_margin_mode(ccxt_margin_mode, symbol, params={'adjustForTimeDifference': True})
-                        except ccxt.ExchangeError as e_margin:
-                            raise OrderPlacementError(f"Failed to set margin mode to {ccxt_margin_mode} for {symbol}: {str(e_margin)}")
-                        except Exception as e_generic_margin:
-                            raise OrderPlacementError(f"Unexpected error setting margin mode for {symbol}: {str(e_generic_margin)}")
-
-                    if leverage > 0:
-                        try:
-                            exchange.set_leverage(leverage, symbol, params={'adjustForTimeDifference': True})
-                        except ccxt.ExchangeError as e_leverage:
-                            raise OrderPlacementError(f"Failed to set leverage to {leverage} for {symbol}: {str(e_leverage)}")
-                        except Exception as e_generic_leverage:
-                            raise OrderPlacementError(f"Unexpected error setting leverage for {symbol}: {str(e_generic_leverage)}")
-
-            ccxt_order_type = cast(OrderType, order_type.lower())
-            ccxt_side = cast(OrderSide, side.lower())
-            
-            assert ccxt_order_type in ['limit', 'market'], f"Invalid order type: {ccxt_order_type}"
-            assert ccxt_side in ['buy', 'sell'], f"Invalid order side: {ccxt_side}"
-
-            final_price = None
-            if order_type.upper() == ui_strings.ORDER_TYPE_LIMIT:
-                final_price = price
-
-            order_response = exchange.create_order(symbol, ccxt_order_type, ccxt_side, amount, final_price, {})
-            return order_response
-
-        except ccxt.InsufficientFunds as e:
-            raise InsufficientFundsError(f"Insufficient funds: {str(e)}")
-        except ccxt.InvalidOrder as e:
-            raise InvalidOrderParamsError(f"Invalid order parameters for exchange: {str(e)}")
-        except ccxt.NetworkError as e:
-            raise CustomNetworkError(f"Network error during order placement: {str(e)}")
-        except ccxt.ExchangeError as e:
-            raise OrderPlacementError(f"Binance API error during order placement: {str(e)}")
-        except InvalidOrderParamsError:
-            raise
-        except Exception as e:
-            raise AppLogicError(f"An unexpected error occurred during order placement: {str(e)}")
+            rows = self._throttled(exchange, market_environment, 'position_risk',
+                                   lambda: exchange.fapiPrivateV2GetPositionRisk({'symbol': to_market_id(symbol)}))
+        except Exception:
+            return FuturesSymbolConfig()
+        return self._seed_futures_config(self.futures_config, api_key, market_environment, symbol, rows)
+
+    def _configure_futures_symbol(self, exchange: ccxt.Exchange, market_environment: MarketEnvironment,
+                                  api_key: str, symbol: str, margin_mode: Optional[str], leverage: Optional[int]) -> None:
+        """
+        Futures-specific setup: Margin Mode and Leverage.
+        Only values that differ from the cached ones are sent; a failed change drops the symbol
+        from the cache, so the next call reads the exchange again instead of trusting it.
+        """
+        if not self._needs_futures_config(market_environment, symbol, margin_mode, leverage):
+            return
+
+        known = self._known_futures_config(exchange, market_environment, api_key, symbol)
+        ccxt_margin_mode, new_leverage = self._futures_config_changes(margin_mode, leverage, known)
+
+        if ccxt_margin_mode:
+            try:
+                self._throttled(exchange, market_environment, 'set_margin_mode',
+                                lambda: exchange.set_margin_mode(ccxt_margin_mode, symbol, params={'adjustForTimeDifference': True}))
+            except Exception as e:
+                self._futures_config_failed(self.futures_config, api_key, market_environment, symbol,
+                                            self._margin_mode_error(ccxt_margin_mode, symbol, e))
+            self.futures_config.update(api_key, market_environment, symbol, margin_mode=ccxt_margin_mode)
+
+        if new_leverage is not None:
+            try:
+                self._throttled(exchange, market_environment, 'set_leverage',
+                                lambda: exchange.set_leverage(new_leverage, symbol, params={'adjustForTimeDifference': True}))
+            except Exception as e:
+                self._futures_config_failed(self.futures_config, api_key, market_environment, symbol,
+                                            self._leverage_error(new_leverage, symbol, e))
+            self.futures_config.update(api_key, market_environment, symbol, leverage=new_leverage)
+
+    @classmethod
+    def _needs_futures_config(cls, market_environment: MarketEnvironment, symbol: str,
+                              margin_mode: Optional[str], leverage: Optional[int]) -> bool:
+        return cls._is_futures(market_environment) and bool(symbol and margin_mode and leverage is not None)
+
+    @staticmethod
+    def _seed_futures_config(cache: FuturesConfigCache, api_key: str, market_environment: MarketEnvironment,
+                             symbol: str, rows: Any) -> FuturesSymbolConfig:
+        """Caches a position-risk response (every symbol of the account) and returns this symbol's config."""
+        cache.seed(api_key, market_environment, parse_position_risk(rows))
+        return cache.get(api_key, market_environment, symbol) or FuturesSymbolConfig()
+
+    @classmethod
+    def _futures_config_changes(cls, margin_mode: str, leverage: int,
+                                known: FuturesSymbolConfig) -> Tuple[str, Optional[int]]:
+        """The ccxt margin mode and the leverage to send; '' and None for values already in effect."""
+        ccxt_margin_mode = cls._ccxt_margin_mode(margin_mode)
+        if known.margin_mode == ccxt_margin_mode:
+            ccxt_margin_mode = ""
+        return ccxt_margin_mode, (leverage if leverage > 0 and known.leverage != leverage else None)
+
+    @staticmethod
+    def _margin_mode_error(ccxt_margin_mode: str, symbol: str, e: Exception) -> Optional[OrderPlacementError]:
+        """The error to raise after a failed margin mode change, or None if the mode was already set."""
+        if isinstance(e, ccxt.ExchangeError):
+            if margin_mode_unchanged(e):
+                return None
+            return OrderPlacementError(f"Failed to set margin mode to {ccxt_margin_mode} for {symbol}: {str(e)}")
+        return OrderPlacementError(f"Unexpected error setting margin mode for {symbol}: {str(e)}")
+
+    @staticmethod
+    def _leverage_error(leverage: int, symbol: str, e: Exception) -> OrderPlacementError:
+        if isinstance(e, ccxt.ExchangeError):
+            return OrderPlacementError(f"Failed to set leverage to {leverage} for {symbol}: {str(e)}")
+        return OrderPlacementError(f"Unexpected error setting leverage for {symbol}: {str(e)}")
+
+    @staticmethod
+    def _futures_config_failed(cache: FuturesConfigCache, api_key: str, market_environment: MarketEnvironment,
+                               symbol: str, error: Optional[OrderPlacementError]) -> None:
+        """Drops the symbol from the cache and raises ``error``, so the next call reads the exchange again."""
+        if error is None:
+            return
+        cache.invalidate(api_key, market_environment, [symbol])
+        raise error
+
+    @staticmethod
+    def _to_ccxt_order_args(order_type: str, side: str, price: Optional[float]) -> Tuple[OrderType, OrderSide, Optional[float]]:
+        ccxt_order_type = cast(OrderType, order_type.lower())
+        ccxt_side = cast(OrderSide, side.lower())
+
+        assert ccxt_order_type in ['limit', 'market'], f"Invalid order type: {ccxt_order_type}"
+        assert ccxt_side in ['buy', 'sell'], f"Invalid order side: {ccxt_side}"
+
+        final_price = None
+        if order_type.upper() == ui_strings.ORDER_TYPE_LIMIT:
+            final_price = price
+        return ccxt_order_type, ccxt_side, final_price
+
+    @staticmethod
+    def _order_params(client_order_id: Optional[str]) -> Dict[str, Any]:
+        return {'newClientOrderId': client_order_id} if client_order_id else {}
+
+    def _create_order(self, exchange: ccxt.Exchange, market_environment: MarketEnvironment, symbol: str,
+                      order_type: str, side: str, amount: float, price: Optional[float],
+                      client_order_id: Optional[str] = None):
+        args = self._create_order_args(symbol, order_type, side, amount, price, client_order_id)
+        return self._throttled(exchange, market_environment, 'create_order', lambda: exchange.create_order(*args),
+                               orders=1)
+
+    @classmethod
+    def _create_order_args(cls, symbol: str, order_type: str, side: str, amount: float, price: Optional[float],
+                           client_order_id: Optional[str]) -> Tuple[Any, ...]:
+        """Positional arguments of ccxt's create_order for one order."""
+        ccxt_order_type, ccxt_side, final_price = cls._to_ccxt_order_args(order_type, side, price)
+        return symbol, ccxt_order_type, ccxt_side, amount, final_price, cls._order_params(client_order_id)
+
+    def _fetch_order_by_client_id(self, exchange: ccxt.Exchange, market_environment: MarketEnvironment,
+                                  symbol: str, client_order_id: str) -> Optional[Dict[str, Any]]:
+        """The order the exchange knows under this client id, or None if it never received it."""
+        try:
+            return self._throttled(exchange, market_environment, 'fetch_order',
+                                   lambda: exchange.fetch_order(None, symbol, {'origClientOrderId': client_order_id}))
+        except ccxt.OrderNotFound:
+            return None
+
+    def _recover_after_network_error(self, exchange: ccxt.Exchange, market_environment: MarketEnvironment,
+                                     symbol: str, client_order_ids: List[str], error: Exception,
+                                     attempt: int) -> Tuple[Dict[str, Dict[str, Any]], int]:
+        """
+        Waits out the backoff, then looks the orders up by client id, since a timeout does not
+        mean they were not placed. A lookup that fails on the network uses up an attempt too.
+
+        Returns:
+            The orders found, keyed by client id, and the next attempt number.
+
+        Raises:
+            The last network error once the retry policy gives up.
+        """
+        while True:
+            time.sleep(self._retry_delay(self.retry_policy, self.metrics, attempt, error))
+            attempt += 1
+            try:
+                found = {}
+                for client_order_id in client_order_ids:
+                    order = self._fetch_order_by_client_id(exchange, market_environment, symbol, client_order_id)
+                    if order is not None:
+                        found[client_order_id] = order
+                return found, attempt
+            except ccxt.NetworkError as e:
+                error = e
+
+    def _create_order_with_retry(self, exchange: ccxt.Exchange, market_environment: MarketEnvironment, symbol: str,
+                                 order: Dict[str, Any]):
+        """Sends one order; with a client id, a network error is followed by a lookup and, if needed, a resend."""
+        client_order_id = order.get('client_order_id')
+        attempt = 0
+        while True:
+            try:
+                return self._create_order(exchange, market_environment, symbol, order['order_type'], order['side'],
+                                          order['amount'], order.get('price'), client_order_id)
+            except ccxt.NetworkError as e:
+                if not client_order_id:
+                    raise
+                found, attempt = self._recover_after_network_error(exchange, market_environment, symbol,
+                                                                   [client_order_id], e, attempt)
+            if client_order_id in found:
+                return found[client_order_id]
+
+    @staticmethod
+    def _batch_requests(symbol: str, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        requests = []
+        for order in orders:
+            ccxt_order_type, ccxt_side, final_price = BinanceLogic._to_ccxt_order_args(
+                order['order_type'], order['side'], order.get('price'))
+            requests.append({
+                'symbol': symbol, 'type': ccxt_order_type, 'side': ccxt_side, 'amount': order['amount'],
+                'price': final_price, 'params': BinanceLogic._order_params(order.get('client_order_id')),
+            })
+        return requests
+
+    def _create_orders_native_batch(self, exchange: ccxt.Exchange, market_environment: MarketEnvironment, symbol: str,
+                                    orders: List[Dict[str, Any]]) -> List[Tuple[bool, Any]]:
+        """
+        Sends the orders through batchOrders. If the request fails on the network and every order
+        has a client id, the orders are looked up and only those the exchange lacks are resent.
+        """
+        results: Dict[int, Tuple[bool, Any]] = {}
+        pending = list(range(len(orders)))
+        attempt = 0
+        while pending:
+            batch = [orders[i] for i in pending]
+            requests = self._batch_requests(symbol, batch)
+            try:
+                responses = self._throttled(exchange, market_environment, 'create_orders',
+                                            lambda: exchange.create_orders(requests), orders=len(requests))
+            except ccxt.NetworkError as e:
+                client_order_ids = self._recoverable_client_ids(batch)
+                if client_order_ids is None:
+                    raise
+                found, attempt = self._recover_after_network_error(exchange, market_environment, symbol,
+                                                                   client_order_ids, e, attempt)
+                pending = self._still_missing(pending, client_order_ids, found, results)
+                continue
+            results.update(zip(pending, self._batch_results(batch, responses)))
+            pending = []
+        return [results[i] for i in range(len(orders))]
+
+    @staticmethod
+    def _recoverable_client_ids(orders: List[Dict[str, Any]]) -> Optional[List[str]]:
+        """Client ids of the orders, or None if one lacks an id: such a batch cannot be looked up safely."""
+        client_order_ids = [order.get('client_order_id') for order in orders]
+        return client_order_ids if all(client_order_ids) else None
+
+    @staticmethod
+    def _still_missing(pending: List[int], client_order_ids: List[str], found: Dict[str, Dict[str, Any]],
+                       results: Dict[int, Tuple[bool, Any]]) -> List[int]:
+        """Records the orders the lookup found and returns the positions that must be resent."""
+        missing = []
+        for i, client_order_id in zip(pending, client_order_ids):
+            if client_order_id in found:
+                results[i] = (True, found[client_order_id])
+            else:
+                missing.append(i)
+        return missing
+
+    @staticmethod
+    def _batch_results(orders: List[Dict[str, Any]], responses: List[Dict[str, Any]]) -> List[Tuple[bool, Any]]:
+        """Pairs each order of a batchOrders request with its response, flagging rejected entries."""
+        results: List[Tuple[bool, Any]] = []
+        for i in range(len(orders)):
+            response = responses[i] if i < len(responses) else None
+            if response is None:
+                results.append((False, OrderPlacementError(error_messages.BATCH_ORDER_MISSING_RESPONSE)))
+            elif response.get('status') == 'rejected':
+                info = response.get('info') or {}
+                detail = f"{info.get('code', 'N/A')} {info.get('msg', '')}".strip()
+                results.append((False, OrderPlacementError(f"Binance API error during order placement: {detail}")))
+            else:
+                results.append((True, response))
+        return results
+
+    def _create_orders_sequentially(self, exchange: ccxt.Exchange, market_environment: MarketEnvironment, symbol: str,
+                                    orders: List[Dict[str, Any]]) -> List[Tuple[bool, Any]]:
+        """Spot fallback: one request per order, stopping at the first failure."""
+        results: List[Tuple[bool, Any]] = []
+        for i, order in enumerate(orders):
+            try:
+                response = self._create_order_with_retry(exchange, market_environment, symbol, order)
+            except Exception as e:
+                results.extend(self._sequence_failure(e, len(orders) - i - 1))
+                break
+            results.append((True, response))
+        return results
+
+    @classmethod
+    def _sequence_failure(cls, error: Exception, remaining: int) -> List[Tuple[bool, Any]]:
+        """Results of the order that failed and of the ``remaining`` orders left unsent after it."""
+        skipped = OrderPlacementError(error_messages.BATCH_ORDER_NOT_SUBMITTED)
+        return [(False, cls._map_order_exception(error))] + [(False, skipped)] * remaining
+
+    @staticmethod
+    def _map_order_exception(e: Exception) -> Exception:
+        """Maps an error raised while placing an order to the application's exception types."""
+        if isinstance(e, ccxt.InsufficientFunds):
+            return InsufficientFundsError(f"Insufficient funds: {str(e)}")
+        if isinstance(e, ccxt.InvalidOrder):
+            return InvalidOrderParamsError(f"Invalid order parameters for exchange: {str(e)}")
+        if isinstance(e, ccxt.NetworkError):
+            return CustomNetworkError(f"Network error during order placement: {str(e)}")
+        if isinstance(e, ccxt.ExchangeError):
+            return OrderPlacementError(f"Binance API error during order placement: {str(e)}")
+        if isinstance(e, (InvalidOrderParamsError, OrderPlacementError)):
+            return e
+        return AppLogicError(f"An unexpected error occurred during order placement: {str(e)}")
@@ -0,0 +1,473 @@
+import asyncio
+import time
+import ccxt
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+from .constants import error_messages, ui_strings
+from .services.exchange_factory import AsyncExchangePool
+from .services.futures_config_cache import FuturesConfigCache, FuturesSymbolConfig
+from .services.leverage_brackets import LeverageBracketIndex
+from .services.market_index import MarketIndex
+from .services.metrics import Metrics, timed_async
+from .services.rate_limiter import RateLimiter
+from .services.retry_policy import RetryPolicy
+from .models.margin_brackets import MarginBrackets
+from .models.market_environment import MarketEnvironment
+from .models.order_state import to_market_id
+from .models.symbol_rules import SymbolRules
+from .models.rollback_report import RollbackReport
+from .app_logic import (
+    BinanceLogic, ApiKeyMissingError, CustomNetworkError, CustomExchangeError, AppLogicError,
+    InvalidOrderParamsError, MAX_FUTURES_CANCEL_BATCH, MAX_CONCURRENT_CANCELS,
+)
+
+T = TypeVar('T')
+
+class AsyncBinanceLogic:
+    """
+    Asynchronous counterpart of BinanceLogic, built on ccxt.async_support.
+
+    Methods have the same arguments, results and exceptions as their BinanceLogic
+    equivalents, but are coroutines: many requests can be in flight on one event loop
+    (see AsyncLoopThread) without a thread per request. Validation, error mapping and
+    the shared rate budget are the same as in BinanceLogic. An instance and its clients
+    belong to a single event loop; call close() on that loop when done.
+    """
+
+    def __init__(self, exchange_pool: Optional[AsyncExchangePool] = None, rate_limiter: Optional[RateLimiter] = None,
+                 market_index: Optional[MarketIndex] = None, retry_policy: Optional[RetryPolicy] = None,
+                 metrics: Optional[Metrics] = None, futures_config: Optional[FuturesConfigCache] = None,
+                 leverage_brackets: Optional[LeverageBracketIndex] = None):
+        """
+        Args:
+            exchange_pool: The async client pool. A private pool is created if omitted.
+            rate_limiter: The request budget to acquire from. Defaults to the process-wide limiter,
+                          so sync and async calls share the same Binance limits.
+            market_index: The symbol filter cache. Defaults to the process-wide index.
+            retry_policy: Backoff between retries after a network error. Defaults to RetryPolicy().
+            metrics: Where spans and counters are recorded. Defaults to the process-wide registry.
+            futures_config: Known margin mode and leverage per symbol. Defaults to the process-wide
+                            cache, shared with BinanceLogic.
+            leverage_brackets: The futures maintenance-margin bracket cache. Defaults to the process-wide
+                               index, shared with BinanceLogic.
+        """
+        self.metrics = metrics if metrics is not None else Metrics.shared()
+        self.exchange_pool = exchange_pool if exchange_pool is not None else AsyncExchangePool(metrics=self.metrics)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter.shared()
+        self.market_index = market_index if market_index is not None else MarketIndex.shared()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.futures_config = futures_config if futures_config is not None else FuturesConfigCache.shared()
+        self.leverage_brackets = (leverage_brackets if leverage_brackets is not None
+                                  else LeverageBracketIndex.shared())
+
+    max_batch_size = staticmethod(BinanceLogic.max_batch_size)
+
+    async def close(self) -> None:
+        """Closes every exchange client and its HTTP session."""
+        await self.exchange_pool.close()
+
+    @timed_async('logic.get_balance')
+    async def get_balance(self, api_key: str, secret_key: str, market_environment: MarketEnvironment) -> float:
+        """Fetches the total USDT balance. See BinanceLogic.get_balance."""
+        if not api_key or not secret_key:
+            raise ApiKeyMissingError(error_messages.PARAM_API_KEYS_REQUIRED)
+
+        try:
+            exchange = self.exchange_pool.get(api_key, secret_key, market_environment)
+            balance_data = await self._throttled(exchange, market_environment, 'fetch_balance', exchange.fetch_balance)
+            usdt_balance = balance_data.get('total', {}).get('USDT', 0.0)
+            return float(usdt_balance)
+
+        except ccxt.NetworkError as e:
+            raise CustomNetworkError(f"Network error connecting to Binance: {str(e)}")
+        except ccxt.ExchangeError as e:
+            raise CustomExchangeError(f"Binance API error: {str(e)}")
+        except Exception as e:
+            raise AppLogicError(f"An unexpected error occurred in application logic: {str(e)}")
+
+    @timed_async('logic.place_order')
+    async def place_order(self,
+                          api_key: str,
+                          secret_key: str,
+                          market_environment: MarketEnvironment,
+                          symbol: str,
+                          order_type: str,
+                          side: str,
+                          amount: float,
+                          price: Optional[float] = None,
+                          margin_mode: Optional[str] = None,
+                          leverage: Optional[int] = None,
+                          client_order_id: Optional[str] = None):
+        """Places one order. See BinanceLogic.place_order."""
+        if not api_key or not secret_key:
+            raise ApiKeyMissingError(error_messages.PARAM_API_KEYS_REQUIRED)
+        if not symbol:
+            raise InvalidOrderParamsError(error_messages.PARAM_SYMBOL_REQUIRED)
+        BinanceLogic._validate_order_params(order_type, side, amount, price)
+
+        try:
+            exchange = self.exchange_pool.get(api_key, secret_key, market_environment)
+            with self.metrics.span('place_order.market_rules'):
+                rules = await self._market_rules(exchange, market_environment, symbol)
+            order = BinanceLogic._apply_market_rules(rules, symbol, {'order_type': order_type, 'side': side,
+                                                                     'amount': amount, 'price': price,
+                                                                     'client_order_id': client_order_id})
+            with self.metrics.span('place_order.configure'):
+                await self._configure_futures_symbol(exchange, market_environment, api_key, symbol, margin_mode, leverage)
+            with self.metrics.span('place_order.submit'):
+                return await self._create_order_with_retry(exchange, market_environment, symbol, order)
+        except Exception as e:
+            raise BinanceLogic._map_order_exception(e)
+
+    @timed_async('logic.configure_futures_symbol')
+    async def configure_futures_symbol(self,
+                                       api_key: str,
+                                       secret_key: str,
+                                       market_environment: MarketEnvironment,
+                                       symbol: str,
+                                       margin_mode: Optional[str],
+                                       leverage: Optional[int]) -> None:
+        """Applies the margin mode and leverage of a futures symbol. See BinanceLogic.configure_futures_symbol."""
+        if not api_key or not secret_key:
+            raise ApiKeyMissingError(error_messages.PARAM_API_KEYS_REQUIRED)
+        if not symbol:
+            raise InvalidOrderParamsError(error_messages.PARAM_SYMBOL_REQUIRED)
+
+        try:
+            exchange = self.exchange_pool.get(api_key, secret_key, market_environment)
+            await self._configure_futures_symbol(exchange, market_environment, api_key, symbol, margin_mode, leverage)
+        except Exception as e:
+            raise BinanceLogic._map_order_exception(e)
+
+    @timed_async('logic.prepare_orders')
+    async def prepare_orders(self,
+                             api_key: str,
+                             secret_key: str,
+                             market_environment: MarketEnvironment,
+                             symbol: str,
+                             orders: List[Dict[str, Any]]) -> List[Tuple[bool, Any]]:
+        """Checks orders against the symbol's filters without placing them. See BinanceLogic.prepare_orders."""
+        if not api_key or not secret_key:
+            raise ApiKeyMissingError(error_messages.PARAM_API_KEYS_REQUIRED)
+        if not symbol:
+            raise InvalidOrderParamsError(error_messages.PARAM_SYMBOL_REQUIRED)
+
+        exchange = self.exchange_pool.get(api_key, secret_key, market_environment)
+        rules = await self._market_rules(exchange, market_environment, symbol)
+        return BinanceLogic._prepare_with_rules(rules, symbol, orders)
+
+    @timed_async('logic.margin_brackets')
+    async def margin_brackets(self,
+                              api_key: str,
+                              secret_key: str,
+                              market_environment: MarketEnvironment,
+                              symbol: str) -> Optional[MarginBrackets]:
+        """Maintenance-margin brackets of a futures symbol, or None. See BinanceLogic.margin_brackets."""
+        if not api_key or not secret_key:
+            raise ApiKeyMissingError(error_messages.PARAM_API_KEYS_REQUIRED)
+        if not BinanceLogic._is_futures(market_environment):
+            return None
+
+        index = self.leverage_brackets
+        if index.needs_refresh(market_environment, symbol):
+            try:
+                exchange = self.exchange_pool.get(api_key, secret_key, market_environment)
+                rows = await self._throttled(exchange, market_environment, 'leverage_bracket',
+                                             exchange.fapiPrivateGetLeverageBracket)
+                index.update(market_environment, rows)
+            except Exception:
+                index.record_failure(market_environment)
+        return index.get(market_environment, symbol)
+
+    async def _market_rules(self, exchange, market_environment: MarketEnvironment,
+                            symbol: str) -> Optional[SymbolRules]:
+        """Symbol filters from the market index, refreshed through this client when needed."""
+        if self.market_index.needs_refresh(market_environment, symbol):
+            try:
+                markets = await self._throttled(exchange, market_environment, 'fetch_markets', exchange.fetch_markets)
+                self.market_index.update(market_environment, markets)
+            except Exception:
+                self.market_index.record_failure(market_environment)
+        return self.market_index.get(market_environment, symbol)
+
+    @timed_async('logic.place_orders_batch')
+    async def place_orders_batch(self,
+                                 api_key: str,
+                                 secret_key: str,
+                                 market_environment: MarketEnvironment,
+                                 symbol: str,
+                                 orders: List[Dict[str, Any]],
+                                 margin_mode: Optional[str] = None,
+                                 leverage: Optional[int] = None) -> List[Tuple[bool, Any]]:
+        """Places several orders on one symbol. See BinanceLogic.place_orders_batch."""
+        BinanceLogic._validate_batch(api_key, secret_key, market_environment, symbol, orders)
+        if not orders:
+            return []
+
+        try:
+            exchange = self.exchange_pool.get(api_key, secret_key, market_environment)
+            with self.metrics.span('place_orders_batch.market_rules'):
+                rules = await self._market_rules(exchange, market_environment, symbol)
+            prepared = BinanceLogic._prepare_with_rules(rules, symbol, orders)
+            sendable = [payload for success, payload in prepared if success]
+            if not sendable:
+                return prepared
+            with self.metrics.span('place_orders_batch.configure'):
+                await self._configure_futures_symbol(exchange, market_environment, api_key, symbol, margin_mode, leverage)
+            with self.metrics.span('place_orders_batch.submit'):
+                if BinanceLogic._is_futures(market_environment):
+                    sent = await self._create_orders_native_batch(exchange, market_environment, symbol, sendable)
+                else:
+                    sent = await self._create_orders_sequentially(exchange, market_environment, symbol, sendable)
+            return BinanceLogic._merge_prepared(prepared, sent)
+        except Exception as e:
+            mapped = BinanceLogic._map_order_exception(e)
+            return [(False, mapped) for _ in orders]
+
+    @timed_async('logic.cancel_orders')
+    async def cancel_orders(self,
+                            api_key: str,
+                            secret_key: str,
+                            market_environment: MarketEnvironment,
+                            symbol: str,
+                            order_ids: List[str]) -> RollbackReport:
+        """Cancels the given orders and verifies the result. See BinanceLogic.cancel_orders."""
+        if not api_key or not secret_key:
+            raise ApiKeyMissingError(error_messages.PARAM_API_KEYS_REQUIRED)
+
+        started = time.perf_counter()
+        report = BinanceLogic._new_rollback_report(symbol, order_ids)
+        if not report.requested:
+            return report
+
+        exchange = self.exchange_pool.get(api_key, secret_key, market_environment)
+        pending = report.requested
+        if BinanceLogic._is_futures(market_environment):
+            pending = await self._cancel_orders_native_batch(exchange, market_environment, symbol, pending, report)
+        await self._cancel_orders_concurrently(exchange, market_environment, symbol, pending, report)
+        await self._verify_cancelled(exchange, market_environment, symbol, report)
+
+        if report.still_open:
+            retry = list(report.still_open)
+            await self._cancel_orders_concurrently(exchange, market_environment, symbol, retry, report)
+            await self._verify_cancelled(exchange, market_environment, symbol, report)
+
+        report.duration = time.perf_counter() - started
+        return report
+
+    @timed_async('logic.fetch_open_orders')
+    async def fetch_open_orders(self,
+                                api_key: str,
+                                secret_key: str,
+                                market_environment: MarketEnvironment,
+                                symbol: str) -> List[Dict[str, Any]]:
+        """Fetches the orders still resting on one symbol. See BinanceLogic.fetch_open_orders."""
+        if not api_key or not secret_key:
+            raise ApiKeyMissingError(error_messages.PARAM_API_KEYS_REQUIRED)
+
+        try:
+            exchange = self.exchange_pool.get(api_key, secret_key, market_environment)
+            return await self._throttled(exchange, market_environment, 'fetch_open_orders',
+                                         lambda: exchange.fetch_open_orders(symbol))
+        except ccxt.NetworkError as e:
+            raise CustomNetworkError(f"Network error connecting to Binance: {str(e)}")
+        except ccxt.ExchangeError as e:
+            raise CustomExchangeError(f"Binance API error: {str(e)}")
+
+    @timed_async('logic.fetch_orders_by_client_id')
+    async def fetch_orders_by_client_id(self,
+                                        api_key: str,
+                                        secret_key: str,
+                                        market_environment: MarketEnvironment,
+                                        symbol: str,
+                                        client_order_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Looks orders up by client order id, all at once. See BinanceLogic.fetch_orders_by_client_id."""
+        if not api_key or not secret_key:
+            raise ApiKeyMissingError(error_messages.PARAM_API_KEYS_REQUIRED)
+
+        exchange = self.exchange_pool.get(api_key, secret_key, market_environment)
+        outcomes = await asyncio.gather(*(self._fetch_order_by_client_id(exchange, market_environment, symbol,
+                                                                         client_order_id)
+                                          for client_order_id in client_order_ids), return_exceptions=True)
+        return {client_order_id: outcome for client_order_id, outcome in zip(client_order_ids, outcomes)
+                if not isinstance(outcome, Exception)}
+
+    async def _cancel_orders_native_batch(self, exchange, market_environment: MarketEnvironment, symbol: str,
+                                          order_ids: List[str], report: RollbackReport) -> List[str]:
+        """Cancels through cancel-multiple, all chunks in flight at once. Returns the ids not reached."""
+        if not exchange.has.get('cancelOrders'):
+            return list(order_ids)
+
+        chunks = [order_ids[start:start + MAX_FUTURES_CANCEL_BATCH]
+                  for start in range(0, len(order_ids), MAX_FUTURES_CANCEL_BATCH)]
+        outcomes = await asyncio.gather(
+            *(self._throttled(exchange, market_environment, 'cancel_orders',
+                              lambda chunk=chunk: exchange.cancel_orders(chunk, symbol)) for chunk in chunks),
+            return_exceptions=True)
+
+        unreached: List[str] = []
+        for chunk, responses in zip(chunks, outcomes):
+            if isinstance(responses, Exception):
+                unreached.extend(chunk)
+            else:
+                BinanceLogic._record_cancel_responses(report, chunk, responses)
+        return unreached
+
+    async def _cancel_orders_concurrently(self, exchange, market_environment: MarketEnvironment, symbol: str,
+                                          order_ids: List[str], report: RollbackReport) -> None:
+        if not order_ids:
+            return
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CANCELS)
+
+        async def cancel_one(order_id: str):
+            async with semaphore:
+                return await self._throttled(exchange, market_environment, 'cancel_order',
+                                             lambda: exchange.cancel_order(order_id, symbol))
+
+        outcomes = await asyncio.gather(*(cancel_one(order_id) for order_id in order_ids), return_exceptions=True)
+        BinanceLogic._record_cancel_outcomes(report, order_ids, outcomes)
+
+    async def _verify_cancelled(self, exchange, market_environment: MarketEnvironment, symbol: str,
+                                report: RollbackReport) -> None:
+        try:
+            open_orders = await self._throttled(exchange, market_environment, 'fetch_open_orders',
+                                                lambda: exchange.fetch_open_orders(symbol))
+        except Exception as e:
+            BinanceLogic._record_verification(report, error=e)
+            return
+        BinanceLogic._record_verification(report, open_orders)
+
+    async def _throttled(self, exchange, market_environment: MarketEnvironment, operation: str,
+                         call: Callable[[], Awaitable[T]], orders: int = 0) -> T:
+        """Awaits one exchange call inside the shared rate budget, then feeds back the response headers."""
+        weight = self.rate_limiter.request_weight(operation, market_environment)
+        waited = await self.rate_limiter.acquire_async(market_environment, weight=weight, orders=orders)
+        BinanceLogic._record_rate_limit_wait(self.metrics, market_environment, waited)
+        try:
+            with self.metrics.span(f'exchange.{operation}'):
+                return await call()
+        finally:
+            self.rate_limiter.update_from_headers(market_environment, getattr(exchange, 'last_response_headers', None))
+
+    async def _known_futures_config(self, exchange, market_environment: MarketEnvironment,
+                                    api_key: str, symbol: str) -> FuturesSymbolConfig:
+        """Cached margin mode and leverage of the symbol. See BinanceLogic._known_futures_config."""
+        known = self.futures_config.get(api_key, market_environment, symbol)
+        if known is not None:
+            return known
+        try:
+            rows = await self._throttled(exchange, market_environment, 'position_risk',
+                                         lambda: exchange.fapiPrivateV2GetPositionRisk({'symbol': to_market_id(symbol)}))
+        except Exception:
+            return FuturesSymbolConfig()
+        return BinanceLogic._seed_futures_config(self.futures_config, api_key, market_environment, symbol, rows)
+
+    async def _configure_futures_symbol(self, exchange, market_environment: MarketEnvironment, api_key: str,
+                                        symbol: str, margin_mode: Optional[str], leverage: Optional[int]) -> None:
+        """Futures-specific setup: Margin Mode and Leverage. See BinanceLogic._configure_futures_symbol."""
+        if not BinanceLogic._needs_futures_config(market_environment, symbol, margin_mode, leverage):
+            return
+
+        known = await self._known_futures_config(exchange, market_environment, api_key, symbol)
+        ccxt_margin_mode, new_leverage = BinanceLogic._futures_config_changes(margin_mode, leverage, known)
+
+        if ccxt_margin_mode:
+            try:
+                await self._throttled(exchange, market_environment, 'set_margin_mode',
+                                      lambda: exchange.set_margin_mode(ccxt_margin_mode, symbol, params={'adjustForTimeDifference': True}))
+            except Exception as e:
+                BinanceLogic._futures_config_failed(self.futures_config, api_key, market_environment, symbol,
+                                                    BinanceLogic._margin_mode_error(ccxt_margin_mode, symbol, e))
+            self.futures_config.update(api_key, market_environment, symbol, margin_mode=ccxt_margin_mode)
+
+        if new_leverage is not None:
+            try:
+                await self._throttled(exchange, market_environment, 'set_leverage',
+                                      lambda: exchange.set_leverage(new_leverage, symbol, params={'adjustForTimeDifference': True}))
+            except Exception as e:
+                BinanceLogic._futures_config_failed(self.futures_config, api_key, market_environment, symbol,
+                                                    BinanceLogic._leverage_error(new_leverage, symbol, e))
+            self.futures_config.update(api_key, market_environment, symbol, leverage=new_leverage)
+
+    async def _create_order(self, exchange, market_environment: MarketEnvironment, symbol: str,
+                            order_type: str, side: str, amount: float, price: Optional[float],
+                            client_order_id: Optional[str] = None):
+        args = BinanceLogic._create_order_args(symbol, order_type, side, amount, price, client_order_id)
+        return await self._throttled(exchange, market_environment, 'create_order',
+                                     lambda: exchange.create_order(*args), orders=1)
+
+    async def _fetch_order_by_client_id(self, exchange, market_environment: MarketEnvironment,
+                                        symbol: str, client_order_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return await self._throttled(exchange, market_environment, 'fetch_order',
+                                         lambda: exchange.fetch_order(None, symbol, {'origClientOrderId': client_order_id}))
+        except ccxt.OrderNotFound:
+            return None
+
+    async def _recover_after_network_error(self, exchange, market_environment: MarketEnvironment, symbol: str,
+                                           client_order_ids: List[str], error: Exception,
+                                           attempt: int) -> Tuple[Dict[str, Dict[str, Any]], int]:
+        """Backoff, then lookup by client id. See BinanceLogic._recover_after_network_error."""
+        while True:
+            await asyncio.sleep(BinanceLogic._retry_delay(self.retry_policy, self.metrics, attempt, error))
+            attempt += 1
+            try:
+                found = {}
+                for client_order_id in client_order_ids:
+                    order = await self._fetch_order_by_client_id(exchange, market_environment, symbol, client_order_id)
+                    if order is not None:
+                        found[client_order_id] = order
+                return found, attempt
+            except ccxt.NetworkError as e:
+                error = e
+
+    async def _create_order_with_retry(self, exchange, market_environment: MarketEnvironment, symbol: str,
+                                       order: Dict[str, Any]):
+        client_order_id = order.get('client_order_id')
+        attempt = 0
+        while True:
+            try:
+                return await self._create_order(exchange, market_environment, symbol, order['order_type'],
+                                                order['side'], order['amount'], order.get('price'), client_order_id)
+            except ccxt.NetworkError as e:
+                if not client_order_id:
+                    raise
+                found, attempt = await self._recover_after_network_error(exchange, market_environment, symbol,
+                                                                         [client_order_id], e, attempt)
+            if client_order_id in found:
+                return found[client_order_id]
+
+    async def _create_orders_native_batch(self, exchange, market_environment: MarketEnvironment, symbol: str,
+                                          orders: List[Dict[str, Any]]) -> List[Tuple[bool, Any]]:
+        results: Dict[int, Tuple[bool, Any]] = {}
+        pending = list(range(len(orders)))
+        attempt = 0
+        while pending:
+            batch = [orders[i] for i in pending]
+            requests = BinanceLogic._batch_requests(symbol, batch)
+            try:
+                responses = await self._throttled(exchange, market_environment, 'create_orders',
+                                                  lambda: exchange.create_orders(requests), orders=len(requests))
+            except ccxt.NetworkError as e:
+                client_order_ids = BinanceLogic._recoverable_client_ids(batch)
+                if client_order_ids is None:
+                    raise
+                found, attempt = await self._recover_after_network_error(exchange, market_environment, symbol,
+                                                                         client_order_ids, e, attempt)
+                pending = BinanceLogic._still_missing(pending, client_order_ids, found, results)
+                continue
+            results.update(zip(pending, BinanceLogic._batch_results(batch, responses)))
+            pending = []
+        return [results[i] for i in range(len(orders))]
+
+    async def _create_orders_sequentially(self, exchange, market_environment: MarketEnvironment, symbol: str,
+                                          orders: List[Dict[str, Any]]) -> List[Tuple[bool, Any]]:
+        """Spot fallback: one request per order, stopping at the first failure."""
+        results: List[Tuple[bool, Any]] = []
+        for i, order in enumerate(orders):
+            try:
+                response = await self._create_order_with_retry(exchange, market_environment, symbol, order)
+            except Exception as e:
+                results.extend(BinanceLogic._sequence_failure(e, len(orders) - i - 1))
+                break
+            results.append((True, response))
+        return results
@@ -0,0 +1,8 @@
+from .data import BacktestError, BlocBougies, lire_bougies
+from .engine import (EchelleDca, CycleBacktest, ResultatBacktest, MoteurBacktest, backtester,
+                     backtester_symboles)
+from .monte_carlo import GenerateurBootstrap, GenerateurGbm, ResultatMonteCarlo, simuler_risque
+
+__all__ = ['BacktestError', 'BlocBougies', 'lire_bougies', 'EchelleDca', 'CycleBacktest', 'ResultatBacktest',
+           'MoteurBacktest', 'backtester', 'backtester_symboles', 'GenerateurBootstrap', 'GenerateurGbm',
+           'ResultatMonteCarlo', 'simuler_risque']
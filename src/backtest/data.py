@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Union
+import numpy as np
+from ..constants import error_messages
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Dépendance optionnelle, uniquement pour les fichiers Parquet
+    pq = None
+
+# Nombre de bougies lues à la fois : la mémoire reste constante quelle que soit la taille du fichier.
+TAILLE_BLOC = 100_000
+
+COLONNES_OHLCV = ("timestamp", "open", "high", "low", "close", "volume")
+# Noms de colonnes acceptés (ccxt fetch_ohlcv, exports de klines Binance, exports génériques).
+ALIAS_COLONNES = {
+    "timestamp": ("timestamp", "open_time", "opentime", "time", "ts"),
+    "open": ("open", "o"),
+    "high": ("high", "h"),
+    "low": ("low", "l"),
+    "close": ("close", "c"),
+    "volume": ("volume", "vol", "v"),
+}
+
+class BacktestError(ValueError):
+    """Custom exception for backtest errors."""
+    pass
+
+@dataclass
+class BlocBougies:
+    """Bloc de bougies OHLCV stocké par colonnes."""
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @classmethod
+    def depuis_colonnes(cls, colonnes: Sequence[np.ndarray]) -> "BlocBougies":
+        timestamp, *prix = colonnes
+        return cls(np.asarray(timestamp, dtype=np.int64),
+                   *(np.asarray(valeurs, dtype=np.float64) for valeurs in prix))
+
+def _resoudre_colonnes(noms: Sequence[str], chemin) -> List[int]:
+    """Retourne l'index de chaque colonne OHLCV dans l'en-tête donné."""
+    normalises = [nom.strip().lower() for nom in noms]
+    indices, manquantes = [], []
+    for colonne in COLONNES_OHLCV:
+        index = next((normalises.index(alias) for alias in ALIAS_COLONNES[colonne] if alias in normalises), None)
+        if index is None:
+            manquantes.append(colonne)
+        indices.append(index)
+    if manquantes:
+        raise BacktestError(error_messages.BACKTEST_ERROR_MISSING_COLUMNS.format(
+            path=chemin, columns=", ".join(manquantes)))
+    return indices
+
+def _est_numerique(valeur: str) -> bool:
+    try:
+        float(valeur)
+        return True
+    except ValueError:
+        return False
+
+def _lire_csv(chemin: Path, taille_bloc: int) -> Iterator[BlocBougies]:
+    """
+    Lit un CSV par blocs de taille_bloc lignes. Avec ou sans en-tête ; sans en-tête, les six
+    premières colonnes sont timestamp, open, high, low, close, volume (format des klines Binance).
+    """
+    with open(chemin, "r", encoding="utf-8") as fichier:
+        premiere = fichier.readline()
+        if not premiere.strip():
+            return
+        champs = premiere.strip().split(",")
+        if _est_numerique(champs[0]):
+            indices = list(range(len(COLONNES_OHLCV)))
+            lignes_en_attente = [premiere]
+        else:
+            indices = _resoudre_colonnes(champs, chemin)
+            lignes_en_attente = []
+
+        while True:
+            lignes = lignes_en_attente + list(islice(fichier, taille_bloc - len(lignes_en_attente)))
+            lignes_en_attente = []
+            lignes = [ligne for ligne in lignes if ligne.strip()]
+            if not lignes:
+                return
+            donnees = np.loadtxt(lignes, delimiter=",", usecols=indices, dtype=np.float64, ndmin=2)
+            yield BlocBougies.depuis_colonnes(donnees.T)
+
+def _lire_parquet(chemin: Path, taille_bloc: int) -> Iterator[BlocBougies]:
+    """Lit uniquement les colonnes OHLCV d'un fichier Parquet, par lots de taille_bloc lignes."""
+    if pq is None:
+        raise BacktestError(error_messages.BACKTEST_ERROR_PARQUET_UNAVAILABLE)
+    fichier = pq.ParquetFile(chemin)
+    noms = fichier.schema_arrow.names
+    colonnes = [noms[i] for i in _resoudre_colonnes(noms, chemin)]
+    for lot in fichier.iter_batches(batch_size=taille_bloc, columns=colonnes):
+        yield BlocBougies.depuis_colonnes([lot.column(nom).to_numpy(zero_copy_only=False) for nom in colonnes])
+
+def lire_bougies(chemin: Union[str, Path], taille_bloc: Optional[int] = None) -> Iterator[BlocBougies]:
+    """
+    Itère sur les bougies d'un fichier CSV ou Parquet (selon l'extension) par blocs.
+    Les bougies doivent être triées par timestamp croissant.
+    """
+    chemin = Path(chemin)
+    taille_bloc = taille_bloc or TAILLE_BLOC
+    if chemin.suffix.lower() in (".parquet", ".pq"):
+        return _lire_parquet(chemin, taille_bloc)
+    return _lire_csv(chemin, taille_bloc)
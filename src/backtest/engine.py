@@ -0,0 +1,257 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Union
+import numpy as np
+from ..constants import error_messages
+from .data import BacktestError, BlocBougies, lire_bougies
+
+# Frais par défaut (0,1 %), appliqués à chaque exécution sur le notionnel.
+FRAIS_DEFAUT = 0.001
+# Taille initiale de la fenêtre de recherche du prochain événement (multipliée par 4 à chaque essai).
+FENETRE_RECHERCHE = 256
+
+@dataclass
+class EchelleDca:
+    """
+    Forme d'une échelle d'achats LIMIT, indépendante du prix : chaque niveau est défini par
+    son ratio au prix du premier niveau (ratios[0] == 1) et par son montant en devise de cotation.
+    """
+    ratios: np.ndarray
+    montants: np.ndarray
+
+    def __post_init__(self):
+        self.ratios = np.asarray(self.ratios, dtype=np.float64)
+        self.montants = np.asarray(self.montants, dtype=np.float64)
+        executables = (self.ratios > 0) & (self.montants > 0)
+        self.ratios, self.montants = self.ratios[executables], self.montants[executables]
+        if len(self.ratios) == 0:
+            raise BacktestError(error_messages.BACKTEST_ERROR_EMPTY_LADDER)
+
+    @classmethod
+    def depuis_simulation(cls, results: dict) -> "EchelleDca":
+        """Construit l'échelle à partir du résultat de calculer_iterations."""
+        prix = np.asarray(results["prix_iterations"], dtype=np.float64)
+        montants = results.get("montants_par_iteration") or np.full(len(prix), results["montant_par_iteration"])
+        return cls(ratios=prix / prix[0], montants=montants)
+
+    def __len__(self) -> int:
+        return len(self.ratios)
+
+@dataclass
+class CycleBacktest:
+    """Un cycle d'achats DCA clôturé par une prise de profit."""
+    debut: int
+    fin: int
+    niveaux_executes: int
+    prix_moyen: float
+    prix_sortie: float
+    pnl: float
+
+@dataclass
+class ResultatBacktest:
+    """Résultat d'un backtest. Les montants sont en devise de cotation, le PnL est net de frais."""
+    nombre_bougies: int
+    balance_initiale: float
+    equity_finale: float
+    pnl_realise: float
+    pnl_latent: float
+    frais_total: float
+    niveaux_executes: int
+    quantite_finale: float
+    prix_moyen_final: Optional[float]
+    drawdown_max_percent: float
+    perte_latente_max: float
+    cycles: List[CycleBacktest] = field(default_factory=list)
+
+def _premier_index(condition: Callable[[int, int], np.ndarray], debut: int, fin: int) -> int:
+    """
+    Premier index de [debut, fin) où condition est vraie, ou fin. La fenêtre examinée grandit
+    géométriquement, donc le coût est proportionnel à la distance de l'événement et non au bloc.
+    """
+    fenetre = FENETRE_RECHERCHE
+    while debut < fin:
+        borne = min(fin, debut + fenetre)
+        masque = condition(debut, borne)
+        if masque.any():
+            return debut + int(masque.argmax())
+        debut = borne
+        fenetre *= 4
+    return fin
+
+class MoteurBacktest:
+    """
+    Rejoue des bougies contre une échelle DCA, bloc par bloc, en ne gardant que l'état courant.
+
+    Règles d'exécution, par bougie :
+    - la prise de profit est testée d'abord, sur la position détenue à l'ouverture : si le plus
+      haut atteint prix_moyen * (1 + take_profit_percent / 100), toute la position est vendue à
+      ce prix (ou à l'ouverture si elle est au-dessus) ;
+    - sinon, chaque niveau dont le prix est >= au plus bas est exécuté, au prix du niveau ou à
+      l'ouverture si elle est plus basse. La quantité de l'ordre est montant / prix du niveau.
+    Le prix moyen inclut les frais d'achat. Après une prise de profit, l'échelle est réancrée sur
+    la clôture de la bougie de sortie si relancer est vrai ; sinon le backtest n'achète plus.
+    """
+
+    def __init__(self, echelle: EchelleDca, ancre: Optional[float] = None, balance: Optional[float] = None,
+                 take_profit_percent: Optional[float] = None, frais: float = FRAIS_DEFAUT, relancer: bool = True):
+        if not 0 <= frais < 1:
+            raise BacktestError(error_messages.BACKTEST_ERROR_INVALID_FEE)
+        self.echelle = echelle
+        self.ancre = ancre
+        self.take_profit_percent = take_profit_percent
+        self.frais = frais
+        self.relancer = relancer
+
+        self.balance_initiale = float(balance) if balance is not None else float(echelle.montants.sum())
+        self.cash = self.balance_initiale
+        self.quantite = 0.0
+        self.cout = 0.0
+        self.prochain = 0
+        self.prix_niveaux = None
+        self.quantites_niveaux = None
+        self.prix_tp = None
+        self.termine = False
+        self.debut_cycle = None
+        self.niveaux_cycle = 0
+
+        self.nombre_bougies = 0
+        self.derniere_cloture = None
+        self.pic_equity = self.balance_initiale
+        self.drawdown_max = 0.0
+        self.perte_latente_max = 0.0
+        self.frais_total = 0.0
+        self.pnl_realise = 0.0
+        self.niveaux_executes = 0
+        self.cycles: List[CycleBacktest] = []
+
+    def _armer(self, ancre: float):
+        self.prix_niveaux = self.echelle.ratios * ancre
+        self.quantites_niveaux = self.echelle.montants / self.prix_niveaux
+        self.prochain = 0
+
+    def traiter(self, bloc: BlocBougies):
+        """Consomme un bloc de bougies."""
+        n = len(bloc)
+        if n == 0:
+            return
+        if self.prix_niveaux is None:
+            self._armer(self.ancre if self.ancre is not None else float(bloc.open[0]))
+
+        i = 0
+        while i < n:
+            evenement = self._prochain_evenement(bloc, i)
+            if evenement > i:
+                self._marquer(bloc, i, evenement)
+            if evenement == n:
+                break
+            self._appliquer_evenement(bloc, evenement)
+            self._marquer(bloc, evenement, evenement + 1)
+            i = evenement + 1
+        self.nombre_bougies += n
+
+    def _prochain_evenement(self, bloc: BlocBougies, debut: int) -> int:
+        seuil_achat = -np.inf
+        if not self.termine and self.prochain < len(self.prix_niveaux):
+            seuil_achat = self.prix_niveaux[self.prochain]
+        seuil_tp = self.prix_tp if self.quantite > 0 and self.prix_tp is not None else np.inf
+        if seuil_achat == -np.inf and seuil_tp == np.inf:
+            return len(bloc)
+        return _premier_index(lambda a, b: (bloc.low[a:b] <= seuil_achat) | (bloc.high[a:b] >= seuil_tp),
+                              debut, len(bloc))
+
+    def _appliquer_evenement(self, bloc: BlocBougies, i: int):
+        ouverture, plus_bas = bloc.open[i], bloc.low[i]
+        if self.quantite > 0 and self.prix_tp is not None and bloc.high[i] >= self.prix_tp:
+            self._sortir(max(self.prix_tp, ouverture), int(bloc.timestamp[i]))
+            if self.relancer:
+                self._armer(float(bloc.close[i]))
+            else:
+                self.termine = True
+            return
+
+        while self.prochain < len(self.prix_niveaux) and plus_bas <= self.prix_niveaux[self.prochain]:
+            prix = min(self.prix_niveaux[self.prochain], ouverture)
+            quantite = self.quantites_niveaux[self.prochain]
+            notionnel = quantite * prix
+            frais = notionnel * self.frais
+            if self.quantite == 0:
+                self.debut_cycle = int(bloc.timestamp[i])
+                self.niveaux_cycle = 0
+            self.quantite += quantite
+            self.cout += notionnel + frais
+            self.cash -= notionnel + frais
+            self.frais_total += frais
+            self.prochain += 1
+            self.niveaux_cycle += 1
+            self.niveaux_executes += 1
+
+        if self.take_profit_percent is not None and self.quantite > 0:
+            self.prix_tp = self.cout / self.quantite * (1 + self.take_profit_percent / 100)
+
+    def _sortir(self, prix: float, timestamp: int):
+        produit = self.quantite * prix
+        frais = produit * self.frais
+        pnl = produit - frais - self.cout
+        self.cycles.append(CycleBacktest(debut=self.debut_cycle, fin=timestamp, niveaux_executes=self.niveaux_cycle,
+                                         prix_moyen=self.cout / self.quantite, prix_sortie=prix, pnl=pnl))
+        self.cash += produit - frais
+        self.frais_total += frais
+        self.pnl_realise += pnl
+        self.quantite = 0.0
+        self.cout = 0.0
+        self.prix_tp = None
+
+    def _marquer(self, bloc: BlocBougies, debut: int, fin: int):
+        """Met à jour equity, drawdown et perte latente sur [debut, fin) avec la position courante."""
+        self.derniere_cloture = float(bloc.close[fin - 1])
+        if self.quantite == 0:
+            self.pic_equity = max(self.pic_equity, self.cash)
+            return
+        equity_cloture = self.cash + self.quantite * bloc.close[debut:fin]
+        equity_plus_bas = self.cash + self.quantite * bloc.low[debut:fin]
+        # Le plus bas d'une bougie est comparé au pic atteint avant elle : sa propre clôture vient après.
+        pics = np.maximum.accumulate(np.concatenate(([self.pic_equity], equity_cloture)))
+        self.drawdown_max = max(self.drawdown_max, float(((pics[:-1] - equity_plus_bas) / pics[:-1]).max()))
+        self.perte_latente_max = max(self.perte_latente_max, float(self.cout - self.quantite * bloc.low[debut:fin].min()))
+        self.pic_equity = float(pics[-1])
+
+    def resultat(self) -> ResultatBacktest:
+        valeur_position = self.quantite * self.derniere_cloture if self.quantite > 0 else 0.0
+        return ResultatBacktest(
+            nombre_bougies=self.nombre_bougies,
+            balance_initiale=self.balance_initiale,
+            equity_finale=self.cash + valeur_position,
+            pnl_realise=self.pnl_realise,
+            pnl_latent=valeur_position - self.cout,
+            frais_total=self.frais_total,
+            niveaux_executes=self.niveaux_executes,
+            quantite_finale=self.quantite,
+            prix_moyen_final=self.cout / self.quantite if self.quantite > 0 else None,
+            drawdown_max_percent=self.drawdown_max * 100,
+            perte_latente_max=self.perte_latente_max,
+            cycles=list(self.cycles),
+        )
+
+def backtester(source: Union[str, Path, Iterable[BlocBougies]], echelle: EchelleDca,
+               taille_bloc: Optional[int] = None, **options) -> ResultatBacktest:
+    """
+    Backtest d'une échelle sur un fichier de bougies (CSV ou Parquet) ou sur des blocs déjà chargés.
+    Les options sont celles de MoteurBacktest (ancre, balance, take_profit_percent, frais, relancer).
+    """
+    blocs = lire_bougies(source, taille_bloc) if isinstance(source, (str, Path)) else source
+    moteur = MoteurBacktest(echelle, **options)
+    for bloc in blocs:
+        moteur.traiter(bloc)
+    return moteur.resultat()
+
+def backtester_symboles(fichiers: Dict[str, Union[str, Path]], echelle: EchelleDca,
+                        max_workers: Optional[int] = None, **options) -> Dict[str, ResultatBacktest]:
+    """
+    Backtest de la même échelle sur plusieurs symboles, un processus par fichier.
+    Sans ancre explicite, chaque échelle est ancrée sur l'ouverture de la première bougie du symbole.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {symbole: executor.submit(backtester, str(chemin), echelle, **options)
+                   for symbole, chemin in fichiers.items()}
+        return {symbole: future.result() for symbole, future in futures.items()}
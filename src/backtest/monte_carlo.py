@@ -0,0 +1,296 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+import numpy as np
+from ..constants import error_messages
+from .data import BacktestError, BlocBougies, lire_bougies
+from .engine import EchelleDca
+
+# Valeurs (chemins x pas) traitées à la fois par un processus : un lot occupe quelques dizaines
+# de Mo quel que soit le nombre total de chemins.
+ELEMENTS_PAR_LOT = 500_000
+# Largeur de la première fenêtre de pas (multipliée par 4 à chaque fenêtre, comme FENETRE_RECHERCHE).
+FENETRE_INITIALE = 32
+# Chemins confiés à chaque tâche du pool. La graine d'une tâche dérive de la graine globale :
+# pour une même graine, le résultat ne dépend pas du nombre de processus.
+CHEMINS_PAR_TACHE = 20_000
+# Taux de marge de maintenance du premier palier des contrats USDⓈ-M (0,4 %).
+TAUX_MAINTENANCE_DEFAUT = 0.004
+# Objectif de sortie, en % au-dessus du prix moyen, qui met fin au cycle et libère le capital.
+TAKE_PROFIT_DEFAUT = 1.0
+
+@dataclass(frozen=True)
+class GenerateurGbm:
+    """
+    Mouvement brownien géométrique : rendements logarithmiques gaussiens indépendants, de
+    volatilité et de dérive données par pas (et non annualisées).
+    """
+    volatilite: float
+    derive: float = 0.0
+
+    def __post_init__(self):
+        if not (self.volatilite >= 0 and math.isfinite(self.volatilite) and math.isfinite(self.derive)):
+            raise BacktestError(error_messages.MONTE_CARLO_ERROR_VOLATILITY)
+
+    def generer(self, rng: np.random.Generator, nombre: int, horizon: int) -> np.ndarray:
+        rendements = rng.standard_normal((nombre, horizon))
+        rendements *= self.volatilite
+        rendements += self.derive - self.volatilite ** 2 / 2
+        return rendements
+
+@dataclass
+class GenerateurBootstrap:
+    """
+    Rendements logarithmiques historiques tirés avec remise, par blocs consécutifs de
+    ``longueur_bloc`` pas pour conserver une partie de l'autocorrélation (volatilité groupée).
+    """
+    rendements: np.ndarray
+    longueur_bloc: int = 1
+
+    def __post_init__(self):
+        rendements = np.asarray(self.rendements, dtype=np.float64)
+        self.rendements = rendements[np.isfinite(rendements)]
+        if self.longueur_bloc < 1 or len(self.rendements) < self.longueur_bloc:
+            raise BacktestError(error_messages.MONTE_CARLO_ERROR_RETURNS)
+
+    @classmethod
+    def depuis_bougies(cls, source: Union[str, Path, Iterable[BlocBougies]], longueur_bloc: int = 1,
+                       taille_bloc: Optional[int] = None) -> "GenerateurBootstrap":
+        """Rendements d'une clôture à la suivante, lus bloc par bloc (voir lire_bougies)."""
+        blocs = lire_bougies(source, taille_bloc) if isinstance(source, (str, Path)) else source
+        rendements, precedente = [], None
+        for bloc in blocs:
+            if len(bloc) == 0:
+                continue
+            clotures = bloc.close if precedente is None else np.concatenate(([precedente], bloc.close))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rendements.append(np.diff(np.log(clotures)))
+            precedente = bloc.close[-1]
+        return cls(np.concatenate(rendements) if rendements else np.empty(0), longueur_bloc)
+
+    def generer(self, rng: np.random.Generator, nombre: int, horizon: int) -> np.ndarray:
+        longueur = self.longueur_bloc
+        nombre_blocs = -(-horizon // longueur)
+        debuts = rng.integers(0, len(self.rendements) - longueur + 1, size=(nombre, nombre_blocs))
+        indices = (debuts[:, :, None] + np.arange(longueur)).reshape(nombre, nombre_blocs * longueur)
+        return self.rendements[indices[:, :horizon]]
+
+Generateur = Union[GenerateurGbm, GenerateurBootstrap]
+
+@dataclass
+class ResultatMonteCarlo:
+    """
+    Agrégats d'une simulation de Monte-Carlo, additionnés lot par lot : aucun chemin n'est gardé.
+
+    Chaque chemin est suivi jusqu'à la sortie au take-profit (fin du premier cycle) ou jusqu'à
+    l'horizon. ``profondeurs[d]`` compte les chemins dont d niveaux ont été exécutés,
+    ``recuperations[t]`` ceux sortis au pas t ; ``liquidations`` donne, par effet de levier,
+    le nombre de chemins liquidés avant leur sortie.
+    """
+    nombre_chemins: int
+    horizon: int
+    profondeurs: np.ndarray
+    recuperations: np.ndarray
+    catastrophes: int = 0
+    liquidations: Dict[int, int] = field(default_factory=dict)
+
+    @classmethod
+    def vide(cls, nombre_niveaux: int, horizon: int, leviers: Sequence[int]) -> "ResultatMonteCarlo":
+        return cls(0, horizon, np.zeros(nombre_niveaux + 1, dtype=np.int64), np.zeros(horizon + 1, dtype=np.int64),
+                   0, {levier: 0 for levier in leviers})
+
+    def fusionner(self, autre: "ResultatMonteCarlo") -> "ResultatMonteCarlo":
+        """Ajoute les agrégats d'un autre lot de la même simulation."""
+        self.nombre_chemins += autre.nombre_chemins
+        self.profondeurs += autre.profondeurs
+        self.recuperations += autre.recuperations
+        self.catastrophes += autre.catastrophes
+        for levier, nombre in autre.liquidations.items():
+            self.liquidations[levier] = self.liquidations.get(levier, 0) + nombre
+        return self
+
+    @property
+    def probabilite_catastrophe(self) -> float:
+        return self.catastrophes / self.nombre_chemins
+
+    def probabilite_liquidation(self, levier: int) -> float:
+        return self.liquidations[levier] / self.nombre_chemins
+
+    @property
+    def probabilite_recuperation(self) -> float:
+        return float(self.recuperations.sum()) / self.nombre_chemins
+
+    @property
+    def profondeur_moyenne(self) -> float:
+        return float(np.arange(len(self.profondeurs)) @ self.profondeurs) / self.nombre_chemins
+
+    def quantile_profondeur(self, q: float) -> int:
+        """Plus petit nombre de niveaux exécutés atteint ou dépassé par une fraction q des chemins."""
+        return int(np.searchsorted(np.cumsum(self.profondeurs), q * self.nombre_chemins))
+
+    @property
+    def temps_recuperation_moyen(self) -> Optional[float]:
+        """Nombre moyen de pas avant la sortie, parmi les chemins sortis."""
+        sortis = int(self.recuperations.sum())
+        if sortis == 0:
+            return None
+        return float(np.arange(len(self.recuperations)) @ self.recuperations) / sortis
+
+    def quantile_recuperation(self, q: float) -> Optional[int]:
+        """Pas avant lequel une fraction q de tous les chemins est sortie ; None si elle ne l'est pas à l'horizon."""
+        rang = int(np.searchsorted(np.cumsum(self.recuperations), q * self.nombre_chemins))
+        return rang if rang < len(self.recuperations) else None
+
+    def resume(self) -> List[str]:
+        """Texte récapitulatif, dans le style de formater_details."""
+        def pas(valeur):
+            return "au-delà de l'horizon" if valeur is None else f"{valeur:.0f} pas"
+
+        lignes = [
+            f"Chemins simulés: {self.nombre_chemins} sur {self.horizon} pas",
+            f"Niveaux exécutés: moyenne {self.profondeur_moyenne:.2f}, médiane {self.quantile_profondeur(0.5)}, "
+            f"95 % {self.quantile_profondeur(0.95)} (sur {len(self.profondeurs) - 1})",
+            f"Probabilité d'atteindre le prix catastrophique: {self.probabilite_catastrophe:.2%}",
+            f"Probabilité de sortie au take-profit: {self.probabilite_recuperation:.2%}",
+            f"Durée d'immobilisation: moyenne {pas(self.temps_recuperation_moyen)}, "
+            f"médiane {pas(self.quantile_recuperation(0.5))}, 95 % {pas(self.quantile_recuperation(0.95))}",
+        ]
+        for levier in sorted(self.liquidations):
+            lignes.append(f"Probabilité de liquidation (x{levier}): {self.probabilite_liquidation(levier):.2%}")
+        return lignes
+
+class _ContexteRisque:
+    """Échelle précalculée par profondeur d'exécution, envoyée une fois à chaque processus."""
+
+    def __init__(self, echelle: EchelleDca, ratio_catastrophique: float, generateur: Generateur, horizon: int,
+                 leviers: Sequence[int], take_profit_percent: float, taux_maintenance: float):
+        self.nombre_niveaux = len(echelle)
+        self.ratios_croissants = echelle.ratios[::-1].copy()
+        # Indexés par le nombre de niveaux exécutés (0 à n) : coût et quantité cumulés, seuil de sortie.
+        self.cout = np.concatenate(([0.0], np.cumsum(echelle.montants)))
+        self.quantite = np.concatenate(([0.0], np.cumsum(echelle.montants / echelle.ratios)))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.seuil_sortie = self.cout / self.quantite * (1 + take_profit_percent / 100)
+        self.seuil_sortie[0] = np.inf
+        self.balance = float(echelle.montants.sum())
+        self.ratio_catastrophique = ratio_catastrophique
+        self.generateur = generateur
+        self.horizon = horizon
+        self.leviers = tuple(leviers)
+        self.taux_maintenance = taux_maintenance
+
+def _simuler_lot(contexte: _ContexteRisque, rng: np.random.Generator, nombre: int) -> ResultatMonteCarlo:
+    """
+    Simule ``nombre`` chemins. Les prix sont des ratios au prix d'entrée (1 au pas 0, où le
+    premier niveau est exécuté) ; un niveau est exécuté dès que le prix passe sous son ratio.
+
+    Les chemins avancent par fenêtres de pas, de plus en plus larges : ceux sortis au take-profit
+    sont comptés puis retirés, et la fenêtre suivante n'est générée que pour les chemins restants.
+    """
+    horizon, leviers = contexte.horizon, contexte.leviers
+    resultat = ResultatMonteCarlo.vide(contexte.nombre_niveaux, horizon, leviers)
+    resultat.nombre_chemins = nombre
+    # État des chemins encore actifs entre deux fenêtres.
+    log_prix = np.zeros(nombre)
+    minimum = np.ones(nombre)
+    liquide = np.zeros((nombre, len(leviers)), dtype=bool)
+    pas, fenetre = 0, FENETRE_INITIALE
+    while len(log_prix) and pas < horizon:
+        actifs = len(log_prix)
+        largeur = min(horizon - pas, fenetre, max(1, ELEMENTS_PAR_LOT // actifs))
+        prix = contexte.generateur.generer(rng, actifs, largeur)
+        np.cumsum(prix, axis=1, out=prix)
+        prix += log_prix[:, None]
+        log_prix = prix[:, -1].copy()
+        np.exp(prix, out=prix)
+        minimums = np.minimum.accumulate(prix, axis=1)
+        np.minimum(minimums, minimum[:, None], out=minimums)
+        profondeur = contexte.nombre_niveaux - np.searchsorted(contexte.ratios_croissants, minimums, side='left')
+
+        sortie = prix >= contexte.seuil_sortie[profondeur]
+        sorti = sortie.any(axis=1)
+        # Dernier pas de la fenêtre à prendre en compte : celui de la sortie, ou le dernier.
+        fin = np.where(sorti, sortie.argmax(axis=1), largeur - 1)
+
+        # Marge croisée, la balance de l'échelle servant de portefeuille : liquidation quand
+        # balance + PnL latent <= marge de maintenance, la position étant multipliée par le levier.
+        notionnel = contexte.quantite[profondeur] * prix
+        perte = notionnel - contexte.cout[profondeur]
+        for k, levier in enumerate(leviers):
+            seuil = contexte.balance + levier * perte <= contexte.taux_maintenance * levier * notionnel
+            liquide[:, k] |= seuil.any(axis=1) & (seuil.argmax(axis=1) <= fin)
+
+        termine = sorti | (pas + largeur >= horizon)
+        lignes = np.flatnonzero(termine)
+        resultat.profondeurs += np.bincount(profondeur[lignes, fin[lignes]], minlength=contexte.nombre_niveaux + 1)
+        resultat.recuperations += np.bincount(pas + fin[sorti] + 1, minlength=horizon + 1)
+        resultat.catastrophes += int((minimums[lignes, fin[lignes]] <= contexte.ratio_catastrophique).sum())
+        for k, levier in enumerate(leviers):
+            resultat.liquidations[levier] += int(liquide[lignes, k].sum())
+
+        restants = ~termine
+        log_prix, minimum, liquide = log_prix[restants], minimums[restants, -1], liquide[restants]
+        pas += largeur
+        fenetre *= 4
+    return resultat
+
+def _simuler_tache(contexte: _ContexteRisque, graine: np.random.SeedSequence, nombre: int) -> ResultatMonteCarlo:
+    rng = np.random.default_rng(graine)
+    taille_lot = max(1, ELEMENTS_PAR_LOT // FENETRE_INITIALE)
+    total = ResultatMonteCarlo.vide(contexte.nombre_niveaux, contexte.horizon, contexte.leviers)
+    for debut in range(0, nombre, taille_lot):
+        total.fusionner(_simuler_lot(contexte, rng, min(taille_lot, nombre - debut)))
+    return total
+
+_contexte_processus: Optional[_ContexteRisque] = None
+
+def _installer_contexte(contexte: _ContexteRisque):
+    global _contexte_processus
+    _contexte_processus = contexte
+
+def _simuler_tache_processus(graine: np.random.SeedSequence, nombre: int) -> ResultatMonteCarlo:
+    return _simuler_tache(_contexte_processus, graine, nombre)
+
+def simuler_risque(resultats: dict, generateur: Generateur, nombre_chemins: int = 100_000, horizon: int = 1_000,
+                   leviers: Sequence[int] = (1,), take_profit_percent: float = TAKE_PROFIT_DEFAUT,
+                   taux_maintenance: float = TAUX_MAINTENANCE_DEFAUT, graine: Optional[int] = None,
+                   max_workers: Optional[int] = None, chemins_par_tache: int = CHEMINS_PAR_TACHE) -> ResultatMonteCarlo:
+    """
+    Risque de l'échelle d'un résultat de calculer_iterations sur des chemins de prix synthétiques.
+
+    Les chemins sont répartis en tâches de ``chemins_par_tache`` sur un pool de processus
+    (dans le processus courant s'il n'y a qu'une tâche ou si max_workers vaut 1). Chaque tâche
+    génère ses chemins par fenêtres d'au plus ELEMENTS_PAR_LOT valeurs et ne renvoie que leurs
+    agrégats : la mémoire ne dépend ni de ``nombre_chemins`` ni de ``horizon``. Le pas est celui du générateur (celui des
+    bougies pour un bootstrap). La liquidation est évaluée sur le prix de chaque pas, au taux
+    de maintenance fixe ``taux_maintenance``.
+    """
+    if nombre_chemins < 1 or horizon < 1 or chemins_par_tache < 1:
+        raise BacktestError(error_messages.MONTE_CARLO_ERROR_PARAMETERS)
+    if any(int(levier) != levier or levier < 1 for levier in leviers):
+        raise BacktestError(error_messages.MONTE_CARLO_ERROR_LEVERAGE)
+    if not 0 <= taux_maintenance < 1:
+        raise BacktestError(error_messages.MONTE_CARLO_ERROR_MAINTENANCE)
+    if not take_profit_percent >= 0:
+        raise BacktestError(error_messages.MONTE_CARLO_ERROR_TAKE_PROFIT)
+
+    echelle = EchelleDca.depuis_simulation(resultats)
+    ratio_catastrophique = resultats["inputs"]["prix_catastrophique"] / resultats["prix_iterations"][0]
+    leviers = tuple(int(levier) for levier in leviers)
+    contexte = _ContexteRisque(echelle, ratio_catastrophique, generateur, horizon, leviers,
+                               take_profit_percent, taux_maintenance)
+
+    tailles = [min(chemins_par_tache, nombre_chemins - debut) for debut in range(0, nombre_chemins, chemins_par_tache)]
+    graines = np.random.SeedSequence(graine).spawn(len(tailles))
+    total = ResultatMonteCarlo.vide(len(echelle), horizon, leviers)
+    if len(tailles) == 1 or max_workers == 1:
+        for graine_tache, nombre in zip(graines, tailles):
+            total.fusionner(_simuler_tache(contexte, graine_tache, nombre))
+        return total
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_installer_contexte,
+                             initargs=(contexte,)) as executor:
+        for partiel in executor.map(_simuler_tache_processus, graines, tailles):
+            total.fusionner(partiel)
+    return total
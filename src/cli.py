@@ -0,0 +1,229 @@
+"""
+Interface en ligne de commande, sans PyQt5 : solde, ordre simple, simulation et déploiement DCA.
+
+Les clés API sont lues dans les variables d'environnement BINANCE_API_KEY et
+BINANCE_SECRET_KEY, sinon dans le trousseau (celles enregistrées par l'application).
+Avec BINANCE_MULTIAPP_METRICS_FILE, les durées mesurées sont écrites dans ce fichier à la fin.
+La couche exchange (ccxt) n'est importée que par les commandes qui l'utilisent : ``simulate``
+démarre sans elle.
+Exemples :
+    python -m src.cli balance --env FUTURES_TESTNET
+    python -m src.cli simulate --balance 1000 --prix-entree 40 --prix-catastrophique 5 --drop 10
+    python -m src.cli simulate --balance 1000 --prix-entree 40 --prix-catastrophique 5 --drop 10 \
+        --repartition martingale --montant-initial 20
+    python -m src.cli dca-deploy --env FUTURES_TESTNET --symbol BTC/USDT --balance 1000 \
+        --prix-entree 60000 --prix-catastrophique 30000 --drop 5 --leverage 3
+"""
+import argparse
+import functools
+import os
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .constants import error_messages, ui_strings
+from .models.market_environment import MarketEnvironment
+from .models.rollback_report import RollbackReport
+from .simulation_logic import (calculer_iterations, SimulationError, FormeEchelle, ESPACEMENTS,
+                               ESPACEMENT_GEOMETRIQUE, REPARTITIONS, REPARTITION_EGALE)
+
+ENV_API_KEY = "BINANCE_API_KEY"
+ENV_SECRET_KEY = "BINANCE_SECRET_KEY"
+
+MARGIN_MODES = {"cross": ui_strings.MERGE_MODE_CROSS, "isolated": ui_strings.MERGE_MODE_ISOLATED}
+
+
+
+def load_keys(market_env: MarketEnvironment) -> Tuple[Optional[str], Optional[str]]:
+    """Clés de l'environnement : variables d'environnement d'abord, trousseau ensuite."""
+    api_key, secret_key = os.environ.get(ENV_API_KEY), os.environ.get(ENV_SECRET_KEY)
+    if api_key and secret_key:
+        return api_key, secret_key
+    from . import keyring_utils
+    return keyring_utils.load_creds(market_env.value)
+
+
+def exchange_command(handler: Callable[..., int]) -> Callable[..., int]:
+    """
+    Commande qui parle à Binance : importe la couche exchange à l'appel, démarre l'export des
+    mesures configuré par l'environnement et traduit les erreurs de BinanceLogic en code 1.
+    """
+    @functools.wraps(handler)
+    def run(args, logic_factory, journal) -> int:
+        from .app_logic import (
+            BinanceLogic, ApiKeyMissingError, InvalidOrderParamsError, InsufficientFundsError, OrderPlacementError,
+            CustomNetworkError, CustomExchangeError, AppLogicError
+        )
+        from .services.metrics import MetricsExporter
+        app_errors = (ApiKeyMissingError, InvalidOrderParamsError, InsufficientFundsError, OrderPlacementError,
+                      CustomNetworkError, CustomExchangeError, AppLogicError)
+        exporter = MetricsExporter.from_environment()
+        if exporter is not None:
+            exporter.start()
+        try:
+            return handler(args, logic_factory or BinanceLogic, journal)
+        except app_errors as e:
+            print(str(e), file=sys.stderr)
+            return 1
+        finally:
+            if exporter is not None:
+                exporter.stop()
+    return run
+
+
+def simulation_levels(results: Dict[str, Any], leverage: int = 1) -> List[Dict[str, Any]]:
+    """Niveaux DCA d'une simulation, quantités multipliées par le levier comme dans l'onglet DCA."""
+    return [{'price': prix, 'amount': float(quantite) * leverage}
+            for prix, quantite in zip(results['prix_iterations'], results['quantites_par_iteration'])]
+
+
+def parse_weights(text: str) -> Tuple[float, ...]:
+    """Courbe de poids de --poids ("1,2,4") ; argparse signale une valeur non numérique."""
+    try:
+        return tuple(float(value) for value in text.replace(";", ",").split(",") if value.strip())
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"courbe de poids invalide : {text!r}")
+
+
+def _simulate(args) -> Dict[str, Any]:
+    forme = FormeEchelle(espacement=args.espacement, acceleration=args.acceleration,
+                         repartition=args.repartition, multiplicateur=args.multiplicateur,
+                         montant_initial=args.montant_initial, poids=args.poids)
+    return calculer_iterations(balance=args.balance, prix_entree=args.prix_entree,
+                               prix_catastrophique=args.prix_catastrophique, drop_percent=args.drop,
+                               forme=forme)
+
+
+def cmd_simulate(args, logic_factory, journal) -> int:
+    print("\n".join(_simulate(args)["details_text"]))
+    return 0
+
+
+@exchange_command
+def cmd_balance(args, logic_factory, journal) -> int:
+    api_key, secret_key = load_keys(args.env)
+    balance = logic_factory().get_balance(api_key, secret_key, args.env)
+    print(f"{args.env.value}: {balance:.2f} USDT")
+    return 0
+
+
+@exchange_command
+def cmd_order(args, logic_factory, journal) -> int:
+    api_key, secret_key = load_keys(args.env)
+    order = logic_factory().place_order(api_key, secret_key, args.env, args.symbol, args.type.upper(),
+                                        args.side.upper(), args.amount, args.price,
+                                        MARGIN_MODES[args.margin_mode], args.leverage)
+    print(f"Ordre {order.get('id')} {order.get('status')}: {order.get('side')} {order.get('amount')} "
+          f"{order.get('symbol')} @ {order.get('price')}")
+    return 0
+
+
+def _print_attempt(level_index: int, symbol: str, success: bool, payload: Any) -> None:
+    if success:
+        print(f"Niveau {level_index+1} ({symbol}): ordre {payload.order_id} placé")
+    else:
+        print(f"Niveau {level_index+1} ({symbol}): échec - {payload}", file=sys.stderr)
+
+
+def _print_rollback(report: RollbackReport) -> None:
+    print(report.summary(), file=sys.stderr)
+
+
+@exchange_command
+def cmd_dca_deploy(args, logic_factory, journal) -> int:
+    from .services.dca_ladder import DcaLadder, MSG_CANCELLED
+    levels = simulation_levels(_simulate(args), args.leverage)
+    api_key, secret_key = load_keys(args.env)
+    errors: List[str] = []
+    ladder = DcaLadder(logic_factory(), api_key, secret_key, args.env, args.symbol, levels,
+                       MARGIN_MODES[args.margin_mode], args.leverage,
+                       use_batch_orders=not args.level_by_level, journal=journal,
+                       on_attempt=_print_attempt, on_finished=print, on_error=errors.append,
+                       on_rollback=_print_rollback)
+    try:
+        ladder.run()
+    except KeyboardInterrupt:
+        # Ctrl+C pendant un appel : on annule ce qui a déjà été placé avant de quitter.
+        ladder.stop()
+        ladder.rollback()
+        print(MSG_CANCELLED, file=sys.stderr)
+        return 130
+    for message in errors:
+        print(message, file=sys.stderr)
+    return 1 if errors else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Binance DCA en ligne de commande.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_env(sub):
+        sub.add_argument("--env", type=MarketEnvironment, choices=list(MarketEnvironment),
+                         default=MarketEnvironment.FUTURES_TESTNET,
+                         metavar="{" + ",".join(env.value for env in MarketEnvironment) + "}")
+
+    def add_margin(sub):
+        sub.add_argument("--margin-mode", choices=sorted(MARGIN_MODES), default="cross")
+        sub.add_argument("--leverage", type=int, default=1)
+
+    def add_simulation(sub):
+        sub.add_argument("--balance", required=True, type=float)
+        sub.add_argument("--prix-entree", required=True, type=float)
+        sub.add_argument("--prix-catastrophique", required=True, type=float)
+        sub.add_argument("--drop", required=True, type=float, help="Pourcentage de drop par niveau")
+        sub.add_argument("--espacement", choices=ESPACEMENTS, default=ESPACEMENT_GEOMETRIQUE)
+        sub.add_argument("--acceleration", type=float, default=1.0,
+                         help="Facteur appliqué au drop à chaque niveau (espacement accelere)")
+        sub.add_argument("--repartition", choices=REPARTITIONS, default=REPARTITION_EGALE)
+        sub.add_argument("--multiplicateur", type=float, default=1.0,
+                         help="Facteur de taille d'un niveau au suivant (martingale, lineaire)")
+        sub.add_argument("--montant-initial", type=float,
+                         help="Montant du premier niveau ; le multiplicateur est alors résolu pour investir toute la balance")
+        sub.add_argument("--poids", type=parse_weights, default=(), help="Courbe de poids (repartition personnalisee), ex. 1,2,4")
+
+    balance = commands.add_parser("balance", help="Affiche le solde USDT")
+    add_env(balance)
+    balance.set_defaults(handler=cmd_balance)
+
+    order = commands.add_parser("order", help="Place un ordre simple")
+    add_env(order)
+    order.add_argument("--symbol", required=True)
+    order.add_argument("--side", choices=["buy", "sell"], required=True)
+    order.add_argument("--type", choices=["market", "limit"], default="limit")
+    order.add_argument("--amount", type=float, required=True)
+    order.add_argument("--price", type=float, help="Prix limite (ignoré pour un ordre au marché)")
+    add_margin(order)
+    order.set_defaults(handler=cmd_order)
+
+    simulate = commands.add_parser("simulate", help="Calcule l'échelle DCA sans rien envoyer")
+    add_simulation(simulate)
+    simulate.set_defaults(handler=cmd_simulate)
+
+    deploy = commands.add_parser("dca-deploy", help="Simule puis place l'échelle DCA d'un symbole")
+    add_env(deploy)
+    deploy.add_argument("--symbol", required=True)
+    add_simulation(deploy)
+    add_margin(deploy)
+    deploy.add_argument("--level-by-level", action="store_true", help="Un appel par niveau au lieu des envois groupés")
+    deploy.set_defaults(handler=cmd_dca_deploy)
+    return parser
+
+
+def main(argv=None, logic_factory: Optional[Callable[[], Any]] = None, journal=None) -> int:
+    """
+    Point d'entrée ; retourne le code de sortie (0 succès, 1 erreur, 130 interruption).
+
+    Args:
+        logic_factory: Fabrique de la logique d'exchange ; BinanceLogic par défaut.
+        journal: OrderJournal des déploiements ; par défaut le journal partagé du processus.
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args, logic_factory, journal)
+    except SimulationError as e:
+        print(f"Erreur de Simulation: {e}", file=sys.stderr)
+    except Exception as e:
+        print(f"{error_messages.ERROR_UNEXPECTED}: {e}", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -29,6 +29,13 @@ PARAM_ORDER_TYPE_INVALID = "Le type d'ordre doit être LIMIT ou MARKET."
 PARAM_SIDE_INVALID = "Le côté doit être BUY ou SELL."
 PARAM_AMOUNT_MUST_BE_POSITIVE = "Le montant doit être positif."
 PARAM_PRICE_MUST_BE_POSITIVE_LIMIT = "Le prix doit être positif pour les ordres LIMIT."
+PARAM_BATCH_TOO_LARGE = "Un lot ne peut pas contenir plus de {max_size} ordres."
+PARAM_MARKET_FILTER = "Ordre refusé par les filtres de {symbol} : {detail}."
+PARAM_MAX_NUM_ORDERS = "Ordre non soumis : {symbol} accepte au plus {max_orders} ordres ouverts."
+
+# Per-order errors reported by BinanceLogic.place_orders_batch
+BATCH_ORDER_MISSING_RESPONSE = "Aucune réponse de l'exchange pour cet ordre du lot."
+BATCH_ORDER_NOT_SUBMITTED = "Ordre non soumis : un ordre précédent du lot a échoué."
 
 # --- Simulation Logic Errors (from simulation_logic.py SimulationError) ---
 # These are messages used when raising SimulationError in simulation_logic.py
@@ -38,6 +45,26 @@ SIM_ERROR_PRIX_CATASTROPHIQUE_NOT_NEGATIVE = "Le prix catastrophique ne peut pas
 SIM_ERROR_PRIX_ENTREE_MUST_BE_GREATER = "Le prix d'entrée doit être supérieur au prix catastrophique."
 SIM_ERROR_DROP_PERCENT_RANGE = "Le pourcentage de drop doit être entre 0 et 100 (exclusif)."
 SIM_ERROR_NO_ITERATIONS_POSSIBLE = "Aucune itération possible avec les paramètres donnés (le prix d'entrée est peut-être déjà inférieur ou égal au prix catastrophique)."
+SIM_ERROR_UNKNOWN_LADDER_MODE = "Mode d'échelle inconnu : {mode}."
+SIM_ERROR_ACCELERATION_POSITIVE = "L'accélération du drop doit être un nombre positif."
+SIM_ERROR_MULTIPLIER_POSITIVE = "Le multiplicateur de taille doit être un nombre positif."
+SIM_ERROR_INVALID_WEIGHTS = "La courbe de poids doit contenir au moins une valeur, toutes positives."
+SIM_ERROR_LINEAR_WEIGHTS = "Avec ce multiplicateur, la répartition linéaire donne un montant nul ou négatif au dernier niveau."
+SIM_ERROR_FIRST_AMOUNT_MODE = "Le montant du premier niveau ne s'applique qu'aux répartitions martingale et linéaire."
+SIM_ERROR_FIRST_AMOUNT_POSITIVE = "Le montant du premier niveau doit être un nombre positif."
+SIM_ERROR_FIRST_AMOUNT_UNREACHABLE = "Aucun multiplicateur n'investit exactement la balance avec ce montant pour le premier niveau."
+
+# --- Backtest Errors (src/backtest, BacktestError) ---
+BACKTEST_ERROR_PARQUET_UNAVAILABLE = "La lecture des fichiers Parquet nécessite le paquet optionnel 'pyarrow'."
+BACKTEST_ERROR_MISSING_COLUMNS = "Colonnes OHLCV introuvables dans {path} : {columns}."
+BACKTEST_ERROR_EMPTY_LADDER = "L'échelle DCA ne contient aucun niveau exécutable."
+BACKTEST_ERROR_INVALID_FEE = "Les frais doivent être compris entre 0 et 1 (ex. 0.001 pour 0,1 %)."
+MONTE_CARLO_ERROR_PARAMETERS = "Le nombre de chemins, l'horizon et la taille des tâches doivent être des entiers positifs."
+MONTE_CARLO_ERROR_VOLATILITY = "La volatilité doit être positive ou nulle et la dérive finie."
+MONTE_CARLO_ERROR_RETURNS = "Pas assez de rendements historiques pour le bootstrap (au moins un bloc complet)."
+MONTE_CARLO_ERROR_LEVERAGE = "Les effets de levier doivent être des entiers d'au moins 1."
+MONTE_CARLO_ERROR_MAINTENANCE = "Le taux de marge de maintenance doit être compris entre 0 et 1."
+MONTE_CARLO_ERROR_TAKE_PROFIT = "Le take-profit doit être positif ou nul."
 
 # --- Generic Catch-All ---
 ERROR_UNEXPECTED = "Une erreur inattendue est survenue."
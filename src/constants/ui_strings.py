@@ -10,6 +10,7 @@ TAB_CONFIG = "Config" # Renamed from TAB_BALANCE
 TAB_TRADE = "Trade"
 TAB_SIMULATION_DCA = "Simulation DCA"
 TAB_DCA_ORDERS = "Ordres DCA"
+TAB_DIAGNOSTICS = "Diagnostic"
 
 # --- Common Labels & Texts ---
 LABEL_ENVIRONMENT = "Environnement:"
@@ -34,12 +35,33 @@ LABEL_KEYRING_UNAVAILABLE = "Keyring non disponible. Les clés ne peuvent pas ê
 
 # --- Trade Tab ---
 BUTTON_PLACE_ORDER = "Placer l'Ordre"
+LABEL_MARKET_QUOTE = "Carnet:"
+MARKET_QUOTE_UNAVAILABLE = "En attente du carnet..."
+MARKET_QUOTE_TEXT = "Achat {bid:.10g} ({bid_qty:g}) / Vente {ask:.10g} ({ask_qty:g})"
+MARKET_QUOTE_MARK_SUFFIX = ", marque {mark:.10g}"
+STATUS_MARKET_DATA_STREAM_ERROR = "Flux du carnet indisponible, nouvelle tentative en cours : {error}"
 
 # --- Simulation Tab ---
 LABEL_SIM_BALANCE = "Balance Total à Investir:"
 LABEL_SIM_PRIX_ENTREE = "Prix d'entrée initial:"
 LABEL_SIM_PRIX_CATASTROPHIQUE = "Prix catastrophique (seuil d'arrêt):"
 LABEL_SIM_DROP_PERCENT = "Pourcentage de drop par niveau (%):"
+LABEL_SIM_SPACING = "Espacement des prix:"
+LABEL_SIM_ACCELERATION = "Accélération du drop (x par niveau):"
+LABEL_SIM_SIZING = "Répartition de la balance:"
+LABEL_SIM_MULTIPLIER = "Multiplicateur de taille:"
+LABEL_SIM_FIRST_AMOUNT = "Montant du premier niveau:"
+LABEL_SIM_WEIGHTS = "Courbe de poids:"
+PLACEHOLDER_SIM_FIRST_AMOUNT = "Optionnel : le multiplicateur est alors calculé pour investir toute la balance"
+PLACEHOLDER_SIM_WEIGHTS = "ex. 1, 2, 4 (interpolée sur les niveaux)"
+# Modes de simulation_logic (ESPACEMENT_*, REPARTITION_*) et leur libellé.
+SIM_SPACING_MODES = [("geometrique", "Géométrique (drop % du niveau précédent)"),
+                     ("lineaire", "Linéaire (drop % du prix d'entrée)"),
+                     ("accelere", "Accéléré (drop croissant)")]
+SIM_SIZING_MODES = [("egale", "Égale"),
+                    ("martingale", "Martingale (montant multiplié à chaque niveau)"),
+                    ("lineaire", "Linéaire (montant augmenté à chaque niveau)"),
+                    ("personnalisee", "Courbe de poids personnalisée")]
 BUTTON_CALCULATE_SIMULATION = "Calculer la Simulation"
 BUTTON_PLACE_DCA_ORDERS = "Placer Ordres DCA (LIMIT BUY)" # Text for the original button, might be removed or repurposed
 
@@ -53,10 +75,23 @@ LABEL_DCA_STATUS_READY = "Prêt. Chargez les données de simulation."
 LABEL_DCA_NO_SIMULATION_DATA_LOADED = "Aucune donnée de simulation n'est chargée. Veuillez exécuter une simulation et la charger ici."
 DCA_TAB_SIMULATION_DATA_HEADER = "Données de Simulation Chargées:"
 DCA_TAB_ORDERS_SUBMITTING = "Soumission des ordres DCA en cours..."
-DCA_TAB_ORDER_LEVEL_SUCCESS = "Niveau {level} ({symbol}): Ordre {order_id} placé avec succès. Statut: {status}"
-DCA_TAB_ORDER_LEVEL_ERROR = "Niveau {level} ({symbol}): Erreur lors du placement de l'ordre. Détail: {error}"
 DCA_TAB_BATCH_COMPLETE = "Traitement par lots des ordres DCA terminé."
+DCA_TAB_ROLLBACK_OK = "Annulation vérifiée:"
+DCA_TAB_ROLLBACK_INCOMPLETE = "ATTENTION, annulation incomplète:"
 DCA_TAB_DATA_CLEARED = "Données de simulation effacées ou modifiées. Veuillez recharger."
+BUTTON_DCA_ADD_TO_BASKET = "Ajouter au Panier"
+BUTTON_DCA_PLACE_BASKET = "Placer le Panier ({count})"
+DCA_TAB_BASKET_ADDED = "{symbol} ajouté au panier ({count} symboles)."
+DCA_TAB_BASKET_SUBMITTING = "Placement du panier en cours ({count} symboles en parallèle)..."
+DCA_TAB_BASKET_COMPLETE = "Panier terminé : {succeeded}/{total} symboles placés."
+DCA_PROGRESS_HEADERS = ["Symbole", "Niveau", "Prix", "Quantité", "Statut", "Ordre", "Exécuté", "Détail"]
+DCA_PROGRESS_STATUS_WAITING = "En attente"
+DCA_PROGRESS_STATUS_PLACED = "Placé"
+DCA_PROGRESS_STATUS_FAILED = "Erreur"
+DCA_TAB_PROGRESS = "{placed}/{total} niveaux placés, {failed} en erreur."
+STATUS_JOURNAL_RECONCILED = "Journal des ordres DCA réconcilié : {summary}"
+STATUS_BACKEND_LOADING = "Initialisation de la connexion à Binance..."
+STATUS_USER_DATA_STREAM_ERROR = "Flux des ordres indisponible, nouvelle tentative en cours : {error}"
 LABEL_MERGE_MODE = "Mode de Marge:"
 MERGE_MODE_ISOLATED = "Isolé"
 MERGE_MODE_CROSS = "Croisé"
@@ -65,6 +100,13 @@ ERROR_LEVERAGE_INVALID_NUMBER = "L'effet de levier doit être un nombre."
 ERROR_LEVERAGE_OUT_OF_RANGE = "L'effet de levier doit être compris entre 1 et 100 (inclus)."
 
 
+# --- Diagnostics Tab ---
+DIAGNOSTICS_SPAN_HEADERS = ["Section", "Appels", "Erreurs", "p50 (ms)", "p99 (ms)", "Max (ms)", "Total (s)"]
+DIAGNOSTICS_COUNTER_HEADERS = ["Compteur", "Valeur"]
+BUTTON_DIAGNOSTICS_RESET = "Réinitialiser"
+LABEL_DIAGNOSTICS_EXPORT = "Export Prometheus : {target}"
+LABEL_DIAGNOSTICS_NO_EXPORT = "Export désactivé (BINANCE_MULTIAPP_METRICS_FILE / BINANCE_MULTIAPP_METRICS_PORT)."
+
 # --- ComboBox Choices ---
 # Environment selections (ensure keys here can map to MarketEnvironment enum or logic)
 ENV_SPOT = "Spot"
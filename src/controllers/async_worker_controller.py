@@ -0,0 +1,141 @@
+import concurrent.futures
+from typing import Optional, List, Dict, Any
+from ..app_logic import BinanceLogic, MarketEnvironment
+from ..async_app_logic import AsyncBinanceLogic
+from ..services.async_runner import AsyncLoopThread
+from ..workers.async_jobs import (AsyncBalanceJob, AsyncOrderPlacementJob, AsyncBatchDcaOrderJob, AsyncMultiSymbolDcaJob,
+                                  AsyncJournalReconcileJob)
+from ..workers.multi_symbol_dca_worker import MAX_PARALLEL_SYMBOLS
+from ..models.dca_deployment import DcaDeployment
+from ..services.order_journal import OrderJournal
+from .worker_controller import WorkerController
+
+# Délai laissé à une annulation DCA en cours lors de l'arrêt de l'application.
+STOP_TIMEOUT = 30.0
+
+class AsyncWorkerController(WorkerController):
+    """
+    Même contrat de signaux que WorkerController, mais chaque opération est une coroutine
+    d'AsyncBinanceLogic exécutée sur une boucle asyncio unique (AsyncLoopThread) au lieu
+    d'une tâche du pool de threads. Les signaux sont émis depuis le thread de la boucle et livrés
+    par Qt dans le thread des objets connectés.
+    """
+
+    def __init__(self, binance_logic: BinanceLogic, async_logic: Optional[AsyncBinanceLogic] = None,
+                 runner: Optional[AsyncLoopThread] = None, journal: Optional[OrderJournal] = None):
+        super().__init__(binance_logic, journal=journal)
+        self.async_logic = async_logic or AsyncBinanceLogic(rate_limiter=binance_logic.rate_limiter)
+        self.runner = runner or AsyncLoopThread()
+        self.balance_job: Optional[AsyncBalanceJob] = None
+        self.order_placement_job: Optional[AsyncOrderPlacementJob] = None
+        self.batch_dca_job: Optional[AsyncBatchDcaOrderJob] = None
+        self.multi_symbol_dca_job: Optional[AsyncMultiSymbolDcaJob] = None
+        self.journal_reconcile_job: Optional[AsyncJournalReconcileJob] = None
+        self._futures: Dict[str, concurrent.futures.Future] = {}
+
+    def _is_busy(self, name: str) -> bool:
+        future = self._futures.get(name)
+        return future is not None and not future.done()
+
+    def _launch(self, name: str, job) -> concurrent.futures.Future:
+        future = self.runner.submit(job.run())
+        self._futures[name] = future
+        return future
+
+    def start_fetch_balance(self, api_key: str, secret_key: str, market_env: MarketEnvironment):
+        """Lance la récupération du solde sur la boucle asynchrone."""
+        if self._is_busy('balance'):
+            return
+
+        self.balance_job = AsyncBalanceJob(self.async_logic, api_key, secret_key, market_env)
+        self.balance_job.success.connect(self.balance_success)
+        self.balance_job.error.connect(self.balance_error)
+        self.balance_job.finished.connect(self.balance_finished)
+        self._launch('balance', self.balance_job)
+
+    def start_place_order(self, api_key: str, secret_key: str, market_env: MarketEnvironment,
+                         symbol: str, order_type: str, side: str, amount: float,
+                         price: Optional[float] = None):
+        """Lance le placement d'un ordre sur la boucle asynchrone."""
+        if self._is_busy('order'):
+            return
+
+        self.order_placement_job = AsyncOrderPlacementJob(
+            self.async_logic, api_key, secret_key, market_env,
+            symbol, order_type, side, amount, price
+        )
+        self.order_placement_job.success.connect(self.order_success)
+        self.order_placement_job.error.connect(self.order_error)
+        self.order_placement_job.finished.connect(self.order_finished)
+        self._launch('order', self.order_placement_job)
+
+    def start_place_dca_orders(self, api_key: str, secret_key: str, market_env: MarketEnvironment,
+                              symbol: str, dca_levels_data: List[Dict[str, Any]],
+                              margin_mode: str, leverage: int, use_batch_orders: bool = True):
+        """Lance le placement des ordres DCA sur la boucle asynchrone."""
+        if self._is_busy('dca'):
+            return
+
+        self.batch_dca_job = AsyncBatchDcaOrderJob(
+            self.async_logic, api_key, secret_key, market_env,
+            symbol, dca_levels_data, margin_mode, leverage,
+            use_batch_orders=use_batch_orders, journal=self.journal
+        )
+        self.batch_dca_job.order_attempt_finished.connect(self.dca_order_attempt_finished)
+        self.batch_dca_job.batch_processing_finished.connect(self.dca_batch_finished)
+        self.batch_dca_job.batch_error.connect(self.dca_batch_error)
+        self.batch_dca_job.rollback_finished.connect(self.dca_rollback_finished)
+        self._launch('dca', self.batch_dca_job)
+
+    def start_place_multi_symbol_dca(self, api_key: str, secret_key: str, market_env: MarketEnvironment,
+                                     deployments: List[DcaDeployment], use_batch_orders: bool = True,
+                                     max_parallel_symbols: int = MAX_PARALLEL_SYMBOLS):
+        """Lance le placement multi-symboles sur la boucle asynchrone."""
+        if self._is_busy('multi_dca'):
+            return
+
+        self.multi_symbol_dca_job = AsyncMultiSymbolDcaJob(
+            self.async_logic, api_key, secret_key, market_env, deployments,
+            use_batch_orders=use_batch_orders, max_parallel_symbols=max_parallel_symbols, journal=self.journal
+        )
+        self.multi_symbol_dca_job.order_attempt_finished.connect(self.dca_order_attempt_finished)
+        self.multi_symbol_dca_job.rollback_finished.connect(self.dca_rollback_finished)
+        self.multi_symbol_dca_job.symbol_finished.connect(self.dca_symbol_finished)
+        self.multi_symbol_dca_job.deployment_finished.connect(self.dca_deployment_finished)
+        self._launch('multi_dca', self.multi_symbol_dca_job)
+
+    def start_reconcile_journal(self, api_key: str, secret_key: str, market_env: MarketEnvironment):
+        """Lance la réconciliation du journal des ordres sur la boucle asynchrone."""
+        if self._is_busy('reconcile'):
+            return
+
+        self.journal_reconcile_job = AsyncJournalReconcileJob(
+            self.async_logic, api_key, secret_key, market_env, journal=self.journal
+        )
+        self.journal_reconcile_job.reconcile_finished.connect(self.journal_reconciled)
+        self._launch('reconcile', self.journal_reconcile_job)
+
+    def stop_all_workers(self):
+        """
+        Annule le solde et l'ordre en cours, laisse le placement DCA s'arrêter proprement
+        (avec annulation des ordres déjà placés), puis ferme les clients et la boucle.
+        """
+        for name in ('balance', 'order', 'reconcile'):
+            if self._is_busy(name):
+                self._futures[name].cancel()
+
+        for name, job in (('dca', self.batch_dca_job), ('multi_dca', self.multi_symbol_dca_job)):
+            if self._is_busy(name):
+                job.stop()
+                try:
+                    self._futures[name].result(STOP_TIMEOUT)
+                except Exception:
+                    pass
+
+        if self.runner.is_running():
+            try:
+                self.runner.run(self.async_logic.close(), STOP_TIMEOUT)
+            except Exception:
+                pass
+            self.runner.stop()
+        super().stop_all_workers()
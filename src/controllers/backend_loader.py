@@ -0,0 +1,79 @@
+import importlib
+import threading
+import time
+from dataclasses import dataclass
+from PyQt5.QtCore import QObject, pyqtSignal
+from typing import Optional, Tuple
+from ..models.market_environment import MarketEnvironment
+
+# Modules lourds (ccxt, aiohttp, numpy, keyring) chargés hors du thread Qt au démarrage.
+# Noms relatifs au paquet des contrôleurs.
+BACKEND_MODULES = (
+    "..keyring_utils",
+    "..simulation_logic",
+    "..app_logic",
+    ".worker_controller",
+    ".user_data_controller",
+    ".market_data_controller",
+)
+ASYNC_BACKEND_MODULES = (".async_worker_controller",)
+
+
+@dataclass
+class BackendState:
+    """Résultat de l'initialisation en arrière-plan, livré au thread Qt."""
+    keyring_available: bool
+    market_env: Optional[MarketEnvironment]
+    credentials: Tuple[Optional[str], Optional[str]] = (None, None)
+    duration: float = 0.0
+    error: Optional[str] = None
+
+
+class BackendLoader(QObject):
+    """
+    Importe la couche d'échange et découvre le backend du trousseau dans un thread démon,
+    pour que la fenêtre s'affiche sans attendre. ``ready`` porte un BackendState ;
+    les imports étant alors en cache, le thread Qt crée les contrôleurs sans délai.
+    """
+    ready = pyqtSignal(object)
+
+    def __init__(self, market_env: Optional[MarketEnvironment], use_async: bool = False, parent=None):
+        super().__init__(parent)
+        self.market_env = market_env
+        self.modules = BACKEND_MODULES + (ASYNC_BACKEND_MODULES if use_async else ())
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self.run, name="binance-backend-loader", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def run(self) -> None:
+        start = time.perf_counter()
+        try:
+            for name in self.modules:
+                importlib.import_module(name, __package__)
+            state = self._discover_keyring()
+        except Exception as e:
+            state = BackendState(keyring_available=False, market_env=self.market_env, error=str(e))
+        state.duration = time.perf_counter() - start
+        self.ready.emit(state)
+
+    def _discover_keyring(self) -> BackendState:
+        import keyring
+        import keyring.errors
+        from .. import keyring_utils
+
+        try:
+            keyring.get_keyring()
+        except keyring.errors.NoKeyringError:
+            return BackendState(keyring_available=False, market_env=self.market_env)
+        credentials = (None, None)
+        if self.market_env is not None:
+            credentials = keyring_utils.load_creds(self.market_env.value)
+        return BackendState(keyring_available=True, market_env=self.market_env, credentials=credentials)
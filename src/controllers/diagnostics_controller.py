@@ -0,0 +1,57 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from typing import Optional
+from ..services.metrics import Metrics, MetricsExporter
+
+# Rafraîchissement du panneau de diagnostic quand il est affiché.
+REFRESH_INTERVAL_MS = 1000
+
+
+class DiagnosticsController(QObject):
+    """
+    Relit le registre des mesures à intervalle régulier pendant que le panneau de diagnostic
+    est affiché, et publie un instantané ``(spans, compteurs)``. Démarre aussi l'export
+    Prometheus configuré par l'environnement (fichier et/ou endpoint HTTP local).
+    """
+    snapshot_ready = pyqtSignal(object, object)
+
+    def __init__(self, metrics: Optional[Metrics] = None, exporter: Optional[MetricsExporter] = None,
+                 parent=None):
+        super().__init__(parent)
+        self.metrics = metrics if metrics is not None else Metrics.shared()
+        self.exporter = exporter if exporter is not None else MetricsExporter.from_environment(self.metrics)
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_INTERVAL_MS)
+        self._timer.timeout.connect(self.refresh)
+        if self.exporter is not None:
+            self.exporter.start()
+
+    def export_target(self) -> Optional[str]:
+        """Fichier et/ou URL de l'export, pour l'affichage ; None si l'export est désactivé."""
+        if self.exporter is None:
+            return None
+        targets = []
+        if self.exporter.path is not None:
+            targets.append(str(self.exporter.path))
+        if self.exporter.port is not None:
+            targets.append(f"http://127.0.0.1:{self.exporter.port}/metrics")
+        return ", ".join(targets)
+
+    def set_active(self, active: bool) -> None:
+        """Rafraîchit tout de suite puis périodiquement tant que le panneau est visible."""
+        if active:
+            self.refresh()
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def refresh(self) -> None:
+        self.snapshot_ready.emit(self.metrics.spans(), self.metrics.counters())
+
+    def reset(self) -> None:
+        self.metrics.reset()
+        self.refresh()
+
+    def stop(self) -> None:
+        self._timer.stop()
+        if self.exporter is not None:
+            self.exporter.stop()
@@ -0,0 +1,91 @@
+import asyncio
+import concurrent.futures
+from PyQt5.QtCore import QObject, pyqtSignal
+from typing import FrozenSet, Iterable, Optional, Tuple
+from ..models.market_environment import MarketEnvironment
+from ..models.order_state import to_market_id
+from ..models.ticker import Ticker
+from ..services.async_runner import AsyncLoopThread
+from ..services.exchange_factory import ExchangeFactory
+from ..services.market_data_stream import MarketDataStream, DepthSnapshotClient, TickerCache
+
+# Délai laissé au flux pour fermer sa connexion à l'arrêt.
+STOP_TIMEOUT = 5.0
+
+class MarketDataController(QObject):
+    """
+    Tient à jour, sur sa propre boucle asyncio, les carnets locaux des symboles suivis par
+    l'interface. ``ticker`` se lit sans appel réseau ; ``ticker_updated`` signale chaque
+    changement du haut du carnet.
+    """
+    ticker_updated = pyqtSignal(object)
+    stream_error = pyqtSignal(str)
+
+    def __init__(self, cache: Optional[TickerCache] = None, runner: Optional[AsyncLoopThread] = None):
+        super().__init__()
+        self.cache = cache if cache is not None else TickerCache()
+        self.runner = runner or AsyncLoopThread(name="binance-market-data")
+        self.cache.subscribe(self.ticker_updated.emit)
+        self._stream: Optional[MarketDataStream] = None
+        self._future: Optional[concurrent.futures.Future] = None
+        self._subscription: Optional[Tuple[MarketEnvironment, FrozenSet[str]]] = None
+
+    def is_running(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def watch(self, market_env: MarketEnvironment, symbols: Iterable[str]):
+        """Suit exactement ces symboles ; sans effet si le flux les suit déjà pour cet environnement."""
+        market_ids = frozenset(to_market_id(s) for s in symbols if s and s.strip())
+        subscription = (market_env, market_ids)
+        if self.is_running() and subscription == self._subscription:
+            return
+        previous_env = self._subscription[0] if self._subscription else None
+        stopping = self.stop_stream()
+        if market_env != previous_env:
+            # Vidé une fois l'ancien flux fermé, pour qu'il n'y réécrive pas les prix de l'autre environnement.
+            if stopping is None:
+                self.cache.clear()
+            else:
+                stopping.add_done_callback(lambda _: self.cache.clear())
+        self._subscription = subscription
+        if not market_ids:
+            return
+
+        exchange = ExchangeFactory.create_async('', '', market_env)
+        self._stream = MarketDataStream(sorted(market_ids), DepthSnapshotClient(exchange, market_env),
+                                        self.cache, market_env,
+                                        on_error=lambda e: self.stream_error.emit(str(e)))
+        self._future = self.runner.submit(self._run(self._stream, exchange, stopping))
+
+    def ticker(self, symbol: str) -> Optional[Ticker]:
+        return self.cache.get(symbol)
+
+    @staticmethod
+    async def _run(stream: MarketDataStream, exchange, stopping: Optional[concurrent.futures.Future]) -> None:
+        try:
+            if stopping is not None:
+                await asyncio.wrap_future(stopping)
+            await stream.run()
+        finally:
+            await exchange.close()
+
+    def stop_stream(self) -> Optional[concurrent.futures.Future]:
+        """
+        Demande la fermeture de la connexion courante, sans arrêter la boucle ni attendre : appelée
+        depuis le thread Qt à chaque changement de symbole. Retourne le Future de l'arrêt, ou None.
+        """
+        if not self.is_running():
+            return None
+        stopping = self.runner.stop_task(self._future, self._stream.stop(), STOP_TIMEOUT)
+        self._stream, self._future = None, None
+        return stopping
+
+    def stop(self):
+        """Arrête le flux puis la boucle ; à appeler à la fermeture de l'application."""
+        stopping = self.stop_stream()
+        if stopping is not None:
+            try:
+                stopping.result(2 * STOP_TIMEOUT)
+            except concurrent.futures.TimeoutError:
+                pass
+        self.runner.stop()
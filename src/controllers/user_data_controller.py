@@ -0,0 +1,76 @@
+import asyncio
+import concurrent.futures
+from PyQt5.QtCore import QObject, pyqtSignal
+from typing import Optional, Tuple
+from ..models.market_environment import MarketEnvironment
+from ..services.async_runner import AsyncLoopThread
+from ..services.exchange_factory import ExchangeFactory, _fingerprint
+from ..services.order_store import OrderStateStore
+from ..services.user_data_stream import UserDataStream, ListenKeyClient
+
+# Délai laissé au flux pour fermer sa connexion et sa listenKey à l'arrêt.
+STOP_TIMEOUT = 5.0
+
+class UserDataController(QObject):
+    """
+    Démarre et arrête le flux utilisateur Binance sur sa propre boucle asyncio, et relaie
+    chaque changement d'état d'ordre du store sous forme de signal Qt.
+    """
+    order_updated = pyqtSignal(object)
+    stream_error = pyqtSignal(str)
+
+    def __init__(self, store: Optional[OrderStateStore] = None, runner: Optional[AsyncLoopThread] = None):
+        super().__init__()
+        self.store = store if store is not None else OrderStateStore()
+        self.runner = runner or AsyncLoopThread(name="binance-user-data")
+        self.store.subscribe(self.order_updated.emit)
+        self._stream: Optional[UserDataStream] = None
+        self._future: Optional[concurrent.futures.Future] = None
+        self._identity: Optional[Tuple[str, str, MarketEnvironment]] = None
+
+    def is_running(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def start(self, api_key: str, secret_key: str, market_env: MarketEnvironment):
+        """Démarre le flux pour ces clés ; sans effet s'il tourne déjà pour les mêmes clés et environnement."""
+        identity = (_fingerprint(api_key), _fingerprint(secret_key), market_env)
+        if self.is_running() and identity == self._identity:
+            return
+        stopping = self.stop_stream()
+
+        exchange = ExchangeFactory.create_async(api_key, secret_key, market_env)
+        self._stream = UserDataStream(ListenKeyClient(exchange, market_env), self.store, market_env,
+                                      on_error=lambda e: self.stream_error.emit(str(e)))
+        self._identity = identity
+        self._future = self.runner.submit(self._run(self._stream, exchange, stopping))
+
+    @staticmethod
+    async def _run(stream: UserDataStream, exchange, stopping: Optional[concurrent.futures.Future]) -> None:
+        try:
+            # L'ancien flux ferme d'abord sa listenKey, qui peut être la même pour le même compte.
+            if stopping is not None:
+                await asyncio.wrap_future(stopping)
+            await stream.run()
+        finally:
+            await exchange.close()
+
+    def stop_stream(self) -> Optional[concurrent.futures.Future]:
+        """
+        Demande la fermeture de la connexion courante et de sa listenKey, sans arrêter la boucle
+        ni attendre depuis le thread Qt. Retourne le Future de l'arrêt, ou None.
+        """
+        if not self.is_running():
+            return None
+        stopping = self.runner.stop_task(self._future, self._stream.stop(), STOP_TIMEOUT)
+        self._stream, self._future, self._identity = None, None, None
+        return stopping
+
+    def stop(self):
+        """Arrête le flux puis la boucle ; à appeler à la fermeture de l'application."""
+        stopping = self.stop_stream()
+        if stopping is not None:
+            try:
+                stopping.result(2 * STOP_TIMEOUT)
+            except concurrent.futures.TimeoutError:
+                pass
+        self.runner.stop()
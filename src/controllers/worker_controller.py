@@ -1,11 +1,21 @@
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
 from typing import Optional, List, Dict, Any
 from ..app_logic import BinanceLogic, MarketEnvironment
 from ..workers.balance_worker import BalanceWorker
 from ..workers.order_placement_worker import OrderPlacementWorker
 from ..workers.batch_dca_worker import BatchDcaOrderWorker
+from ..workers.multi_symbol_dca_worker import MultiSymbolDcaWorker, MAX_PARALLEL_SYMBOLS
+from ..workers.journal_reconcile_worker import JournalReconcileWorker
+from ..workers.task_runner import TaskRunner, PooledWorker, SHUTDOWN_TIMEOUT_MS
+from ..models.dca_deployment import DcaDeployment
+from ..services.order_journal import OrderJournal
 
 class WorkerController(QObject):
+    """
+    Lance les workers dans le pool partagé (TaskRunner). Une demande faite pendant qu'une
+    opération du même type tourne est mise en file au lieu d'être ignorée ; aucune méthode
+    n'attend un worker depuis le thread Qt, sauf stop_all_workers à la fermeture.
+    """
     # Signaux pour le BalanceWorker
     balance_success = pyqtSignal(float)
     balance_error = pyqtSignal(str)
@@ -20,32 +30,61 @@ class WorkerController(QObject):
     dca_order_attempt_finished = pyqtSignal(int, str, bool, object)
     dca_batch_finished = pyqtSignal(str)
     dca_batch_error = pyqtSignal(str)
+    dca_rollback_finished = pyqtSignal(object)
 
-    def __init__(self, binance_logic: BinanceLogic):
+    # Signaux pour le MultiSymbolDcaWorker (la progression passe par dca_order_attempt_finished)
+    dca_symbol_finished = pyqtSignal(object)
+    dca_deployment_finished = pyqtSignal(object)
+
+    # Signal du JournalReconcileWorker (liste de ReconcileReport)
+    journal_reconciled = pyqtSignal(object)
+
+    def __init__(self, binance_logic: BinanceLogic, journal: Optional[OrderJournal] = None,
+                 task_runner: Optional[TaskRunner] = None):
+        """
+        Args:
+            journal: Journal des ordres DCA ; par défaut le journal partagé du processus.
+            task_runner: Pool d'exécution des workers ; par défaut le pool partagé du processus.
+        """
         super().__init__()
         self.binance_logic = binance_logic
+        self.journal = journal
+        self.task_runner = task_runner if task_runner is not None else TaskRunner.shared()
+        self._active: List[PooledWorker] = []
         self.balance_worker: Optional[BalanceWorker] = None
         self.order_placement_worker: Optional[OrderPlacementWorker] = None
         self.batch_dca_worker: Optional[BatchDcaOrderWorker] = None
+        self.multi_symbol_dca_worker: Optional[MultiSymbolDcaWorker] = None
+        self.journal_reconcile_worker: Optional[JournalReconcileWorker] = None
+
+    def _start(self, worker: PooledWorker) -> None:
+        """Met le worker en file dans le pool et le garde jusqu'à la livraison de son signal de fin."""
+        self._active.append(worker)
+        worker.finished.connect(self._on_worker_finished)
+        worker.start(self.task_runner)
+
+    @pyqtSlot()
+    def _on_worker_finished(self):
+        worker = self.sender()
+        if worker in self._active:
+            self._active.remove(worker)
+
+    def active_workers(self) -> List[PooledWorker]:
+        """Workers en cours ou en file, dans l'ordre de soumission."""
+        return list(self._active)
 
     def start_fetch_balance(self, api_key: str, secret_key: str, market_env: MarketEnvironment):
         """Démarre le worker pour récupérer le solde."""
-        if self.balance_worker and self.balance_worker.isRunning():
-            return
-
         self.balance_worker = BalanceWorker(self.binance_logic, api_key, secret_key, market_env)
         self.balance_worker.success.connect(self.balance_success)
         self.balance_worker.error.connect(self.balance_error)
         self.balance_worker.finished.connect(self.balance_finished)
-        self.balance_worker.start()
+        self._start(self.balance_worker)
 
     def start_place_order(self, api_key: str, secret_key: str, market_env: MarketEnvironment,
                          symbol: str, order_type: str, side: str, amount: float,
                          price: Optional[float] = None):
         """Démarre le worker pour placer un ordre."""
-        if self.order_placement_worker and self.order_placement_worker.isRunning():
-            return
-
         self.order_placement_worker = OrderPlacementWorker(
             self.binance_logic, api_key, secret_key, market_env,
             symbol, order_type, side, amount, price
@@ -53,34 +92,50 @@ class WorkerController(QObject):
         self.order_placement_worker.success.connect(self.order_success)
         self.order_placement_worker.error.connect(self.order_error)
         self.order_placement_worker.finished.connect(self.order_finished)
-        self.order_placement_worker.start()
+        self._start(self.order_placement_worker)
 
     def start_place_dca_orders(self, api_key: str, secret_key: str, market_env: MarketEnvironment,
                               symbol: str, dca_levels_data: List[Dict[str, Any]],
-                              margin_mode: str, leverage: int):
+                              margin_mode: str, leverage: int, use_batch_orders: bool = True):
         """Démarre le worker pour placer les ordres DCA."""
-        if self.batch_dca_worker and self.batch_dca_worker.isRunning():
-            return
-
         self.batch_dca_worker = BatchDcaOrderWorker(
             self.binance_logic, api_key, secret_key, market_env,
-            symbol, dca_levels_data, margin_mode, leverage
+            symbol, dca_levels_data, margin_mode, leverage,
+            use_batch_orders=use_batch_orders, journal=self.journal
         )
         self.batch_dca_worker.order_attempt_finished.connect(self.dca_order_attempt_finished)
         self.batch_dca_worker.batch_processing_finished.connect(self.dca_batch_finished)
         self.batch_dca_worker.batch_error.connect(self.dca_batch_error)
-        self.batch_dca_worker.start()
+        self.batch_dca_worker.rollback_finished.connect(self.dca_rollback_finished)
+        self._start(self.batch_dca_worker)
 
-    def stop_all_workers(self):
-        """Arrête tous les workers en cours d'exécution."""
-        if self.balance_worker and self.balance_worker.isRunning():
-            self.balance_worker.quit()
-            self.balance_worker.wait()
+    def start_place_multi_symbol_dca(self, api_key: str, secret_key: str, market_env: MarketEnvironment,
+                                     deployments: List[DcaDeployment], use_batch_orders: bool = True,
+                                     max_parallel_symbols: int = MAX_PARALLEL_SYMBOLS):
+        """Démarre le worker qui place les échelles DCA de plusieurs symboles en parallèle."""
+        self.multi_symbol_dca_worker = MultiSymbolDcaWorker(
+            self.binance_logic, api_key, secret_key, market_env, deployments,
+            use_batch_orders=use_batch_orders, max_parallel_symbols=max_parallel_symbols, journal=self.journal
+        )
+        self.multi_symbol_dca_worker.order_attempt_finished.connect(self.dca_order_attempt_finished)
+        self.multi_symbol_dca_worker.rollback_finished.connect(self.dca_rollback_finished)
+        self.multi_symbol_dca_worker.symbol_finished.connect(self.dca_symbol_finished)
+        self.multi_symbol_dca_worker.deployment_finished.connect(self.dca_deployment_finished)
+        self._start(self.multi_symbol_dca_worker)
 
-        if self.order_placement_worker and self.order_placement_worker.isRunning():
-            self.order_placement_worker.quit()
-            self.order_placement_worker.wait()
+    def start_reconcile_journal(self, api_key: str, secret_key: str, market_env: MarketEnvironment):
+        """Démarre la réconciliation du journal des ordres avec les ordres ouverts de l'environnement."""
+        self.journal_reconcile_worker = JournalReconcileWorker(
+            self.binance_logic, api_key, secret_key, market_env, journal=self.journal
+        )
+        self.journal_reconcile_worker.reconcile_finished.connect(self.journal_reconciled)
+        self._start(self.journal_reconcile_worker)
 
-        if self.batch_dca_worker and self.batch_dca_worker.isRunning():
-            self.batch_dca_worker.stop()
-            self.batch_dca_worker.wait() 
\ No newline at end of file
+    def stop_all_workers(self):
+        """
+        Demande l'arrêt de tous les workers (en file ou en cours), puis attend la fin du pool.
+        Réservé à la fermeture : les placements DCA interrompus annulent leurs ordres avant de finir.
+        """
+        for worker in list(self._active):
+            worker.stop()
+        self.task_runner.wait_for_done(SHUTDOWN_TIMEOUT_MS)
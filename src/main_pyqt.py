@@ -1,18 +1,27 @@
+import os
 import sys
 import logging
-from PyQt5.QtWidgets import QApplication, QMainWindow, QStatusBar
-from PyQt5.QtCore import pyqtSlot
-from typing import Optional
+from PyQt5.QtWidgets import QApplication, QMainWindow, QStatusBar, QTableWidgetItem
+from PyQt5.QtCore import QTimer, pyqtSlot
+from typing import Dict, List, Optional, Tuple
 
 from .ui_main_window import Ui_MainWindow
-from .app_logic import BinanceLogic, MarketEnvironment
 from .constants import ui_strings, error_messages
-from .simulation_logic import calculer_iterations, SimulationError
-from . import keyring_utils
-from .controllers.worker_controller import WorkerController
+from .controllers.backend_loader import BackendLoader, BackendState
+from .controllers.diagnostics_controller import DiagnosticsController
 from .utils.market_utils import MarketUtils
-import keyring
-import keyring.errors
+from .models.dca_deployment import DcaDeployment
+from .models.market_environment import MarketEnvironment
+from .models.order_state import OrderState, to_market_id
+from .models.ticker import Ticker
+from .models.journal_entry import JournalEntry
+from .viewmodels.dca_progress_model import DcaProgressModel
+
+# Délai sans frappe avant de recalculer la simulation pendant la saisie des paramètres.
+SIMULATION_LIVE_DELAY_MS = 250
+
+# Mettre à 1 pour exécuter les appels Binance en coroutines sur une boucle asyncio unique.
+ASYNC_EXCHANGE_ENV_VAR = "BINANCE_MULTIAPP_ASYNC"
 
 class BinanceAppPyQt(QMainWindow):
     def __init__(self):
@@ -22,35 +31,42 @@ class BinanceAppPyQt(QMainWindow):
         self._status_bar = QStatusBar(self)
         self.setStatusBar(self._status_bar)
 
-        self.binance_logic = BinanceLogic()
-        self.worker_controller = WorkerController(self.binance_logic)
+        # Couche d'échange et trousseau : créés par _on_backend_ready, une fois la fenêtre affichée.
+        self.binance_logic = None
+        self.order_journal = None
+        self.worker_controller = None
+        self.user_data_controller = None
+        self.market_data_controller = None
+        # Environnements dont le journal a déjà été réconcilié pendant cette session.
+        self._journal_checked_envs = set()
         self.last_simulation_dca_levels = None
         self.original_simulation_dca_levels = None
-        self.keyring_available = True
-
-        try:
-            keyring.get_keyring()
-            self.keyring_available = True
-            self._status_bar.showMessage(ui_strings.APP_NAME + ": Keyring initialisé.", 3000)
-        except keyring.errors.NoKeyringError:
-            self.keyring_available = False
-            self.ui.saveApiKeysCheckBox.setEnabled(False)
-            self.ui.saveApiKeysCheckBox.setToolTip(ui_strings.LABEL_KEYRING_UNAVAILABLE)
-            self._status_bar.showMessage(ui_strings.LABEL_KEYRING_UNAVAILABLE, 5000)
-            logging.warning(ui_strings.LABEL_KEYRING_UNAVAILABLE)
+        self.dca_basket: List[DcaDeployment] = []
+        # Ordres DCA placés, par (symbole Binance, id d'ordre) : niveau et symbole affichés.
+        self._dca_order_levels: Dict[Tuple[str, str], Tuple[int, str]] = {}
+        # Champs de prix encore à pré-remplir depuis le carnet, après un changement de symbole.
+        self._trade_price_prefill_pending = False
+        self._sim_entry_prefill_pending = False
+        self.keyring_available = False
 
         # Connect signals for Balance Tab
         self.ui.fetchBalanceButton.clicked.connect(self.start_fetch_balance)
         self.ui.globalEnvironmentComboBox.currentTextChanged.connect(self._load_api_keys_for_selected_env)
-        self._load_api_keys_for_selected_env()
 
         # Connect signals for Trade Tab
         self.ui.placeOrderButton.clicked.connect(self.start_place_order)
         self.ui.orderTypeComboBox.currentTextChanged.connect(self.on_order_type_changed)
         self.on_order_type_changed(self.ui.orderTypeComboBox.currentText())
+        self.ui.tradeSymbolLineEdit.editingFinished.connect(self._on_trade_symbol_edited)
+        self.ui.sideComboBox.currentTextChanged.connect(lambda _: self._refresh_trade_quote())
 
         # Connect signals for Simulation Tab
         self.ui.simCalculerButton.clicked.connect(self.handle_simulation_calculation)
+        self.ui.simSymbolComboBox.currentTextChanged.connect(self._on_sim_symbol_changed)
+
+        # Le flux de marché ne suit les symboles que lorsque Trade ou Simulation est affiché.
+        self.ui.tabWidget.currentChanged.connect(lambda _: self._watch_market_symbols())
+        self.ui.globalEnvironmentComboBox.currentTextChanged.connect(lambda _: self._watch_market_symbols())
 
         # Connect signals for DCA Orders Tab
         self.ui.tabWidget.setTabText(self.ui.tabWidget.indexOf(self.ui.dcaOrdersTab), ui_strings.TAB_DCA_ORDERS)
@@ -62,6 +78,13 @@ class BinanceAppPyQt(QMainWindow):
 
         self.ui.dcaLoadDataButton.clicked.connect(self._load_dca_data_to_tab)
         self.ui.dcaPlaceOrdersButton.clicked.connect(self.start_place_dca_orders_from_dca_tab)
+        self.ui.dcaAddToBasketButton.clicked.connect(self._add_dca_ladder_to_basket)
+        self.ui.dcaPlaceBasketButton.clicked.connect(self.start_place_dca_basket)
+
+        # Progression DCA : une ligne par niveau, mises à jour regroupées par le modèle.
+        self.dca_progress_model = DcaProgressModel(self)
+        self.ui.dcaProgressTableView.setModel(self.dca_progress_model)
+        self.dca_progress_model.progress_changed.connect(self._on_dca_progress_changed)
 
         # Initial states for DCA Orders Tab
         self.ui.dcaPlaceOrdersButton.setEnabled(False)
@@ -69,6 +92,79 @@ class BinanceAppPyQt(QMainWindow):
         self.ui.dcaSymbolValueLabel.setText(ui_strings.LABEL_DCA_SYMBOL_DEFAULT)
         self.ui.dcaLeverageLineEdit.setText("20")
 
+        # Connect simulation state clearing signals
+        # La simulation est recalculée en direct, une fois la saisie interrompue SIMULATION_LIVE_DELAY_MS.
+        self._simulation_timer = QTimer(self)
+        self._simulation_timer.setSingleShot(True)
+        self._simulation_timer.setInterval(SIMULATION_LIVE_DELAY_MS)
+        self._simulation_timer.timeout.connect(self._on_simulation_inputs_idle)
+        for line_edit in (self.ui.simBalanceLineEdit, self.ui.simPrixEntreeLineEdit,
+                          self.ui.simPrixCatastrophiqueLineEdit, self.ui.simDropPercentLineEdit,
+                          self.ui.simAccelerationLineEdit, self.ui.simMultiplicateurLineEdit,
+                          self.ui.simMontantInitialLineEdit, self.ui.simPoidsLineEdit):
+            line_edit.textChanged.connect(self._clear_dca_simulation_state)
+            line_edit.textChanged.connect(lambda _: self._simulation_timer.start())
+        for combo_box in (self.ui.simEspacementComboBox, self.ui.simRepartitionComboBox):
+            combo_box.currentIndexChanged.connect(self._update_ladder_shape_fields)
+            combo_box.currentIndexChanged.connect(self._clear_dca_simulation_state)
+            combo_box.currentIndexChanged.connect(lambda _: self._simulation_timer.start())
+        self._update_ladder_shape_fields()
+        self.ui.simSymbolComboBox.currentTextChanged.connect(self._clear_dca_simulation_state)
+
+        # Panneau de diagnostic : durées des sections instrumentées et compteurs, relus chaque seconde
+        # tant que l'onglet est affiché.
+        self.diagnostics_controller = DiagnosticsController(parent=self)
+        self.diagnostics_controller.snapshot_ready.connect(self._show_diagnostics)
+        self.ui.diagnosticsResetButton.clicked.connect(self.diagnostics_controller.reset)
+        self.ui.tabWidget.currentChanged.connect(
+            lambda _: self.diagnostics_controller.set_active(self.ui.tabWidget.currentWidget() is self.ui.diagnosticsTab))
+        export_target = self.diagnostics_controller.export_target()
+        if export_target:
+            self.ui.diagnosticsExportLabel.setText(ui_strings.LABEL_DIAGNOSTICS_EXPORT.format(target=export_target))
+
+        # Les boutons qui appellent l'exchange attendent la fin de l'initialisation en arrière-plan.
+        self.ui.fetchBalanceButton.setEnabled(False)
+        self.ui.placeOrderButton.setEnabled(False)
+        self._status_bar.showMessage(ui_strings.STATUS_BACKEND_LOADING)
+        self.backend_loader = BackendLoader(self._selected_environment(),
+                                            use_async=os.environ.get(ASYNC_EXCHANGE_ENV_VAR) == "1")
+        self.backend_loader.ready.connect(self._on_backend_ready)
+        self.backend_loader.start()
+
+    def _selected_environment(self) -> Optional[MarketEnvironment]:
+        return MarketUtils.get_environment_from_text(self.ui.globalEnvironmentComboBox.currentText())
+
+    @property
+    def backend_ready(self) -> bool:
+        return self.worker_controller is not None
+
+    @pyqtSlot(object)
+    def _on_backend_ready(self, state: BackendState):
+        """Crée la couche d'échange et les contrôleurs (modules déjà importés par le BackendLoader)."""
+        from .app_logic import BinanceLogic
+        from .controllers.worker_controller import WorkerController
+        from .controllers.user_data_controller import UserDataController
+        from .controllers.market_data_controller import MarketDataController
+        from .services.order_journal import OrderJournal
+
+        self.binance_logic = BinanceLogic()
+        self.order_journal = OrderJournal.shared()
+        if os.environ.get(ASYNC_EXCHANGE_ENV_VAR) == "1":
+            from .controllers.async_worker_controller import AsyncWorkerController
+            self.worker_controller = AsyncWorkerController(self.binance_logic, journal=self.order_journal)
+        else:
+            self.worker_controller = WorkerController(self.binance_logic, journal=self.order_journal)
+        self.worker_controller.journal_reconciled.connect(self._on_journal_reconciled)
+        self.user_data_controller = UserDataController()
+        self.user_data_controller.order_updated.connect(self._on_dca_order_state_changed)
+        self.user_data_controller.stream_error.connect(
+            lambda message: self._status_bar.showMessage(ui_strings.STATUS_USER_DATA_STREAM_ERROR.format(error=message), 5000))
+        # Carnets locaux des symboles des onglets Trade et Simulation, lus sans appel REST.
+        self.market_data_controller = MarketDataController()
+        self.market_data_controller.ticker_updated.connect(self._on_ticker_updated)
+        self.market_data_controller.stream_error.connect(
+            lambda message: self._status_bar.showMessage(ui_strings.STATUS_MARKET_DATA_STREAM_ERROR.format(error=message), 5000))
+
         # Connect worker controller signals
         self.worker_controller.balance_success.connect(self.on_fetch_success)
         self.worker_controller.balance_error.connect(self.on_fetch_error)
@@ -81,41 +177,82 @@ class BinanceAppPyQt(QMainWindow):
         self.worker_controller.dca_order_attempt_finished.connect(self._on_dca_tab_order_attempt_finished)
         self.worker_controller.dca_batch_finished.connect(self._on_dca_tab_batch_finished)
         self.worker_controller.dca_batch_error.connect(self._on_dca_tab_batch_error)
+        self.worker_controller.dca_rollback_finished.connect(self._on_dca_tab_rollback_finished)
+        self.worker_controller.dca_symbol_finished.connect(self._on_dca_tab_symbol_finished)
+        self.worker_controller.dca_deployment_finished.connect(self._on_dca_tab_deployment_finished)
 
-        # Connect simulation state clearing signals
-        self.ui.simBalanceLineEdit.textChanged.connect(self._clear_dca_simulation_state)
-        self.ui.simPrixEntreeLineEdit.textChanged.connect(self._clear_dca_simulation_state)
-        self.ui.simPrixCatastrophiqueLineEdit.textChanged.connect(self._clear_dca_simulation_state)
-        self.ui.simDropPercentLineEdit.textChanged.connect(self._clear_dca_simulation_state)
-        self.ui.simSymbolComboBox.currentTextChanged.connect(self._clear_dca_simulation_state)
+        self.ui.fetchBalanceButton.setEnabled(True)
+        self.ui.placeOrderButton.setEnabled(True)
+        self._refresh_dca_basket_button()
+
+        self.keyring_available = state.keyring_available
+        if state.error is not None:
+            logging.error(state.error)
+        if self.keyring_available:
+            self._status_bar.showMessage(ui_strings.APP_NAME + ": Keyring initialisé.", 3000)
+        else:
+            self.ui.saveApiKeysCheckBox.setEnabled(False)
+            self.ui.saveApiKeysCheckBox.setToolTip(ui_strings.LABEL_KEYRING_UNAVAILABLE)
+            self._status_bar.showMessage(ui_strings.LABEL_KEYRING_UNAVAILABLE, 5000)
+            logging.warning(ui_strings.LABEL_KEYRING_UNAVAILABLE)
+
+        if state.market_env is not None and state.market_env == self._selected_environment():
+            self._apply_credentials(state.market_env, *state.credentials)
+        else:
+            # L'environnement a changé pendant l'initialisation : lecture directe, le trousseau est prêt.
+            self._load_api_keys_for_selected_env()
+        self._watch_market_symbols()
 
     @pyqtSlot()
     def _load_api_keys_for_selected_env(self):
+        if not self.backend_ready:
+            return  # Les clés seront appliquées par _on_backend_ready
         if not self.keyring_available:
             self.ui.saveApiKeysCheckBox.setEnabled(False)
             self.ui.saveApiKeysCheckBox.setChecked(False)
             return
 
-        selected_env_text = self.ui.globalEnvironmentComboBox.currentText()
-        market_env = MarketUtils.get_environment_from_text(selected_env_text)
-
+        market_env = self._selected_environment()
         if market_env:
-            api_key, secret_key = keyring_utils.load_creds(market_env.value)
-            if api_key and secret_key:
-                self.ui.apiKeyLineEdit.setText(api_key)
-                self.ui.secretKeyLineEdit.setText(secret_key)
-                self.ui.saveApiKeysCheckBox.setChecked(True)
-            else:
-                self.ui.apiKeyLineEdit.clear()
-                self.ui.secretKeyLineEdit.clear()
-                self.ui.saveApiKeysCheckBox.setChecked(False)
-            self.ui.saveApiKeysCheckBox.setEnabled(True)
+            from . import keyring_utils
+            self._apply_credentials(market_env, *keyring_utils.load_creds(market_env.value))
         else:
             self.ui.apiKeyLineEdit.clear()
             self.ui.secretKeyLineEdit.clear()
             self.ui.saveApiKeysCheckBox.setChecked(False)
             self.ui.saveApiKeysCheckBox.setEnabled(self.keyring_available)
 
+    def _apply_credentials(self, market_env: MarketEnvironment, api_key: Optional[str], secret_key: Optional[str]):
+        if not self.keyring_available:
+            return
+        if api_key and secret_key:
+            self.ui.apiKeyLineEdit.setText(api_key)
+            self.ui.secretKeyLineEdit.setText(secret_key)
+            self.ui.saveApiKeysCheckBox.setChecked(True)
+            self._reconcile_order_journal(api_key, secret_key, market_env)
+        else:
+            self.ui.apiKeyLineEdit.clear()
+            self.ui.secretKeyLineEdit.clear()
+            self.ui.saveApiKeysCheckBox.setChecked(False)
+        self.ui.saveApiKeysCheckBox.setEnabled(True)
+
+    def _reconcile_order_journal(self, api_key: str, secret_key: str, market_env: MarketEnvironment):
+        """Au premier usage des clés d'un environnement, vérifie les ordres DCA restés sans état final."""
+        if market_env in self._journal_checked_envs:
+            return
+        self._journal_checked_envs.add(market_env)
+        if self.order_journal.unresolved(market_env):
+            self.worker_controller.start_reconcile_journal(api_key, secret_key, market_env)
+
+    @pyqtSlot(object)
+    def _on_journal_reconciled(self, reports):
+        if not reports:
+            return
+        summary = " ; ".join(report.summary() for report in reports)
+        message = ui_strings.STATUS_JOURNAL_RECONCILED.format(summary=summary)
+        self._status_bar.showMessage(message, 10000)
+        self.ui.dcaSimResultsTextEdit.append(message)
+
     @pyqtSlot()
     def start_fetch_balance(self):
         api_key = self.ui.apiKeyLineEdit.text().strip()
@@ -134,12 +271,14 @@ class BinanceAppPyQt(QMainWindow):
             return
 
         if self.keyring_available:
+            from . import keyring_utils
             if self.ui.saveApiKeysCheckBox.isChecked():
                 if api_key and secret_key:
                     keyring_utils.save_creds(market_env.value, api_key, secret_key)
             else:
                 keyring_utils.delete_creds(market_env.value)
 
+        self._reconcile_order_journal(api_key, secret_key, market_env)
         self.ui.fetchBalanceButton.setEnabled(False)
         self.ui.balanceValueLabel.setText(ui_strings.LABEL_LOADING)
 
@@ -165,6 +304,62 @@ class BinanceAppPyQt(QMainWindow):
         if not is_limit_order:
             self.ui.priceLineEdit.clear()
 
+    def _watch_market_symbols(self):
+        if self.market_data_controller is None:
+            return
+        current_tab = self.ui.tabWidget.currentWidget()
+        if current_tab not in (self.ui.tradeTab, self.ui.simulationTab):
+            return
+        market_env = MarketUtils.get_environment_from_text(self.ui.globalEnvironmentComboBox.currentText())
+        if market_env is None:
+            return
+        symbols = [self.ui.tradeSymbolLineEdit.text().strip(), self.ui.simSymbolComboBox.currentText().strip()]
+        self.market_data_controller.watch(market_env, symbols)
+        self._refresh_trade_quote()
+
+    @pyqtSlot()
+    def _on_trade_symbol_edited(self):
+        self._trade_price_prefill_pending = not self.ui.priceLineEdit.text().strip()
+        self._watch_market_symbols()
+
+    @pyqtSlot(str)
+    def _on_sim_symbol_changed(self, _symbol: str):
+        self._sim_entry_prefill_pending = not self.ui.simPrixEntreeLineEdit.text().strip()
+        self._watch_market_symbols()
+
+    @pyqtSlot(object)
+    def _on_ticker_updated(self, ticker: Ticker):
+        trade_symbol = self.ui.tradeSymbolLineEdit.text().strip()
+        if trade_symbol and to_market_id(trade_symbol) == ticker.market_id:
+            self._refresh_trade_quote(ticker)
+        sim_symbol = self.ui.simSymbolComboBox.currentText()
+        if self._sim_entry_prefill_pending and sim_symbol and to_market_id(sim_symbol) == ticker.market_id \
+                and ticker.reference_price is not None:
+            self._sim_entry_prefill_pending = False
+            if not self.ui.simPrixEntreeLineEdit.text().strip():
+                self.ui.simPrixEntreeLineEdit.setText(f"{ticker.reference_price:.10g}")
+
+    def _refresh_trade_quote(self, ticker: Optional[Ticker] = None):
+        """Affiche le haut du carnet du symbole de l'onglet Trade et pré-remplit le prix LIMIT vide."""
+        symbol = self.ui.tradeSymbolLineEdit.text().strip()
+        if ticker is None and self.market_data_controller is not None:
+            ticker = self.market_data_controller.ticker(symbol) if symbol else None
+        if ticker is None or ticker.bid is None or ticker.ask is None:
+            self.ui.tradeQuoteValueLabel.setText(ui_strings.MARKET_QUOTE_UNAVAILABLE)
+            return
+        text = ui_strings.MARKET_QUOTE_TEXT.format(bid=ticker.bid, bid_qty=ticker.bid_qty,
+                                                   ask=ticker.ask, ask_qty=ticker.ask_qty)
+        if ticker.mark_price is not None:
+            text += ui_strings.MARKET_QUOTE_MARK_SUFFIX.format(mark=ticker.mark_price)
+        self.ui.tradeQuoteValueLabel.setText(text)
+
+        if self._trade_price_prefill_pending and self.ui.priceLineEdit.isEnabled():
+            self._trade_price_prefill_pending = False
+            if not self.ui.priceLineEdit.text().strip():
+                # Prix passif : meilleur achat pour un BUY, meilleure vente pour un SELL.
+                is_buy = self.ui.sideComboBox.currentText().upper() == ui_strings.SIDE_BUY
+                self.ui.priceLineEdit.setText(f"{ticker.bid if is_buy else ticker.ask:.10g}")
+
     @pyqtSlot()
     def start_place_order(self):
         api_key = self.ui.apiKeyLineEdit.text().strip()
@@ -239,13 +434,18 @@ class BinanceAppPyQt(QMainWindow):
 
     @pyqtSlot()
     def _clear_dca_simulation_state(self):
-        if self.last_simulation_dca_levels is not None:
-            self.last_simulation_dca_levels = None
-            self.original_simulation_dca_levels = None
+        """Oublie l'échelle chargée ; sans effet si elle l'est déjà (appelé à chaque frappe)."""
+        if self.original_simulation_dca_levels is None and self.last_simulation_dca_levels is None \
+                and self.dca_progress_model.rowCount() == 0:
+            return
+        self.last_simulation_dca_levels = None
+        self.original_simulation_dca_levels = None
 
         self.ui.dcaSymbolValueLabel.setText(ui_strings.LABEL_DCA_SYMBOL_DEFAULT)
+        self.dca_progress_model.clear()
         self.ui.dcaSimResultsTextEdit.setText(ui_strings.DCA_TAB_DATA_CLEARED)
         self.ui.dcaPlaceOrdersButton.setEnabled(False)
+        self.ui.dcaAddToBasketButton.setEnabled(False)
         self.ui.dcaStatusLabel.setText(ui_strings.DCA_TAB_DATA_CLEARED)
 
     @pyqtSlot()
@@ -260,8 +460,8 @@ class BinanceAppPyQt(QMainWindow):
             except ValueError:
                 leverage = 1
 
-            self.ui.dcaSimResultsTextEdit.append(ui_strings.DCA_TAB_SIMULATION_DATA_HEADER + "\n")
-            
+            self.ui.dcaSimResultsTextEdit.append(f"{ui_strings.DCA_TAB_SIMULATION_DATA_HEADER} (x{leverage})")
+
             self.last_simulation_dca_levels = [
                 {
                     'price': level['price'],
@@ -270,20 +470,61 @@ class BinanceAppPyQt(QMainWindow):
                 for level in self.original_simulation_dca_levels
             ]
 
-            for i, level in enumerate(self.last_simulation_dca_levels):
-                level_text = f"Niveau {i+1}: Prix: {round(float(level['price']), 2):.2f}, Montant: {round(float(level['amount']), 2):.2f} (x{leverage})"
-                self.ui.dcaSimResultsTextEdit.append(level_text)
+            self.dca_progress_model.load([(current_sim_symbol, self.last_simulation_dca_levels)])
 
             self.ui.dcaPlaceOrdersButton.setEnabled(True)
+            self.ui.dcaAddToBasketButton.setEnabled(True)
             self.ui.dcaStatusLabel.setText(ui_strings.LABEL_DCA_STATUS_READY)
         else:
             self.ui.dcaSymbolValueLabel.setText(ui_strings.LABEL_DCA_SYMBOL_DEFAULT)
+            self.dca_progress_model.clear()
             self.ui.dcaSimResultsTextEdit.setText(ui_strings.LABEL_DCA_NO_SIMULATION_DATA_LOADED)
             self.ui.dcaPlaceOrdersButton.setEnabled(False)
+            self.ui.dcaAddToBasketButton.setEnabled(False)
             self.ui.dcaStatusLabel.setText(ui_strings.LABEL_DCA_NO_SIMULATION_DATA_LOADED)
 
+    @pyqtSlot()
+    def _update_ladder_shape_fields(self):
+        """N'active que les paramètres utilisés par l'espacement et la répartition choisis."""
+        spacing = self.ui.simEspacementComboBox.currentData()
+        sizing = self.ui.simRepartitionComboBox.currentData()
+        self.ui.simAccelerationLineEdit.setEnabled(spacing == "accelere")
+        self.ui.simMultiplicateurLineEdit.setEnabled(sizing in ("martingale", "lineaire"))
+        self.ui.simMontantInitialLineEdit.setEnabled(sizing in ("martingale", "lineaire"))
+        self.ui.simPoidsLineEdit.setEnabled(sizing == "personnalisee")
+
+    def _ladder_shape(self):
+        """FormeEchelle des champs de l'onglet ; un champ vide garde la valeur par défaut. Lève ValueError."""
+        from .simulation_logic import FormeEchelle
+        spacing = self.ui.simEspacementComboBox.currentData()
+        sizing = self.ui.simRepartitionComboBox.currentData()
+        acceleration = self.ui.simAccelerationLineEdit.text().strip()
+        multiplier = self.ui.simMultiplicateurLineEdit.text().strip()
+        first_amount = self.ui.simMontantInitialLineEdit.text().strip()
+        weights = self.ui.simPoidsLineEdit.text().replace(";", ",")
+        resolvable = sizing in ("martingale", "lineaire")
+        return FormeEchelle(
+            espacement=spacing,
+            acceleration=float(acceleration) if spacing == "accelere" and acceleration else 1.0,
+            repartition=sizing,
+            multiplicateur=float(multiplier) if resolvable and multiplier else 1.0,
+            montant_initial=float(first_amount) if resolvable and first_amount else None,
+            poids=tuple(float(w) for w in weights.split(",") if w.strip()) if sizing == "personnalisee" else (),
+        )
+
     @pyqtSlot()
     def handle_simulation_calculation(self):
+        self._run_simulation(prefill_entry=True)
+
+    @pyqtSlot()
+    def _on_simulation_inputs_idle(self):
+        """Recalcul en direct après la saisie ; le prix d'entrée, peut-être en cours d'effacement, n'est pas pré-rempli."""
+        self._run_simulation(prefill_entry=False)
+
+    def _run_simulation(self, prefill_entry: bool):
+        """Affiche la simulation des paramètres saisis ; les jeux déjà calculés viennent du cache LRU."""
+        from .simulation_logic import SimulationCache, SimulationError
+        self._simulation_timer.stop()
         self.ui.simResultsTextEdit.clear()
         self._clear_dca_simulation_state()
 
@@ -293,6 +534,12 @@ class BinanceAppPyQt(QMainWindow):
             prix_catastrophique_str = self.ui.simPrixCatastrophiqueLineEdit.text().strip()
             drop_percent_str = self.ui.simDropPercentLineEdit.text().strip()
 
+            if prefill_entry and not prix_entree_str and self.market_data_controller is not None:
+                ticker = self.market_data_controller.ticker(self.ui.simSymbolComboBox.currentText())
+                if ticker is not None and ticker.reference_price is not None:
+                    prix_entree_str = f"{ticker.reference_price:.10g}"
+                    self.ui.simPrixEntreeLineEdit.setText(prix_entree_str)
+
             if not all([balance_str, prix_entree_str, prix_catastrophique_str, drop_percent_str]):
                 self.ui.simResultsTextEdit.setText(error_messages.ERROR_ALL_SIM_FIELDS_REQUIRED)
                 return
@@ -302,15 +549,17 @@ class BinanceAppPyQt(QMainWindow):
                 prix_entree = float(prix_entree_str)
                 prix_catastrophique = float(prix_catastrophique_str)
                 drop_percent = float(drop_percent_str)
+                forme = self._ladder_shape()
             except ValueError:
                 self.ui.simResultsTextEdit.setText(error_messages.ERROR_SIM_NUMERIC_INPUT)
                 return
 
-            results_data = calculer_iterations(
+            results_data = SimulationCache.shared().calculer_iterations(
                 balance=balance,
                 prix_entree=prix_entree,
                 prix_catastrophique=prix_catastrophique,
-                drop_percent=drop_percent
+                drop_percent=drop_percent,
+                forme=forme
             )
 
             formatted_results = "\n".join(results_data.get("details_text", []))
@@ -336,48 +585,22 @@ class BinanceAppPyQt(QMainWindow):
 
     @pyqtSlot()
     def start_place_dca_orders_from_dca_tab(self):
+        if not self.backend_ready:
+            self._show_dca_error(ui_strings.STATUS_BACKEND_LOADING)
+            return
         self.ui.dcaStatusLabel.setText(ui_strings.DCA_TAB_ORDERS_SUBMITTING)
         self.ui.dcaSimResultsTextEdit.append("\n" + ui_strings.DCA_TAB_ORDERS_SUBMITTING)
 
         margin_mode_str = self.ui.dcaMergeModeComboBox.currentText()
-        leverage_str = self.ui.dcaLeverageLineEdit.text().strip()
-        leverage_int = 0
-
-        if not leverage_str:
-            self.ui.dcaStatusLabel.setText(ui_strings.ERROR_LEVERAGE_INVALID_NUMBER)
-            self.ui.dcaSimResultsTextEdit.append(ui_strings.ERROR_LEVERAGE_INVALID_NUMBER)
+        leverage_int = self._read_dca_leverage()
+        if leverage_int is None:
             self.ui.dcaPlaceOrdersButton.setEnabled(True)
             return
-        try:
-            leverage_int = int(leverage_str)
-        except ValueError:
-            self.ui.dcaStatusLabel.setText(ui_strings.ERROR_LEVERAGE_INVALID_NUMBER)
-            self.ui.dcaSimResultsTextEdit.append(ui_strings.ERROR_LEVERAGE_INVALID_NUMBER)
-            self.ui.dcaPlaceOrdersButton.setEnabled(True)
-            return
-
-        if not (1 <= leverage_int <= 100):
-            self.ui.dcaStatusLabel.setText(ui_strings.ERROR_LEVERAGE_OUT_OF_RANGE)
-            self.ui.dcaSimResultsTextEdit.append(ui_strings.ERROR_LEVERAGE_OUT_OF_RANGE)
-            self.ui.dcaPlaceOrdersButton.setEnabled(True)
-            return
-
-        api_key = self.ui.apiKeyLineEdit.text().strip()
-        secret_key = self.ui.secretKeyLineEdit.text().strip()
-
-        is_valid, error_msg = MarketUtils.validate_api_keys(api_key, secret_key)
-        if not is_valid:
-            self.ui.dcaStatusLabel.setText(error_msg)
-            self.ui.dcaSimResultsTextEdit.append(error_msg)
-            return
 
-        dca_tab_env_text = self.ui.globalEnvironmentComboBox.currentText()
-        market_env = MarketUtils.get_environment_from_text(dca_tab_env_text)
-        if market_env is None:
-            err_msg = error_messages.ERROR_INVALID_ENVIRONMENT_SELECTED
-            self.ui.dcaStatusLabel.setText(err_msg)
-            self.ui.dcaSimResultsTextEdit.append(err_msg)
+        credentials = self._read_dca_credentials()
+        if credentials is None:
             return
+        api_key, secret_key, market_env = credentials
 
         dca_symbol = self.ui.dcaSymbolValueLabel.text()
         if not dca_symbol or dca_symbol == ui_strings.LABEL_DCA_SYMBOL_DEFAULT:
@@ -393,44 +616,148 @@ class BinanceAppPyQt(QMainWindow):
             return
 
         self.ui.dcaPlaceOrdersButton.setEnabled(False)
+        self.dca_progress_model.load([(dca_symbol, self.last_simulation_dca_levels)])
 
+        self.user_data_controller.start(api_key, secret_key, market_env)
         self.worker_controller.start_place_dca_orders(
             api_key, secret_key, market_env,
             dca_symbol, self.last_simulation_dca_levels,
             margin_mode_str, leverage_int
         )
 
+    def _show_dca_error(self, message: str):
+        self.ui.dcaStatusLabel.setText(message)
+        self.ui.dcaSimResultsTextEdit.append(message)
+
+    def _read_dca_leverage(self) -> Optional[int]:
+        """Lit l'effet de levier de l'onglet DCA ; affiche l'erreur et retourne None s'il est invalide."""
+        try:
+            leverage_int = int(self.ui.dcaLeverageLineEdit.text().strip())
+        except ValueError:
+            self._show_dca_error(ui_strings.ERROR_LEVERAGE_INVALID_NUMBER)
+            return None
+        if not (1 <= leverage_int <= 100):
+            self._show_dca_error(ui_strings.ERROR_LEVERAGE_OUT_OF_RANGE)
+            return None
+        return leverage_int
+
+    def _read_dca_credentials(self) -> Optional[Tuple[str, str, MarketEnvironment]]:
+        """Lit les clés API et l'environnement ; affiche l'erreur et retourne None s'ils sont invalides."""
+        api_key = self.ui.apiKeyLineEdit.text().strip()
+        secret_key = self.ui.secretKeyLineEdit.text().strip()
+
+        is_valid, error_msg = MarketUtils.validate_api_keys(api_key, secret_key)
+        if not is_valid:
+            self._show_dca_error(error_msg)
+            return None
+
+        market_env = MarketUtils.get_environment_from_text(self.ui.globalEnvironmentComboBox.currentText())
+        if market_env is None:
+            self._show_dca_error(error_messages.ERROR_INVALID_ENVIRONMENT_SELECTED)
+            return None
+        return api_key, secret_key, market_env
+
+    def _refresh_dca_basket_button(self):
+        self.ui.dcaPlaceBasketButton.setText(ui_strings.BUTTON_DCA_PLACE_BASKET.format(count=len(self.dca_basket)))
+        self.ui.dcaPlaceBasketButton.setEnabled(bool(self.dca_basket) and self.backend_ready)
+
+    @pyqtSlot()
+    def _add_dca_ladder_to_basket(self):
+        """Ajoute l'échelle chargée au panier ; une échelle déjà présente pour ce symbole est remplacée."""
+        dca_symbol = self.ui.dcaSymbolValueLabel.text()
+        if not dca_symbol or dca_symbol == ui_strings.LABEL_DCA_SYMBOL_DEFAULT or not self.last_simulation_dca_levels:
+            self._show_dca_error(ui_strings.LABEL_DCA_NO_SIMULATION_DATA_LOADED)
+            return
+        leverage_int = self._read_dca_leverage()
+        if leverage_int is None:
+            return
+
+        deployment = DcaDeployment(dca_symbol, list(self.last_simulation_dca_levels),
+                                   self.ui.dcaMergeModeComboBox.currentText(), leverage_int)
+        self.dca_basket = [d for d in self.dca_basket if d.symbol != dca_symbol] + [deployment]
+        self._refresh_dca_basket_button()
+        message = ui_strings.DCA_TAB_BASKET_ADDED.format(symbol=dca_symbol, count=len(self.dca_basket))
+        self.ui.dcaStatusLabel.setText(message)
+        self.ui.dcaSimResultsTextEdit.append(message)
+
+    @pyqtSlot()
+    def start_place_dca_basket(self):
+        """Place en une seule opération les échelles de tous les symboles du panier."""
+        if not self.dca_basket or not self.backend_ready:
+            return
+        credentials = self._read_dca_credentials()
+        if credentials is None:
+            return
+        api_key, secret_key, market_env = credentials
+
+        from .services.dca_ladder import MAX_PARALLEL_SYMBOLS
+        self.ui.dcaPlaceBasketButton.setEnabled(False)
+        message = ui_strings.DCA_TAB_BASKET_SUBMITTING.format(count=min(len(self.dca_basket), MAX_PARALLEL_SYMBOLS))
+        self.ui.dcaStatusLabel.setText(message)
+        self.ui.dcaSimResultsTextEdit.append("\n" + message)
+        self.dca_progress_model.load([(deployment.symbol, deployment.levels) for deployment in self.dca_basket])
+        self.user_data_controller.start(api_key, secret_key, market_env)
+        self.worker_controller.start_place_multi_symbol_dca(api_key, secret_key, market_env, list(self.dca_basket))
+
+    @pyqtSlot(object)
+    def _on_dca_tab_symbol_finished(self, outcome):
+        self.ui.dcaSimResultsTextEdit.append(outcome.summary())
+
+    @pyqtSlot(object)
+    def _on_dca_tab_deployment_finished(self, outcomes):
+        self.dca_progress_model.flush()
+        succeeded = {outcome.symbol for outcome in outcomes if outcome.success}
+        message = ui_strings.DCA_TAB_BASKET_COMPLETE.format(succeeded=len(succeeded), total=len(outcomes))
+        self.ui.dcaSimResultsTextEdit.append(f"\n{message}")
+        self.ui.dcaStatusLabel.setText(message)
+        # Seuls les symboles en échec restent dans le panier pour une nouvelle tentative.
+        self.dca_basket = [d for d in self.dca_basket if d.symbol not in succeeded]
+        self._refresh_dca_basket_button()
+
     @pyqtSlot(int, str, bool, object)
     def _on_dca_tab_order_attempt_finished(self, level_idx, symbol, success, result_obj):
-        if success:
-            order_response = result_obj
-            msg = ui_strings.DCA_TAB_ORDER_LEVEL_SUCCESS.format(
-                level=level_idx + 1,
-                symbol=symbol,
-                order_id=order_response.get('id', 'N/A'),
-                status=order_response.get('status', 'N/A')
-            )
-        else:
-            error_detail = str(result_obj)
-            msg = ui_strings.DCA_TAB_ORDER_LEVEL_ERROR.format(
-                level=level_idx + 1,
-                symbol=symbol,
-                error=error_detail
-            )
-        self.ui.dcaSimResultsTextEdit.append(msg)
-        self.ui.dcaStatusLabel.setText(msg)
-        cursor = self.ui.dcaSimResultsTextEdit.textCursor()
-        cursor.movePosition(cursor.End)
-        self.ui.dcaSimResultsTextEdit.setTextCursor(cursor)
+        """Met le niveau à jour dans le tableau de progression (appliqué par lots par le modèle)."""
+        self.dca_progress_model.record_attempt(level_idx, symbol, success, result_obj)
+        entry: Optional[JournalEntry] = result_obj if success else None
+        if entry is not None and entry.order_id is not None:
+            self._dca_order_levels[(to_market_id(symbol), entry.order_id)] = (level_idx, symbol)
+            # Le flux a pu rapporter une exécution avant la réponse REST.
+            known_state = self.user_data_controller.store.get(symbol, entry.order_id)
+            if known_state is not None:
+                self._on_dca_order_state_changed(known_state)
+
+    @pyqtSlot(object)
+    def _on_dca_order_state_changed(self, state: OrderState):
+        """Reporte l'évolution d'un ordre DCA (exécution, annulation) reçue par le flux utilisateur."""
+        placed = self._dca_order_levels.get(state.key)
+        if placed is None or state.status == 'NEW':
+            return
+        level_idx, symbol = placed
+        self.dca_progress_model.record_state(level_idx, symbol, state)
+
+    @pyqtSlot(int, int, int)
+    def _on_dca_progress_changed(self, placed: int, failed: int, total: int):
+        if placed + failed == 0:
+            return
+        self.ui.dcaStatusLabel.setText(ui_strings.DCA_TAB_PROGRESS.format(placed=placed, total=total, failed=failed))
+        if self.dca_progress_model.latest_row is not None:
+            self.ui.dcaProgressTableView.scrollTo(self.dca_progress_model.index(self.dca_progress_model.latest_row, 0))
 
     @pyqtSlot(str)
     def _on_dca_tab_batch_error(self, error_message: str):
+        self.dca_progress_model.flush()
         self.ui.dcaSimResultsTextEdit.append(f"\n{error_message}")
         self.ui.dcaStatusLabel.setText(error_message)
         self.ui.dcaPlaceOrdersButton.setEnabled(True)
 
+    @pyqtSlot(object)
+    def _on_dca_tab_rollback_finished(self, report):
+        prefix = ui_strings.DCA_TAB_ROLLBACK_OK if report.success else ui_strings.DCA_TAB_ROLLBACK_INCOMPLETE
+        self.ui.dcaSimResultsTextEdit.append(f"\n{prefix} {report.summary()}")
+
     @pyqtSlot(str)
     def _on_dca_tab_batch_finished(self, summary_message):
+        self.dca_progress_model.flush()
         final_msg = f"{ui_strings.DCA_TAB_BATCH_COMPLETE} {summary_message}"
         self.ui.dcaSimResultsTextEdit.append(f"\n{final_msg}")
         self.ui.dcaStatusLabel.setText(final_msg)
@@ -439,9 +766,31 @@ class BinanceAppPyQt(QMainWindow):
         cursor.movePosition(cursor.End)
         self.ui.dcaSimResultsTextEdit.setTextCursor(cursor)
 
+    @pyqtSlot(object, object)
+    def _show_diagnostics(self, spans, counters):
+        """Remplit les tableaux du panneau de diagnostic avec un instantané du registre des mesures."""
+        table = self.ui.diagnosticsSpansTable
+        table.setRowCount(len(spans))
+        for row, summary in enumerate(spans):
+            name = summary.name + "".join(f" {key}={value}" for key, value in summary.labels)
+            values = [name, str(summary.count), str(summary.errors), f"{summary.p50 * 1000:.1f}",
+                      f"{summary.p99 * 1000:.1f}", f"{summary.max * 1000:.1f}", f"{summary.total:.2f}"]
+            for column, value in enumerate(values):
+                table.setItem(row, column, QTableWidgetItem(value))
+
+        table = self.ui.diagnosticsCountersTable
+        table.setRowCount(len(counters))
+        for row, ((name, labels), value) in enumerate(counters.items()):
+            table.setItem(row, 0, QTableWidgetItem(name + "".join(f" {key}={label}" for key, label in labels)))
+            table.setItem(row, 1, QTableWidgetItem(f"{value:g}"))
+
     def closeEvent(self, event):
         """Assure que les workers sont correctement arrêtés à la fermeture."""
-        self.worker_controller.stop_all_workers()
+        if self.backend_ready:
+            self.worker_controller.stop_all_workers()
+            self.user_data_controller.stop()
+            self.market_data_controller.stop()
+        self.diagnostics_controller.stop()
         event.accept()
 
 
@@ -0,0 +1,28 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from .journal_entry import JournalEntry
+from .rollback_report import RollbackReport
+
+@dataclass
+class DcaDeployment:
+    """Échelle DCA à placer sur un symbole, avec ses propres paramètres de marge."""
+    symbol: str
+    levels: List[Dict[str, Any]]
+    margin_mode: str
+    leverage: int
+
+@dataclass
+class DeploymentOutcome:
+    """Résultat du placement de l'échelle d'un symbole dans un déploiement multi-symboles."""
+    symbol: str
+    success: bool
+    message: str
+    placed: List[JournalEntry] = field(default_factory=list)
+    rollback: Optional[RollbackReport] = None
+
+    def summary(self) -> str:
+        state = "OK" if self.success else "ÉCHEC"
+        text = f"{self.symbol}: {state}, {len(self.placed)} ordres placés. {self.message}"
+        if self.rollback is not None:
+            text += f" {self.rollback.summary()}"
+        return text
@@ -0,0 +1,74 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Ordre enregistré avant l'envoi, sans réponse de l'exchange pour l'instant.
+STATE_PENDING = 'PENDING'
+# Ordre accepté par l'exchange ; ``order_id`` est connu.
+STATE_ACKED = 'ACKED'
+STATE_FAILED = 'FAILED'
+STATE_CANCELED = 'CANCELED'
+# Ordre accepté qui n'est plus ouvert (exécuté ou annulé hors de l'application).
+STATE_CLOSED = 'CLOSED'
+# Intention sans réponse que la réconciliation n'a retrouvée parmi aucun ordre ouvert.
+STATE_NOT_FOUND = 'NOT_FOUND'
+
+UNRESOLVED_STATES = frozenset({STATE_PENDING, STATE_ACKED})
+
+@dataclass
+class JournalEntry:
+    """Un niveau DCA dans le journal des ordres : intention, puis réponse de l'exchange."""
+    intent_id: str
+    run_id: str
+    market_env: str
+    symbol: str
+    level_index: int
+    side: str
+    order_type: str
+    price: float
+    amount: float
+    state: str = STATE_PENDING
+    order_id: Optional[str] = None
+    client_order_id: Optional[str] = None
+    status: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    @property
+    def is_unresolved(self) -> bool:
+        return self.state in UNRESOLVED_STATES
+
+    def acknowledge(self, response: Dict[str, Any]) -> None:
+        """Reporte la réponse ccxt d'un ordre accepté."""
+        order_id = response.get('id')
+        self.order_id = str(order_id) if order_id is not None else None
+        self.client_order_id = response.get('clientOrderId') or self.client_order_id
+        self.status = response.get('status')
+        self.state = STATE_ACKED
+
+    def fail(self, error: Any) -> None:
+        self.error = str(error)
+        self.state = STATE_FAILED
+
+    def mark_uncertain(self, error: Any) -> None:
+        """Échec réseau après les nouvelles tentatives : l'ordre a pu être reçu, l'entrée reste à réconcilier."""
+        self.error = str(error)
+        self.state = STATE_PENDING
+
+@dataclass
+class ReconcileReport:
+    """Résultat de la réconciliation du journal avec les ordres ouverts d'un symbole."""
+    symbol: str
+    still_open: List[JournalEntry] = field(default_factory=list)
+    closed: List[JournalEntry] = field(default_factory=list)
+    not_found: List[JournalEntry] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def summary(self) -> str:
+        if self.error is not None:
+            return f"{self.symbol}: réconciliation impossible ({self.error})"
+        text = (f"{self.symbol}: {len(self.still_open)} ordres encore ouverts, "
+                f"{len(self.closed)} terminés")
+        if self.not_found:
+            text += f", {len(self.not_found)} envois sans trace chez l'exchange"
+        return text
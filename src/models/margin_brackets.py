@@ -0,0 +1,44 @@
+from bisect import bisect_right
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List
+
+
+@dataclass
+class MarginBrackets:
+    """
+    Paliers de marge de maintenance d'un symbole futures (GET /fapi/v1/leverageBracket),
+    par notionnel croissant. Le palier i couvre les notionnels de ``notional_floors[i]``
+    (inclus) à ``notional_caps[i]`` (exclu) ; la marge de maintenance d'une position de
+    notionnel N y vaut ``N * maint_margin_ratios[i] - maint_amounts[i]``.
+    """
+    symbol: str
+    notional_floors: List[float]
+    notional_caps: List[float]
+    maint_margin_ratios: List[float]
+    maint_amounts: List[float]
+    max_leverages: List[int]
+
+    def bracket_index(self, notional: float) -> int:
+        """Index du palier qui contient le notionnel (le dernier au-delà du plafond)."""
+        return min(max(bisect_right(self.notional_floors, notional) - 1, 0), len(self.notional_floors) - 1)
+
+    def max_leverage(self, notional: float) -> int:
+        """Effet de levier maximal autorisé pour une position de ce notionnel."""
+        return self.max_leverages[self.bracket_index(notional)]
+
+    def maintenance_margin(self, notional: float) -> float:
+        """Marge de maintenance d'une position de ce notionnel."""
+        i = self.bracket_index(notional)
+        return notional * self.maint_margin_ratios[i] - self.maint_amounts[i]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MarginBrackets":
+        return cls(symbol=data['symbol'],
+                   notional_floors=[float(v) for v in data['notional_floors']],
+                   notional_caps=[float(v) for v in data['notional_caps']],
+                   maint_margin_ratios=[float(v) for v in data['maint_margin_ratios']],
+                   maint_amounts=[float(v) for v in data['maint_amounts']],
+                   max_leverages=[int(v) for v in data['max_leverages']])
@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+from typing import Optional
+
+# Statuts Binance après lesquels un ordre n'évolue plus.
+TERMINAL_STATUSES = frozenset({'FILLED', 'CANCELED', 'EXPIRED', 'EXPIRED_IN_MATCH', 'REJECTED'})
+
+def to_market_id(symbol: str) -> str:
+    """Identifiant Binance d'un symbole : "BTC/USDT" et "BTC/USDT:USDT" deviennent "BTCUSDT"."""
+    return symbol.split(':')[0].replace('/', '').upper()
+
+@dataclass
+class OrderState:
+    """Dernier état connu d'un ordre, tel que rapporté par le flux utilisateur Binance."""
+    market_id: str
+    order_id: str
+    client_order_id: str
+    side: str
+    status: str
+    price: float
+    amount: float
+    filled: float = 0.0
+    average_price: Optional[float] = None
+    update_time: int = 0
+    latency_ms: Optional[float] = None
+
+    @property
+    def key(self):
+        return self.market_id, self.order_id
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def supersedes(self, previous: 'OrderState') -> bool:
+        """
+        Vrai si cet état est plus récent que ``previous``. Les événements peuvent arriver en
+        double ou dans le désordre après une reconnexion : un état terminal n'est jamais
+        remplacé et la quantité exécutée ne recule pas.
+        """
+        if previous.is_terminal:
+            return False
+        if self.filled != previous.filled:
+            return self.filled > previous.filled
+        return self.update_time >= previous.update_time
@@ -0,0 +1,30 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+@dataclass
+class RollbackReport:
+    """Résultat de l'annulation d'un groupe d'ordres sur un symbole."""
+    symbol: str
+    requested: List[str] = field(default_factory=list)
+    cancelled: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    still_open: List[str] = field(default_factory=list)
+    verified: bool = False
+    verification_error: Optional[str] = None
+    duration: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        """Vrai si la vérification confirme qu'aucun des ordres demandés n'est encore ouvert."""
+        return self.verified and not self.still_open
+
+    def summary(self) -> str:
+        text = (f"Annulation {self.symbol}: {len(self.cancelled)}/{len(self.requested)} ordres annulés "
+                f"en {self.duration:.2f}s")
+        if self.failed:
+            text += f", {len(self.failed)} échecs d'annulation"
+        if self.still_open:
+            text += f", encore ouverts: {', '.join(self.still_open)}"
+        if not self.verified:
+            text += f", vérification impossible ({self.verification_error or 'erreur inconnue'})"
+        return text
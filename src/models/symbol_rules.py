@@ -0,0 +1,61 @@
+from dataclasses import dataclass, asdict
+from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR
+from typing import Any, Dict, Optional
+
+def _snap(value: float, step: Optional[float], rounding: str) -> float:
+    """Arrondit value au multiple de step (calcul décimal, sans erreur d'arrondi binaire)."""
+    if not step:
+        return value
+    step_decimal = Decimal(str(step))
+    multiple = (Decimal(str(value)) / step_decimal).to_integral_value(rounding=rounding)
+    return float(multiple * step_decimal)
+
+@dataclass
+class SymbolRules:
+    """
+    Filtres Binance d'un symbole (PRICE_FILTER, LOT_SIZE, MIN_NOTIONAL/NOTIONAL, MAX_NUM_ORDERS).
+    Une valeur None signifie que le filtre est absent ou désactivé.
+    """
+    symbol: str
+    tick_size: Optional[float] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    step_size: Optional[float] = None
+    min_qty: Optional[float] = None
+    max_qty: Optional[float] = None
+    min_notional: Optional[float] = None
+    max_num_orders: Optional[int] = None
+
+    def snap_price(self, price: float, side: str) -> float:
+        """Prix au pas de cotation : vers le bas pour un achat, vers le haut pour une vente."""
+        return _snap(price, self.tick_size, ROUND_FLOOR if side.upper() == "BUY" else ROUND_CEILING)
+
+    def snap_amount(self, amount: float) -> float:
+        """Quantité arrondie vers le bas au pas de quantité, pour ne jamais dépasser le montant prévu."""
+        return _snap(amount, self.step_size, ROUND_FLOOR)
+
+    def violation(self, amount: float, price: Optional[float]) -> Optional[str]:
+        """Retourne la description du premier filtre non respecté, ou None si l'ordre est recevable."""
+        if amount <= 0:
+            return f"quantité nulle après arrondi au pas {self.step_size}"
+        if self.min_qty and amount < self.min_qty:
+            return f"quantité {amount} inférieure au minimum {self.min_qty}"
+        if self.max_qty and amount > self.max_qty:
+            return f"quantité {amount} supérieure au maximum {self.max_qty}"
+        if price is not None:
+            if price <= 0:
+                return f"prix nul après arrondi au pas {self.tick_size}"
+            if self.min_price and price < self.min_price:
+                return f"prix {price} inférieur au minimum {self.min_price}"
+            if self.max_price and price > self.max_price:
+                return f"prix {price} supérieur au maximum {self.max_price}"
+            if self.min_notional and amount * price < self.min_notional:
+                return f"notionnel {amount * price:.8g} inférieur au minimum {self.min_notional}"
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SymbolRules":
+        return cls(**{key: data.get(key) for key in cls.__dataclass_fields__})
@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass(frozen=True)
+class Ticker:
+    """Haut du carnet local d'un symbole : meilleurs prix, prix de marque et fraîcheur."""
+    market_id: str
+    bid: Optional[float]
+    bid_qty: float
+    ask: Optional[float]
+    ask_qty: float
+    mark_price: Optional[float] = None
+    update_id: int = 0
+    event_time: int = 0
+
+    @property
+    def mid_price(self) -> Optional[float]:
+        if self.bid is None or self.ask is None:
+            return None
+        return (self.bid + self.ask) / 2.0
+
+    @property
+    def reference_price(self) -> Optional[float]:
+        """Prix de marque (futures) s'il est connu, sinon milieu de fourchette (spot)."""
+        return self.mark_price if self.mark_price is not None else self.mid_price
+
+    def top_of_book(self):
+        """Valeurs qui changent l'affichage ; sert à ne notifier que les changements visibles."""
+        return self.bid, self.bid_qty, self.ask, self.ask_qty, self.mark_price
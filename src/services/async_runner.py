@@ -0,0 +1,95 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, Optional
+
+class AsyncLoopThread:
+    """
+    Boucle asyncio unique, exécutée dans un thread démon dédié.
+
+    Les opérations réseau asynchrones y sont soumises depuis n'importe quel thread (en
+    pratique le thread Qt) : des dizaines de requêtes en vol ne coûtent que des coroutines,
+    pas un thread chacune. Les résultats reviennent sous forme de concurrent.futures.Future,
+    ou par des signaux Qt émis depuis la boucle (livrés en file dans le thread du récepteur).
+    """
+
+    def __init__(self, name: str = "binance-async-loop"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """La boucle, démarrée au premier accès."""
+        with self._lock:
+            if self._loop is None:
+                self._start_locked()
+            return self._loop
+
+    def is_running(self) -> bool:
+        with self._lock:
+            return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        """Planifie une coroutine sur la boucle et retourne son Future (thread-safe)."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+        """Exécute une coroutine sur la boucle et attend son résultat depuis un autre thread."""
+        return self.submit(coro).result(timeout)
+
+    def stop_task(self, future: concurrent.futures.Future, stop: Coroutine[Any, Any, Any],
+                  timeout: float) -> concurrent.futures.Future:
+        """
+        Arrête une tâche soumise par ``submit`` sans bloquer le thread appelant : ``stop`` est
+        exécutée sur la boucle, puis la tâche y est attendue et annulée si elle n'a pas fini
+        après ``timeout`` secondes. Retourne le Future de cet arrêt, qui ne lève pas.
+        """
+        return self.submit(self._stop_task(future, stop, timeout))
+
+    @staticmethod
+    async def _stop_task(future: concurrent.futures.Future, stop: Coroutine[Any, Any, Any], timeout: float) -> None:
+        task = asyncio.wrap_future(future)
+        try:
+            await asyncio.wait_for(stop, timeout)
+            await asyncio.wait_for(task, timeout)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+        except Exception:
+            future.cancel()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Annule les tâches restantes, arrête la boucle et attend la fin du thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _start_locked(self) -> None:
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run_loop():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(started.set)
+            try:
+                loop.run_forever()
+            finally:
+                pending = asyncio.all_tasks(loop)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.close()
+
+        self._thread = threading.Thread(target=run_loop, name=self.name, daemon=True)
+        self._loop = loop
+        self._thread.start()
+        started.wait()
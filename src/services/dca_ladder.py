@@ -0,0 +1,539 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from typing import Any, Callable, Dict, Generator, List, NamedTuple, Optional, Tuple, TypeVar
+from ..app_logic import CustomNetworkError
+from ..constants import ui_strings
+from ..models.margin_brackets import MarginBrackets
+from ..models.dca_deployment import DcaDeployment, DeploymentOutcome
+from ..models.journal_entry import JournalEntry
+from ..models.market_environment import MarketEnvironment
+from ..models.rollback_report import RollbackReport
+from .margin_calculator import ladder_problem
+from .metrics import Metrics
+from .order_journal import OrderJournal
+
+# Nombre de symboles placés en même temps ; le limiteur de débit partagé fixe le rythme global.
+MAX_PARALLEL_SYMBOLS = 4
+
+MSG_NO_LEVELS = "Aucune donnée de simulation disponible."
+MSG_COMPLETED = "Traitement DCA terminé avec succès."
+MSG_CANCELLED = "Traitement DCA annulé par l'utilisateur."
+MSG_NOTHING_PLACED = "Aucun ordre n'a été placé. Veuillez vérifier les paramètres et réessayer."
+
+Level = Tuple[int, Dict[str, Any]]
+T = TypeVar('T')
+
+
+class ExchangeCall(NamedTuple):
+    """Appel à la logique d'exchange demandé par une étape de l'échelle : méthode et arguments."""
+    method: str
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+
+
+# Étape de l'échelle : générateur qui cède des ExchangeCall, reçoit leurs résultats et retourne un T.
+Steps = Generator[ExchangeCall, Any, T]
+
+
+def _ignore(*args) -> None:
+    pass
+
+
+class DcaLadder:
+    """
+    Placement d'une échelle DCA sur un symbole, sans dépendance à Qt.
+
+    La progression est publiée par des fonctions de rappel : ``on_attempt(index, symbole,
+    succès, entrée ou message)``, ``on_finished(message)``, ``on_error(message)`` et
+    ``on_rollback(RollbackReport)``. Les workers Qt y branchent leurs signaux, la ligne de
+    commande ses affichages. En futures, l'échelle est refusée avant tout envoi si la position
+    cumulée serait liquidée avant le niveau suivant ou si l'effet de levier dépasse le maximum
+    du palier de marge ; mode de marge et effet de levier sont ensuite appliqués une seule fois
+    avant le premier ordre. En cas d'échec d'un niveau ou d'arrêt, les ordres déjà
+    placés sont annulés. Le temps passé dans ``on_attempt`` (émission des signaux), l'écriture du
+    journal et les annulations sont mesurés dans ``metrics``.
+    """
+
+    def __init__(self, logic, api_key: str, secret_key: str, market_env: MarketEnvironment,
+                 symbol_str: str, dca_levels_data: List[Dict[str, Any]], margin_mode: str, leverage: int,
+                 use_batch_orders: bool = True, journal: Optional[OrderJournal] = None,
+                 on_attempt: Callable[[int, str, bool, Any], None] = _ignore,
+                 on_finished: Callable[[str], None] = _ignore,
+                 on_error: Callable[[str], None] = _ignore,
+                 on_rollback: Callable[[RollbackReport], None] = _ignore,
+                 metrics: Optional[Metrics] = None):
+        """
+        Args:
+            logic: BinanceLogic (ou AsyncBinanceLogic pour AsyncDcaLadder).
+            journal: Journal des ordres ; par défaut le journal partagé du processus.
+            metrics: Registre des mesures ; par défaut celui du processus.
+        """
+        self.logic = logic
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.market_env = market_env
+        self.symbol_str = symbol_str
+        self.dca_levels_data = dca_levels_data
+        self.margin_mode = margin_mode
+        self.leverage = leverage
+        self.use_batch_orders = use_batch_orders
+        self.journal = journal if journal is not None else OrderJournal.shared()
+        self.run_id = OrderJournal.new_run_id()
+        self.on_attempt = on_attempt
+        self.on_finished = on_finished
+        self.on_error = on_error
+        self.on_rollback = on_rollback
+        self.metrics = metrics if metrics is not None else Metrics.shared()
+        self._is_running = True
+
+    @property
+    def is_running(self) -> bool:
+        return self._is_running
+
+    def stop(self) -> None:
+        """Demande l'arrêt ; les ordres déjà placés sont annulés avant la fin de run()."""
+        self._is_running = False
+
+    def placed_entries(self) -> List[JournalEntry]:
+        """Ordres de ce lot acceptés par l'exchange et pas encore annulés, d'après le journal."""
+        return self.journal.placed(self.run_id)
+
+    def _placed_order_ids(self) -> List[str]:
+        return [entry.order_id for entry in self.placed_entries() if entry.order_id is not None]
+
+    @staticmethod
+    def _rollback_outcome(report: Optional[RollbackReport]) -> str:
+        if report is None or report.success:
+            return "Tous les ordres ont été annulés."
+        return f"ATTENTION: l'annulation est incomplète. {report.summary()}"
+
+    def _finish_rollback(self, order_ids: List[str], report: Optional[RollbackReport],
+                         error: Optional[Exception] = None) -> RollbackReport:
+        if report is None:
+            report = RollbackReport(symbol=self.symbol_str, requested=order_ids, verification_error=str(error))
+        self.journal.mark_cancelled(self.run_id, report.cancelled)
+        self.metrics.increment('rollbacks', complete=report.success)
+        self.metrics.observe('dca.rollback', report.duration, error=not report.success)
+        self.on_rollback(report)
+        return report
+
+    def _level_error_message(self, level_index: int, error: Any, report: Optional[RollbackReport]) -> str:
+        error_msg = f"Erreur lors du placement de l'ordre {level_index+1}. Détail: {str(error)}"
+        return error_msg + f"\n{self._rollback_outcome(report)} Veuillez vérifier les paramètres et réessayer."
+
+    def _configure_error_message(self, error: Exception) -> str:
+        return (f"Impossible de configurer {self.symbol_str} (mode de marge, effet de levier). "
+                f"Détail: {str(error)}\n{MSG_NOTHING_PLACED}")
+
+    def _margin_error_message(self, problem: str) -> str:
+        return f"Échelle {self.symbol_str} refusée avant envoi : {problem}.\n{MSG_NOTHING_PLACED}"
+
+    def _unexpected_error_message(self, error: Exception, report: Optional[RollbackReport]) -> str:
+        return (f"Une erreur inattendue s'est produite: {str(error)}\n"
+                f"{self._rollback_outcome(report)} Veuillez réessayer.")
+
+    @staticmethod
+    def _level_order(level_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {'order_type': "LIMIT", 'side': "BUY", 'amount': level_data['amount'], 'price': level_data['price']}
+
+    @staticmethod
+    def _intent_order(level_data: Dict[str, Any], entry: JournalEntry) -> Dict[str, Any]:
+        """Ordre du niveau avec son identifiant client, qui rend le renvoi après un délai dépassé sans risque."""
+        return {**DcaLadder._level_order(level_data), 'client_order_id': entry.client_order_id}
+
+    def _record_intents(self, levels: List[Level]) -> List[JournalEntry]:
+        """Inscrit les niveaux au journal et les écrit sur disque ; à appeler juste avant l'envoi."""
+        entries = [self.journal.new_intent(self.run_id, self.market_env, self.symbol_str, i, self._level_order(level_data))
+                   for i, level_data in levels]
+        with self.metrics.span('journal.flush'):
+            self.journal.flush()
+        return entries
+
+    def _record_result(self, level_index: int, entry: JournalEntry, success: bool, payload: Any) -> None:
+        """
+        Reporte la réponse de l'exchange dans le journal (écrite avec le prochain groupe) et la signale.
+        Une erreur réseau persistante ne prouve pas que l'ordre est absent : l'entrée reste alors
+        en attente, et la réconciliation tranchera.
+        """
+        if success:
+            entry.acknowledge(payload)
+        elif isinstance(payload, CustomNetworkError):
+            entry.mark_uncertain(payload)
+        else:
+            entry.fail(payload)
+        self.journal.record(entry)
+        with self.metrics.span('dca.on_attempt'):
+            self.on_attempt(level_index, self.symbol_str, success, entry if success else str(payload))
+
+    def _record_results(self, chunk: List[Level], entries: List[JournalEntry],
+                        results: List[Tuple[bool, Any]]) -> Optional[Tuple[int, Any]]:
+        """Reporte les réponses d'un lot ; retourne le premier niveau refusé et son erreur, s'il y en a un."""
+        first_failure = None
+        for (i, _), entry, (success, payload) in zip(chunk, entries, results):
+            self._record_result(i, entry, success, payload)
+            if not success and first_failure is None:
+                first_failure = (i, payload)
+        return first_failure
+
+    def _positive_levels(self) -> List[Level]:
+        levels = []
+        for i, level_data in enumerate(self.dca_levels_data):
+            if level_data['amount'] <= 0 or level_data['price'] <= 0:
+                self.on_attempt(i, self.symbol_str, False, "Le montant et le prix doivent être positifs.")
+                continue
+            levels.append((i, level_data))
+        return levels
+
+    def _keep_feasible(self, levels: List[Level], prepared: List[Tuple[bool, Any]]) -> List[Level]:
+        """Signale les niveaux refusés par les filtres et retourne les autres, arrondis."""
+        feasible = []
+        for (i, level_data), (success, payload) in zip(levels, prepared):
+            if not success:
+                self.on_attempt(i, self.symbol_str, False, str(payload))
+                continue
+            feasible.append((i, {**level_data, 'amount': payload['amount'], 'price': payload['price']}))
+        return feasible
+
+    def _batch_kwargs(self, chunk: List[Level], entries: List[JournalEntry]) -> Dict[str, Any]:
+        return dict(api_key=self.api_key, secret_key=self.secret_key, market_environment=self.market_env,
+                    symbol=self.symbol_str,
+                    orders=[self._intent_order(level_data, entry) for (_, level_data), entry in zip(chunk, entries)],
+                    margin_mode=self.margin_mode, leverage=self.leverage)
+
+    def _level_kwargs(self, level_data: Dict[str, Any], entry: JournalEntry) -> Dict[str, Any]:
+        return dict(api_key=self.api_key, secret_key=self.secret_key, market_environment=self.market_env,
+                    symbol=self.symbol_str, order_type="LIMIT", side="BUY",
+                    amount=level_data['amount'], price=level_data['price'],
+                    margin_mode=self.margin_mode, leverage=self.leverage, client_order_id=entry.client_order_id)
+
+    @staticmethod
+    def _call(method: str, *args, **kwargs) -> ExchangeCall:
+        return ExchangeCall(method, args, kwargs)
+
+    def _drive(self, steps: Steps[T]) -> T:
+        """
+        Exécute les appels à l'exchange demandés par ``steps`` et lui renvoie chaque résultat,
+        ou l'exception levée, jusqu'à sa valeur de retour. AsyncDcaLadder n'a que ce pilote en propre.
+        """
+        try:
+            call = next(steps)
+            while True:
+                try:
+                    result = getattr(self.logic, call.method)(*call.args, **call.kwargs)
+                except Exception as e:
+                    call = steps.throw(e)
+                else:
+                    call = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    def _cancel_all_orders(self) -> Steps[Optional[RollbackReport]]:
+        """Annule tous les ordres placés précédemment et publie le rapport d'annulation."""
+        order_ids = self._placed_order_ids()
+        if not order_ids:
+            return None
+        try:
+            report = yield self._call('cancel_orders', self.api_key, self.secret_key, self.market_env,
+                                      self.symbol_str, order_ids)
+        except Exception as e:
+            return self._finish_rollback(order_ids, None, e)
+        return self._finish_rollback(order_ids, report)
+
+    def _rollback_after_level_error(self, level_index: int, error: Any) -> Steps[None]:
+        """Annule les ordres déjà placés et signale l'échec du niveau."""
+        report = yield from self._cancel_all_orders()
+        self.on_error(self._level_error_message(level_index, error, report))
+
+    def _cancelled_by_user(self) -> Steps[bool]:
+        if self._is_running:
+            return False
+        yield from self._cancel_all_orders()
+        self.on_finished(MSG_CANCELLED)
+        return True
+
+    def _valid_levels(self) -> Steps[List[Level]]:
+        """
+        Signale les niveaux invalides et retourne les autres avec leur index.
+        Prix et quantités sont arrondis aux filtres du symbole ; un niveau que l'exchange
+        refuserait est écarté avant tout envoi et ne provoque donc pas d'annulation du lot.
+        """
+        levels = self._positive_levels()
+        if not levels:
+            return levels
+        try:
+            prepared = yield self._call('prepare_orders', self.api_key, self.secret_key, self.market_env,
+                                        self.symbol_str, [self._level_order(d) for _, d in levels])
+        except Exception:
+            return levels  # Filtres indisponibles : l'exchange validera lui-même les ordres
+        return self._keep_feasible(levels, prepared)
+
+    def _margin_problem(self, levels: List[Level], brackets: Optional[MarginBrackets]) -> Optional[str]:
+        """
+        Simule la position longue niveau après niveau, dans l'ordre où les prix seront atteints.
+        En marge croisée, le portefeuille retenu est la marge engagée par l'échelle elle-même.
+        """
+        if brackets is None or not levels or not self.leverage:
+            return None
+        filled = sorted((level_data for _, level_data in levels), key=lambda d: d['price'], reverse=True)
+        return ladder_problem([d['price'] for d in filled], [d['amount'] for d in filled], brackets,
+                              float(self.leverage), isolated=self.margin_mode == ui_strings.MERGE_MODE_ISOLATED)
+
+    def _margin_safe(self, levels: List[Level]) -> Steps[bool]:
+        """
+        Vérifie l'échelle contre les paliers de marge du symbole avant tout envoi. Une échelle
+        refusée est signalée et arrête le traitement ; sans paliers (spot, chargement
+        impossible), l'échelle est envoyée telle quelle.
+        """
+        try:
+            brackets = yield self._call('margin_brackets', self.api_key, self.secret_key, self.market_env,
+                                        self.symbol_str)
+            problem = self._margin_problem(levels, brackets)
+        except Exception:
+            return True
+        if problem is None:
+            return True
+        self.on_error(self._margin_error_message(problem))
+        return False
+
+    def _configure_symbol(self) -> Steps[bool]:
+        """
+        Applique mode de marge et effet de levier avant le premier envoi : les appels de
+        placement qui suivent les trouvent déjà en place et ne soumettent que les ordres.
+        Un échec est signalé et arrête le traitement ; aucun ordre n'est encore placé.
+        """
+        try:
+            yield self._call('configure_futures_symbol', self.api_key, self.secret_key, self.market_env,
+                             self.symbol_str, self.margin_mode, self.leverage)
+        except Exception as e:
+            self.on_error(self._configure_error_message(e))
+            return False
+        return True
+
+    def _ready_levels(self) -> Steps[Optional[List[Level]]]:
+        """Niveaux à envoyer une fois l'échelle vérifiée et le symbole configuré, ou None si c'est refusé."""
+        levels = yield from self._valid_levels()
+        if levels and not ((yield from self._margin_safe(levels)) and (yield from self._configure_symbol())):
+            return None
+        return levels
+
+    def run(self) -> None:
+        self._drive(self._run())
+
+    def rollback(self) -> Optional[RollbackReport]:
+        """Annule les ordres déjà placés de ce lot, hors de run() (interruption de l'appelant)."""
+        return self._drive(self._cancel_all_orders())
+
+    def _run(self) -> Steps[None]:
+        if not self.dca_levels_data:
+            self.on_finished(MSG_NO_LEVELS)
+            return
+
+        try:
+            if self.use_batch_orders:
+                completed = yield from self._run_batched()
+            else:
+                completed = yield from self._run_level_by_level()
+
+            if completed and self._is_running:
+                self.on_finished(MSG_COMPLETED)
+
+        except Exception as e:
+            report = yield from self._cancel_all_orders()
+            self.on_error(self._unexpected_error_message(e, report))
+        finally:
+            self.journal.flush()
+
+    def _run_batched(self) -> Steps[bool]:
+        """
+        Soumet les niveaux par lots (batchOrders en futures, envoi groupé sur un même client en spot).
+        Retourne False si le traitement a été interrompu (annulation ou erreur déjà signalée).
+        """
+        levels = yield from self._ready_levels()
+        if levels is None:
+            return False
+        batch_size = self.logic.max_batch_size(self.market_env)
+
+        for start in range(0, len(levels), batch_size):
+            if (yield from self._cancelled_by_user()):
+                return False
+
+            chunk = levels[start:start + batch_size]
+            entries = self._record_intents(chunk)
+            results = yield self._call('place_orders_batch', **self._batch_kwargs(chunk, entries))
+
+            first_failure = self._record_results(chunk, entries, results)
+            if first_failure is not None:
+                yield from self._rollback_after_level_error(*first_failure)
+                return False
+
+        return True
+
+    def _run_level_by_level(self) -> Steps[bool]:
+        """
+        Place chaque niveau avec son propre appel à place_order.
+        Le rythme est fixé par le limiteur de débit partagé de BinanceLogic.
+        """
+        levels = yield from self._ready_levels()
+        if levels is None:
+            return False
+        for i, level_data in levels:
+            if (yield from self._cancelled_by_user()):
+                return False
+
+            entry, = self._record_intents([(i, level_data)])
+            try:
+                order_response = yield self._call('place_order', **self._level_kwargs(level_data, entry))
+            except Exception as e:
+                self._record_result(i, entry, False, e)
+                yield from self._rollback_after_level_error(i, e)
+                return False
+            self._record_result(i, entry, True, order_response)
+
+        return True
+
+
+class AsyncDcaLadder(DcaLadder):
+    """
+    Variante de DcaLadder sur AsyncBinanceLogic : mêmes étapes, mêmes rappels, mêmes messages,
+    mais les appels à l'exchange sont attendus et run() doit être attendu sur la boucle.
+    """
+
+    async def _drive(self, steps: Steps[T]) -> T:
+        try:
+            call = next(steps)
+            while True:
+                try:
+                    result = await getattr(self.logic, call.method)(*call.args, **call.kwargs)
+                except Exception as e:
+                    call = steps.throw(e)
+                else:
+                    call = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    async def run(self) -> None:
+        await self._drive(self._run())
+
+    async def rollback(self) -> Optional[RollbackReport]:
+        return await self._drive(self._cancel_all_orders())
+
+
+class MultiSymbolDeployment:
+    """
+    Place les échelles DCA de plusieurs symboles en une seule opération, sans dépendance à Qt.
+
+    Chaque symbole est traité par un DcaLadder, au plus ``max_parallel_symbols`` à la fois,
+    dans un pool de threads propre à l'opération. Tous partagent la même logique d'exchange
+    (et donc le budget de requêtes) ; l'échec d'un symbole n'annule que les ordres de ce
+    symbole. ``on_attempt`` et ``on_rollback`` relaient ceux des échelles ;
+    ``on_symbol_finished`` reçoit le DeploymentOutcome de chaque symbole.
+    """
+    ladder_class = DcaLadder
+
+    def __init__(self, logic, api_key: str, secret_key: str, market_env: MarketEnvironment,
+                 deployments: List[DcaDeployment], use_batch_orders: bool = True,
+                 max_parallel_symbols: int = MAX_PARALLEL_SYMBOLS, journal: Optional[OrderJournal] = None,
+                 on_attempt: Callable[[int, str, bool, Any], None] = _ignore,
+                 on_rollback: Callable[[RollbackReport], None] = _ignore,
+                 on_symbol_finished: Callable[[DeploymentOutcome], None] = _ignore):
+        self.logic = logic
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.market_env = market_env
+        self.deployments = deployments
+        self.use_batch_orders = use_batch_orders
+        self.max_parallel_symbols = max(1, max_parallel_symbols)
+        self.journal = journal
+        self.on_attempt = on_attempt
+        self.on_rollback = on_rollback
+        self.on_symbol_finished = on_symbol_finished
+        self._is_running = True
+        self._lock = threading.Lock()
+        self._active: List[DcaLadder] = []
+
+    def stop(self) -> None:
+        """Demande l'arrêt de tous les symboles ; chacun annule ses propres ordres déjà placés."""
+        self._is_running = False
+        with self._lock:
+            for ladder in self._active:
+                ladder.stop()
+
+    def _cancelled_outcome(self, deployment: DcaDeployment) -> DeploymentOutcome:
+        outcome = DeploymentOutcome(deployment.symbol, False, MSG_CANCELLED)
+        self.on_symbol_finished(outcome)
+        return outcome
+
+    def _ladder(self, deployment: DcaDeployment, finished: List[str], errors: List[str],
+                rollbacks: List[RollbackReport]) -> DcaLadder:
+        def on_rollback(report: RollbackReport):
+            rollbacks.append(report)
+            self.on_rollback(report)
+
+        return self.ladder_class(
+            self.logic, self.api_key, self.secret_key, self.market_env,
+            deployment.symbol, deployment.levels, deployment.margin_mode, deployment.leverage,
+            use_batch_orders=self.use_batch_orders, journal=self.journal,
+            on_attempt=self.on_attempt, on_finished=finished.append, on_error=errors.append, on_rollback=on_rollback
+        )
+
+    def _outcome(self, deployment: DcaDeployment, ladder: DcaLadder, finished: List[str], errors: List[str],
+                 rollbacks: List[RollbackReport]) -> DeploymentOutcome:
+        success = not errors and ladder.is_running
+        message = (errors or finished or [""])[-1]
+        outcome = DeploymentOutcome(deployment.symbol, success, message, placed=ladder.placed_entries(),
+                                    rollback=rollbacks[-1] if rollbacks else None)
+        self.on_symbol_finished(outcome)
+        return outcome
+
+    def run(self) -> List[DeploymentOutcome]:
+        if not self.deployments:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_parallel_symbols, len(self.deployments))) as executor:
+            return list(executor.map(self._deploy, self.deployments))
+
+    def _deploy(self, deployment: DcaDeployment) -> DeploymentOutcome:
+        if not self._is_running:
+            return self._cancelled_outcome(deployment)
+
+        finished: List[str] = []
+        errors: List[str] = []
+        rollbacks: List[RollbackReport] = []
+        ladder = self._ladder(deployment, finished, errors, rollbacks)
+        with self._lock:
+            self._active.append(ladder)
+        try:
+            ladder.run()
+        finally:
+            with self._lock:
+                self._active.remove(ladder)
+        return self._outcome(deployment, ladder, finished, errors, rollbacks)
+
+
+class AsyncMultiSymbolDeployment(MultiSymbolDeployment):
+    """Variante de MultiSymbolDeployment sur la boucle asyncio : les symboles sont des coroutines concurrentes."""
+    ladder_class = AsyncDcaLadder
+
+    async def run(self) -> List[DeploymentOutcome]:
+        semaphore = asyncio.Semaphore(self.max_parallel_symbols)
+
+        async def deploy(deployment: DcaDeployment) -> DeploymentOutcome:
+            async with semaphore:
+                return await self._deploy(deployment)
+
+        return list(await asyncio.gather(*(deploy(deployment) for deployment in self.deployments)))
+
+    async def _deploy(self, deployment: DcaDeployment) -> DeploymentOutcome:
+        if not self._is_running:
+            return self._cancelled_outcome(deployment)
+
+        finished: List[str] = []
+        errors: List[str] = []
+        rollbacks: List[RollbackReport] = []
+        ladder = self._ladder(deployment, finished, errors, rollbacks)
+        self._active.append(ladder)
+        try:
+            await ladder.run()
+        finally:
+            self._active.remove(ladder)
+        return self._outcome(deployment, ladder, finished, errors, rollbacks)
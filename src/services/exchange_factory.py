@@ -1,33 +1,363 @@
 import ccxt
-from typing import Optional
+import ccxt.async_support as ccxt_async
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
 from ..models.market_environment import MarketEnvironment
+from .metrics import Metrics
+
+# URL (schéma et hôte) qui remplace celles de Binance pour tous les endpoints REST, par
+# exemple celle du serveur local de scripts/fake_binance.py pour les tests de bout en bout.
+API_URL_ENV_VAR = "BINANCE_MULTIAPP_API_URL"
+
+
+def redirect_api_urls(exchange, base_url: str) -> None:
+    """Envoie toutes les requêtes REST du client vers ``base_url`` en gardant le chemin de chaque endpoint."""
+    base_url = base_url.rstrip('/')
+    api = exchange.urls['api']
+    for name, url in api.items():
+        if isinstance(url, str):
+            api[name] = base_url + urlsplit(url).path
+
+
+def instrument_time_sync(exchange, metrics: Metrics) -> None:
+    """
+    Chronomètre la synchronisation d'horloge (``load_time_difference``) que ccxt lance au
+    chargement des marchés quand ``adjustForTimeDifference`` est actif.
+    """
+    load_time_difference = exchange.load_time_difference
+    if isinstance(exchange, ccxt_async.Exchange):
+        async def timed_load_time_difference(*args, **kwargs):
+            with metrics.span('exchange.time_sync'):
+                return await load_time_difference(*args, **kwargs)
+        exchange.load_time_difference = timed_load_time_difference
+    else:
+        def timed_load_time_difference(*args, **kwargs):
+            with metrics.span('exchange.time_sync'):
+                return load_time_difference(*args, **kwargs)
+        exchange.load_time_difference = timed_load_time_difference
+
 
 class ExchangeFactory:
+    # Remplace l'URL de Binance pour les clients créés ensuite ; None pour les vrais endpoints.
+    api_base_url: Optional[str] = os.environ.get(API_URL_ENV_VAR) or None
+
     @staticmethod
-    def create(api_key: str, secret_key: str, market_env: MarketEnvironment) -> ccxt.Exchange:
+    def build_config(api_key: str, secret_key: str, market_env: MarketEnvironment) -> dict:
         """
-        Crée une instance d'exchange configurée selon l'environnement spécifié.
-        
+        Construit la configuration ccxt pour l'environnement spécifié.
+
         Args:
             api_key: La clé API Binance
             secret_key: La clé secrète Binance
             market_env: L'environnement de marché (SPOT, FUTURES_LIVE, FUTURES_TESTNET)
-            
+
         Returns:
-            Une instance configurée de l'exchange Binance
+            Le dictionnaire de configuration passé au constructeur ccxt
         """
-        exchange = ccxt.binance()
-        exchange.apiKey = api_key
-        exchange.secret = secret_key
-        exchange.options = getattr(exchange, 'options', {})
-        exchange.options['adjustForTimeDifference'] = True
+        options = {'adjustForTimeDifference': True, 'fetchMarkets': {'types': ['spot']}}
 
         # Configuration spécifique pour les futures
         if market_env in [MarketEnvironment.FUTURES_LIVE, MarketEnvironment.FUTURES_TESTNET]:
-            exchange.options['defaultType'] = 'future'
+            options['defaultType'] = 'future'
+            options['fetchMarkets'] = {'types': ['linear']}
+
+        return {
+            'apiKey': api_key,
+            'secret': secret_key,
+            # Le RateLimiter applique déjà les poids Binance : le délai fixe de ccxt s'y ajouterait.
+            'enableRateLimit': False,
+            'options': options,
+        }
+
+    @staticmethod
+    def create(api_key: str, secret_key: str, market_env: MarketEnvironment) -> ccxt.Exchange:
+        """
+        Crée une instance d'exchange configurée selon l'environnement spécifié.
+
+        Args:
+            api_key: La clé API Binance
+            secret_key: La clé secrète Binance
+            market_env: L'environnement de marché (SPOT, FUTURES_LIVE, FUTURES_TESTNET)
+
+        Returns:
+            Une instance configurée de l'exchange Binance
+        """
+        exchange = ccxt.binance(ExchangeFactory.build_config(api_key, secret_key, market_env))
 
         # Activation du mode testnet si nécessaire
         if market_env == MarketEnvironment.FUTURES_TESTNET:
             exchange.set_sandbox_mode(True)
+        if ExchangeFactory.api_base_url:
+            redirect_api_urls(exchange, ExchangeFactory.api_base_url)
+
+        return exchange
+
+    @staticmethod
+    def create_async(api_key: str, secret_key: str, market_env: MarketEnvironment) -> ccxt_async.Exchange:
+        """
+        Crée une instance asynchrone (ccxt.async_support) avec la même configuration que ``create``.
+        Le client doit être utilisé et fermé depuis une seule boucle asyncio.
+        """
+        exchange = ccxt_async.binance(ExchangeFactory.build_config(api_key, secret_key, market_env))
+
+        if market_env == MarketEnvironment.FUTURES_TESTNET:
+            exchange.set_sandbox_mode(True)
+        if ExchangeFactory.api_base_url:
+            redirect_api_urls(exchange, ExchangeFactory.api_base_url)
+
+        return exchange
+
+
+PoolKey = Tuple[str, MarketEnvironment]
 
-        return exchange 
\ No newline at end of file
+
+def _fingerprint(value: str) -> str:
+    """Empreinte SHA-256 d'une clé, pour ne jamais garder les secrets en clair comme index."""
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+class _PoolSlot:
+    """Clients inactifs et état partagé pour une paire (clé API, environnement)."""
+
+    def __init__(self, secret_fingerprint: str):
+        self.secret_fingerprint = secret_fingerprint
+        self.generation = 0
+        self.leased = 0
+        self.idle: List[Tuple[ccxt.Exchange, float]] = []
+        self.template: Optional[ccxt.Exchange] = None
+
+
+class ExchangePool:
+    """
+    Pool de clients ccxt réutilisables, indexé par (empreinte de la clé API, MarketEnvironment).
+
+    Un client rendu au pool conserve sa session HTTP (keep-alive), ses marchés chargés
+    et son décalage horaire : les appels suivants évitent la poignée de main TLS,
+    le ``load_markets`` et la synchronisation ``adjustForTimeDifference``.
+    Chaque client n'est utilisé que par un seul thread à la fois ; les appels
+    concurrents sur la même clé obtiennent des clients distincts, réchauffés à
+    partir des marchés déjà chargés.
+    """
+
+    DEFAULT_IDLE_TIMEOUT = 300.0
+    DEFAULT_MAX_IDLE_PER_KEY = 4
+
+    def __init__(self,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 max_idle_per_key: int = DEFAULT_MAX_IDLE_PER_KEY,
+                 clock: Callable[[], float] = time.monotonic,
+                 metrics: Optional[Metrics] = None):
+        self.metrics = metrics if metrics is not None else Metrics.shared()
+        self.idle_timeout = idle_timeout
+        self.max_idle_per_key = max_idle_per_key
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._slots: Dict[PoolKey, _PoolSlot] = {}
+
+    @staticmethod
+    def make_key(api_key: str, market_env: MarketEnvironment) -> PoolKey:
+        """Clé du pool : empreinte de la clé API et environnement de marché."""
+        return _fingerprint(api_key), market_env
+
+    @contextmanager
+    def lease(self, api_key: str, secret_key: str, market_env: MarketEnvironment) -> Iterator[ccxt.Exchange]:
+        """
+        Prête un client pour la durée du bloc ``with``.
+
+        Le client est rendu au pool en sortie du bloc. Après une erreur réseau,
+        il est fermé et abandonné : sa session peut être dans un état incertain.
+        """
+        key = self.make_key(api_key, market_env)
+        with self.metrics.span('exchange_pool.checkout'):
+            exchange, generation = self._checkout(key, api_key, secret_key, market_env)
+        try:
+            yield exchange
+        except ccxt.NetworkError:
+            self._release(key, generation)
+            self._discard(exchange)
+            raise
+        except BaseException:
+            self._checkin(key, exchange, generation)
+            raise
+        else:
+            self._checkin(key, exchange, generation)
+
+    def invalidate(self, api_key: str, market_env: MarketEnvironment) -> None:
+        """Ferme tous les clients inactifs d'une clé ; les clients prêtés ne seront pas repris."""
+        key = self.make_key(api_key, market_env)
+        with self._lock:
+            slot = self._slots.pop(key, None)
+        if slot:
+            for exchange, _ in slot.idle:
+                self._discard(exchange)
+
+    def clear(self) -> None:
+        """Ferme tous les clients inactifs du pool."""
+        with self._lock:
+            slots = list(self._slots.values())
+            self._slots.clear()
+        for slot in slots:
+            for exchange, _ in slot.idle:
+                self._discard(exchange)
+
+    def evict_idle(self) -> int:
+        """Ferme les clients inactifs depuis plus de ``idle_timeout`` secondes. Retourne leur nombre."""
+        with self._lock:
+            expired = self._collect_expired_locked()
+        for exchange in expired:
+            self._discard(exchange)
+        return len(expired)
+
+    def idle_count(self, api_key: str, market_env: MarketEnvironment) -> int:
+        """Nombre de clients inactifs disponibles pour une clé."""
+        with self._lock:
+            slot = self._slots.get(self.make_key(api_key, market_env))
+            return len(slot.idle) if slot else 0
+
+    def _collect_expired_locked(self) -> List[ccxt.Exchange]:
+        now = self._clock()
+        expired = []
+        for key in list(self._slots):
+            slot = self._slots[key]
+            kept = []
+            for exchange, last_used in slot.idle:
+                if now - last_used > self.idle_timeout:
+                    expired.append(exchange)
+                else:
+                    kept.append((exchange, last_used))
+            slot.idle = kept
+            if not slot.idle and slot.leased == 0:
+                del self._slots[key]
+        return expired
+
+    def _checkout(self, key: PoolKey, api_key: str, secret_key: str,
+                  market_env: MarketEnvironment) -> Tuple[ccxt.Exchange, int]:
+        secret_fingerprint = _fingerprint(secret_key)
+        stale: List[ccxt.Exchange] = []
+        with self._lock:
+            stale.extend(self._collect_expired_locked())
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = _PoolSlot(secret_fingerprint)
+            elif slot.secret_fingerprint != secret_fingerprint:
+                # Rotation du secret : les clients existants portent l'ancien secret.
+                stale.extend(exchange for exchange, _ in slot.idle)
+                slot.idle = []
+                slot.template = None
+                slot.secret_fingerprint = secret_fingerprint
+                slot.generation += 1
+                slot.leased = 0
+            generation = slot.generation
+            slot.leased += 1
+            exchange = slot.idle.pop()[0] if slot.idle else None
+            template = slot.template
+
+        for old in stale:
+            self._discard(old)
+
+        if exchange is None:
+            try:
+                with self.metrics.span('exchange.construct'):
+                    exchange = ExchangeFactory.create(api_key, secret_key, market_env)
+            except BaseException:
+                self._release(key, generation)
+                raise
+            instrument_time_sync(exchange, self.metrics)
+            self._warm_from(exchange, template)
+        return exchange, generation
+
+    def _release(self, key: PoolKey, generation: int) -> None:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is not None and slot.generation == generation:
+                slot.leased -= 1
+
+    def _checkin(self, key: PoolKey, exchange: ccxt.Exchange, generation: int) -> None:
+        with self._lock:
+            slot = self._slots.get(key)
+            current = slot is not None and slot.generation == generation
+            if current:
+                slot.leased -= 1
+            if current and len(slot.idle) < self.max_idle_per_key:
+                slot.idle.append((exchange, self._clock()))
+                if isinstance(getattr(exchange, 'markets', None), dict):
+                    slot.template = exchange
+                return
+        self._discard(exchange)
+
+    @staticmethod
+    def _warm_from(exchange: ccxt.Exchange, template: Optional[ccxt.Exchange]) -> None:
+        """Copie les marchés et le décalage horaire d'un client déjà chaud."""
+        if template is None or not isinstance(getattr(template, 'markets', None), dict):
+            return
+        try:
+            exchange.set_markets_from_exchange(template)
+            time_difference = template.options.get('timeDifference')
+            if time_difference is not None:
+                exchange.options['timeDifference'] = time_difference
+        except Exception:
+            pass  # Le client chargera lui-même ses marchés au premier appel
+
+    @staticmethod
+    def _discard(exchange: ccxt.Exchange) -> None:
+        try:
+            exchange.close()
+        except Exception:
+            pass
+
+
+class AsyncExchangePool:
+    """
+    Clients ccxt asynchrones, un seul par (empreinte de la clé API, MarketEnvironment).
+
+    Contrairement au client synchrone, un client asynchrone accepte plusieurs requêtes
+    simultanées sur sa session aiohttp : les coroutines le partagent au lieu de l'emprunter.
+    Le pool appartient à une boucle asyncio et ne doit être utilisé que depuis celle-ci.
+    """
+
+    def __init__(self, metrics: Optional[Metrics] = None):
+        self.metrics = metrics if metrics is not None else Metrics.shared()
+        self._clients: Dict[PoolKey, Tuple[str, ccxt_async.Exchange]] = {}
+        self._retired: List[ccxt_async.Exchange] = []
+
+    def get(self, api_key: str, secret_key: str, market_env: MarketEnvironment) -> ccxt_async.Exchange:
+        """Retourne le client de la clé, en le créant (ou en le remplaçant si le secret a changé)."""
+        key = ExchangePool.make_key(api_key, market_env)
+        secret_fingerprint = _fingerprint(secret_key)
+        entry = self._clients.get(key)
+        if entry is not None and entry[0] == secret_fingerprint:
+            return entry[1]
+        if entry is not None:
+            # Des requêtes peuvent encore être en cours sur l'ancien client : il sera fermé avec le pool.
+            self._retired.append(entry[1])
+        with self.metrics.span('exchange.construct'):
+            exchange = ExchangeFactory.create_async(api_key, secret_key, market_env)
+        instrument_time_sync(exchange, self.metrics)
+        self._clients[key] = (secret_fingerprint, exchange)
+        return exchange
+
+    async def invalidate(self, api_key: str, market_env: MarketEnvironment) -> None:
+        """Ferme le client d'une clé."""
+        entry = self._clients.pop(ExchangePool.make_key(api_key, market_env), None)
+        if entry is not None:
+            await self._close(entry[1])
+
+    async def close(self) -> None:
+        """Ferme tous les clients et leurs sessions HTTP."""
+        exchanges = [exchange for _, exchange in self._clients.values()] + self._retired
+        self._clients.clear()
+        self._retired = []
+        for exchange in exchanges:
+            await self._close(exchange)
+
+    @staticmethod
+    async def _close(exchange: ccxt_async.Exchange) -> None:
+        try:
+            await exchange.close()
+        except Exception:
+            pass
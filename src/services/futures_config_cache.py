@@ -0,0 +1,112 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from ..models.market_environment import MarketEnvironment
+from ..models.order_state import to_market_id
+
+# Durée pendant laquelle la configuration connue d'un symbole est considérée à jour. Au-delà,
+# elle est relue sur positionRisk : elle a pu être modifiée hors de l'application.
+DEFAULT_MAX_AGE = 10 * 60.0
+
+# Valeurs de marginType de positionRisk, traduites dans celles de ccxt.set_margin_mode.
+_MARGIN_TYPES = {'cross': 'CROSSED', 'crossed': 'CROSSED', 'isolated': 'ISOLATED'}
+
+ConfigKey = Tuple[str, MarketEnvironment, str]
+
+
+@dataclass
+class FuturesSymbolConfig:
+    """Mode de marge ("CROSSED" ou "ISOLATED") et effet de levier d'un symbole ; None si inconnu."""
+    margin_mode: Optional[str] = None
+    leverage: Optional[int] = None
+    updated_at: float = 0.0
+
+
+def parse_position_risk(rows: Any) -> Dict[str, FuturesSymbolConfig]:
+    """Configuration par identifiant Binance ("BTCUSDT") d'après une réponse de /fapi/v2/positionRisk."""
+    configs: Dict[str, FuturesSymbolConfig] = {}
+    for row in rows if isinstance(rows, list) else []:
+        if not isinstance(row, dict) or not row.get('symbol'):
+            continue
+        try:
+            leverage = int(float(row.get('leverage')))
+        except (TypeError, ValueError):
+            leverage = None
+        margin_mode = _MARGIN_TYPES.get(str(row.get('marginType', '')).lower())
+        configs[row['symbol']] = FuturesSymbolConfig(margin_mode, leverage)
+    return configs
+
+
+class FuturesConfigCache:
+    """
+    Dernier mode de marge et effet de levier connus par (compte, environnement, symbole).
+
+    BinanceLogic n'appelle set_margin_mode et set_leverage que pour une valeur différente de
+    celle du cache ; celui-ci est amorcé par une lecture de positionRisk, mis à jour après
+    chaque changement réussi et vidé pour le symbole quand un changement échoue. Le compte
+    est identifié par l'empreinte de sa clé API, jamais par la clé elle-même.
+    """
+
+    _shared_instance: Optional['FuturesConfigCache'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE, clock: Callable[[], float] = time.monotonic):
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._configs: Dict[ConfigKey, FuturesSymbolConfig] = {}
+
+    @classmethod
+    def shared(cls) -> 'FuturesConfigCache':
+        """Instance unique du processus, partagée par les logiques synchrone et asynchrone."""
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    @staticmethod
+    def _key(api_key: str, market_env: MarketEnvironment, symbol: str) -> ConfigKey:
+        return hashlib.sha256(api_key.encode('utf-8')).hexdigest(), market_env, to_market_id(symbol)
+
+    def get(self, api_key: str, market_env: MarketEnvironment, symbol: str) -> Optional[FuturesSymbolConfig]:
+        """Configuration connue du symbole, ou None si elle est absente ou trop ancienne."""
+        with self._lock:
+            config = self._configs.get(self._key(api_key, market_env, symbol))
+            if config is None or self._clock() - config.updated_at > self.max_age:
+                return None
+            return FuturesSymbolConfig(config.margin_mode, config.leverage, config.updated_at)
+
+    def update(self, api_key: str, market_env: MarketEnvironment, symbol: str,
+               margin_mode: Optional[str] = None, leverage: Optional[int] = None) -> None:
+        """Enregistre une valeur confirmée par l'exchange ; un argument None laisse l'autre valeur intacte."""
+        key = self._key(api_key, market_env, symbol)
+        with self._lock:
+            config = self._configs.setdefault(key, FuturesSymbolConfig())
+            if margin_mode is not None:
+                config.margin_mode = margin_mode
+            if leverage is not None:
+                config.leverage = leverage
+            config.updated_at = self._clock()
+
+    def seed(self, api_key: str, market_env: MarketEnvironment, configs: Dict[str, FuturesSymbolConfig]) -> None:
+        """Remplace la configuration des symboles lus sur positionRisk (indexés par identifiant Binance)."""
+        now = self._clock()
+        with self._lock:
+            for market_id, config in configs.items():
+                key = self._key(api_key, market_env, market_id)
+                self._configs[key] = FuturesSymbolConfig(config.margin_mode, config.leverage, now)
+
+    def invalidate(self, api_key: str, market_env: MarketEnvironment, symbols: Optional[Iterable[str]] = None) -> None:
+        """Oublie la configuration des symboles donnés, ou de tous les symboles du compte."""
+        fingerprint = self._key(api_key, market_env, '')[0]
+        market_ids = None if symbols is None else {to_market_id(symbol) for symbol in symbols}
+        with self._lock:
+            for key in [k for k in self._configs if k[0] == fingerprint and k[1] == market_env]:
+                if market_ids is None or key[2] in market_ids:
+                    del self._configs[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._configs.clear()
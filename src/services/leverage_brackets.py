@@ -0,0 +1,178 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from ..models.margin_brackets import MarginBrackets
+from ..models.market_environment import MarketEnvironment
+from ..models.order_state import to_market_id
+from .market_index import DEFAULT_CACHE_DIR, RETRY_INTERVAL
+
+# Binance ne modifie les paliers de marge que rarement : un chargement par jour suffit.
+DEFAULT_TTL = 24 * 3600.0
+
+
+def _parse_symbol_brackets(row: Any) -> Optional[MarginBrackets]:
+    if not isinstance(row, dict) or not row.get('symbol') or not isinstance(row.get('brackets'), list):
+        return None
+    try:
+        brackets = sorted((b for b in row['brackets'] if isinstance(b, dict)),
+                          key=lambda b: float(b['notionalFloor']))
+        parsed = MarginBrackets(
+            symbol=row['symbol'],
+            notional_floors=[float(b['notionalFloor']) for b in brackets],
+            notional_caps=[float(b['notionalCap']) for b in brackets],
+            maint_margin_ratios=[float(b['maintMarginRatio']) for b in brackets],
+            maint_amounts=[float(b.get('cum') or 0.0) for b in brackets],
+            max_leverages=[int(float(b['initialLeverage'])) for b in brackets],
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+    return parsed if parsed.notional_floors else None
+
+
+def parse_leverage_brackets(rows: Any) -> Dict[str, MarginBrackets]:
+    """
+    Paliers par identifiant Binance ("BTCUSDT") d'après une réponse de /fapi/v1/leverageBracket,
+    qui est une liste de symboles, ou un seul objet quand la requête précise le symbole.
+    """
+    if isinstance(rows, dict):
+        rows = [rows]
+    parsed = (_parse_symbol_brackets(row) for row in (rows if isinstance(rows, list) else []))
+    return {brackets.symbol: brackets for brackets in parsed if brackets is not None}
+
+
+class _EnvironmentBrackets:
+    def __init__(self):
+        self.brackets: Dict[str, MarginBrackets] = {}
+        self.fetched_at = 0.0
+        self.last_attempt = 0.0
+        self.loaded = False
+
+
+class LeverageBracketIndex:
+    """
+    Cache local des paliers de marge de maintenance des contrats futures, par environnement.
+
+    Même fonctionnement que MarketIndex : les paliers de tous les symboles sont chargés en une
+    requête, gardés en mémoire et persistés en JSON dans ``cache_dir`` pendant ``ttl``
+    secondes ; après un échec, l'index périmé reste utilisé et aucun nouvel essai n'est fait
+    avant ``RETRY_INTERVAL``. Les symboles sont acceptés sous la forme "BTC/USDT" ou "BTCUSDT".
+    """
+
+    _shared_instance: Optional['LeverageBracketIndex'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, cache_dir: Optional[Path] = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            cache_dir: Dossier des fichiers de paliers, ou None pour un cache uniquement en mémoire.
+            ttl: Âge maximal des paliers, en secondes.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._indexes: Dict[MarketEnvironment, _EnvironmentBrackets] = {}
+
+    @classmethod
+    def shared(cls) -> 'LeverageBracketIndex':
+        """Instance unique du processus, partagée par les logiques synchrone et asynchrone."""
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    def get(self, market_env: MarketEnvironment, symbol: str) -> Optional[MarginBrackets]:
+        """Paliers connus pour le symbole, sans appel réseau."""
+        with self._lock:
+            return self._index(market_env).brackets.get(to_market_id(symbol))
+
+    def needs_refresh(self, market_env: MarketEnvironment, symbol: Optional[str] = None) -> bool:
+        """Vrai si les paliers sont absents, périmés ou inconnus pour le symbole, et qu'un essai est permis."""
+        with self._lock:
+            index = self._index(market_env)
+            now = self._clock()
+            if now - index.last_attempt < RETRY_INTERVAL:
+                return False
+            stale = not index.brackets or now - index.fetched_at > self.ttl
+            return stale or (symbol is not None and to_market_id(symbol) not in index.brackets)
+
+    def update(self, market_env: MarketEnvironment, rows: Any) -> int:
+        """
+        Remplace les paliers de l'environnement par ceux de la réponse et les persiste.
+
+        Returns:
+            Le nombre de symboles lus.
+        """
+        parsed = parse_leverage_brackets(rows)
+        with self._lock:
+            index = self._index(market_env)
+            index.last_attempt = self._clock()
+            if not parsed:
+                return 0
+            index.brackets = parsed
+            index.fetched_at = index.last_attempt
+            self._save_locked(market_env, index)
+            return len(parsed)
+
+    def record_failure(self, market_env: MarketEnvironment) -> None:
+        """Note un chargement échoué pour espacer les essais suivants."""
+        with self._lock:
+            self._index(market_env).last_attempt = self._clock()
+
+    def brackets(self, market_env: MarketEnvironment, symbol: str,
+                 fetch_brackets: Callable[[], Any]) -> Optional[MarginBrackets]:
+        """Paliers du symbole, en rechargeant le cache via ``fetch_brackets`` si nécessaire."""
+        if self.needs_refresh(market_env, symbol):
+            try:
+                self.update(market_env, fetch_brackets())
+            except Exception:
+                self.record_failure(market_env)
+        return self.get(market_env, symbol)
+
+    def _path(self, market_env: MarketEnvironment) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"brackets_{market_env.name.lower()}.json"
+
+    def _index(self, market_env: MarketEnvironment) -> _EnvironmentBrackets:
+        index = self._indexes.get(market_env)
+        if index is None:
+            index = self._indexes[market_env] = _EnvironmentBrackets()
+        if not index.loaded:
+            index.loaded = True
+            self._load_locked(market_env, index)
+        return index
+
+    def _load_locked(self, market_env: MarketEnvironment, index: _EnvironmentBrackets) -> None:
+        path = self._path(market_env)
+        if path is None or not path.exists():
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            index.brackets = {symbol: MarginBrackets.from_dict(brackets)
+                              for symbol, brackets in data['brackets'].items()}
+            index.fetched_at = float(data['fetched_at'])
+        except (OSError, ValueError, KeyError, TypeError):
+            index.brackets, index.fetched_at = {}, 0.0  # Fichier illisible : il sera réécrit au prochain chargement
+
+    def _save_locked(self, market_env: MarketEnvironment, index: _EnvironmentBrackets) -> None:
+        path = self._path(market_env)
+        if path is None:
+            return
+        data = {'fetched_at': index.fetched_at,
+                'brackets': {symbol: brackets.to_dict() for symbol, brackets in index.brackets.items()}}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Écriture atomique : un autre processus ne lit jamais un fichier à moitié écrit.
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # Le cache disque est une optimisation ; les paliers en mémoire restent valables
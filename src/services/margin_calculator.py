@@ -0,0 +1,136 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence, Union
+import numpy as np
+from ..models.margin_brackets import MarginBrackets
+
+Leverages = Union[int, float, Sequence[float], np.ndarray]
+
+
+@dataclass
+class LadderMargin:
+    """
+    Position longue cumulée d'une échelle d'achats futures, après le remplissage de chaque niveau.
+
+    Les tableaux sont de forme (leviers, niveaux) : la ligne i correspond à ``leverages[i]``,
+    la colonne k à la position une fois les niveaux 0 à k remplis. Un prix de liquidation nul
+    signifie que la position ne peut pas être liquidée.
+    """
+    prices: np.ndarray
+    leverages: np.ndarray
+    quantity: np.ndarray
+    notional: np.ndarray
+    average_entry: np.ndarray
+    initial_margin: np.ndarray
+    maintenance_margin: np.ndarray
+    liquidation_price: np.ndarray
+    max_leverage: np.ndarray
+
+    def liquidated_before_next_level(self) -> np.ndarray:
+        """Vrai en (i, k) si la position est liquidée avant que le prix n'atteigne le niveau k + 1."""
+        unsafe = np.zeros(self.liquidation_price.shape, dtype=bool)
+        unsafe[:, :-1] = self.liquidation_price[:, :-1] >= self.prices[1:]
+        return unsafe
+
+    def first_unsafe_level(self) -> np.ndarray:
+        """Par levier, le premier niveau après lequel la position est liquidée avant le suivant, ou -1."""
+        unsafe = self.liquidated_before_next_level()
+        return np.where(unsafe.any(axis=1), unsafe.argmax(axis=1), -1)
+
+    def leverage_allowed(self) -> np.ndarray:
+        """Par levier, vrai si Binance l'accepte pour le notionnel de la position complète."""
+        return self.leverages <= self.max_leverage[:, -1]
+
+
+def _bracket_table(brackets: MarginBrackets):
+    return (np.asarray(brackets.notional_floors, dtype=float), np.asarray(brackets.notional_caps, dtype=float),
+            np.asarray(brackets.maint_margin_ratios, dtype=float), np.asarray(brackets.maint_amounts, dtype=float),
+            np.asarray(brackets.max_leverages, dtype=float))
+
+
+def ladder_margin(prices: Sequence[float], amounts: Union[Sequence[float], np.ndarray], brackets: MarginBrackets,
+                  leverage: Leverages, isolated: bool = True,
+                  wallet_balance: Optional[float] = None) -> LadderMargin:
+    """
+    Prix moyen, marges et prix de liquidation de la position après chaque niveau, pour un ou
+    plusieurs effets de levier à la fois.
+
+    Pour une position longue, la liquidation survient quand le solde ``W`` de la marge plus la
+    perte latente tombe à la marge de maintenance du palier atteint : ``P = (N - W - cum) /
+    (Q * (1 - mmr))``. Le prix est calculé pour chaque palier et celui dont l'intervalle de
+    notionnel contient ``Q * P`` est retenu. En marge isolée, ``W`` est la marge initiale de la
+    position ; en marge croisée, ``wallet_balance``, ou à défaut la marge initiale de l'échelle
+    complète (le capital engagé dans l'échelle). Les autres positions du compte sont ignorées.
+
+    Args:
+        prices: Prix des niveaux, dans l'ordre de remplissage (décroissants).
+        amounts: Quantités des niveaux, forme (niveaux,) ou (leviers, niveaux).
+        leverage: Un effet de levier ou une suite d'effets de levier.
+        isolated: Marge isolée (True) ou croisée (False).
+    """
+    prices = np.asarray(prices, dtype=float)
+    leverages = np.atleast_1d(np.asarray(leverage, dtype=float))
+    amounts = np.broadcast_to(np.asarray(amounts, dtype=float), (leverages.size, prices.size))
+    floors, caps, ratios, cums, max_leverages = _bracket_table(brackets)
+
+    quantity = np.cumsum(amounts, axis=1)
+    notional = np.cumsum(amounts * prices, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        average_entry = np.where(quantity > 0, notional / quantity, 0.0)
+    initial_margin = notional / leverages[:, None]
+    if isolated:
+        wallet = initial_margin
+    elif wallet_balance is not None:
+        wallet = np.full_like(notional, float(wallet_balance))
+    else:
+        wallet = np.broadcast_to(initial_margin[:, -1:], notional.shape)
+
+    entry_bracket = np.clip(np.searchsorted(floors, notional, side='right') - 1, 0, floors.size - 1)
+    maintenance_margin = notional * ratios[entry_bracket] - cums[entry_bracket]
+
+    # Prix de liquidation dans chaque palier : forme (leviers, niveaux, paliers).
+    with np.errstate(divide='ignore', invalid='ignore'):
+        candidates = ((notional - wallet)[..., None] - cums) / (quantity[..., None] * (1.0 - ratios))
+    notional_at_price = quantity[..., None] * candidates
+    in_bracket = (notional_at_price >= floors) & (notional_at_price < caps)
+    bracket = np.where(in_bracket.any(axis=-1), in_bracket.argmax(axis=-1), entry_bracket)
+    liquidation_price = np.take_along_axis(candidates, bracket[..., None], axis=-1)[..., 0]
+    liquidation_price = np.where(np.isfinite(liquidation_price), np.maximum(liquidation_price, 0.0), 0.0)
+
+    return LadderMargin(prices=prices, leverages=leverages, quantity=quantity, notional=notional,
+                        average_entry=average_entry, initial_margin=initial_margin,
+                        maintenance_margin=maintenance_margin, liquidation_price=liquidation_price,
+                        max_leverage=max_leverages[entry_bracket].astype(int))
+
+
+def leverage_sweep(prices: Sequence[float], base_amounts: Sequence[float], brackets: MarginBrackets,
+                   leverages: Sequence[float], isolated: bool = True,
+                   wallet_balance: Optional[float] = None) -> LadderMargin:
+    """
+    Compare plusieurs effets de levier pour une même échelle sans levier : comme l'onglet DCA,
+    chaque quantité est multipliée par le levier, la marge engagée restant la même.
+    """
+    leverages = np.atleast_1d(np.asarray(leverages, dtype=float))
+    amounts = np.asarray(base_amounts, dtype=float)[None, :] * leverages[:, None]
+    return ladder_margin(prices, amounts, brackets, leverages, isolated, wallet_balance)
+
+
+def ladder_problem(prices: Sequence[float], amounts: Sequence[float], brackets: MarginBrackets, leverage: float,
+                   isolated: bool = True, wallet_balance: Optional[float] = None) -> Optional[str]:
+    """
+    Décrit la raison pour laquelle l'échelle ne doit pas être envoyée, ou retourne None.
+
+    L'échelle est refusée si l'effet de levier dépasse le maximum du palier de la position
+    complète, ou si la position est liquidée avant que le prix n'atteigne le niveau suivant.
+    """
+    if len(prices) == 0:
+        return None
+    margin = ladder_margin(prices, amounts, brackets, leverage, isolated, wallet_balance)
+    if not margin.leverage_allowed()[0]:
+        return (f"effet de levier x{leverage:g} supérieur au maximum x{margin.max_leverage[0, -1]} autorisé "
+                f"pour un notionnel de {margin.notional[0, -1]:.2f}")
+    level = int(margin.first_unsafe_level()[0])
+    if level < 0:
+        return None
+    return (f"liquidation à {margin.liquidation_price[0, level]:.8g} après le niveau {level + 1} "
+            f"(prix moyen {margin.average_entry[0, level]:.8g}), avant le niveau {level + 2} "
+            f"à {margin.prices[level + 1]:.8g}")
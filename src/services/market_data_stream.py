@@ -0,0 +1,270 @@
+import asyncio
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+import aiohttp
+from ..models.market_environment import MarketEnvironment
+from ..models.order_state import to_market_id
+from ..models.ticker import Ticker
+from .order_book import OrderBook
+from .rate_limiter import RateLimiter
+from .user_data_stream import HEARTBEAT_INTERVAL, RECONNECT_DELAYS
+
+STREAM_BASE_URLS = {
+    MarketEnvironment.SPOT: "wss://stream.binance.com:9443/stream",
+    MarketEnvironment.FUTURES_LIVE: "wss://fstream.binance.com/stream",
+    MarketEnvironment.FUTURES_TESTNET: "wss://stream.binancefuture.com/stream",
+}
+# Profondeur de l'instantané REST ; au-delà, les niveaux ne sont connus que par le flux.
+DEPTH_SNAPSHOT_LIMIT = 1000
+# Différences conservées par symbole en attendant l'instantané.
+MAX_BUFFERED_DIFFS = 1000
+# Attente avant un nouvel instantané quand le précédent était trop ancien pour le flux.
+RESYNC_DELAY = 0.5
+
+logger = logging.getLogger(__name__)
+
+TickerListener = Callable[[Ticker], None]
+
+
+class TickerCache:
+    """
+    Derniers Ticker connus par symbole, lisibles depuis n'importe quel thread sans appel réseau.
+    Les écouteurs ne sont appelés que si le haut du carnet ou le prix de marque a changé.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tickers: Dict[str, Ticker] = {}
+        self._listeners: List[TickerListener] = []
+
+    def update(self, ticker: Ticker) -> None:
+        with self._lock:
+            previous = self._tickers.get(ticker.market_id)
+            self._tickers[ticker.market_id] = ticker
+            if previous is not None and previous.top_of_book() == ticker.top_of_book():
+                return
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(ticker)
+
+    def get(self, symbol: str) -> Optional[Ticker]:
+        """``symbol`` accepte le format ccxt ("BTC/USDT") ou Binance ("BTCUSDT")."""
+        with self._lock:
+            return self._tickers.get(to_market_id(symbol))
+
+    def discard(self, symbol: str) -> None:
+        with self._lock:
+            self._tickers.pop(to_market_id(symbol), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tickers.clear()
+
+    def subscribe(self, listener: TickerListener) -> Callable[[], None]:
+        """Ajoute un écouteur et retourne la fonction qui le retire."""
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe():
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+        return unsubscribe
+
+
+class DepthSnapshotClient:
+    """Instantané REST du carnet via les endpoints publics de ccxt (client asynchrone, sans clés)."""
+
+    def __init__(self, exchange, market_env: MarketEnvironment, rate_limiter: Optional[RateLimiter] = None,
+                 limit: int = DEPTH_SNAPSHOT_LIMIT):
+        self.exchange = exchange
+        self.market_env = market_env
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter.shared()
+        self.limit = limit
+
+    async def fetch(self, market_id: str) -> Dict[str, Any]:
+        """Retourne la réponse brute de Binance : ``lastUpdateId``, ``bids`` et ``asks``."""
+        weight = self.rate_limiter.request_weight('depth_snapshot', self.market_env)
+        await self.rate_limiter.acquire_async(self.market_env, weight=weight)
+        params = {'symbol': market_id, 'limit': self.limit}
+        if self.market_env == MarketEnvironment.SPOT:
+            return await self.exchange.publicGetDepth(params)
+        return await self.exchange.fapiPublicGetDepth(params)
+
+
+class MarketDataStream:
+    """
+    Carnets L2 locaux et tickers des symboles suivis, tenus à jour par le flux combiné
+    ``@depth@100ms`` (et ``@markPrice@1s`` en futures).
+
+    À chaque connexion, et à chaque lacune de séquence détectée, le carnet concerné est
+    rechargé depuis un instantané REST ; les différences reçues entre-temps sont mises en
+    attente puis rejouées. Après chaque différence appliquée, le Ticker du symbole est publié
+    dans ``cache``.
+    """
+
+    def __init__(self, symbols: Iterable[str], snapshots, cache: TickerCache, market_env: MarketEnvironment,
+                 ws_base_url: Optional[str] = None, reconnect_delays: Sequence[float] = RECONNECT_DELAYS,
+                 resync_delay: float = RESYNC_DELAY, on_error: Optional[Callable[[Exception], None]] = None):
+        """
+        Args:
+            symbols: Symboles suivis, au format ccxt ou Binance.
+            snapshots: Objet exposant la coroutine fetch(market_id), en pratique un DepthSnapshotClient.
+            ws_base_url: URL du flux combiné ; par défaut celle de l'environnement (STREAM_BASE_URLS).
+        """
+        self.books: Dict[str, OrderBook] = {market_id: OrderBook(market_id)
+                                            for market_id in dict.fromkeys(to_market_id(s) for s in symbols)}
+        self.snapshots = snapshots
+        self.cache = cache
+        self.market_env = market_env
+        self.ws_base_url = (ws_base_url or STREAM_BASE_URLS[market_env]).rstrip('/')
+        self.reconnect_delays = tuple(reconnect_delays) or (1.0,)
+        self.resync_delay = resync_delay
+        self.on_error = on_error
+        self._buffers: Dict[str, List[Dict[str, Any]]] = {market_id: [] for market_id in self.books}
+        self._marks: Dict[str, float] = {}
+        self._resync_tasks: Dict[str, asyncio.Task] = {}
+        self._stopping = asyncio.Event()
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self.connections = 0
+        self.resyncs = 0
+
+    @property
+    def stream_names(self) -> List[str]:
+        names = []
+        for market_id in self.books:
+            names.append(f"{market_id.lower()}@depth@100ms")
+            if self.market_env != MarketEnvironment.SPOT:
+                names.append(f"{market_id.lower()}@markPrice@1s")
+        return names
+
+    async def run(self) -> None:
+        """Consomme le flux jusqu'à stop(), en se reconnectant après chaque coupure."""
+        attempt = 0
+        while not self._stopping.is_set():
+            try:
+                await self._consume()
+                attempt = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._report(e)
+            finally:
+                self._cancel_resyncs()
+            delay = self.reconnect_delays[min(attempt, len(self.reconnect_delays) - 1)]
+            try:
+                await asyncio.wait_for(self._stopping.wait(), delay)
+            except asyncio.TimeoutError:
+                attempt += 1
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        ws = self._ws
+        if ws is not None:
+            await ws.close()
+
+    async def _consume(self) -> None:
+        url = f"{self.ws_base_url}?streams={'/'.join(self.stream_names)}"
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(url, heartbeat=HEARTBEAT_INTERVAL) as ws:
+                self._ws = ws
+                self.connections += 1
+                # Les différences manquées pendant la coupure imposent un nouvel instantané.
+                for market_id in self.books:
+                    self._buffers[market_id] = []
+                    self._start_resync(market_id)
+                try:
+                    async for message in ws:
+                        if message.type != aiohttp.WSMsgType.TEXT:
+                            break
+                        self.handle_message(message.data)
+                finally:
+                    self._ws = None
+
+    def handle_message(self, raw: str) -> None:
+        """Applique un message du flux combiné (ou d'un enregistrement rejoué) aux carnets."""
+        try:
+            event = json.loads(raw)
+        except ValueError:
+            return
+        if 'stream' in event and 'data' in event:
+            event = event['data']
+        event_type = event.get('e')
+        if event_type == 'depthUpdate':
+            self._on_depth(event)
+        elif event_type == 'markPriceUpdate' and event.get('s') in self.books:
+            self._marks[event['s']] = float(event['p'])
+            self._publish(self.books[event['s']])
+
+    def _on_depth(self, event: Dict[str, Any]) -> None:
+        market_id = event.get('s')
+        book = self.books.get(market_id)
+        if book is None:
+            return
+        if not book.synced:
+            buffer = self._buffers[market_id]
+            buffer.append(event)
+            del buffer[:-MAX_BUFFERED_DIFFS]
+            return
+        if book.apply_diff(event):
+            self._publish(book)
+            return
+        logger.info("Carnet %s : lacune de séquence avant %s, resynchronisation", market_id, event.get('U'))
+        book.reset()
+        self._buffers[market_id] = [event]
+        self._start_resync(market_id)
+
+    def _start_resync(self, market_id: str) -> None:
+        task = self._resync_tasks.get(market_id)
+        if task is not None and not task.done():
+            return
+        self.books[market_id].reset()
+        self._resync_tasks[market_id] = asyncio.create_task(self._resync(market_id))
+
+    async def _resync(self, market_id: str) -> None:
+        """Recharge le carnet depuis un instantané et rejoue les différences en attente."""
+        book = self.books[market_id]
+        while not self._stopping.is_set():
+            self.resyncs += 1
+            try:
+                snapshot = await self.snapshots.fetch(market_id)
+            except Exception as e:
+                self._report(e)
+                await asyncio.sleep(self.resync_delay)
+                continue
+            book.load_snapshot(snapshot['lastUpdateId'], snapshot.get('bids', ()), snapshot.get('asks', ()))
+            pending, self._buffers[market_id] = self._buffers[market_id], []
+            if all(book.apply_diff(event) for event in pending):
+                self._publish(book)
+                return
+            # L'instantané précède la plus ancienne différence en attente : en redemander un.
+            book.reset()
+            self._buffers[market_id] = pending[-MAX_BUFFERED_DIFFS:]
+            await asyncio.sleep(self.resync_delay)
+
+    def _cancel_resyncs(self) -> None:
+        for task in self._resync_tasks.values():
+            task.cancel()
+        self._resync_tasks.clear()
+
+    def _publish(self, book: OrderBook) -> None:
+        if not book.synced:
+            return
+        bid, ask = book.best_bid(), book.best_ask()
+        self.cache.update(Ticker(
+            market_id=book.market_id,
+            bid=bid[0] if bid else None,
+            bid_qty=bid[1] if bid else 0.0,
+            ask=ask[0] if ask else None,
+            ask_qty=ask[1] if ask else 0.0,
+            mark_price=self._marks.get(book.market_id),
+            update_id=book.last_update_id,
+            event_time=book.event_time,
+        ))
+
+    def _report(self, error: Exception) -> None:
+        logger.warning("Flux de marché %s : %s", self.market_env.name, error)
+        if self.on_error is not None:
+            self.on_error(error)
@@ -0,0 +1,206 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from ..models.market_environment import MarketEnvironment
+from ..models.symbol_rules import SymbolRules
+
+# Durée de validité de l'index d'un environnement avant rechargement.
+DEFAULT_TTL = 6 * 3600.0
+# Délai minimal entre deux chargements déclenchés par un symbole inconnu ou un échec.
+RETRY_INTERVAL = 60.0
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "binance_multiapp"
+
+
+def _positive(value: Any) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+def parse_market(market: Any, market_env: MarketEnvironment) -> Optional[Tuple[str, SymbolRules]]:
+    """
+    Extrait les filtres d'un marché ccxt (fetch_markets) pour l'environnement donné.
+
+    Les marchés futures perpétuels USDⓈ-M sont indexés par "BASE/QUOTE", le format utilisé
+    par l'application. Retourne None pour un marché d'un autre type ou illisible.
+    """
+    if not isinstance(market, dict):
+        return None
+    if market_env == MarketEnvironment.SPOT:
+        if not market.get('spot'):
+            return None
+        symbol = market.get('symbol')
+    else:
+        if not (market.get('linear') and market.get('swap')):
+            return None
+        symbol = f"{market.get('base')}/{market.get('quote')}"
+    if not symbol:
+        return None
+
+    info = market.get('info') if isinstance(market.get('info'), dict) else {}
+    filters = {f.get('filterType'): f for f in info.get('filters') or [] if isinstance(f, dict)}
+    price_filter = filters.get('PRICE_FILTER', {})
+    lot_size = filters.get('LOT_SIZE', {})
+    notional = filters.get('NOTIONAL') or filters.get('MIN_NOTIONAL') or {}
+    max_orders = filters.get('MAX_NUM_ORDERS', {})
+    precision = market.get('precision') or {}
+    limits = market.get('limits') or {}
+
+    max_num_orders = _positive(max_orders.get('maxNumOrders', max_orders.get('limit')))
+    rules = SymbolRules(
+        symbol=symbol,
+        tick_size=_positive(price_filter.get('tickSize')) or _positive(precision.get('price')),
+        min_price=_positive(price_filter.get('minPrice')) or _positive((limits.get('price') or {}).get('min')),
+        max_price=_positive(price_filter.get('maxPrice')) or _positive((limits.get('price') or {}).get('max')),
+        step_size=_positive(lot_size.get('stepSize')) or _positive(precision.get('amount')),
+        min_qty=_positive(lot_size.get('minQty')) or _positive((limits.get('amount') or {}).get('min')),
+        max_qty=_positive(lot_size.get('maxQty')) or _positive((limits.get('amount') or {}).get('max')),
+        min_notional=(_positive(notional.get('minNotional', notional.get('notional')))
+                      or _positive((limits.get('cost') or {}).get('min'))),
+        max_num_orders=int(max_num_orders) if max_num_orders else None,
+    )
+    return symbol, rules
+
+
+class _EnvironmentIndex:
+    def __init__(self):
+        self.rules: Dict[str, SymbolRules] = {}
+        self.fetched_at = 0.0
+        self.last_attempt = 0.0
+        self.loaded = False
+
+
+class MarketIndex:
+    """
+    Index local des filtres de marché (pas de prix, pas de quantité, notionnel minimum,
+    nombre maximal d'ordres), par environnement.
+
+    L'index est chargé une fois par environnement, gardé en mémoire et persisté en JSON
+    dans ``cache_dir`` : un redémarrage réutilise le fichier tant qu'il a moins de ``ttl``
+    secondes. Un rechargement fusionne les marchés reçus dans l'index existant (les
+    symboles retirés de la cote sont supprimés). Si le chargement échoue, l'index
+    périmé reste utilisé et aucun nouvel essai n'est fait avant ``RETRY_INTERVAL``.
+    """
+
+    _shared_instance: Optional['MarketIndex'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, cache_dir: Optional[Path] = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            cache_dir: Dossier des fichiers d'index, ou None pour un index uniquement en mémoire.
+            ttl: Âge maximal de l'index, en secondes.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._indexes: Dict[MarketEnvironment, _EnvironmentIndex] = {}
+
+    @classmethod
+    def shared(cls) -> 'MarketIndex':
+        """Instance unique du processus, partagée par toutes les instances de BinanceLogic."""
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    def get(self, market_env: MarketEnvironment, symbol: str) -> Optional[SymbolRules]:
+        """Filtres connus pour le symbole, sans appel réseau."""
+        with self._lock:
+            return self._index(market_env).rules.get(symbol)
+
+    def needs_refresh(self, market_env: MarketEnvironment, symbol: Optional[str] = None) -> bool:
+        """Vrai si l'index est absent, périmé ou ne connaît pas le symbole, et qu'un essai est permis."""
+        with self._lock:
+            index = self._index(market_env)
+            now = self._clock()
+            if now - index.last_attempt < RETRY_INTERVAL:
+                return False
+            stale = not index.rules or now - index.fetched_at > self.ttl
+            return stale or (symbol is not None and symbol not in index.rules)
+
+    def update(self, market_env: MarketEnvironment, markets: Iterable[Any]) -> int:
+        """
+        Remplace l'index de l'environnement par le résultat de fetch_markets et le persiste.
+        Les symboles absents de la réponse sont retirés ; une réponse vide laisse l'index intact.
+
+        Returns:
+            Le nombre de symboles ajoutés, modifiés ou supprimés par rapport à l'index précédent.
+        """
+        parsed = dict(filter(None, (parse_market(market, market_env) for market in markets)))
+        with self._lock:
+            index = self._index(market_env)
+            index.last_attempt = self._clock()
+            if not parsed:
+                return 0
+            changed = sum(1 for symbol, rules in parsed.items() if index.rules.get(symbol) != rules)
+            changed += sum(1 for symbol in index.rules if symbol not in parsed)
+            index.rules = parsed
+            index.fetched_at = index.last_attempt
+            self._save_locked(market_env, index)
+            return changed
+
+    def record_failure(self, market_env: MarketEnvironment) -> None:
+        """Note un chargement échoué pour espacer les essais suivants."""
+        with self._lock:
+            self._index(market_env).last_attempt = self._clock()
+
+    def rules(self, market_env: MarketEnvironment, symbol: str,
+              fetch_markets: Callable[[], Iterable[Any]]) -> Optional[SymbolRules]:
+        """Filtres du symbole, en rechargeant l'index via ``fetch_markets`` si nécessaire."""
+        if self.needs_refresh(market_env, symbol):
+            try:
+                self.update(market_env, fetch_markets())
+            except Exception:
+                self.record_failure(market_env)
+        return self.get(market_env, symbol)
+
+    def _path(self, market_env: MarketEnvironment) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"markets_{market_env.name.lower()}.json"
+
+    def _index(self, market_env: MarketEnvironment) -> _EnvironmentIndex:
+        index = self._indexes.get(market_env)
+        if index is None:
+            index = self._indexes[market_env] = _EnvironmentIndex()
+        if not index.loaded:
+            index.loaded = True
+            self._load_locked(market_env, index)
+        return index
+
+    def _load_locked(self, market_env: MarketEnvironment, index: _EnvironmentIndex) -> None:
+        path = self._path(market_env)
+        if path is None or not path.exists():
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            index.rules = {symbol: SymbolRules.from_dict(rules) for symbol, rules in data['rules'].items()}
+            index.fetched_at = float(data['fetched_at'])
+        except (OSError, ValueError, KeyError, TypeError):
+            index.rules, index.fetched_at = {}, 0.0  # Fichier illisible : il sera réécrit au prochain chargement
+
+    def _save_locked(self, market_env: MarketEnvironment, index: _EnvironmentIndex) -> None:
+        path = self._path(market_env)
+        if path is None:
+            return
+        data = {'fetched_at': index.fetched_at,
+                'rules': {symbol: rules.to_dict() for symbol, rules in index.rules.items()}}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Écriture atomique : un autre processus ne lit jamais un fichier à moitié écrit.
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # Le cache disque est une optimisation ; l'index en mémoire reste valable
@@ -0,0 +1,300 @@
+import functools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Durées conservées par span pour les percentiles (les plus récentes).
+DEFAULT_WINDOW = 1024
+# Fichier réécrit périodiquement au format texte Prometheus (collecteur textfile de node_exporter).
+METRICS_FILE_ENV_VAR = "BINANCE_MULTIAPP_METRICS_FILE"
+# Port local d'un endpoint HTTP /metrics au format Prometheus.
+METRICS_PORT_ENV_VAR = "BINANCE_MULTIAPP_METRICS_PORT"
+EXPORT_INTERVAL = 5.0
+METRIC_PREFIX = "binance_multiapp"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class _SpanRecord:
+    def __init__(self, window: int):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+
+@dataclass
+class SpanSummary:
+    """Agrégat d'un span : nombre d'appels, erreurs, durées totale, p50, p99 et maximale (secondes)."""
+    name: str
+    labels: Labels
+    count: int
+    errors: int
+    total: float
+    p50: float
+    p99: float
+    max: float
+
+
+class Metrics:
+    """
+    Registre des mesures du processus : spans (durées d'une section de code) et compteurs.
+
+    ``span(nom, **étiquettes)`` chronomètre un bloc ``with`` ; une exception le compte comme
+    erreur sans être interceptée. ``increment`` fait avancer un compteur (tentatives,
+    annulations, attentes du limiteur). Les lectures (``spans``, ``counters``) renvoient
+    des copies, utilisables depuis un autre thread que celui des mesures.
+    """
+
+    _shared_instance: Optional['Metrics'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, window: int = DEFAULT_WINDOW, clock: Callable[[], float] = time.perf_counter):
+        self.window = window
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._spans: Dict[Tuple[str, Labels], _SpanRecord] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+
+    @classmethod
+    def shared(cls) -> 'Metrics':
+        """Instance unique du processus, lue par le panneau de diagnostic et l'exportateur."""
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    @contextmanager
+    def span(self, name: str, **labels) -> Iterator[None]:
+        start = self._clock()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.observe(name, self._clock() - start, error=failed, **labels)
+
+    def observe(self, name: str, seconds: float, error: bool = False, **labels) -> None:
+        """Enregistre une durée mesurée ailleurs (attente du limiteur, délai de reprise)."""
+        key = (name, _labels(labels))
+        with self._lock:
+            record = self._spans.get(key)
+            if record is None:
+                record = self._spans[key] = _SpanRecord(self.window)
+            record.count += 1
+            record.errors += int(error)
+            record.total += seconds
+            record.max = max(record.max, seconds)
+            record.recent.append(seconds)
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def spans(self) -> List[SpanSummary]:
+        with self._lock:
+            items = [(key, record.count, record.errors, record.total, record.max, sorted(record.recent))
+                     for key, record in self._spans.items()]
+        return sorted((SpanSummary(name, labels, count, errors, total, _percentile(recent, 0.5),
+                                   _percentile(recent, 0.99), maximum)
+                       for (name, labels), count, errors, total, maximum, recent in items),
+                      key=lambda summary: (summary.name, summary.labels))
+
+    def counters(self) -> Dict[Tuple[str, Labels], float]:
+        with self._lock:
+            return dict(sorted(self._counters.items()))
+
+    def counter(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get((name, _labels(labels)), 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+
+def timed(name: str):
+    """Décore une méthode dont l'instance porte un attribut ``metrics`` : chaque appel est un span."""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.span(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def timed_async(name: str):
+    """Variante de ``timed`` pour les coroutines."""
+    def decorate(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            with self.metrics.span(name):
+                return await method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def render_prometheus(metrics: Metrics) -> str:
+    """Mesures au format texte d'exposition Prometheus (0.0.4)."""
+    lines = [f"# HELP {METRIC_PREFIX}_span_seconds Durée des sections instrumentées.",
+             f"# TYPE {METRIC_PREFIX}_span_seconds summary"]
+    errors = []
+    for summary in metrics.spans():
+        labels = (("span", summary.name),) + summary.labels
+        for quantile, value in (("0.5", summary.p50), ("0.99", summary.p99)):
+            lines.append(f"{METRIC_PREFIX}_span_seconds{_format_labels(labels, (('quantile', quantile),))} {value:.6f}")
+        lines.append(f"{METRIC_PREFIX}_span_seconds_sum{_format_labels(labels)} {summary.total:.6f}")
+        lines.append(f"{METRIC_PREFIX}_span_seconds_count{_format_labels(labels)} {summary.count}")
+        errors.append(f"{METRIC_PREFIX}_span_errors_total{_format_labels(labels)} {summary.errors}")
+    if errors:
+        lines += [f"# TYPE {METRIC_PREFIX}_span_errors_total counter"] + errors
+    names_seen = set()
+    for (name, labels), value in metrics.counters().items():
+        metric = f"{METRIC_PREFIX}_{name}_total"
+        if metric not in names_seen:
+            names_seen.add(metric)
+            lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """
+    Publie les mesures au format Prometheus : réécriture périodique d'un fichier local
+    (``path``) et/ou endpoint HTTP ``/metrics`` sur 127.0.0.1 (``port``, 0 pour un port libre).
+    """
+
+    def __init__(self, metrics: Optional[Metrics] = None, path: Optional[Path] = None, port: Optional[int] = None,
+                 interval: float = EXPORT_INTERVAL):
+        self.metrics = metrics if metrics is not None else Metrics.shared()
+        self.path = Path(path) if path is not None else None
+        self.port = port
+        self.interval = interval
+        self._stop = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @classmethod
+    def from_environment(cls, metrics: Optional[Metrics] = None) -> Optional['MetricsExporter']:
+        """Exportateur configuré par BINANCE_MULTIAPP_METRICS_FILE / _PORT, ou None si aucune n'est définie."""
+        path = os.environ.get(METRICS_FILE_ENV_VAR) or None
+        port = os.environ.get(METRICS_PORT_ENV_VAR) or None
+        if port is not None:
+            port = cls._parse_port(port)
+        if path is None and port is None:
+            return None
+        return cls(metrics, path=path, port=port)
+
+    @staticmethod
+    def _parse_port(value: str) -> Optional[int]:
+        """Port TCP de la variable d'environnement ; une valeur invalide est signalée puis ignorée."""
+        try:
+            port = int(value)
+        except ValueError:
+            port = -1
+        if not 0 <= port <= 65535:
+            logger.warning("%s ignorée : port invalide %r", METRICS_PORT_ENV_VAR, value)
+            return None
+        return port
+
+    def start(self) -> 'MetricsExporter':
+        if self.port is not None:
+            try:
+                self._server = ThreadingHTTPServer(("127.0.0.1", self.port), self._handler())
+            except OSError as e:
+                # Port déjà pris : seul l'endpoint HTTP est abandonné, l'export fichier continue.
+                logger.warning("Endpoint /metrics désactivé : port %s indisponible (%s)", self.port, e)
+                self.port = None
+            else:
+                self.port = self._server.server_address[1]
+                threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        if self.path is not None:
+            self._writer = threading.Thread(target=self._write_periodically, name="metrics-file", daemon=True)
+            self._writer.start()
+        return self
+
+    def stop(self) -> None:
+        """Arrête l'endpoint et écrit une dernière fois le fichier."""
+        self._stop.set()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def write(self) -> None:
+        """Remplace le fichier de façon atomique, pour qu'un lecteur ne voie jamais un fichier partiel."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        temporary.write_text(render_prometheus(self.metrics), encoding="utf-8")
+        os.replace(temporary, self.path)
+
+    def _write_safely(self) -> None:
+        try:
+            self.write()
+        except OSError as e:
+            # Disque plein, dossier supprimé... : l'écriture suivante réessaiera.
+            logger.warning("Export des mesures vers %s impossible : %s", self.path, e)
+
+    def _write_periodically(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._write_safely()
+        self._write_safely()
+
+    def _handler(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render_prometheus(metrics).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,98 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+Level = Tuple[float, float]
+
+class OrderBook:
+    """
+    Carnet L2 local d'un symbole, synchronisé selon la procédure Binance : un instantané
+    REST (``lastUpdateId``) puis les différences du flux ``@depth``.
+
+    Chaque différence doit prolonger exactement la précédente (``U == u + 1`` en spot,
+    ``pu == u`` en futures) ; sinon ``apply_diff`` refuse l'événement et le carnet doit être
+    réinitialisé depuis un nouvel instantané. Les meilleurs prix sont tenus à jour à chaque
+    différence, leur lecture est en O(1).
+    """
+
+    def __init__(self, market_id: str):
+        self.market_id = market_id
+        self.reset()
+
+    def reset(self) -> None:
+        """Vide le carnet ; il reste désynchronisé jusqu'au prochain instantané."""
+        self._bids: Dict[float, float] = {}
+        self._asks: Dict[float, float] = {}
+        self._best_bid: Optional[float] = None
+        self._best_ask: Optional[float] = None
+        self.last_update_id: Optional[int] = None
+        self.event_time = 0
+        self._awaiting_first_diff = False
+
+    @property
+    def synced(self) -> bool:
+        return self.last_update_id is not None
+
+    def load_snapshot(self, last_update_id: int, bids: Iterable[Sequence[Any]], asks: Iterable[Sequence[Any]]) -> None:
+        self.reset()
+        self._bids = {float(price): float(qty) for price, qty in bids if float(qty) > 0}
+        self._asks = {float(price): float(qty) for price, qty in asks if float(qty) > 0}
+        self._best_bid = max(self._bids) if self._bids else None
+        self._best_ask = min(self._asks) if self._asks else None
+        self.last_update_id = int(last_update_id)
+        self._awaiting_first_diff = True
+
+    def apply_diff(self, event: Dict[str, Any]) -> bool:
+        """
+        Applique un événement ``depthUpdate``. Les événements antérieurs à l'état courant sont
+        ignorés. Retourne False, sans rien modifier, si l'événement révèle une lacune de séquence.
+        """
+        if not self.synced:
+            return False
+        first_id, final_id = int(event['U']), int(event['u'])
+        if final_id <= self.last_update_id:
+            return True
+        if self._awaiting_first_diff:
+            # Le premier événement retenu doit couvrir l'identifiant qui suit l'instantané.
+            if first_id > self.last_update_id + 1:
+                return False
+        elif 'pu' in event:
+            if int(event['pu']) != self.last_update_id:
+                return False
+        elif first_id != self.last_update_id + 1:
+            return False
+
+        for price, qty in event.get('b', ()):
+            self._set_bid(float(price), float(qty))
+        for price, qty in event.get('a', ()):
+            self._set_ask(float(price), float(qty))
+        self.last_update_id = final_id
+        self.event_time = int(event.get('E') or 0)
+        self._awaiting_first_diff = False
+        return True
+
+    def _set_bid(self, price: float, qty: float) -> None:
+        if qty > 0:
+            self._bids[price] = qty
+            if self._best_bid is None or price > self._best_bid:
+                self._best_bid = price
+        elif self._bids.pop(price, None) is not None and price == self._best_bid:
+            self._best_bid = max(self._bids) if self._bids else None
+
+    def _set_ask(self, price: float, qty: float) -> None:
+        if qty > 0:
+            self._asks[price] = qty
+            if self._best_ask is None or price < self._best_ask:
+                self._best_ask = price
+        elif self._asks.pop(price, None) is not None and price == self._best_ask:
+            self._best_ask = min(self._asks) if self._asks else None
+
+    def best_bid(self) -> Optional[Level]:
+        return (self._best_bid, self._bids[self._best_bid]) if self._best_bid is not None else None
+
+    def best_ask(self) -> Optional[Level]:
+        return (self._best_ask, self._asks[self._best_ask]) if self._best_ask is not None else None
+
+    def bids(self, depth: int = 10) -> List[Level]:
+        return sorted(self._bids.items(), reverse=True)[:depth]
+
+    def asks(self, depth: int = 10) -> List[Level]:
+        return sorted(self._asks.items())[:depth]
@@ -0,0 +1,228 @@
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import astuple, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from ..models.journal_entry import (JournalEntry, ReconcileReport, STATE_ACKED, STATE_CANCELED, STATE_CLOSED,
+                                    STATE_NOT_FOUND, STATE_PENDING, UNRESOLVED_STATES)
+from ..models.market_environment import MarketEnvironment
+from .market_index import DEFAULT_CACHE_DIR
+from .retry_policy import client_order_id
+
+DEFAULT_JOURNAL_PATH = DEFAULT_CACHE_DIR / "order_journal.sqlite3"
+
+_COLUMNS = [f.name for f in fields(JournalEntry)]
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS orders (
+    intent_id TEXT PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    market_env TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    level_index INTEGER NOT NULL,
+    side TEXT NOT NULL,
+    order_type TEXT NOT NULL,
+    price REAL NOT NULL,
+    amount REAL NOT NULL,
+    state TEXT NOT NULL,
+    order_id TEXT,
+    client_order_id TEXT,
+    status TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_run ON orders (run_id);
+CREATE INDEX IF NOT EXISTS orders_unresolved ON orders (market_env, symbol) WHERE state IN ('{STATE_PENDING}', '{STATE_ACKED}');
+"""
+_UPSERT = f"INSERT OR REPLACE INTO orders ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+
+
+class OrderJournal:
+    """
+    Journal durable des ordres DCA, dans une base SQLite en mode WAL.
+
+    Chaque niveau est inscrit (``PENDING``) avant son envoi, puis mis à jour avec la
+    réponse de l'exchange. Les écritures sont regroupées : ``record`` ne fait que mettre
+    l'entrée en attente en mémoire, et ``flush`` écrit tout ce qui attend dans une seule
+    transaction. Les workers appellent ``flush`` juste avant chaque envoi, si bien qu'une
+    intention est toujours sur disque avant que l'ordre puisse exister chez l'exchange ;
+    une réponse perdue lors d'un arrêt brutal est retrouvée par ``reconcile``.
+    """
+
+    _shared_instance: Optional['OrderJournal'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: Optional[Path] = DEFAULT_JOURNAL_PATH, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            path: Fichier de la base, ou None pour un journal uniquement en mémoire.
+        """
+        self.path = Path(path) if path is not None else None
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._staged: Dict[str, tuple] = {}
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path) if self.path is not None else ":memory:",
+                                   check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # En WAL, NORMAL ne synchronise qu'aux checkpoints : une transaction coûte quelques microsecondes.
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    @classmethod
+    def shared(cls) -> 'OrderJournal':
+        """Instance unique du processus, partagée par tous les workers."""
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    @staticmethod
+    def new_run_id() -> str:
+        return uuid.uuid4().hex[:12]
+
+    def new_intent(self, run_id: str, market_env: MarketEnvironment, symbol: str, level_index: int,
+                   order: Dict[str, Any]) -> JournalEntry:
+        """
+        Crée et met en attente l'intention d'un niveau ; ``order`` est au format de place_orders_batch.
+        Sans identifiant client dans ``order``, le niveau reçoit l'identifiant déterministe du lot.
+        """
+        now = self._clock()
+        entry = JournalEntry(
+            intent_id=f"{run_id}-{level_index}", run_id=run_id, market_env=market_env.value, symbol=symbol,
+            level_index=level_index, side=order['side'], order_type=order['order_type'],
+            price=float(order.get('price') or 0.0), amount=float(order['amount']),
+            client_order_id=order.get('client_order_id') or client_order_id(run_id, level_index),
+            created_at=now, updated_at=now,
+        )
+        self.record(entry)
+        return entry
+
+    def record(self, entry: JournalEntry) -> None:
+        """Met l'état courant de l'entrée en attente d'écriture ; les états successifs sont fusionnés."""
+        entry.updated_at = self._clock()
+        row = astuple(entry)
+        with self._lock:
+            self._staged[entry.intent_id] = row
+
+    def record_all(self, entries: Iterable[JournalEntry]) -> None:
+        for entry in entries:
+            self.record(entry)
+
+    def flush(self) -> int:
+        """Écrit les entrées en attente dans une transaction. Retourne le nombre de lignes écrites."""
+        with self._lock:
+            if not self._staged:
+                return 0
+            staged, self._staged = self._staged, {}
+            try:
+                self._db.execute("BEGIN")
+                self._db.executemany(_UPSERT, list(staged.values()))
+                self._db.execute("COMMIT")
+            except sqlite3.Error:
+                self._db.execute("ROLLBACK")
+                self._staged = {**staged, **self._staged}
+                raise
+            return len(staged)
+
+    def _query(self, where: str, params: Iterable[Any] = ()) -> List[JournalEntry]:
+        self.flush()
+        with self._lock:
+            rows = self._db.execute(f"SELECT {', '.join(_COLUMNS)} FROM orders WHERE {where} "
+                                    f"ORDER BY created_at, level_index", tuple(params)).fetchall()
+        return [JournalEntry(*row) for row in rows]
+
+    def run_entries(self, run_id: str) -> List[JournalEntry]:
+        return self._query("run_id = ?", (run_id,))
+
+    def placed(self, run_id: str) -> List[JournalEntry]:
+        """Ordres du lot acceptés par l'exchange et pas encore annulés, dans l'ordre des niveaux."""
+        return self._query("run_id = ? AND state = ?", (run_id, STATE_ACKED))
+
+    def unresolved(self, market_env: MarketEnvironment, symbol: Optional[str] = None) -> List[JournalEntry]:
+        """Entrées dont l'état chez l'exchange reste à confirmer (en attente de réponse ou ouvertes)."""
+        states = tuple(sorted(UNRESOLVED_STATES))
+        where = f"market_env = ? AND state IN ({', '.join('?' * len(states))})"
+        params: List[Any] = [market_env.value, *states]
+        if symbol is not None:
+            where += " AND symbol = ?"
+            params.append(symbol)
+        return self._query(where, params)
+
+    def mark_cancelled(self, run_id: str, order_ids: Iterable[str]) -> None:
+        cancelled = {str(order_id) for order_id in order_ids}
+        for entry in self.placed(run_id):
+            if entry.order_id in cancelled:
+                entry.state = STATE_CANCELED
+                self.record(entry)
+        self.flush()
+
+    @staticmethod
+    def _open_by_client_id(open_orders: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        return {str(order['clientOrderId']): order for order in open_orders if order.get('clientOrderId')}
+
+    def lookups_needed(self, market_env: MarketEnvironment, symbol: str,
+                       open_orders: List[Dict[str, Any]]) -> List[str]:
+        """
+        Identifiants clients des intentions sans réponse qui ne figurent pas parmi les ordres
+        ouverts : l'ordre a pu être exécuté ou annulé, il faut le chercher par son identifiant.
+        """
+        open_by_client = self._open_by_client_id(open_orders)
+        return [entry.client_order_id for entry in self.unresolved(market_env, symbol)
+                if entry.state == STATE_PENDING and entry.client_order_id
+                and entry.client_order_id not in open_by_client]
+
+    def reconcile(self, market_env: MarketEnvironment, symbol: str, open_orders: List[Dict[str, Any]],
+                  looked_up: Optional[Dict[str, Optional[Dict[str, Any]]]] = None) -> ReconcileReport:
+        """
+        Confronte les entrées non résolues du symbole à ses ordres ouverts (réponse de fetch_open_orders).
+
+        Un ordre accepté absent des ordres ouverts est terminé. Une intention sans réponse n'est
+        rattachée qu'à l'ordre de même identifiant client : parmi les ordres ouverts, sinon dans
+        ``looked_up`` (résultat de la recherche par identifiant des ``lookups_needed``, None si
+        l'exchange ne connaît pas l'ordre). Une intention absente de ``looked_up`` (recherche
+        impossible) reste en attente pour la prochaine réconciliation.
+        """
+        report = ReconcileReport(symbol=symbol)
+        looked_up = looked_up or {}
+        open_ids = {str(order.get('id')) for order in open_orders}
+        open_by_client = self._open_by_client_id(open_orders)
+
+        for entry in self.unresolved(market_env, symbol):
+            if entry.state == STATE_ACKED:
+                if entry.order_id in open_ids:
+                    report.still_open.append(entry)
+                else:
+                    entry.state = STATE_CLOSED
+                    report.closed.append(entry)
+                    self.record(entry)
+                continue
+
+            client_id = entry.client_order_id
+            if client_id in open_by_client:
+                entry.acknowledge(open_by_client[client_id])
+                report.still_open.append(entry)
+            elif client_id and client_id not in looked_up:
+                continue
+            elif client_id and looked_up[client_id] is not None:
+                entry.acknowledge(looked_up[client_id])
+                if entry.status == 'open':
+                    report.still_open.append(entry)
+                else:
+                    entry.state = STATE_CLOSED
+                    report.closed.append(entry)
+            else:
+                entry.state = STATE_NOT_FOUND
+                report.not_found.append(entry)
+            self.record(entry)
+
+        self.flush()
+        return report
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,69 @@
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from ..models.order_state import OrderState, to_market_id
+
+OrderListener = Callable[[OrderState], None]
+
+class OrderStateStore:
+    """
+    État local des ordres et des soldes, alimenté par le flux utilisateur.
+
+    Les lectures ne font aucun appel réseau. Les écouteurs sont appelés, dans le thread
+    qui applique la mise à jour, pour chaque état qui remplace effectivement le précédent.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._orders: Dict[Tuple[str, str], OrderState] = {}
+        self._by_client_id: Dict[str, Tuple[str, str]] = {}
+        self._balances: Dict[str, float] = {}
+        self._listeners: List[OrderListener] = []
+
+    def apply(self, state: OrderState) -> bool:
+        """Enregistre l'état s'il est plus récent que celui connu. Retourne True s'il a été retenu."""
+        with self._lock:
+            previous = self._orders.get(state.key)
+            if previous is not None and not state.supersedes(previous):
+                return False
+            self._orders[state.key] = state
+            if state.client_order_id:
+                self._by_client_id[state.client_order_id] = state.key
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(state)
+        return True
+
+    def get(self, symbol: str, order_id) -> Optional[OrderState]:
+        """État d'un ordre ; ``symbol`` accepte le format ccxt ("BTC/USDT") ou Binance ("BTCUSDT")."""
+        with self._lock:
+            return self._orders.get((to_market_id(symbol), str(order_id)))
+
+    def by_client_id(self, client_order_id: str) -> Optional[OrderState]:
+        with self._lock:
+            key = self._by_client_id.get(client_order_id)
+            return self._orders.get(key) if key else None
+
+    def open_orders(self, symbol: Optional[str] = None) -> List[OrderState]:
+        market_id = to_market_id(symbol) if symbol else None
+        with self._lock:
+            return [state for state in self._orders.values()
+                    if not state.is_terminal and (market_id is None or state.market_id == market_id)]
+
+    def update_balances(self, balances: Dict[str, float]) -> None:
+        with self._lock:
+            self._balances.update(balances)
+
+    def balance(self, asset: str) -> Optional[float]:
+        with self._lock:
+            return self._balances.get(asset)
+
+    def subscribe(self, listener: OrderListener) -> Callable[[], None]:
+        """Ajoute un écouteur et retourne la fonction qui le retire."""
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe():
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+        return unsubscribe
@@ -0,0 +1,236 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, List, Mapping, Optional
+from ..models.market_environment import MarketEnvironment
+
+# Part de chaque limite Binance que l'application s'autorise à consommer.
+DEFAULT_HEADROOM = 0.9
+
+# Limites publiées par Binance : (type, capacité, fenêtre en secondes, en-tête de réponse).
+_SPOT_LIMITS = [
+    ('weight', 6000, 60, 'x-mbx-used-weight-1m'),
+    ('orders', 100, 10, 'x-mbx-order-count-10s'),
+]
+_FUTURES_LIMITS = [
+    ('weight', 2400, 60, 'x-mbx-used-weight-1m'),
+    ('orders', 300, 10, 'x-mbx-order-count-10s'),
+    ('orders', 1200, 60, 'x-mbx-order-count-1m'),
+]
+BINANCE_LIMITS = {
+    MarketEnvironment.SPOT: _SPOT_LIMITS,
+    MarketEnvironment.FUTURES_LIVE: _FUTURES_LIMITS,
+    MarketEnvironment.FUTURES_TESTNET: _FUTURES_LIMITS,
+}
+
+# Poids des appels ccxt utilisés par BinanceLogic : (spot, futures).
+REQUEST_WEIGHTS = {
+    'fetch_balance': (20, 5),
+    'create_order': (1, 1),
+    'create_orders': (5, 5),
+    'set_margin_mode': (1, 1),
+    'set_leverage': (1, 1),
+    'position_risk': (1, 5),
+    'leverage_bracket': (1, 1),
+    'cancel_order': (1, 1),
+    'cancel_orders': (1, 1),
+    'fetch_open_orders': (6, 1),
+    'fetch_order': (4, 1),
+    'fetch_markets': (20, 1),
+    'listen_key': (2, 1),
+    'depth_snapshot': (50, 20),
+}
+
+
+class RateLimitTimeoutError(Exception):
+    """Levée quand le budget ne se libère pas avant le délai demandé."""
+    pass
+
+
+class _Window:
+    """Compteur d'une limite Binance sur une fenêtre fixe alignée sur l'horloge."""
+
+    def __init__(self, kind: str, capacity: int, interval: float, header: str, headroom: float):
+        self.kind = kind
+        self.capacity = max(1, int(capacity * headroom))
+        self.interval = interval
+        self.header = header
+        self.window_start = 0.0
+        self.used = 0
+
+    def roll(self, now: float) -> None:
+        start = now - (now % self.interval)
+        if start != self.window_start:
+            self.window_start = start
+            self.used = 0
+
+    def delay_for(self, now: float, cost: int) -> float:
+        """Secondes à attendre avant de pouvoir consommer ``cost`` dans cette fenêtre."""
+        self.roll(now)
+        if cost <= 0 or self.used + min(cost, self.capacity) <= self.capacity:
+            return 0.0
+        return self.window_start + self.interval - now
+
+
+class _EnvironmentBudget:
+    def __init__(self, limits, headroom: float):
+        self.windows: List[_Window] = [_Window(*limit, headroom=headroom) for limit in limits]
+        self.blocked_until = 0.0
+
+    def delay_for(self, now: float, weight: int, orders: int) -> float:
+        delay = max(0.0, self.blocked_until - now)
+        for window in self.windows:
+            cost = weight if window.kind == 'weight' else orders
+            delay = max(delay, window.delay_for(now, cost))
+        return delay
+
+    def commit(self, weight: int, orders: int) -> None:
+        for window in self.windows:
+            window.used += weight if window.kind == 'weight' else orders
+
+
+class RateLimiter:
+    """
+    Budget de requêtes partagé par tous les workers, par environnement de marché.
+
+    Suit le poids des requêtes et le nombre d'ordres sur les mêmes fenêtres que
+    Binance (poids par minute, ordres par 10 s et par minute en futures).
+    ``acquire`` bloque uniquement quand une fenêtre est pleine, jusqu'à sa
+    réinitialisation. Les compteurs sont recalés après chaque réponse sur les
+    en-têtes ``X-MBX-USED-WEIGHT-*`` et ``X-MBX-ORDER-COUNT-*``, qui incluent
+    les requêtes des autres clients partageant l'IP, et un ``Retry-After``
+    (réponses 429/418) suspend l'environnement pour la durée demandée.
+    """
+
+    _shared_instance: Optional['RateLimiter'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self,
+                 limits: Optional[Dict[MarketEnvironment, list]] = None,
+                 headroom: float = DEFAULT_HEADROOM,
+                 clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        self._limits = limits if limits is not None else BINANCE_LIMITS
+        self._headroom = headroom
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._budgets: Dict[MarketEnvironment, _EnvironmentBudget] = {}
+
+    @classmethod
+    def shared(cls) -> 'RateLimiter':
+        """Instance unique du processus, partagée par toutes les instances de BinanceLogic."""
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    @staticmethod
+    def request_weight(operation: str, market_env: MarketEnvironment) -> int:
+        """Poids Binance d'une opération ccxt (1 si inconnue)."""
+        spot_weight, futures_weight = REQUEST_WEIGHTS.get(operation, (1, 1))
+        return spot_weight if market_env == MarketEnvironment.SPOT else futures_weight
+
+    def acquire(self, market_env: MarketEnvironment, weight: int = 1, orders: int = 0,
+                timeout: Optional[float] = None) -> float:
+        """
+        Réserve ``weight`` de poids et ``orders`` ordres dans le budget de l'environnement.
+
+        Returns:
+            Le temps passé à attendre, en secondes.
+
+        Raises:
+            RateLimitTimeoutError: Si l'attente dépasserait ``timeout`` secondes.
+        """
+        waited = 0.0
+        while True:
+            delay = self.try_acquire(market_env, weight, orders)
+            if delay <= 0:
+                return waited
+            self._check_timeout(market_env, waited + delay, timeout)
+            self._sleep(delay)
+            waited += delay
+
+    async def acquire_async(self, market_env: MarketEnvironment, weight: int = 1, orders: int = 0,
+                            timeout: Optional[float] = None) -> float:
+        """
+        Variante de ``acquire`` pour les coroutines : l'attente se fait avec ``asyncio.sleep``
+        et ne bloque pas la boucle d'événements. Le budget est le même que pour ``acquire``.
+        """
+        waited = 0.0
+        while True:
+            delay = self.try_acquire(market_env, weight, orders)
+            if delay <= 0:
+                return waited
+            self._check_timeout(market_env, waited + delay, timeout)
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def try_acquire(self, market_env: MarketEnvironment, weight: int = 1, orders: int = 0) -> float:
+        """
+        Réserve le budget s'il est disponible immédiatement, sans attendre.
+
+        Returns:
+            0 si la réservation est faite, sinon le délai en secondes avant de réessayer.
+        """
+        with self._lock:
+            budget = self._budget(market_env)
+            delay = budget.delay_for(self._clock(), weight, orders)
+            if delay <= 0:
+                budget.commit(weight, orders)
+                return 0.0
+            return delay
+
+    @staticmethod
+    def _check_timeout(market_env: MarketEnvironment, total_wait: float, timeout: Optional[float]) -> None:
+        if timeout is not None and total_wait > timeout:
+            raise RateLimitTimeoutError(
+                f"Rate limit budget for {market_env.value} not available within {timeout:.1f}s")
+
+    def update_from_headers(self, market_env: MarketEnvironment, headers: Optional[Mapping]) -> None:
+        """Recale les compteurs sur les en-têtes d'une réponse Binance."""
+        if not isinstance(headers, Mapping):
+            return
+        lowered = {str(key).lower(): value for key, value in headers.items()}
+        with self._lock:
+            now = self._clock()
+            budget = self._budget(market_env)
+            for window in budget.windows:
+                value = self._parse_number(lowered.get(window.header))
+                if value is not None:
+                    window.roll(now)
+                    window.used = max(window.used, int(value))
+            retry_after = self._parse_number(lowered.get('retry-after'))
+            if retry_after is not None:
+                budget.blocked_until = max(budget.blocked_until, now + retry_after)
+
+    def block(self, market_env: MarketEnvironment, seconds: float) -> None:
+        """Suspend toutes les requêtes de l'environnement pendant ``seconds`` secondes."""
+        with self._lock:
+            budget = self._budget(market_env)
+            budget.blocked_until = max(budget.blocked_until, self._clock() + seconds)
+
+    def usage(self, market_env: MarketEnvironment) -> Dict[str, int]:
+        """Consommation courante par en-tête de limite, pour le diagnostic."""
+        with self._lock:
+            now = self._clock()
+            usage = {}
+            for window in self._budget(market_env).windows:
+                window.roll(now)
+                usage[window.header] = window.used
+            return usage
+
+    def _budget(self, market_env: MarketEnvironment) -> _EnvironmentBudget:
+        budget = self._budgets.get(market_env)
+        if budget is None:
+            budget = self._budgets[market_env] = _EnvironmentBudget(self._limits[market_env], self._headroom)
+        return budget
+
+    @staticmethod
+    def _parse_number(value) -> Optional[float]:
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
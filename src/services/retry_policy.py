@@ -0,0 +1,48 @@
+import random
+from typing import Callable
+
+# Nombre de nouvelles tentatives après un échec réseau, et bornes du délai d'attente (secondes).
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BASE_DELAY = 0.25
+DEFAULT_MAX_DELAY = 4.0
+
+# Binance accepte au plus 36 caractères parmi [.A-Z:/a-z0-9_-] pour newClientOrderId.
+CLIENT_ORDER_ID_PREFIX = "dca"
+MAX_CLIENT_ORDER_ID_LENGTH = 36
+
+
+def client_order_id(run_id: str, level_index: int) -> str:
+    """
+    Identifiant client déterministe d'un niveau DCA : le même niveau d'un même lot porte
+    toujours le même identifiant, ce qui permet de le retrouver chez l'exchange après un
+    délai d'attente dépassé, et à Binance de refuser un doublon.
+    """
+    value = f"{CLIENT_ORDER_ID_PREFIX}-{run_id}-{level_index}"
+    if len(value) > MAX_CLIENT_ORDER_ID_LENGTH:
+        raise ValueError(f"client order id too long: {value}")
+    return value
+
+
+class RetryPolicy:
+    """
+    Backoff exponentiel avec gigue complète (« full jitter ») : avant la tentative
+    ``n`` on attend un délai tiré uniformément dans ``[0, min(max_delay, base_delay * 2**n)]``.
+    La gigue évite que plusieurs workers interrompus par la même coupure ne relancent
+    leurs requêtes au même instant.
+    """
+
+    def __init__(self, max_retries: int = DEFAULT_MAX_RETRIES, base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY, rng: Callable[[], float] = random.random):
+        self.max_retries = max(0, max_retries)
+        self.base_delay = max(0.0, base_delay)
+        self.max_delay = max(0.0, max_delay)
+        self._rng = rng
+
+    def allows(self, attempt: int) -> bool:
+        """Vrai si une ``attempt``-ième nouvelle tentative (à partir de 0) est encore permise."""
+        return attempt < self.max_retries
+
+    def delay(self, attempt: int) -> float:
+        """Délai à attendre avant la nouvelle tentative numéro ``attempt`` (à partir de 0)."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return self._rng() * ceiling
@@ -0,0 +1,229 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+import aiohttp
+from ..models.market_environment import MarketEnvironment
+from ..models.order_state import OrderState
+from .order_store import OrderStateStore
+from .rate_limiter import RateLimiter
+
+WS_BASE_URLS = {
+    MarketEnvironment.SPOT: "wss://stream.binance.com:9443/ws",
+    MarketEnvironment.FUTURES_LIVE: "wss://fstream.binance.com/ws",
+    MarketEnvironment.FUTURES_TESTNET: "wss://stream.binancefuture.com/ws",
+}
+# Binance ferme la listenKey après 60 minutes sans keepalive.
+KEEPALIVE_INTERVAL = 30 * 60.0
+# Ping WebSocket côté client, pour détecter une connexion morte sans attendre le TCP.
+HEARTBEAT_INTERVAL = 20.0
+# Attente avant chaque reconnexion successive ; la dernière valeur est répétée.
+RECONNECT_DELAYS = (0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+
+logger = logging.getLogger(__name__)
+
+
+class ListenKeyClient:
+    """Création, prolongation et fermeture de la listenKey via les endpoints REST de ccxt (client asynchrone)."""
+
+    def __init__(self, exchange, market_env: MarketEnvironment, rate_limiter: Optional[RateLimiter] = None):
+        self.exchange = exchange
+        self.market_env = market_env
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter.shared()
+
+    async def _call(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        weight = self.rate_limiter.request_weight('listen_key', self.market_env)
+        await self.rate_limiter.acquire_async(self.market_env, weight=weight)
+        return await getattr(self.exchange, method)(params or {})
+
+    async def create(self) -> str:
+        if self.market_env == MarketEnvironment.SPOT:
+            response = await self._call('publicPostUserDataStream')
+        else:
+            response = await self._call('fapiPrivatePostListenKey')
+        return response['listenKey']
+
+    async def keepalive(self, listen_key: str) -> None:
+        if self.market_env == MarketEnvironment.SPOT:
+            await self._call('publicPutUserDataStream', {'listenKey': listen_key})
+        else:
+            await self._call('fapiPrivatePutListenKey')
+
+    async def close(self, listen_key: str) -> None:
+        if self.market_env == MarketEnvironment.SPOT:
+            await self._call('publicDeleteUserDataStream', {'listenKey': listen_key})
+        else:
+            await self._call('fapiPrivateDeleteListenKey')
+
+
+def _average_price(cumulative_quote: Any, filled: float) -> Optional[float]:
+    try:
+        return float(cumulative_quote) / filled if filled > 0 else None
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_order_event(event: Dict[str, Any], received_at_ms: float) -> Optional[OrderState]:
+    """
+    Convertit un executionReport (spot) ou un ORDER_TRADE_UPDATE (futures) en OrderState.
+    La latence est l'écart entre l'horodatage de l'événement et sa réception ; elle inclut
+    le décalage d'horloge avec Binance.
+    """
+    event_type = event.get('e')
+    if event_type == 'executionReport':
+        order = event
+        filled = float(order.get('z', 0.0))
+        average_price = _average_price(order.get('Z'), filled)
+        # Pour une annulation, 'C' porte l'identifiant client d'origine de l'ordre.
+        client_order_id = order.get('C') or order.get('c', '')
+    elif event_type == 'ORDER_TRADE_UPDATE':
+        order = event.get('o', {})
+        filled = float(order.get('z', 0.0))
+        average_price = float(order.get('ap', 0.0)) or None
+        client_order_id = order.get('c', '')
+    else:
+        return None
+
+    event_time = event.get('E')
+    return OrderState(
+        market_id=order['s'],
+        order_id=str(order['i']),
+        client_order_id=client_order_id,
+        side=order.get('S', ''),
+        status=order.get('X', ''),
+        price=float(order.get('p', 0.0)),
+        amount=float(order.get('q', 0.0)),
+        filled=filled,
+        average_price=average_price,
+        update_time=int(order.get('T') or event_time or 0),
+        latency_ms=received_at_ms - event_time if event_time else None,
+    )
+
+
+def parse_balance_event(event: Dict[str, Any]) -> Dict[str, float]:
+    """Soldes d'un outboundAccountPosition (spot : libre + bloqué) ou d'un ACCOUNT_UPDATE (futures : wallet)."""
+    event_type = event.get('e')
+    if event_type == 'outboundAccountPosition':
+        return {b['a']: float(b['f']) + float(b['l']) for b in event.get('B', [])}
+    if event_type == 'ACCOUNT_UPDATE':
+        return {b['a']: float(b['wb']) for b in event.get('a', {}).get('B', [])}
+    return {}
+
+
+class UserDataStream:
+    """
+    Flux utilisateur Binance (ordres et soldes) consommé par WebSocket.
+
+    La listenKey est créée puis prolongée toutes les ``keepalive_interval`` secondes ;
+    chaque événement d'ordre ou de solde met à jour ``store``. Après une déconnexion ou une
+    expiration de la clé, une nouvelle clé est obtenue et la connexion rétablie, avec une
+    attente croissante (``reconnect_delays``). Aucun appel REST n'est fait par ordre.
+    """
+
+    def __init__(self, listen_keys, store: OrderStateStore, market_env: MarketEnvironment,
+                 ws_base_url: Optional[str] = None, keepalive_interval: float = KEEPALIVE_INTERVAL,
+                 reconnect_delays: Sequence[float] = RECONNECT_DELAYS,
+                 on_error: Optional[Callable[[Exception], None]] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            listen_keys: Objet exposant les coroutines create(), keepalive(key) et close(key),
+                         en pratique un ListenKeyClient.
+            ws_base_url: URL de base du flux ; par défaut celle de l'environnement (WS_BASE_URLS).
+        """
+        self.listen_keys = listen_keys
+        self.store = store
+        self.market_env = market_env
+        self.ws_base_url = (ws_base_url or WS_BASE_URLS[market_env]).rstrip('/')
+        self.keepalive_interval = keepalive_interval
+        self.reconnect_delays = tuple(reconnect_delays) or (1.0,)
+        self.on_error = on_error
+        self._clock = clock
+        self._stopping = asyncio.Event()
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self.connected = asyncio.Event()
+        self.connections = 0
+
+    async def run(self) -> None:
+        """Consomme le flux jusqu'à stop(), en se reconnectant après chaque coupure."""
+        attempt = 0
+        while not self._stopping.is_set():
+            try:
+                listen_key = await self.listen_keys.create()
+                if await self._consume(listen_key):
+                    attempt = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._report(e)
+            delay = self.reconnect_delays[min(attempt, len(self.reconnect_delays) - 1)]
+            try:
+                await asyncio.wait_for(self._stopping.wait(), delay)
+            except asyncio.TimeoutError:
+                attempt += 1
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        ws = self._ws
+        if ws is not None:
+            await ws.close()
+
+    async def _consume(self, listen_key: str) -> bool:
+        """Lit le flux d'une listenKey jusqu'à la coupure ou l'expiration. Retourne True si la connexion a abouti."""
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(f"{self.ws_base_url}/{listen_key}", heartbeat=HEARTBEAT_INTERVAL) as ws:
+                self._ws = ws
+                self.connections += 1
+                self.connected.set()
+                keepalive = asyncio.create_task(self._keepalive(listen_key))
+                try:
+                    async for message in ws:
+                        if message.type != aiohttp.WSMsgType.TEXT:
+                            break
+                        if not self._handle(message.data):
+                            break
+                finally:
+                    keepalive.cancel()
+                    self.connected.clear()
+                    self._ws = None
+        if self._stopping.is_set():
+            try:
+                await self.listen_keys.close(listen_key)
+            except Exception as e:
+                self._report(e)
+        return True
+
+    async def _keepalive(self, listen_key: str) -> None:
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            try:
+                await self.listen_keys.keepalive(listen_key)
+            except Exception as e:
+                self._report(e)
+
+    def _handle(self, raw: str) -> bool:
+        """Applique un message au store. Retourne False si la listenKey a expiré."""
+        received_at_ms = self._clock() * 1000.0
+        try:
+            event = json.loads(raw)
+        except ValueError:
+            return True
+        if 'stream' in event and 'data' in event:
+            event = event['data']  # Format des flux combinés (/stream?streams=...)
+        if event.get('e') == 'listenKeyExpired':
+            return False
+
+        state = parse_order_event(event, received_at_ms)
+        if state is not None:
+            self.store.apply(state)
+            return True
+        balances = parse_balance_event(event)
+        if balances:
+            self.store.update_balances(balances)
+        return True
+
+    def _report(self, error: Exception) -> None:
+        logger.warning("Flux utilisateur %s : %s", self.market_env.name, error)
+        if self.on_error is not None:
+            self.on_error(error)
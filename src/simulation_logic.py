@@ -1,23 +1,67 @@
 import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+import numpy as np
 from .constants import error_messages
 
-class SimulationError(ValueError):
-    """Custom exception for simulation errors."""
-    pass
+# Plafond de sécurité sur le nombre de niveaux (hors niveau catastrophique final).
+MAX_ITERATIONS_CAP = 1000
+# En dessous de ce prix, l'échelle s'arrête même si le seuil catastrophique n'est pas atteint.
+PRIX_MINIMUM = 0.00000001
+# Nombre de jeux de paramètres dont le résultat est gardé par SimulationCache.
+TAILLE_CACHE_SIMULATION = 64
+# Chiffres significatifs conservés dans la clé : "40", "40.0" et "4e1" désignent la même simulation.
+CHIFFRES_CLE = 12
 
-def calculer_iterations(balance: float, prix_entree: float, prix_catastrophique: float, drop_percent: float) -> dict:
-    """
-    Calcule le nombre d'itérations possibles avec un drop de prix.
+# Espacement des prix : baisse de drop % du niveau précédent, baisse fixe de drop % du prix
+# d'entrée, ou baisse de drop % multipliée par ``acceleration`` à chaque niveau.
+ESPACEMENT_GEOMETRIQUE = "geometrique"
+ESPACEMENT_LINEAIRE = "lineaire"
+ESPACEMENT_ACCELERE = "accelere"
+ESPACEMENTS = (ESPACEMENT_GEOMETRIQUE, ESPACEMENT_LINEAIRE, ESPACEMENT_ACCELERE)
 
-    Args:
-        balance: Le montant total disponible
-        prix_entree: Le prix de départ
-        prix_catastrophique: Le prix limite (seuil d'arrêt)
-        drop_percent: Le pourcentage de drop à chaque itération (e.g., 50 for 50%)
+# Répartition de la balance : montants égaux, multipliés par ``multiplicateur`` à chaque niveau,
+# augmentés de (multiplicateur - 1) fois le premier montant à chaque niveau, ou courbe de poids libre.
+REPARTITION_EGALE = "egale"
+REPARTITION_MARTINGALE = "martingale"
+REPARTITION_LINEAIRE = "lineaire"
+REPARTITION_PERSONNALISEE = "personnalisee"
+REPARTITIONS = (REPARTITION_EGALE, REPARTITION_MARTINGALE, REPARTITION_LINEAIRE, REPARTITION_PERSONNALISEE)
+# Répartitions dont le multiplicateur peut être déduit du montant du premier niveau.
+REPARTITIONS_RESOLUBLES = (REPARTITION_MARTINGALE, REPARTITION_LINEAIRE)
 
-    Returns:
-        A dictionary containing the simulation results or raises SimulationError.
+@dataclass(frozen=True)
+class FormeEchelle:
     """
+    Forme d'une échelle DCA : espacement des prix et répartition de la balance entre les niveaux.
+
+    Si ``montant_initial`` est donné, ``multiplicateur`` est ignoré et remplacé par celui qui
+    investit exactement la balance au niveau catastrophique (voir resoudre_multiplicateur).
+    ``poids`` est la courbe de REPARTITION_PERSONNALISEE, interpolée sur le nombre de niveaux.
+    La forme par défaut est l'échelle historique : prix géométriques, montants égaux.
+    """
+    espacement: str = ESPACEMENT_GEOMETRIQUE
+    acceleration: float = 1.0
+    repartition: str = REPARTITION_EGALE
+    multiplicateur: float = 1.0
+    montant_initial: Optional[float] = None
+    poids: Tuple[float, ...] = ()
+
+    @property
+    def est_uniforme(self) -> bool:
+        return self.espacement == ESPACEMENT_GEOMETRIQUE and self.repartition == REPARTITION_EGALE
+
+FORME_UNIFORME = FormeEchelle()
+
+Cle = Tuple[float, float, float, float, FormeEchelle]
+
+class SimulationError(ValueError):
+    """Custom exception for simulation errors."""
+    pass
+
+def _valider_parametres(balance: float, prix_entree: float, prix_catastrophique: float, drop_percent: float):
     if balance <= 0:
         raise SimulationError(error_messages.SIM_ERROR_BALANCE_POSITIVE)
     if prix_entree <= 0:
@@ -29,109 +73,360 @@ def calculer_iterations(balance: float, prix_entree: float, prix_catastrophique:
     if not (0 < drop_percent < 100):
         raise SimulationError(error_messages.SIM_ERROR_DROP_PERCENT_RANGE)
 
-    prix_actuel = prix_entree
-    # iteration_count = 0 # Correctly count iterations passed
-    # prix_iterations = []
-    # details_text_list = []
+def _valider_forme(forme: FormeEchelle):
+    if forme.espacement not in ESPACEMENTS:
+        raise SimulationError(error_messages.SIM_ERROR_UNKNOWN_LADDER_MODE.format(mode=forme.espacement))
+    if forme.repartition not in REPARTITIONS:
+        raise SimulationError(error_messages.SIM_ERROR_UNKNOWN_LADDER_MODE.format(mode=forme.repartition))
+    if not (forme.acceleration > 0 and math.isfinite(forme.acceleration)):
+        raise SimulationError(error_messages.SIM_ERROR_ACCELERATION_POSITIVE)
+    if not (forme.multiplicateur > 0 and math.isfinite(forme.multiplicateur)):
+        raise SimulationError(error_messages.SIM_ERROR_MULTIPLIER_POSITIVE)
+    if forme.repartition == REPARTITION_PERSONNALISEE and \
+            not (forme.poids and all(p > 0 and math.isfinite(p) for p in forme.poids)):
+        raise SimulationError(error_messages.SIM_ERROR_INVALID_WEIGHTS)
+    if forme.montant_initial is not None:
+        if forme.repartition not in REPARTITIONS_RESOLUBLES:
+            raise SimulationError(error_messages.SIM_ERROR_FIRST_AMOUNT_MODE)
+        if not forme.montant_initial > 0:
+            raise SimulationError(error_messages.SIM_ERROR_FIRST_AMOUNT_POSITIVE)
 
-    # Calculer toutes les itérations
-    # Loop while current price is strictly greater than catastrophic price
-    # and also check against a max number of iterations to prevent infinite loops with tiny drops
-    max_iterations_cap = 1000 # Safety cap
+def _serie_geometrique(prix_entree: float, ratio: float, longueur: int) -> np.ndarray:
+    """
+    Retourne [p, p*r, p*r*r, ...]. Le produit cumulé est séquentiel, donc chaque terme
+    est identique à celui obtenu par multiplications successives dans une boucle.
+    """
+    termes = np.full(longueur, ratio)
+    termes[0] = prix_entree
+    return np.multiply.accumulate(termes)
 
-    # Re-thinking the loop based on the provided script's print statements:
-    # The script prints "Xème itération - Prix d'entrée: P_current", then calculates P_next.
-    # The loop condition is `while P_current > P_catastrophic`.
-    # If P_current makes the loop run, P_current is added. Then P_next is calculated.
-    # If P_next <= P_catastrophic, the original script adds *another* iteration with P_next.
+def _estimer_niveaux(prix_entree: float, seuil: float, ratio: float) -> int:
+    """Nombre de baisses nécessaires pour passer sous le seuil : ceil(log(seuil/p) / log(r))."""
+    if seuil <= 0 or seuil >= prix_entree:
+        return 1
+    return max(1, math.ceil(math.log(seuil / prix_entree) / math.log(ratio)))
 
-    # Let's simplify: the list of prices will be the entry prices for each DCA level.
-    # The number of DCA levels is the number of iterations.
+def calculer_prix_niveaux(prix_entree: float, prix_catastrophique: float, drop_percent: float) -> np.ndarray:
+    """
+    Calcule les prix d'entrée de chaque niveau de DCA sans boucle Python.
 
-    # Resetting for clearer logic based on user's script's output behavior:
-    prix_actuel = prix_entree
-    prix_iterations_for_dca = [] # Prices at which we would DCA
+    L'échelle suit p_j = p_0 * r^j avec r = 1 - drop/100. Pour le premier j >= 1 tel que
+    p_j <= prix catastrophique, p_j est inclus comme dernier niveau. Si p_j passe sous
+    PRIX_MINIMUM avant, l'échelle s'arrête à p_(j-1). Au plus MAX_ITERATIONS_CAP niveaux
+    sont générés avant le niveau catastrophique.
 
-    iteration_num = 1
-    while True:
-        if iteration_num > max_iterations_cap: # Safety break
-            # Consider raising an error or warning if max_iterations_cap is hit
-            # For now, just break, results will be based on iterations up to this point
-            break
+    Les paramètres doivent avoir été validés au préalable.
+    """
+    ratio = 1 - drop_percent / 100
+    seuil = max(prix_catastrophique, PRIX_MINIMUM)
+    # Le logarithme donne le nombre de niveaux à un arrondi près ; on génère une petite
+    # marge et on localise la frontière exacte sur le tableau.
+    longueur = min(_estimer_niveaux(prix_entree, seuil, ratio) + 2, MAX_ITERATIONS_CAP) + 1
+    prix = _serie_geometrique(prix_entree, ratio, longueur)
+    arret = (prix[1:] <= prix_catastrophique) | (prix[1:] < PRIX_MINIMUM)
+    if not arret.any() and longueur < MAX_ITERATIONS_CAP + 1:
+        prix = _serie_geometrique(prix_entree, ratio, MAX_ITERATIONS_CAP + 1)
+        arret = (prix[1:] <= prix_catastrophique) | (prix[1:] < PRIX_MINIMUM)
 
-        # This price is a potential DCA level
-        prix_iterations_for_dca.append(prix_actuel)
-        # details_text_list.append(f"Niveau {iteration_num} - Entrée à: {prix_actuel:.8f}")
+    return _couper_echelle(prix, prix_catastrophique, arret)
 
+def _couper_echelle(prix: np.ndarray, prix_catastrophique: float, arret: np.ndarray) -> np.ndarray:
+    """Applique la règle d'arrêt de calculer_prix_niveaux à des prix candidats décroissants."""
+    if not arret.any():
+        return prix[:MAX_ITERATIONS_CAP]
+    j = int(np.argmax(arret)) + 1
+    if prix[j] <= prix_catastrophique:
+        return prix[:j + 1]
+    return prix[:j]
 
-        if prix_actuel <= prix_catastrophique: # If current price is already at or below catastrophic, this is the last possible DCA
-            break
+def calculer_prix_echelle(prix_entree: float, prix_catastrophique: float, drop_percent: float,
+                          espacement: str = ESPACEMENT_GEOMETRIQUE, acceleration: float = 1.0) -> np.ndarray:
+    """
+    Prix des niveaux selon l'espacement choisi, avec la règle d'arrêt de calculer_prix_niveaux.
 
-        prix_prochain = prix_actuel * (1 - drop_percent / 100)
+    ESPACEMENT_LINEAIRE : p_j = p_0 * (1 - j * drop/100).
+    ESPACEMENT_ACCELERE : p_j = p_(j-1) * (1 - drop/100 * acceleration^(j-1)), baisse plafonnée à 100 %.
+    Un niveau sous PRIX_MINIMUM n'est jamais inclus. Les MAX_ITERATIONS_CAP + 1 prix candidats sont calculés d'un bloc, sans boucle Python.
+    """
+    if espacement == ESPACEMENT_GEOMETRIQUE:
+        return calculer_prix_niveaux(prix_entree, prix_catastrophique, drop_percent)
+    rangs = np.arange(MAX_ITERATIONS_CAP + 1, dtype=np.float64)
+    if espacement == ESPACEMENT_LINEAIRE:
+        prix = prix_entree - rangs * (prix_entree * drop_percent / 100)
+    else:
+        with np.errstate(over='ignore'):
+            baisses = drop_percent / 100 * np.power(acceleration, rangs[:-1])
+        termes = np.empty(MAX_ITERATIONS_CAP + 1)
+        termes[0] = prix_entree
+        termes[1:] = np.clip(1 - baisses, 0.0, None)
+        prix = np.multiply.accumulate(termes)
+    arret = (prix[1:] <= prix_catastrophique) | (prix[1:] < PRIX_MINIMUM)
+    prix = _couper_echelle(prix, prix_catastrophique, arret)
+    # Contrairement à la suite géométrique, ces échelles peuvent atteindre 0 : un tel niveau,
+    # qui n'achèterait rien, n'est pas gardé même avec un seuil catastrophique nul.
+    return prix[:-1] if len(prix) > 1 and prix[-1] < PRIX_MINIMUM else prix
 
-        # If the *next* price would be below catastrophic (but current is not),
-        # we should still consider the current price as a DCA level.
-        # And if that next price IS the catastrophic price or just passed it, it's also a level.
-        if prix_prochain <= prix_catastrophique and prix_actuel > prix_catastrophique:
-            # Current prix_actuel is the last one *above* catastrophic.
-            # The next one (prix_prochain) will be at or below.
-            # The user script includes this prix_prochain as a level.
-            prix_iterations_for_dca.append(prix_prochain)
-            # details_text_list.append(f"Niveau {iteration_num+1} - Entrée à: {prix_prochain:.8f} (niveau catastrophique atteint)")
-            break # Stop after adding the catastrophic level
+def calculer_poids(nombre_niveaux: int, repartition: str = REPARTITION_EGALE, multiplicateur: float = 1.0,
+                   poids: Tuple[float, ...] = ()) -> np.ndarray:
+    """
+    Poids relatifs des niveaux (le montant d'un niveau est proportionnel à son poids).
 
-        prix_actuel = prix_prochain
-        iteration_num += 1
-        if prix_actuel < 0.00000001 and prix_actuel > 0: # Avoid extremely small prices leading to too many iterations
-            if drop_percent > 0: # Only if drop_percent is causing this, not if price_catastrophic is just very low
-                 break # Safety for extreme drops close to zero
+    REPARTITION_MARTINGALE : w_j = multiplicateur^j, calculé en échelle logarithmique pour
+    rester fini sur mille niveaux. REPARTITION_LINEAIRE : w_j = 1 + (multiplicateur - 1) * j.
+    REPARTITION_PERSONNALISEE : ``poids`` répartis régulièrement du premier au dernier niveau
+    et interpolés linéairement entre eux.
+    """
+    rangs = np.arange(nombre_niveaux, dtype=np.float64)
+    if repartition == REPARTITION_MARTINGALE:
+        exposants = rangs * math.log(multiplicateur)
+        return np.exp(exposants - exposants.max())
+    if repartition == REPARTITION_LINEAIRE:
+        resultat = 1 + (multiplicateur - 1) * rangs
+        if resultat[-1] <= 0:
+            raise SimulationError(error_messages.SIM_ERROR_LINEAR_WEIGHTS)
+        return resultat
+    if repartition == REPARTITION_PERSONNALISEE:
+        courbe = np.asarray(poids, dtype=np.float64)
+        if len(courbe) == 1 or nombre_niveaux == 1:
+            return np.full(nombre_niveaux, courbe[0])
+        return np.interp(np.linspace(0, 1, nombre_niveaux), np.linspace(0, 1, len(courbe)), courbe)
+    return np.ones(nombre_niveaux)
 
+def _somme_poids(nombre_niveaux: int, repartition: str, multiplicateur: float) -> float:
+    """Somme des poids quand le premier vaut 1 (peut être infinie pour une martingale)."""
+    rangs = np.arange(nombre_niveaux, dtype=np.float64)
+    if repartition == REPARTITION_MARTINGALE:
+        with np.errstate(over='ignore'):
+            return float(np.power(multiplicateur, rangs).sum())
+    return float((1 + (multiplicateur - 1) * rangs).sum())
 
-    nombre_total_iterations = len(prix_iterations_for_dca)
+def resoudre_multiplicateur(balance: float, montant_initial: float, nombre_niveaux: int,
+                            repartition: str = REPARTITION_MARTINGALE) -> float:
+    """
+    Multiplicateur pour lequel un premier niveau de ``montant_initial`` et les suivants,
+    jusqu'au niveau catastrophique, totalisent exactement ``balance``.
 
-    if nombre_total_iterations == 0:
-        # This case should be caught by "prix_entree <= prix_catastrophique" earlier,
-        # but as a safeguard:
+    La somme des poids croît avec le multiplicateur : il est obtenu par dichotomie, jusqu'à
+    ce que l'intervalle ne puisse plus être réduit en flottants. Le multiplicateur renvoyé
+    est la borne haute, qui garde des poids tous positifs.
+
+    Raises:
+        SimulationError: si aucun multiplicateur ne convient (montant trop grand pour la
+            balance, ou trop petit pour une répartition linéaire aux poids positifs).
+    """
+    cible = balance / montant_initial
+    if nombre_niveaux == 1:
+        if math.isclose(cible, 1.0):
+            return 1.0
+        raise SimulationError(error_messages.SIM_ERROR_FIRST_AMOUNT_UNREACHABLE)
+    # Borne basse exclue : poids nuls au-delà du premier (martingale) ou au dernier niveau (linéaire).
+    bas = 0.0 if repartition == REPARTITION_MARTINGALE else 1 - 1 / (nombre_niveaux - 1)
+    if _somme_poids(nombre_niveaux, repartition, bas) >= cible:
+        raise SimulationError(error_messages.SIM_ERROR_FIRST_AMOUNT_UNREACHABLE)
+    haut = max(2.0, bas + 1)
+    while _somme_poids(nombre_niveaux, repartition, haut) < cible:
+        bas, haut = haut, haut * 2
+    while True:
+        milieu = (bas + haut) / 2
+        if milieu <= bas or milieu >= haut:
+            return haut
+        if _somme_poids(nombre_niveaux, repartition, milieu) < cible:
+            bas = milieu
+        else:
+            haut = milieu
+
+def calculer_niveaux(balance: float, prix_entree: float, prix_catastrophique: float,
+                     drop_percent: float) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Cœur de calcul vectorisé, destiné aux appels répétés (balayages de paramètres).
+
+    Returns:
+        (prix, quantites, montant_par_iteration) où prix et quantites sont des tableaux NumPy.
+    """
+    _valider_parametres(balance, prix_entree, prix_catastrophique, drop_percent)
+
+    prix = calculer_prix_niveaux(prix_entree, prix_catastrophique, drop_percent)
+    if len(prix) == 0:
         raise SimulationError(error_messages.SIM_ERROR_NO_ITERATIONS_POSSIBLE)
 
-    montant_par_iteration = balance / nombre_total_iterations
-    quantites_par_iteration = []
-
-    # Final details text generation
-    details_text_list_final = []
-    details_text_list_final.append(f"Balance: {balance:.2f}")
-    details_text_list_final.append(f"Prix d'entrée initial: {prix_entree:.8f}")
-    details_text_list_final.append(f"Prix catastrophique: {prix_catastrophique:.8f}")
-    details_text_list_final.append(f"Drop par niveau: {drop_percent}%")
-    details_text_list_final.append("-" * 50)
-    details_text_list_final.append(f"Nombre total de niveaux de DCA: {nombre_total_iterations}")
-    details_text_list_final.append(f"Montant par niveau de DCA: {balance:.2f} / {nombre_total_iterations} = {montant_par_iteration:.2f}")
-    details_text_list_final.append("-" * 50)
-    details_text_list_final.append("Répartition par niveau de DCA:")
-
-    for i, prix in enumerate(prix_iterations_for_dca, 1):
+    montant_par_iteration = balance / len(prix)
+    with np.errstate(divide='ignore'):
+        # Un prix nul (seuil catastrophique à 0) donne une quantité infinie.
+        quantites = montant_par_iteration / prix
+    return prix, quantites, montant_par_iteration
+
+def calculer_echelle(balance: float, prix_entree: float, prix_catastrophique: float, drop_percent: float,
+                     forme: FormeEchelle = FORME_UNIFORME) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+    """
+    Comme calculer_niveaux, pour une échelle de forme quelconque.
+
+    Les montants sont la balance répartie au prorata des poids : leur somme est la balance,
+    niveau catastrophique compris. Avec FORME_UNIFORME, prix et quantités sont ceux de
+    calculer_niveaux.
+
+    Returns:
+        (prix, montants, quantites, multiplicateur), le multiplicateur étant celui résolu
+        depuis ``forme.montant_initial`` le cas échéant.
+    """
+    _valider_parametres(balance, prix_entree, prix_catastrophique, drop_percent)
+    _valider_forme(forme)
+
+    prix = calculer_prix_echelle(prix_entree, prix_catastrophique, drop_percent, forme.espacement,
+                                 forme.acceleration)
+    if len(prix) == 0:
+        raise SimulationError(error_messages.SIM_ERROR_NO_ITERATIONS_POSSIBLE)
+
+    multiplicateur = forme.multiplicateur
+    if forme.montant_initial is not None:
+        multiplicateur = resoudre_multiplicateur(balance, forme.montant_initial, len(prix), forme.repartition)
+    poids = calculer_poids(len(prix), forme.repartition, multiplicateur, forme.poids)
+    montants = balance * poids / poids.sum()
+    with np.errstate(divide='ignore'):
+        quantites = montants / prix
+    return prix, montants, quantites, multiplicateur
+
+def _decrire_forme(forme: FormeEchelle, multiplicateur: float) -> List[str]:
+    lignes = []
+    if forme.espacement == ESPACEMENT_LINEAIRE:
+        lignes.append("Espacement: linéaire (baisse fixe en % du prix d'entrée)")
+    elif forme.espacement == ESPACEMENT_ACCELERE:
+        lignes.append(f"Espacement: accéléré (drop x{forme.acceleration:g} à chaque niveau)")
+    if forme.repartition == REPARTITION_MARTINGALE:
+        lignes.append(f"Répartition: martingale (montant x{multiplicateur:.6g} à chaque niveau)")
+    elif forme.repartition == REPARTITION_LINEAIRE:
+        lignes.append(f"Répartition: linéaire (+{multiplicateur - 1:.6g} x le premier montant à chaque niveau)")
+    elif forme.repartition == REPARTITION_PERSONNALISEE:
+        lignes.append("Répartition: courbe de poids " + ", ".join(f"{p:g}" for p in forme.poids))
+    return lignes
+
+def formater_details(results: dict) -> List[str]:
+    """Construit le texte détaillé d'une simulation pour l'affichage dans l'interface."""
+    inputs = results["inputs"]
+    balance = inputs["balance"]
+    nombre_total_iterations = results["nombre_total_iterations"]
+    montant_par_iteration = results["montant_par_iteration"]
+    forme = inputs.get("forme", FORME_UNIFORME)
+    montants = results.get("montants_par_iteration") or [montant_par_iteration] * nombre_total_iterations
+
+    details = [
+        f"Balance: {balance:.2f}",
+        f"Prix d'entrée initial: {inputs['prix_entree']:.8f}",
+        f"Prix catastrophique: {inputs['prix_catastrophique']:.8f}",
+        f"Drop par niveau: {inputs['drop_percent']}%",
+        *_decrire_forme(forme, results.get("multiplicateur", forme.multiplicateur)),
+        "-" * 50,
+        f"Nombre total de niveaux de DCA: {nombre_total_iterations}",
+    ]
+    if forme.repartition == REPARTITION_EGALE:
+        details.append(f"Montant par niveau de DCA: {balance:.2f} / {nombre_total_iterations} = {montant_par_iteration:.2f}")
+    else:
+        details.append(f"Montant par niveau de DCA: de {montants[0]:.2f} à {montants[-1]:.2f} (total {balance:.2f})")
+    details += ["-" * 50, "Répartition par niveau de DCA:"]
+    niveaux = zip(results["prix_iterations"], montants, results["quantites_par_iteration"])
+    for i, (prix, montant, quantite) in enumerate(niveaux, 1):
         if prix <= 0:
-            # This should ideally not be reached if prix_catastrophique is > 0 and validation is correct.
-            # If prix_catastrophique can be 0, then quantite would be infinite.
-            quantite = float('inf') if montant_par_iteration > 0 else 0
-            details_text_list_final.append(f"Niveau {i}: Prix de {prix:.8f} est invalide pour calculer la quantité.")
+            details.append(f"Niveau {i}: Prix de {prix:.8f} est invalide pour calculer la quantité.")
         else:
-            quantite = montant_par_iteration / prix
-            details_text_list_final.append(f"Niveau {i}: {montant_par_iteration:.2f} / {prix:.8f} = {quantite:.8f} (quantité)")
-        quantites_par_iteration.append(quantite)
+            details.append(f"Niveau {i}: {montant:.2f} / {prix:.8f} = {quantite:.8f} (quantité)")
+    return details
 
+def calculer_iterations(balance: float, prix_entree: float, prix_catastrophique: float, drop_percent: float,
+                        avec_details: bool = True, forme: FormeEchelle = FORME_UNIFORME) -> dict:
+    """
+    Calcule le nombre d'itérations possibles avec un drop de prix.
 
-    return {
+    Args:
+        balance: Le montant total disponible
+        prix_entree: Le prix de départ
+        prix_catastrophique: Le prix limite (seuil d'arrêt)
+        drop_percent: Le pourcentage de drop à chaque itération (e.g., 50 for 50%)
+        avec_details: Si False, "details_text" est une liste vide (voir formater_details)
+        forme: Espacement des prix et répartition de la balance (voir FormeEchelle)
+
+    Returns:
+        A dictionary containing the simulation results or raises SimulationError.
+        "montant_par_iteration" est le montant moyen ; "montants_par_iteration" donne celui
+        de chaque niveau.
+    """
+    prix, montants, quantites, multiplicateur = calculer_echelle(balance, prix_entree, prix_catastrophique,
+                                                                 drop_percent, forme)
+    results = {
         "inputs": {
             "balance": balance,
             "prix_entree": prix_entree,
             "prix_catastrophique": prix_catastrophique,
             "drop_percent": drop_percent,
+            "forme": forme,
         },
-        "prix_iterations": prix_iterations_for_dca,
-        "nombre_total_iterations": nombre_total_iterations,
-        "montant_par_iteration": montant_par_iteration,
-        "quantites_par_iteration": quantites_par_iteration,
-        "details_text": details_text_list_final,
+        "prix_iterations": prix.tolist(),
+        "nombre_total_iterations": len(prix),
+        "montant_par_iteration": balance / len(prix),
+        "montants_par_iteration": montants.tolist(),
+        "multiplicateur": multiplicateur,
+        "quantites_par_iteration": quantites.tolist(),
+        "details_text": [],
     }
+    if avec_details:
+        results["details_text"] = formater_details(results)
+    return results
+
+def cle_simulation(balance: float, prix_entree: float, prix_catastrophique: float, drop_percent: float,
+                   forme: FormeEchelle = FORME_UNIFORME) -> Cle:
+    """Paramètres normalisés d'une simulation, utilisés comme clé de cache."""
+    return tuple(float(f"{float(valeur):.{CHIFFRES_CLE}g}")
+                 for valeur in (balance, prix_entree, prix_catastrophique, drop_percent)) + (forme,)
+
+class SimulationCache:
+    """
+    Résultats de calculer_iterations (détails compris) pour les derniers jeux de paramètres,
+    au plus ``taille``, le moins récemment utilisé étant évincé en premier.
+
+    Revenir à des paramètres déjà essayés ne refait ni le calcul ni le formatage. Les
+    paramètres invalides ne sont pas mis en cache : SimulationError est levée à chaque appel.
+    Les résultats renvoyés sont partagés entre les appels et ne doivent pas être modifiés.
+    """
+
+    _shared_instance: Optional['SimulationCache'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, taille: int = TAILLE_CACHE_SIMULATION):
+        self.taille = taille
+        self._lock = threading.Lock()
+        self._resultats: "OrderedDict[Cle, dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def shared(cls) -> 'SimulationCache':
+        """Instance unique du processus."""
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._resultats)
+
+    def calculer_iterations(self, balance: float, prix_entree: float, prix_catastrophique: float,
+                            drop_percent: float, forme: FormeEchelle = FORME_UNIFORME) -> dict:
+        """Comme calculer_iterations, en réutilisant le résultat d'un appel aux mêmes paramètres normalisés."""
+        cle = cle_simulation(balance, prix_entree, prix_catastrophique, drop_percent, forme)
+        with self._lock:
+            resultats = self._resultats.get(cle)
+            if resultats is not None:
+                self._resultats.move_to_end(cle)
+                self.hits += 1
+                return resultats
+        resultats = calculer_iterations(*cle[:4], forme=forme)
+        with self._lock:
+            self.misses += 1
+            self._resultats[cle] = resultats
+            self._resultats.move_to_end(cle)
+            while len(self._resultats) > self.taille:
+                self._resultats.popitem(last=False)
+        return resultats
 
+    def vider(self) -> None:
+        with self._lock:
+            self._resultats.clear()
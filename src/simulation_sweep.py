@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+from typing import Dict, Iterator, Sequence, Union
+import numpy as np
+from .simulation_logic import MAX_ITERATIONS_CAP, PRIX_MINIMUM
+
+ValeursParametre = Union[float, Sequence[float], np.ndarray]
+
+# Ordre des axes de la grille.
+AXES = ("balance", "prix_entree", "prix_catastrophique", "drop_percent")
+
+@dataclass
+class GrilleSimulation:
+    """
+    Résultats d'un balayage de paramètres. Chaque tableau a la forme
+    (len(balance), len(prix_entree), len(prix_catastrophique), len(drop_percent)).
+    Les combinaisons invalides ont valide=False, 0 niveau et NaN pour les autres valeurs.
+    """
+    axes: Dict[str, np.ndarray]
+    valide: np.ndarray
+    nombre_niveaux: np.ndarray
+    montant_par_niveau: np.ndarray
+    prix_moyen: np.ndarray
+    quantite_totale: np.ndarray
+    perte_max: np.ndarray
+    drawdown_max_percent: np.ndarray
+
+    @property
+    def shape(self):
+        return self.valide.shape
+
+    def lignes(self) -> Iterator[Dict[str, float]]:
+        """Parcourt la grille combinaison par combinaison (pour un export CSV par exemple)."""
+        for index in np.ndindex(self.shape):
+            ligne = {nom: float(self.axes[nom][i]) for nom, i in zip(AXES, index)}
+            ligne.update({
+                "valide": bool(self.valide[index]),
+                "nombre_niveaux": int(self.nombre_niveaux[index]),
+                "montant_par_niveau": float(self.montant_par_niveau[index]),
+                "prix_moyen": float(self.prix_moyen[index]),
+                "quantite_totale": float(self.quantite_totale[index]),
+                "perte_max": float(self.perte_max[index]),
+                "drawdown_max_percent": float(self.drawdown_max_percent[index]),
+            })
+            yield ligne
+
+def plage(debut: float, fin: float, pas: float) -> np.ndarray:
+    """Valeurs de debut à fin incluses, espacées de pas."""
+    if pas <= 0:
+        raise ValueError("Le pas doit être strictement positif.")
+    nombre = int(round((fin - debut) / pas)) + 1
+    if nombre < 1:
+        raise ValueError("La fin de la plage doit être supérieure ou égale au début.")
+    return debut + pas * np.arange(nombre)
+
+def _axe(valeurs: ValeursParametre) -> np.ndarray:
+    return np.atleast_1d(np.asarray(valeurs, dtype=float)).ravel()
+
+def _parcourir_echelles(prix_entree: np.ndarray, prix_catastrophique: np.ndarray, ratio: np.ndarray):
+    """
+    Parcourt toutes les échelles en parallèle, un niveau à la fois.
+
+    Chaque prix est obtenu par multiplications successives, comme dans calculer_niveaux,
+    donc le nombre de niveaux est identique au calcul unitaire. Les combinaisons terminées
+    sortent de l'ensemble actif, si bien que le coût suit l'échelle la plus longue.
+
+    Returns:
+        (nombre_niveaux, somme des 1/prix sur les niveaux)
+    """
+    prix = prix_entree.copy()
+    nombre = np.zeros(len(prix), dtype=np.int64)
+    somme_inverses = 1.0 / prix_entree
+    actifs = np.arange(len(prix))
+
+    for j in range(1, MAX_ITERATIONS_CAP + 1):
+        if actifs.size == 0:
+            break
+        prix_j = prix[actifs] * ratio[actifs]
+        prix[actifs] = prix_j
+        # Le niveau catastrophique est inclus ; un prix sous PRIX_MINIMUM ne l'est pas.
+        catastrophique = prix_j <= prix_catastrophique[actifs]
+        minuscule = ~catastrophique & (prix_j < PRIX_MINIMUM)
+        continue_ = ~(catastrophique | minuscule)
+
+        termines = actifs[catastrophique]
+        nombre[termines] = j + 1
+        somme_inverses[termines] += 1.0 / prix_j[catastrophique]
+        nombre[actifs[minuscule]] = j
+
+        actifs = actifs[continue_]
+        if j < MAX_ITERATIONS_CAP:
+            somme_inverses[actifs] += 1.0 / prix_j[continue_]
+
+    nombre[actifs] = MAX_ITERATIONS_CAP
+    return nombre, somme_inverses
+
+def simuler_grille(balance: ValeursParametre, prix_entree: ValeursParametre,
+                   prix_catastrophique: ValeursParametre, drop_percent: ValeursParametre) -> GrilleSimulation:
+    """
+    Calcule la simulation DCA pour toutes les combinaisons des paramètres fournis.
+
+    Chaque paramètre est un scalaire ou une suite de valeurs (voir plage). Les règles de
+    validation et de construction de l'échelle sont celles de calculer_iterations ; au lieu
+    de lever SimulationError, les combinaisons invalides sont marquées dans `valide`.
+
+    Le prix moyen est pondéré par les quantités (montant total / quantité totale) et la perte
+    maximale correspond à une chute jusqu'au prix catastrophique avec tous les niveaux exécutés.
+    """
+    axes = dict(zip(AXES, map(_axe, (balance, prix_entree, prix_catastrophique, drop_percent))))
+    b, pe, pc, d = np.meshgrid(*axes.values(), indexing='ij')
+    shape = b.shape
+
+    valide = (b > 0) & (pe > 0) & (pc >= 0) & (pe > pc) & (d > 0) & (d < 100)
+    nombre_niveaux = np.zeros(shape, dtype=np.int64)
+    somme_inverses = np.full(shape, np.nan)
+
+    with np.errstate(divide='ignore'):
+        nombre_valide, somme_valide = _parcourir_echelles(pe[valide], pc[valide], 1 - d[valide] / 100)
+    nombre_niveaux[valide] = nombre_valide
+    somme_inverses[valide] = somme_valide
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        montant_par_niveau = np.where(valide, b / np.maximum(nombre_niveaux, 1), np.nan)
+        quantite_totale = montant_par_niveau * somme_inverses
+        prix_moyen = b / quantite_totale
+        perte_max = b - quantite_totale * pc
+        drawdown_max_percent = perte_max / b * 100
+
+    return GrilleSimulation(
+        axes=axes,
+        valide=valide,
+        nombre_niveaux=nombre_niveaux,
+        montant_par_niveau=montant_par_niveau,
+        prix_moyen=prix_moyen,
+        quantite_totale=quantite_totale,
+        perte_max=perte_max,
+        drawdown_max_percent=drawdown_max_percent,
+    )
@@ -1,6 +1,7 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QLineEdit, QPushButton, QApplication, QSpacerItem, QSizePolicy,
-                             QTabWidget, QComboBox, QFormLayout, QTextEdit, QCheckBox)
+                             QTabWidget, QComboBox, QFormLayout, QTextEdit, QCheckBox,
+                             QTableWidget, QTableView, QHeaderView, QAbstractItemView)
 from PyQt5.QtCore import QMetaObject, QCoreApplication
 from PyQt5.QtGui import QFont
 from .constants import ui_strings
@@ -131,6 +132,12 @@ class Ui_MainWindow(object):
         self.tradePriceLabel = QLabel(ui_strings.LABEL_PRICE_LIMIT_ORDER, self.tradeTab)
         self.tradeFormLayout.addRow(self.tradePriceLabel, self.priceLineEdit)
 
+        # Best bid/ask from the local order book
+        self.tradeQuoteValueLabel = QLabel(ui_strings.MARKET_QUOTE_UNAVAILABLE, self.tradeTab)
+        self.tradeQuoteValueLabel.setObjectName("tradeQuoteValueLabel")
+        self.tradeQuoteLabel = QLabel(ui_strings.LABEL_MARKET_QUOTE, self.tradeTab)
+        self.tradeFormLayout.addRow(self.tradeQuoteLabel, self.tradeQuoteValueLabel)
+
         self.tradeTabLayout.addLayout(self.tradeFormLayout)
 
         # Place Order Button
@@ -191,6 +198,45 @@ class Ui_MainWindow(object):
         self.simDropPercentLineEdit.setObjectName("simDropPercentLineEdit")
         self.simulationFormLayout.addRow(self.simDropPercentLabel, self.simDropPercentLineEdit)
 
+        # Ladder shape: price spacing and balance sizing (simulation_logic.FormeEchelle)
+        self.simEspacementLabel = QLabel(ui_strings.LABEL_SIM_SPACING, self.simulationTab)
+        self.simEspacementComboBox = QComboBox(self.simulationTab)
+        self.simEspacementComboBox.setObjectName("simEspacementComboBox")
+        for mode, label in ui_strings.SIM_SPACING_MODES:
+            self.simEspacementComboBox.addItem(label, mode)
+        self.simulationFormLayout.addRow(self.simEspacementLabel, self.simEspacementComboBox)
+
+        self.simAccelerationLabel = QLabel(ui_strings.LABEL_SIM_ACCELERATION, self.simulationTab)
+        self.simAccelerationLineEdit = QLineEdit(self.simulationTab)
+        self.simAccelerationLineEdit.setObjectName("simAccelerationLineEdit")
+        self.simAccelerationLineEdit.setPlaceholderText("1")
+        self.simulationFormLayout.addRow(self.simAccelerationLabel, self.simAccelerationLineEdit)
+
+        self.simRepartitionLabel = QLabel(ui_strings.LABEL_SIM_SIZING, self.simulationTab)
+        self.simRepartitionComboBox = QComboBox(self.simulationTab)
+        self.simRepartitionComboBox.setObjectName("simRepartitionComboBox")
+        for mode, label in ui_strings.SIM_SIZING_MODES:
+            self.simRepartitionComboBox.addItem(label, mode)
+        self.simulationFormLayout.addRow(self.simRepartitionLabel, self.simRepartitionComboBox)
+
+        self.simMultiplicateurLabel = QLabel(ui_strings.LABEL_SIM_MULTIPLIER, self.simulationTab)
+        self.simMultiplicateurLineEdit = QLineEdit(self.simulationTab)
+        self.simMultiplicateurLineEdit.setObjectName("simMultiplicateurLineEdit")
+        self.simMultiplicateurLineEdit.setPlaceholderText("1")
+        self.simulationFormLayout.addRow(self.simMultiplicateurLabel, self.simMultiplicateurLineEdit)
+
+        self.simMontantInitialLabel = QLabel(ui_strings.LABEL_SIM_FIRST_AMOUNT, self.simulationTab)
+        self.simMontantInitialLineEdit = QLineEdit(self.simulationTab)
+        self.simMontantInitialLineEdit.setObjectName("simMontantInitialLineEdit")
+        self.simMontantInitialLineEdit.setPlaceholderText(ui_strings.PLACEHOLDER_SIM_FIRST_AMOUNT)
+        self.simulationFormLayout.addRow(self.simMontantInitialLabel, self.simMontantInitialLineEdit)
+
+        self.simPoidsLabel = QLabel(ui_strings.LABEL_SIM_WEIGHTS, self.simulationTab)
+        self.simPoidsLineEdit = QLineEdit(self.simulationTab)
+        self.simPoidsLineEdit.setObjectName("simPoidsLineEdit")
+        self.simPoidsLineEdit.setPlaceholderText(ui_strings.PLACEHOLDER_SIM_WEIGHTS)
+        self.simulationFormLayout.addRow(self.simPoidsLabel, self.simPoidsLineEdit)
+
         self.simulationTabLayout.addLayout(self.simulationFormLayout)
 
         # Calculer Button
@@ -263,11 +309,21 @@ class Ui_MainWindow(object):
         self.dcaLoadDataButtonLayout.addSpacerItem(QSpacerItem(40,20,QSizePolicy.Expanding, QSizePolicy.Minimum))
         self.dcaOrdersTabLayout.addLayout(self.dcaLoadDataButtonLayout)
 
-        # Simulation Data Display
+        # Per-level progress (model set by the main window); fixed row heights keep updates cheap
+        self.dcaProgressTableView = QTableView(self.dcaOrdersTab)
+        self.dcaProgressTableView.setObjectName("dcaProgressTableView")
+        self.dcaProgressTableView.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.dcaProgressTableView.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.dcaProgressTableView.verticalHeader().setVisible(False)
+        self.dcaProgressTableView.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.dcaProgressTableView.horizontalHeader().setStretchLastSection(True)
+        self.dcaOrdersTabLayout.addWidget(self.dcaProgressTableView, 3)
+
+        # Simulation Data Display (run messages: errors, rollbacks, summaries)
         self.dcaSimResultsTextEdit = QTextEdit(self.dcaOrdersTab)
         self.dcaSimResultsTextEdit.setObjectName("dcaSimResultsTextEdit")
         self.dcaSimResultsTextEdit.setReadOnly(True)
-        self.dcaOrdersTabLayout.addWidget(self.dcaSimResultsTextEdit)
+        self.dcaOrdersTabLayout.addWidget(self.dcaSimResultsTextEdit, 1)
 
         # Place DCA Orders Button
         self.dcaPlaceOrdersButton = QPushButton("Place DCA Orders", self.dcaOrdersTab) # Placeholder, use ui_strings later
@@ -276,6 +332,14 @@ class Ui_MainWindow(object):
         self.dcaPlaceOrdersButtonLayout = QHBoxLayout()
         self.dcaPlaceOrdersButtonLayout.addSpacerItem(QSpacerItem(40,20,QSizePolicy.Expanding, QSizePolicy.Minimum))
         self.dcaPlaceOrdersButtonLayout.addWidget(self.dcaPlaceOrdersButton)
+        self.dcaAddToBasketButton = QPushButton(ui_strings.BUTTON_DCA_ADD_TO_BASKET, self.dcaOrdersTab)
+        self.dcaAddToBasketButton.setObjectName("dcaAddToBasketButton")
+        self.dcaAddToBasketButton.setEnabled(False)
+        self.dcaPlaceOrdersButtonLayout.addWidget(self.dcaAddToBasketButton)
+        self.dcaPlaceBasketButton = QPushButton(ui_strings.BUTTON_DCA_PLACE_BASKET.format(count=0), self.dcaOrdersTab)
+        self.dcaPlaceBasketButton.setObjectName("dcaPlaceBasketButton")
+        self.dcaPlaceBasketButton.setEnabled(False)
+        self.dcaPlaceOrdersButtonLayout.addWidget(self.dcaPlaceBasketButton)
         self.dcaPlaceOrdersButtonLayout.addSpacerItem(QSpacerItem(40,20,QSizePolicy.Expanding, QSizePolicy.Minimum))
         self.dcaOrdersTabLayout.addLayout(self.dcaPlaceOrdersButtonLayout)
 
@@ -288,6 +352,39 @@ class Ui_MainWindow(object):
         self.dcaOrdersTabLayout.addSpacerItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding))
         self.tabWidget.addTab(self.dcaOrdersTab, "DCA Orders") # Placeholder, use ui_strings later
 
+        # === Diagnostics Tab ===
+        self.diagnosticsTab = QWidget()
+        self.diagnosticsTab.setObjectName("diagnosticsTab")
+        self.diagnosticsTabLayout = QVBoxLayout(self.diagnosticsTab)
+        self.diagnosticsTabLayout.setObjectName("diagnosticsTabLayout")
+
+        self.diagnosticsSpansTable = QTableWidget(0, len(ui_strings.DIAGNOSTICS_SPAN_HEADERS), self.diagnosticsTab)
+        self.diagnosticsSpansTable.setObjectName("diagnosticsSpansTable")
+        self.diagnosticsSpansTable.setHorizontalHeaderLabels(ui_strings.DIAGNOSTICS_SPAN_HEADERS)
+        self.diagnosticsSpansTable.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.diagnosticsSpansTable.verticalHeader().setVisible(False)
+        self.diagnosticsSpansTable.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.diagnosticsTabLayout.addWidget(self.diagnosticsSpansTable, 3)
+
+        self.diagnosticsCountersTable = QTableWidget(0, len(ui_strings.DIAGNOSTICS_COUNTER_HEADERS), self.diagnosticsTab)
+        self.diagnosticsCountersTable.setObjectName("diagnosticsCountersTable")
+        self.diagnosticsCountersTable.setHorizontalHeaderLabels(ui_strings.DIAGNOSTICS_COUNTER_HEADERS)
+        self.diagnosticsCountersTable.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.diagnosticsCountersTable.verticalHeader().setVisible(False)
+        self.diagnosticsCountersTable.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.diagnosticsTabLayout.addWidget(self.diagnosticsCountersTable, 1)
+
+        self.diagnosticsExportLabel = QLabel(ui_strings.LABEL_DIAGNOSTICS_NO_EXPORT, self.diagnosticsTab)
+        self.diagnosticsExportLabel.setObjectName("diagnosticsExportLabel")
+        self.diagnosticsExportLabel.setWordWrap(True)
+        self.diagnosticsResetButton = QPushButton(ui_strings.BUTTON_DIAGNOSTICS_RESET, self.diagnosticsTab)
+        self.diagnosticsResetButton.setObjectName("diagnosticsResetButton")
+        self.diagnosticsFooterLayout = QHBoxLayout()
+        self.diagnosticsFooterLayout.addWidget(self.diagnosticsExportLabel, 1)
+        self.diagnosticsFooterLayout.addWidget(self.diagnosticsResetButton)
+        self.diagnosticsTabLayout.addLayout(self.diagnosticsFooterLayout)
+        self.tabWidget.addTab(self.diagnosticsTab, ui_strings.TAB_DIAGNOSTICS)
+
         self.mainLayout.addWidget(self.tabWidget)
 
         self.retranslateUi(MainWindow)
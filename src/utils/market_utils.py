@@ -1,5 +1,5 @@
 from typing import Tuple, Optional
-from ..app_logic import MarketEnvironment
+from ..models.market_environment import MarketEnvironment
 from ..constants import ui_strings, error_messages
 
 class MarketUtils:
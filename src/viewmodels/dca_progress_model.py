@@ -0,0 +1,179 @@
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer, pyqtSignal, pyqtSlot
+from PyQt5.QtGui import QColor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from ..constants import ui_strings
+
+# Regroupement des mises à jour : au plus un rafraîchissement de la vue par image (~60 Hz).
+FLUSH_INTERVAL_MS = 16
+
+COLUMN_SYMBOL, COLUMN_LEVEL, COLUMN_PRICE, COLUMN_AMOUNT, COLUMN_STATUS, COLUMN_ORDER, COLUMN_FILLED, COLUMN_DETAIL = range(8)
+
+_FAILED_COLOR = QColor(200, 40, 40)
+
+RowKey = Tuple[str, int]
+
+
+class _ProgressRow:
+    __slots__ = ('symbol', 'level', 'price', 'amount', 'status', 'order_id', 'filled', 'detail', 'outcome')
+
+    def __init__(self, symbol: str, level: int, price: Optional[float] = None, amount: Optional[float] = None):
+        self.symbol = symbol
+        self.level = level
+        self.price = price
+        self.amount = amount
+        self.status = ui_strings.DCA_PROGRESS_STATUS_WAITING
+        self.order_id: Optional[str] = None
+        self.filled: Optional[float] = None
+        self.detail = ""
+        # None tant que le niveau n'a pas de réponse, puis True (placé) ou False (refusé).
+        self.outcome: Optional[bool] = None
+
+    def display(self, column: int) -> str:
+        if column == COLUMN_SYMBOL:
+            return self.symbol
+        if column == COLUMN_LEVEL:
+            return str(self.level + 1)
+        if column == COLUMN_PRICE:
+            return "" if self.price is None else f"{self.price:.2f}"
+        if column == COLUMN_AMOUNT:
+            return "" if self.amount is None else f"{self.amount:.2f}"
+        if column == COLUMN_STATUS:
+            return self.status
+        if column == COLUMN_ORDER:
+            return self.order_id or ""
+        if column == COLUMN_FILLED:
+            return "" if self.filled is None else f"{self.filled:g}"
+        return self.detail
+
+
+class DcaProgressModel(QAbstractTableModel):
+    """
+    Progression d'un placement DCA, une ligne par niveau (symbole, niveau).
+
+    Les signaux des workers ne touchent pas la vue : ``record_attempt`` et ``record_state``
+    mettent la ligne en file, et un minuteur de FLUSH_INTERVAL_MS applique la file en un seul
+    ``dataChanged`` (et un seul ``rowsInserted`` pour les niveaux inconnus). Le coût d'une mise
+    à jour ne dépend donc pas du nombre de lignes, contrairement à un ajout dans un QTextEdit
+    dont le document grandit. ``progress_changed(placés, en erreur, total)`` suit chaque
+    application de la file.
+    """
+    progress_changed = pyqtSignal(int, int, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[_ProgressRow] = []
+        self._index: Dict[RowKey, int] = {}
+        self._pending: Dict[RowKey, Dict[str, Any]] = {}
+        self._placed = 0
+        self._failed = 0
+        # Ligne mise à jour en dernier, pour que la vue la garde visible.
+        self.latest_row: Optional[int] = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(FLUSH_INTERVAL_MS)
+        self._timer.timeout.connect(self.flush)
+
+    # -- QAbstractTableModel -----------------------------------------------------------
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(ui_strings.DCA_PROGRESS_HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return row.display(index.column())
+        if role == Qt.ToolTipRole and index.column() == COLUMN_DETAIL and row.detail:
+            return row.detail
+        if role == Qt.ForegroundRole and row.outcome is False:
+            return _FAILED_COLOR
+        if role == Qt.TextAlignmentRole and index.column() in (COLUMN_LEVEL, COLUMN_PRICE, COLUMN_AMOUNT, COLUMN_FILLED):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return ui_strings.DCA_PROGRESS_HEADERS[section]
+        return None
+
+    # -- Chargement ----------------------------------------------------------------------
+
+    def load(self, ladders: Iterable[Tuple[str, List[Dict[str, Any]]]]) -> None:
+        """Remplace les lignes par les niveaux ``(symbole, niveaux)`` donnés, tous en attente."""
+        self._timer.stop()
+        self._pending.clear()
+        self.beginResetModel()
+        self._rows = [_ProgressRow(symbol, i, float(level['price']), float(level['amount']))
+                      for symbol, levels in ladders for i, level in enumerate(levels)]
+        self._index = {(row.symbol, row.level): position for position, row in enumerate(self._rows)}
+        self._placed = self._failed = 0
+        self.latest_row = None
+        self.endResetModel()
+        self.progress_changed.emit(0, 0, len(self._rows))
+
+    def clear(self) -> None:
+        self.load([])
+
+    def progress(self) -> Tuple[int, int, int]:
+        """(niveaux placés, niveaux en erreur, total), file en attente non comprise."""
+        return self._placed, self._failed, len(self._rows)
+
+    # -- Mises à jour regroupées -----------------------------------------------------------
+
+    def record_attempt(self, level_index: int, symbol: str, success: bool, result: Any) -> None:
+        """Met en file la réponse d'un niveau (JournalEntry si accepté, erreur sinon)."""
+        if success:
+            status = getattr(result, 'status', None)
+            self._queue(symbol, level_index, outcome=True, order_id=getattr(result, 'order_id', None),
+                        status=f"{ui_strings.DCA_PROGRESS_STATUS_PLACED} ({status})" if status
+                        else ui_strings.DCA_PROGRESS_STATUS_PLACED, detail="")
+        else:
+            self._queue(symbol, level_index, outcome=False, status=ui_strings.DCA_PROGRESS_STATUS_FAILED,
+                        detail=str(result))
+
+    def record_state(self, level_index: int, symbol: str, state) -> None:
+        """Met en file l'état d'un ordre du niveau rapporté par le flux utilisateur (OrderState)."""
+        self._queue(symbol, level_index, status=state.status, filled=state.filled)
+
+    def _queue(self, symbol: str, level_index: int, **changes) -> None:
+        self._pending.setdefault((symbol, level_index), {}).update(changes)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    @pyqtSlot()
+    def flush(self) -> None:
+        """Applique la file : au plus une insertion et un dataChanged, quel que soit le nombre de niveaux."""
+        self._timer.stop()
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+
+        missing = sorted(key for key in pending if key not in self._index)
+        if missing:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(missing) - 1)
+            for key in missing:
+                self._index[key] = len(self._rows)
+                self._rows.append(_ProgressRow(*key))
+            self.endInsertRows()
+
+        changed = []
+        for key, changes in pending.items():
+            position = self._index[key]
+            row = self._rows[position]
+            outcome = changes.pop('outcome', row.outcome)
+            if outcome != row.outcome:
+                self._placed += (outcome is True) - (row.outcome is True)
+                self._failed += (outcome is False) - (row.outcome is False)
+                row.outcome = outcome
+            for name, value in changes.items():
+                setattr(row, name, value)
+            changed.append(position)
+
+        self.latest_row = changed[-1]
+        self.dataChanged.emit(self.index(min(changed), 0), self.index(max(changed), self.columnCount() - 1))
+        self.progress_changed.emit(self._placed, self._failed, len(self._rows))
@@ -1,10 +1,11 @@
 from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
-from typing import Optional
+from typing import List, Optional
 from ..app_logic import BinanceLogic
 from ..models.market_environment import MarketEnvironment
 from ..workers.balance_worker import BalanceWorker
 from ..workers.order_placement_worker import OrderPlacementWorker
 from ..workers.batch_dca_worker import BatchDcaOrderWorker
+from ..workers.task_runner import PooledWorker, TaskRunner
 
 class MainViewModel(QObject):
     # Signaux pour la mise à jour de l'UI
@@ -15,69 +16,62 @@ class MainViewModel(QObject):
     batch_order_progress = pyqtSignal(int, str, bool, object)
     batch_completed = pyqtSignal(str)
     batch_error = pyqtSignal(str)
+    batch_rollback = pyqtSignal(object)
 
-    def __init__(self):
+    def __init__(self, task_runner: Optional[TaskRunner] = None):
         super().__init__()
         self.binance_logic = BinanceLogic()
-        self._current_balance_worker: Optional[BalanceWorker] = None
-        self._current_order_worker: Optional[OrderPlacementWorker] = None
-        self._current_batch_worker: Optional[BatchDcaOrderWorker] = None
+        self.task_runner = task_runner if task_runner is not None else TaskRunner.shared()
+        self._workers: List[PooledWorker] = []
+
+    def _start(self, worker: PooledWorker) -> None:
+        """Met le worker en file dans le pool ; les demandes successives s'exécutent dans l'ordre."""
+        self._workers.append(worker)
+        worker.finished.connect(self._on_worker_finished)
+        worker.start(self.task_runner)
+
+    @pyqtSlot()
+    def _on_worker_finished(self):
+        worker = self.sender()
+        if worker in self._workers:
+            self._workers.remove(worker)
 
     @pyqtSlot(str, str, MarketEnvironment)
     def fetch_balance(self, api_key: str, secret_key: str, market_env: MarketEnvironment):
-        """Démarre le worker pour récupérer le solde."""
-        if self._current_balance_worker is not None:
-            self._current_balance_worker.stop()
-            self._current_balance_worker.wait()
-
-        self._current_balance_worker = BalanceWorker(
-            self.binance_logic, api_key, secret_key, market_env
-        )
-        self._current_balance_worker.success.connect(self.balance_updated)
-        self._current_balance_worker.error.connect(self.balance_error)
-        self._current_balance_worker.start()
+        """Met en file la récupération du solde."""
+        worker = BalanceWorker(self.binance_logic, api_key, secret_key, market_env)
+        worker.success.connect(self.balance_updated)
+        worker.error.connect(self.balance_error)
+        self._start(worker)
 
-    @pyqtSlot(str, str, MarketEnvironment, str, str, str, float, Optional[float])
+    # Le prix est optionnel (ordre au marché) : ``object`` accepte None là où ``float`` ne le permet pas.
+    @pyqtSlot(str, str, MarketEnvironment, str, str, str, float, object)
     def place_order(self, api_key: str, secret_key: str, market_env: MarketEnvironment,
                    symbol: str, order_type: str, side: str, amount: float, price: Optional[float] = None):
-        """Démarre le worker pour placer un ordre."""
-        if self._current_order_worker is not None:
-            self._current_order_worker.stop()
-            self._current_order_worker.wait()
-
-        self._current_order_worker = OrderPlacementWorker(
+        """Met en file le placement d'un ordre."""
+        worker = OrderPlacementWorker(
             self.binance_logic, api_key, secret_key, market_env,
             symbol, order_type, side, amount, price
         )
-        self._current_order_worker.success.connect(self.order_placed)
-        self._current_order_worker.error.connect(self.order_error)
-        self._current_order_worker.start()
+        worker.success.connect(self.order_placed)
+        worker.error.connect(self.order_error)
+        self._start(worker)
 
     @pyqtSlot(str, str, MarketEnvironment, str, list, str, int)
     def place_batch_orders(self, api_key: str, secret_key: str, market_env: MarketEnvironment,
                           symbol: str, dca_levels: list, margin_mode: str, leverage: int):
-        """Démarre le worker pour placer une série d'ordres DCA."""
-        if self._current_batch_worker is not None:
-            self._current_batch_worker.stop()
-            self._current_batch_worker.wait()
-
-        self._current_batch_worker = BatchDcaOrderWorker(
+        """Met en file le placement d'une série d'ordres DCA."""
+        worker = BatchDcaOrderWorker(
             self.binance_logic, api_key, secret_key, market_env,
             symbol, dca_levels, margin_mode, leverage
         )
-        self._current_batch_worker.order_attempt_finished.connect(self.batch_order_progress)
-        self._current_batch_worker.batch_processing_finished.connect(self.batch_completed)
-        self._current_batch_worker.batch_error.connect(self.batch_error)
-        self._current_batch_worker.start()
+        worker.order_attempt_finished.connect(self.batch_order_progress)
+        worker.batch_processing_finished.connect(self.batch_completed)
+        worker.batch_error.connect(self.batch_error)
+        worker.rollback_finished.connect(self.batch_rollback)
+        self._start(worker)
 
     def cleanup(self):
-        """Nettoie les workers en cours."""
-        if self._current_balance_worker is not None:
-            self._current_balance_worker.stop()
-            self._current_balance_worker.wait()
-        if self._current_order_worker is not None:
-            self._current_order_worker.stop()
-            self._current_order_worker.wait()
-        if self._current_batch_worker is not None:
-            self._current_batch_worker.stop()
-            self._current_batch_worker.wait() 
\ No newline at end of file
+        """Demande l'arrêt des workers en file ou en cours, sans bloquer le thread Qt."""
+        for worker in list(self._workers):
+            worker.stop()
@@ -1,5 +1,12 @@
+from .task_runner import TaskRunner, TaskFuture, CancellationToken, PooledWorker
 from .balance_worker import BalanceWorker
 from .order_placement_worker import OrderPlacementWorker
 from .batch_dca_worker import BatchDcaOrderWorker
+from .multi_symbol_dca_worker import MultiSymbolDcaWorker
+from .journal_reconcile_worker import JournalReconcileWorker
+from .async_jobs import (AsyncBalanceJob, AsyncOrderPlacementJob, AsyncBatchDcaOrderJob, AsyncMultiSymbolDcaJob,
+                         AsyncJournalReconcileJob)
 
-__all__ = ['BalanceWorker', 'OrderPlacementWorker', 'BatchDcaOrderWorker'] 
\ No newline at end of file
+__all__ = ['TaskRunner', 'TaskFuture', 'CancellationToken', 'PooledWorker', 'BalanceWorker', 'OrderPlacementWorker',
+           'BatchDcaOrderWorker', 'MultiSymbolDcaWorker', 'JournalReconcileWorker', 'AsyncBalanceJob',
+           'AsyncOrderPlacementJob', 'AsyncBatchDcaOrderJob', 'AsyncMultiSymbolDcaJob', 'AsyncJournalReconcileJob']
@@ -0,0 +1,194 @@
+import asyncio
+from PyQt5.QtCore import QObject, pyqtSignal
+from typing import List, Dict, Any, Optional
+from ..async_app_logic import AsyncBinanceLogic
+from ..app_logic import (
+    ApiKeyMissingError, InvalidOrderParamsError, InsufficientFundsError, OrderPlacementError,
+    CustomNetworkError, CustomExchangeError, AppLogicError
+)
+from ..models.dca_deployment import DcaDeployment
+from ..models.journal_entry import JournalEntry, ReconcileReport
+from ..models.market_environment import MarketEnvironment
+from ..services.dca_ladder import AsyncDcaLadder, AsyncMultiSymbolDeployment, MAX_PARALLEL_SYMBOLS
+from ..services.order_journal import OrderJournal
+from ..constants import error_messages
+from .journal_reconcile_worker import JournalReconcileWorker
+
+class AsyncBalanceJob(QObject):
+    """
+    Équivalent asynchrone de BalanceWorker : mêmes signaux, mais run() est une coroutine
+    exécutée sur la boucle asyncio partagée au lieu d'un thread dédié.
+    """
+    success = pyqtSignal(float)
+    error = pyqtSignal(str)
+    finished = pyqtSignal()
+
+    def __init__(self, async_logic: AsyncBinanceLogic, api_key: str, secret_key: str,
+                 market_environment: MarketEnvironment, parent=None):
+        super().__init__(parent)
+        self.async_logic = async_logic
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.market_environment = market_environment
+
+    async def run(self):
+        try:
+            balance = await self.async_logic.get_balance(self.api_key, self.secret_key, self.market_environment)
+            self.success.emit(balance)
+        except (ApiKeyMissingError, CustomNetworkError, CustomExchangeError, AppLogicError) as e:
+            self.error.emit(str(e))
+        except Exception as e:
+            self.error.emit(f"{error_messages.ERROR_UNEXPECTED}: {str(e)}")
+        finally:
+            self.finished.emit()
+
+
+class AsyncOrderPlacementJob(QObject):
+    """Équivalent asynchrone d'OrderPlacementWorker."""
+    success = pyqtSignal(object)
+    error = pyqtSignal(str)
+    finished = pyqtSignal()
+
+    def __init__(self, async_logic: AsyncBinanceLogic, api_key: str, secret_key: str,
+                 market_environment: MarketEnvironment, symbol: str, order_type: str,
+                 side: str, amount: float, price: Optional[float] = None, parent=None):
+        super().__init__(parent)
+        self.async_logic = async_logic
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.market_environment = market_environment
+        self.symbol = symbol
+        self.order_type = order_type
+        self.side = side
+        self.amount = amount
+        self.price = price
+
+    async def run(self):
+        try:
+            order_response = await self.async_logic.place_order(
+                self.api_key, self.secret_key, self.market_environment,
+                self.symbol, self.order_type, self.side, self.amount, self.price
+            )
+            self.success.emit(order_response)
+        except (ApiKeyMissingError, InvalidOrderParamsError, InsufficientFundsError,
+                OrderPlacementError, CustomNetworkError, AppLogicError) as e:
+            self.error.emit(str(e))
+        except Exception as e:
+            self.error.emit(f"{error_messages.ERROR_UNEXPECTED}: {str(e)}")
+        finally:
+            self.finished.emit()
+
+
+class AsyncBatchDcaOrderJob(QObject):
+    """
+    Équivalent asynchrone de BatchDcaOrderWorker : relais Qt d'un AsyncDcaLadder, avec les
+    mêmes signaux, les mêmes messages et la même annulation des ordres déjà placés.
+    """
+    order_attempt_finished = pyqtSignal(int, str, bool, object)
+    batch_processing_finished = pyqtSignal(str)
+    batch_error = pyqtSignal(str)
+    rollback_finished = pyqtSignal(object)
+    finished = pyqtSignal()
+
+    def __init__(self, async_logic: AsyncBinanceLogic, api_key: str, secret_key: str, market_env: MarketEnvironment,
+                 symbol_str: str, dca_levels_data: List[Dict[str, Any]], margin_mode: str, leverage: int,
+                 use_batch_orders: bool = True, journal: Optional[OrderJournal] = None, parent=None):
+        super().__init__(parent)
+        self.async_logic = async_logic
+        self.symbol_str = symbol_str
+        self.ladder = AsyncDcaLadder(
+            async_logic, api_key, secret_key, market_env, symbol_str, dca_levels_data, margin_mode, leverage,
+            use_batch_orders=use_batch_orders, journal=journal,
+            on_attempt=self.order_attempt_finished.emit, on_finished=self.batch_processing_finished.emit,
+            on_error=self.batch_error.emit, on_rollback=self.rollback_finished.emit
+        )
+        self.journal = self.ladder.journal
+        self.run_id = self.ladder.run_id
+
+    def stop(self):
+        """Demande l'arrêt ; les ordres déjà placés sont annulés avant la fin de run()."""
+        self.ladder.stop()
+
+    def placed_entries(self) -> List[JournalEntry]:
+        return self.ladder.placed_entries()
+
+    async def run(self):
+        try:
+            await self.ladder.run()
+        finally:
+            self.finished.emit()
+
+
+class AsyncMultiSymbolDcaJob(QObject):
+    """
+    Équivalent asynchrone de MultiSymbolDcaWorker : relais Qt d'un AsyncMultiSymbolDeployment,
+    au plus ``max_parallel_symbols`` symboles en cours sur la boucle à la fois.
+    """
+    order_attempt_finished = pyqtSignal(int, str, bool, object)
+    rollback_finished = pyqtSignal(object)
+    symbol_finished = pyqtSignal(object)
+    deployment_finished = pyqtSignal(object)
+    finished = pyqtSignal()
+
+    def __init__(self, async_logic: AsyncBinanceLogic, api_key: str, secret_key: str, market_env: MarketEnvironment,
+                 deployments: List[DcaDeployment], use_batch_orders: bool = True,
+                 max_parallel_symbols: int = MAX_PARALLEL_SYMBOLS, journal: Optional[OrderJournal] = None,
+                 parent=None):
+        super().__init__(parent)
+        self.async_logic = async_logic
+        self.deployment = AsyncMultiSymbolDeployment(
+            async_logic, api_key, secret_key, market_env, deployments,
+            use_batch_orders=use_batch_orders, max_parallel_symbols=max_parallel_symbols, journal=journal,
+            on_attempt=self.order_attempt_finished.emit, on_rollback=self.rollback_finished.emit,
+            on_symbol_finished=self.symbol_finished.emit
+        )
+
+    def stop(self):
+        """Demande l'arrêt de tous les symboles ; chacun annule ses propres ordres déjà placés."""
+        self.deployment.stop()
+
+    async def run(self):
+        try:
+            self.deployment_finished.emit(await self.deployment.run())
+        finally:
+            self.finished.emit()
+
+
+class AsyncJournalReconcileJob(QObject):
+    """Équivalent asynchrone de JournalReconcileWorker : les symboles sont vérifiés en parallèle."""
+    reconcile_finished = pyqtSignal(object)
+    finished = pyqtSignal()
+
+    def __init__(self, async_logic: AsyncBinanceLogic, api_key: str, secret_key: str, market_env: MarketEnvironment,
+                 journal: Optional[OrderJournal] = None, parent=None):
+        super().__init__(parent)
+        self.async_logic = async_logic
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.market_env = market_env
+        self.journal = journal if journal is not None else OrderJournal.shared()
+
+    unresolved_symbols = JournalReconcileWorker.unresolved_symbols
+
+    async def _reconcile(self, symbol: str) -> ReconcileReport:
+        try:
+            open_orders = await self.async_logic.fetch_open_orders(self.api_key, self.secret_key,
+                                                                   self.market_env, symbol)
+        except Exception as e:
+            return ReconcileReport(symbol=symbol, error=str(e))
+        looked_up = {}
+        client_ids = self.journal.lookups_needed(self.market_env, symbol, open_orders)
+        if client_ids:
+            try:
+                looked_up = await self.async_logic.fetch_orders_by_client_id(self.api_key, self.secret_key,
+                                                                             self.market_env, symbol, client_ids)
+            except Exception:
+                pass  # Les intentions restent en attente jusqu'à la prochaine réconciliation
+        return self.journal.reconcile(self.market_env, symbol, open_orders, looked_up)
+
+    async def run(self):
+        try:
+            reports = await asyncio.gather(*(self._reconcile(symbol) for symbol in self.unresolved_symbols()))
+            self.reconcile_finished.emit(list(reports))
+        finally:
+            self.finished.emit()
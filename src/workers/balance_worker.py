@@ -1,27 +1,24 @@
-from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtCore import pyqtSignal
 from ..app_logic import BinanceLogic, ApiKeyMissingError, CustomNetworkError, CustomExchangeError, AppLogicError
 from ..models.market_environment import MarketEnvironment
 from ..constants import error_messages
+from .task_runner import PooledWorker, PRIORITY_REFRESH
 
-class BalanceWorker(QThread):
+class BalanceWorker(PooledWorker):
     """
-    Worker thread pour récupérer le solde Binance sans bloquer l'UI.
+    Worker pour récupérer le solde Binance sans bloquer l'UI.
     """
     success = pyqtSignal(float)
     error = pyqtSignal(str)
 
+    priority = PRIORITY_REFRESH
+
     def __init__(self, binance_logic: BinanceLogic, api_key: str, secret_key: str, market_environment: MarketEnvironment, parent=None):
         super().__init__(parent)
         self.binance_logic = binance_logic
         self.api_key = api_key
         self.secret_key = secret_key
         self.market_environment = market_environment
-        self._is_running = True
-
-    def stop(self):
-        """Arrête le thread."""
-        self._is_running = False
-        self.wait()
 
     def run(self):
         if not self._is_running:
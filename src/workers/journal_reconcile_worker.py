@@ -0,0 +1,53 @@
+from PyQt5.QtCore import pyqtSignal
+from typing import Any, Dict, List, Optional
+from ..app_logic import BinanceLogic
+from ..models.journal_entry import ReconcileReport
+from ..models.market_environment import MarketEnvironment
+from ..services.order_journal import OrderJournal
+from .task_runner import PooledWorker, PRIORITY_REFRESH
+
+class JournalReconcileWorker(PooledWorker):
+    """
+    Confronte le journal des ordres aux ordres ouverts de l'exchange, symbole par symbole,
+    pour les entrées laissées sans état final (typiquement après un arrêt brutal). Les intentions
+    absentes des ordres ouverts sont ensuite recherchées par leur identifiant client.
+    """
+    reconcile_finished = pyqtSignal(object)
+
+    priority = PRIORITY_REFRESH
+
+    def __init__(self, binance_logic: BinanceLogic, api_key: str, secret_key: str, market_env: MarketEnvironment,
+                 journal: Optional[OrderJournal] = None, parent=None):
+        super().__init__(parent)
+        self.binance_logic = binance_logic
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.market_env = market_env
+        self.journal = journal if journal is not None else OrderJournal.shared()
+
+    def unresolved_symbols(self) -> List[str]:
+        return list(dict.fromkeys(entry.symbol for entry in self.journal.unresolved(self.market_env)))
+
+    def _look_up(self, symbol: str, open_orders: List[Dict[str, Any]]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Recherche par identifiant client des intentions absentes des ordres ouverts."""
+        client_ids = self.journal.lookups_needed(self.market_env, symbol, open_orders)
+        if not client_ids:
+            return {}
+        try:
+            return self.binance_logic.fetch_orders_by_client_id(self.api_key, self.secret_key, self.market_env,
+                                                                symbol, client_ids)
+        except Exception:
+            return {}  # Les intentions restent en attente jusqu'à la prochaine réconciliation
+
+    def run(self):
+        reports = []
+        for symbol in self.unresolved_symbols():
+            try:
+                open_orders = self.binance_logic.fetch_open_orders(self.api_key, self.secret_key,
+                                                                   self.market_env, symbol)
+            except Exception as e:
+                reports.append(ReconcileReport(symbol=symbol, error=str(e)))
+                continue
+            reports.append(self.journal.reconcile(self.market_env, symbol, open_orders,
+                                                  self._look_up(symbol, open_orders)))
+        self.reconcile_finished.emit(reports)
@@ -0,0 +1,44 @@
+from PyQt5.QtCore import pyqtSignal
+from typing import List, Optional
+from ..app_logic import BinanceLogic, MarketEnvironment
+from ..models.dca_deployment import DcaDeployment
+from ..services.dca_ladder import MultiSymbolDeployment, MAX_PARALLEL_SYMBOLS
+from ..services.order_journal import OrderJournal
+from .task_runner import PooledWorker, PRIORITY_ORDER
+
+class MultiSymbolDcaWorker(PooledWorker):
+    """
+    Relais Qt d'un MultiSymbolDeployment : place les échelles DCA de plusieurs symboles
+    en une seule opération.
+
+    Les symboles tournent dans un pool de threads propre à l'opération, et non dans le
+    TaskRunner : ces sous-tâches sont attendues depuis une tâche du TaskRunner, et les
+    placer dans le même pool borné pourrait le bloquer.
+    """
+    order_attempt_finished = pyqtSignal(int, str, bool, object)
+    rollback_finished = pyqtSignal(object)
+    symbol_finished = pyqtSignal(object)
+    deployment_finished = pyqtSignal(object)
+
+    priority = PRIORITY_ORDER
+
+    def __init__(self, binance_logic: BinanceLogic, api_key: str, secret_key: str, market_env: MarketEnvironment,
+                 deployments: List[DcaDeployment], use_batch_orders: bool = True,
+                 max_parallel_symbols: int = MAX_PARALLEL_SYMBOLS, journal: Optional[OrderJournal] = None,
+                 parent=None):
+        super().__init__(parent)
+        self.binance_logic = binance_logic
+        self.deployment = MultiSymbolDeployment(
+            binance_logic, api_key, secret_key, market_env, deployments,
+            use_batch_orders=use_batch_orders, max_parallel_symbols=max_parallel_symbols, journal=journal,
+            on_attempt=self.order_attempt_finished.emit, on_rollback=self.rollback_finished.emit,
+            on_symbol_finished=self.symbol_finished.emit
+        )
+
+    def _request_stop(self) -> None:
+        """Demande l'arrêt de tous les symboles ; chacun annule ses propres ordres déjà placés."""
+        self._is_running = False
+        self.deployment.stop()
+
+    def run(self):
+        self.deployment_finished.emit(self.deployment.run())
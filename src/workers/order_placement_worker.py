@@ -1,4 +1,4 @@
-from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtCore import pyqtSignal
 from typing import Optional
 from ..app_logic import (
     BinanceLogic, ApiKeyMissingError, InvalidOrderParamsError,
@@ -6,11 +6,14 @@ from ..app_logic import (
 )
 from ..models.market_environment import MarketEnvironment
 from ..constants import error_messages
+from .task_runner import PooledWorker, PRIORITY_ORDER
 
-class OrderPlacementWorker(QThread):
+class OrderPlacementWorker(PooledWorker):
     success = pyqtSignal(object)
     error = pyqtSignal(str)
 
+    priority = PRIORITY_ORDER
+
     def __init__(self, binance_logic: BinanceLogic, api_key: str, secret_key: str,
                  market_environment: MarketEnvironment, symbol: str, order_type: str,
                  side: str, amount: float, price: Optional[float] = None, parent=None):
@@ -24,12 +27,6 @@ class OrderPlacementWorker(QThread):
         self.side = side
         self.amount = amount
         self.price = price
-        self._is_running = True
-
-    def stop(self):
-        """Arrête le thread."""
-        self._is_running = False
-        self.wait()
 
     def run(self):
         if not self._is_running:
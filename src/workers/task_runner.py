@@ -0,0 +1,285 @@
+import concurrent.futures
+import threading
+from collections import deque
+from PyQt5.QtCore import QMetaObject, QObject, QRunnable, Qt, QThreadPool, pyqtSignal, pyqtSlot
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+# Priorités du pool (les plus hautes passent d'abord quand tous les threads sont occupés).
+# Les annulations d'une échelle DCA s'exécutent dans sa tâche de placement, déjà démarrée :
+# elles n'attendent jamais derrière un rafraîchissement en file.
+PRIORITY_CANCEL = 30
+PRIORITY_ORDER = 20
+PRIORITY_DEFAULT = 10
+PRIORITY_REFRESH = 0
+
+# Nombre de threads du pool partagé ; le limiteur de débit fixe de toute façon le rythme des requêtes.
+DEFAULT_MAX_WORKERS = 4
+# Délai laissé aux tâches en cours (annulations DCA comprises) lors de l'arrêt de l'application.
+SHUTDOWN_TIMEOUT_MS = 30000
+
+
+class CancellationToken:
+    """Drapeau d'annulation partagé entre le demandeur et la tâche, avec rappels à l'annulation."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """Appelle ``callback`` à l'annulation, ou tout de suite si elle a déjà eu lieu."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+
+class TaskFuture(QObject):
+    """
+    Résultat d'une tâche du pool. Les signaux sont émis dans le thread Qt, par la boucle
+    d'événements, une fois la tâche terminée : une connexion faite juste après ``submit``
+    ne peut donc pas manquer la fin d'une tâche rapide. ``result`` permet d'attendre hors du
+    thread Qt.
+    """
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    finished = pyqtSignal()
+
+    def __init__(self, token: CancellationToken, parent=None):
+        super().__init__(parent)
+        self.token = token
+        self._future: concurrent.futures.Future = concurrent.futures.Future()
+
+    def cancel(self) -> None:
+        """Annule la tâche : elle ne démarrera pas si elle attend encore, et son jeton la prévient si elle tourne."""
+        self.token.cancel()
+
+    def cancelled(self) -> bool:
+        return self._future.cancelled()
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        return self._future.result(timeout)
+
+    def exception(self, timeout: Optional[float] = None) -> Optional[BaseException]:
+        return self._future.exception(timeout)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Attend la fin de la tâche ; à ne pas appeler depuis le thread Qt."""
+        done, _ = concurrent.futures.wait([self._future], timeout)
+        return bool(done)
+
+    def _schedule_delivery(self) -> None:
+        """Appelé dans le thread du pool : confie l'émission des signaux à la boucle du thread Qt."""
+        QMetaObject.invokeMethod(self, "_deliver", Qt.QueuedConnection)
+
+    @pyqtSlot()
+    def _deliver(self):
+        if not self._future.cancelled():
+            error = self._future.exception()
+            if error is not None:
+                self.failed.emit(error)
+            else:
+                self.succeeded.emit(self._future.result())
+        self.finished.emit()
+
+
+class _TaskRunnable(QRunnable):
+    def __init__(self, runner: 'TaskRunner', call: Callable[[], Any], future: TaskFuture, group: Optional[str]):
+        super().__init__()
+        self._runner = runner
+        self._call = call
+        self._future = future
+        self._group = group
+
+    def run(self):
+        future = self._future
+        try:
+            if future.token.is_cancelled:
+                future._future.cancel()
+            if not future._future.set_running_or_notify_cancel():
+                return
+            try:
+                result = self._call()
+            except BaseException as e:
+                future._future.set_exception(e)
+            else:
+                future._future.set_result(result)
+        finally:
+            self._call = None
+            self._runner._task_done(self._group)
+            future._schedule_delivery()
+
+
+class TaskRunner(QObject):
+    """
+    Pool de threads borné (QThreadPool) partagé par les workers de l'application.
+
+    Remplace le QThread créé à chaque clic : une tâche soumise attend un thread libre,
+    par ordre de priorité, au lieu d'être ignorée quand une opération du même type tourne.
+    Les tâches d'un même ``group`` s'exécutent l'une après l'autre, dans l'ordre de
+    soumission. Chaque tâche reçoit un CancellationToken et rend un TaskFuture.
+
+    Les tâches doivent être soumises depuis le thread Qt : leurs références sont libérées
+    dans ce thread, une fois les signaux de fin livrés.
+    """
+
+    _shared_instance: Optional['TaskRunner'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max(1, max_workers))
+        self._lock = threading.Lock()
+        self._groups: Dict[str, Deque[Tuple[_TaskRunnable, int]]] = {}
+        self._live: Set[TaskFuture] = set()
+        self._keep_alive: Dict[TaskFuture, Any] = {}
+
+    @classmethod
+    def shared(cls) -> 'TaskRunner':
+        """Instance unique du processus."""
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    @property
+    def max_workers(self) -> int:
+        return self._pool.maxThreadCount()
+
+    def submit(self, fn: Callable[..., Any], *args, priority: int = PRIORITY_DEFAULT,
+               token: Optional[CancellationToken] = None, group: Optional[str] = None,
+               keep_alive: Any = None, **kwargs) -> TaskFuture:
+        """
+        Planifie ``fn(*args, **kwargs)`` dans le pool.
+
+        Args:
+            priority: Rang dans la file d'attente du pool (voir les constantes PRIORITY_*).
+            token: Jeton d'annulation à associer, créé sinon (``future.token``).
+            group: Nom de file sérielle : la tâche attend la fin des précédentes du même groupe.
+            keep_alive: Objet gardé en vie jusqu'à la livraison des signaux de fin (un worker, typiquement).
+        """
+        future = TaskFuture(token if token is not None else CancellationToken())
+        runnable = _TaskRunnable(self, lambda: fn(*args, **kwargs), future, group)
+        future.finished.connect(self._release)
+        with self._lock:
+            self._live.add(future)
+            self._keep_alive[future] = keep_alive
+            if group is not None:
+                queue = self._groups.setdefault(group, deque())
+                queue.append((runnable, priority))
+                if len(queue) > 1:
+                    return future
+        self._pool.start(runnable, priority)
+        return future
+
+    def _task_done(self, group: Optional[str]) -> None:
+        """Appelé dans le thread du pool : lance la tâche suivante du groupe."""
+        if group is None:
+            return
+        following = None
+        with self._lock:
+            queue = self._groups[group]
+            queue.popleft()
+            if queue:
+                following = queue[0]
+            else:
+                del self._groups[group]
+        if following is not None:
+            self._pool.start(*following)
+
+    @pyqtSlot()
+    def _release(self):
+        future = self.sender()
+        with self._lock:
+            self._live.discard(future)
+            self._keep_alive.pop(future, None)
+
+    def pending(self) -> int:
+        """Nombre de tâches soumises dont les signaux de fin n'ont pas encore été livrés."""
+        with self._lock:
+            return len(self._live)
+
+    def cancel_all(self) -> None:
+        with self._lock:
+            futures = list(self._live)
+        for future in futures:
+            future.cancel()
+
+    def wait_for_done(self, timeout_ms: int = SHUTDOWN_TIMEOUT_MS) -> bool:
+        """Attend la fin des tâches en cours et en file ; réservé à l'arrêt de l'application."""
+        return self._pool.waitForDone(timeout_ms)
+
+
+class PooledWorker(QObject):
+    """
+    Base des workers exécutés dans le TaskRunner plutôt que dans leur propre QThread.
+
+    Garde l'interface des anciens QThread (``start``, ``isRunning``, ``wait``, ``finished``)
+    pour que les appelants n'aient pas à changer ; ``stop`` ne bloque plus le thread Qt.
+    """
+    finished = pyqtSignal()
+
+    # Rang de la tâche dans la file du pool.
+    priority = PRIORITY_DEFAULT
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._is_running = True
+        self.token = CancellationToken()
+        self.token.add_callback(self._request_stop)
+        self.future: Optional[TaskFuture] = None
+
+    def task_group(self) -> Optional[str]:
+        """File sérielle du worker : deux demandes du même type s'exécutent l'une après l'autre."""
+        return type(self).__name__
+
+    def start(self, runner: Optional[TaskRunner] = None) -> TaskFuture:
+        runner = runner if runner is not None else TaskRunner.shared()
+        self.future = runner.submit(self.run, priority=self.priority, token=self.token,
+                                    group=self.task_group(), keep_alive=self)
+        self.future.finished.connect(self.finished)
+        return self.future
+
+    def isRunning(self) -> bool:
+        return self.future is not None and not self.future.done()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Attend la fin de la tâche ; à ne pas appeler depuis le thread Qt."""
+        return self.future is None or self.future.wait(timeout)
+
+    def _request_stop(self) -> None:
+        self._is_running = False
+
+    def stop(self):
+        """Demande l'arrêt sans attendre : une tâche encore en file ne démarrera pas."""
+        self.token.cancel()
+
+    def run(self):
+        """
+        Corps de la tâche, exécuté dans un thread du pool : chaque sous-classe doit le redéfinir.
+
+        Les résultats et les erreurs sont publiés par les signaux propres au worker (``success``,
+        ``error``…), à n'émettre que tant que ``_is_running`` est vrai ; ``finished`` est émis
+        ensuite par le pool. La valeur retournée, en général None, devient le résultat du
+        TaskFuture (signal ``succeeded``) ; une exception non rattrapée est transmise par son
+        signal ``failed``.
+        """
+        raise NotImplementedError
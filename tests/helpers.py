@@ -0,0 +1,8 @@
+class FakeClock:
+    """Stand-in for time.time / time.monotonic: returns ``now``, which tests advance by hand."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
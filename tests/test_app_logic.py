@@ -13,11 +13,14 @@ from src.app_logic import (
     InvalidOrderParamsError
 )
 from src.constants import error_messages, ui_strings
+from src.services.futures_config_cache import FuturesConfigCache
+from src.services.market_index import MarketIndex
+from src.services.retry_policy import RetryPolicy
 
 class TestBinanceLogic(unittest.TestCase):
     def setUp(self):
         """Set up for test methods."""
-        self.logic = BinanceLogic()
+        self.logic = BinanceLogic(market_index=MarketIndex(cache_dir=None), futures_config=FuturesConfigCache())
         self.dummy_api_key = "test_api_key"
         self.dummy_secret_key = "test_secret_key"
 
@@ -362,5 +365,331 @@ class TestBinanceLogic(unittest.TestCase):
                 'BTC/USDT', ui_strings.ORDER_TYPE_LIMIT, ui_strings.SIDE_BUY, 1.0, 30000.0
             )
 
+    # --- Tests for place_orders_batch ---
+
+    def _batch_orders(self, count):
+        return [
+            {'order_type': ui_strings.ORDER_TYPE_LIMIT, 'side': ui_strings.SIDE_BUY,
+             'amount': 1.0 + i, 'price': 100.0 - i}
+            for i in range(count)
+        ]
+
+    @patch('src.app_logic.ccxt.binance')
+    def test_place_orders_batch_futures_uses_native_batch(self, mock_binance_constructor):
+        mock_exchange = MagicMock()
+        mock_exchange.create_orders.return_value = [
+            {'id': '1', 'status': 'open'},
+            {'info': {'code': -4005, 'msg': 'Quantity greater than max quantity.'}, 'status': 'rejected'},
+            {'id': '3', 'status': 'open'},
+        ]
+        mock_binance_constructor.return_value = mock_exchange
+
+        results = self.logic.place_orders_batch(
+            self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.FUTURES_LIVE,
+            'BTC/USDT', self._batch_orders(3), margin_mode=ui_strings.MERGE_MODE_CROSS, leverage=10
+        )
+
+        mock_exchange.create_orders.assert_called_once()
+        requests = mock_exchange.create_orders.call_args[0][0]
+        self.assertEqual([r['price'] for r in requests], [100.0, 99.0, 98.0])
+        self.assertEqual(requests[0]['type'], 'limit')
+        self.assertEqual(requests[0]['side'], 'buy')
+        mock_exchange.create_order.assert_not_called()
+        mock_exchange.set_margin_mode.assert_called_once()
+        mock_exchange.set_leverage.assert_called_once()
+
+        self.assertEqual([success for success, _ in results], [True, False, True])
+        self.assertEqual(results[0][1]['id'], '1')
+        self.assertIsInstance(results[1][1], OrderPlacementError)
+        self.assertIn('-4005', str(results[1][1]))
+
+    @patch('src.app_logic.ccxt.binance')
+    def test_unchanged_margin_mode_is_not_an_error(self, mock_binance_constructor):
+        mock_exchange = MagicMock()
+        mock_exchange.set_margin_mode.side_effect = ccxt.OperationRejected(
+            'binance {"code": -4046, "msg": "No need to change margin type."}')
+        mock_exchange.create_orders.return_value = [{'id': '1', 'status': 'open'}]
+        mock_binance_constructor.return_value = mock_exchange
+
+        results = self.logic.place_orders_batch(
+            self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.FUTURES_LIVE,
+            'BTC/USDT', self._batch_orders(1), margin_mode=ui_strings.MERGE_MODE_CROSS, leverage=10
+        )
+
+        self.assertEqual([success for success, _ in results], [True])
+        mock_exchange.set_leverage.assert_called_once()
+
+    @patch('src.app_logic.ccxt.binance')
+    def test_futures_settings_are_sent_once_per_symbol(self, mock_binance_constructor):
+        mock_exchange = MagicMock()
+        mock_exchange.fapiPrivateV2GetPositionRisk.side_effect = ccxt.NetworkError("Timeout")
+        mock_exchange.create_order.return_value = {'id': '1', 'status': 'open'}
+        mock_binance_constructor.return_value = mock_exchange
+
+        for _ in range(3):
+            self.logic.place_order(self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.FUTURES_LIVE,
+                                   'BTC/USDT', ui_strings.ORDER_TYPE_LIMIT, ui_strings.SIDE_BUY, 1.0, 30000.0,
+                                   margin_mode=ui_strings.MERGE_MODE_CROSS, leverage=10)
+        self.logic.place_order(self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.FUTURES_LIVE,
+                               'BTC/USDT', ui_strings.ORDER_TYPE_LIMIT, ui_strings.SIDE_BUY, 1.0, 30000.0,
+                               margin_mode=ui_strings.MERGE_MODE_CROSS, leverage=20)
+
+        mock_exchange.fapiPrivateV2GetPositionRisk.assert_called_once_with({'symbol': 'BTCUSDT'})
+        mock_exchange.set_margin_mode.assert_called_once()
+        self.assertEqual([c.args[0] for c in mock_exchange.set_leverage.call_args_list], [10, 20])
+        self.assertEqual(mock_exchange.create_order.call_count, 4)
+
+    @patch('src.app_logic.ccxt.binance')
+    def test_futures_settings_are_seeded_from_position_risk(self, mock_binance_constructor):
+        mock_exchange = MagicMock()
+        mock_exchange.fapiPrivateV2GetPositionRisk.return_value = [
+            {'symbol': 'BTCUSDT', 'marginType': 'isolated', 'leverage': '10', 'positionAmt': '0.000'}]
+        mock_binance_constructor.return_value = mock_exchange
+
+        self.logic.configure_futures_symbol(self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.FUTURES_LIVE,
+                                            'BTC/USDT', ui_strings.MERGE_MODE_ISOLATED, 10)
+        self.logic.configure_futures_symbol(self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.FUTURES_LIVE,
+                                            'BTC/USDT', ui_strings.MERGE_MODE_CROSS, 10)
+
+        mock_exchange.set_margin_mode.assert_called_once()
+        self.assertEqual(mock_exchange.set_margin_mode.call_args.args[:2], ('CROSSED', 'BTC/USDT'))
+        mock_exchange.set_leverage.assert_not_called()
+
+    @patch('src.app_logic.ccxt.binance')
+    def test_failed_futures_setting_invalidates_the_cache(self, mock_binance_constructor):
+        mock_exchange = MagicMock()
+        mock_exchange.fapiPrivateV2GetPositionRisk.return_value = [
+            {'symbol': 'BTCUSDT', 'marginType': 'cross', 'leverage': '20'}]
+        mock_exchange.set_leverage.side_effect = [ccxt.BadRequest("binance {\"code\":-4028}"), {'leverage': 50}]
+        mock_binance_constructor.return_value = mock_exchange
+
+        with self.assertRaises(OrderPlacementError):
+            self.logic.configure_futures_symbol(self.dummy_api_key, self.dummy_secret_key,
+                                                MarketEnvironment.FUTURES_LIVE, 'BTC/USDT', ui_strings.MERGE_MODE_CROSS, 50)
+        self.assertIsNone(self.logic.futures_config.get(self.dummy_api_key, MarketEnvironment.FUTURES_LIVE, 'BTC/USDT'))
+
+        self.logic.configure_futures_symbol(self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.FUTURES_LIVE,
+                                            'BTC/USDT', ui_strings.MERGE_MODE_CROSS, 50)
+
+        self.assertEqual(mock_exchange.fapiPrivateV2GetPositionRisk.call_count, 2)
+        mock_exchange.set_margin_mode.assert_not_called()
+        self.assertEqual(mock_exchange.set_leverage.call_count, 2)
+        known = self.logic.futures_config.get(self.dummy_api_key, MarketEnvironment.FUTURES_LIVE, 'BTC/USDT')
+        self.assertEqual((known.margin_mode, known.leverage), ('CROSSED', 50))
+
+    @patch('src.app_logic.ccxt.binance')
+    def test_place_orders_batch_spot_falls_back_to_sequential(self, mock_binance_constructor):
+        mock_exchange = MagicMock()
+        mock_exchange.create_order.side_effect = [
+            {'id': '1', 'status': 'open'},
+            ccxt.InsufficientFunds("Account has insufficient balance"),
+        ]
+        mock_binance_constructor.return_value = mock_exchange
+
+        results = self.logic.place_orders_batch(
+            self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.SPOT,
+            'BTC/USDT', self._batch_orders(3)
+        )
+
+        mock_exchange.create_orders.assert_not_called()
+        self.assertEqual(mock_exchange.create_order.call_count, 2)
+        mock_binance_constructor.assert_called_once()
+        self.assertEqual([success for success, _ in results], [True, False, False])
+        self.assertIsInstance(results[1][1], InsufficientFundsError)
+        self.assertIn(error_messages.BATCH_ORDER_NOT_SUBMITTED, str(results[2][1]))
+
+    @patch('src.app_logic.ccxt.binance')
+    def test_place_orders_batch_request_failure_fails_every_order(self, mock_binance_constructor):
+        mock_exchange = MagicMock()
+        mock_exchange.create_orders.side_effect = ccxt.NetworkError("Timeout")
+        mock_binance_constructor.return_value = mock_exchange
+
+        results = self.logic.place_orders_batch(
+            self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.FUTURES_TESTNET,
+            'BTC/USDT', self._batch_orders(2)
+        )
+
+        self.assertEqual(len(results), 2)
+        for success, error in results:
+            self.assertFalse(success)
+            self.assertIsInstance(error, CustomNetworkError)
+
+    def test_place_orders_batch_rejects_oversized_batch(self):
+        too_many = BinanceLogic.max_batch_size(MarketEnvironment.FUTURES_LIVE) + 1
+        with self.assertRaises(InvalidOrderParamsError):
+            self.logic.place_orders_batch(
+                self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.FUTURES_LIVE,
+                'BTC/USDT', self._batch_orders(too_many)
+            )
+
+    def test_place_orders_batch_validates_before_sending(self):
+        orders = self._batch_orders(2)
+        orders[1]['price'] = 0
+        with self.assertRaisesRegex(InvalidOrderParamsError, error_messages.PARAM_PRICE_MUST_BE_POSITIVE_LIMIT):
+            self.logic.place_orders_batch(
+                self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.FUTURES_LIVE,
+                'BTC/USDT', orders
+            )
+
+    # --- Tests for client order ids and retries ---
+
+    def _retrying_logic(self, max_retries=3):
+        return BinanceLogic(market_index=MarketIndex(cache_dir=None), futures_config=FuturesConfigCache(),
+                            retry_policy=RetryPolicy(max_retries=max_retries, base_delay=0.0))
+
+    def test_retry_policy_backoff_is_exponential_and_capped(self):
+        policy = RetryPolicy(max_retries=2, base_delay=0.5, max_delay=1.5, rng=lambda: 1.0)
+        self.assertEqual([policy.delay(n) for n in range(4)], [0.5, 1.0, 1.5, 1.5])
+        self.assertEqual([policy.allows(n) for n in range(3)], [True, True, False])
+        self.assertEqual(RetryPolicy(rng=lambda: 0.0).delay(3), 0.0)
+
+    @patch('src.app_logic.ccxt.binance')
+    def test_place_order_resubmits_after_lookup_finds_nothing(self, mock_binance_constructor):
+        mock_exchange = MagicMock()
+        mock_exchange.create_order.side_effect = [ccxt.RequestTimeout("Timeout"), {'id': '7', 'status': 'open'}]
+        mock_exchange.fetch_order.side_effect = ccxt.OrderNotFound("Order does not exist.")
+        mock_binance_constructor.return_value = mock_exchange
+
+        order = self._retrying_logic().place_order(
+            self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.SPOT,
+            'BTC/USDT', ui_strings.ORDER_TYPE_LIMIT, ui_strings.SIDE_BUY, 1.0, 30000.0, client_order_id="dca-run-0"
+        )
+
+        self.assertEqual(order['id'], '7')
+        self.assertEqual(mock_exchange.create_order.call_count, 2)
+        for call in mock_exchange.create_order.call_args_list:
+            self.assertEqual(call[0][5], {'newClientOrderId': "dca-run-0"})
+        mock_exchange.fetch_order.assert_called_once_with(None, 'BTC/USDT', {'origClientOrderId': "dca-run-0"})
+
+    @patch('src.app_logic.ccxt.binance')
+    def test_place_order_timeout_does_not_double_place(self, mock_binance_constructor):
+        mock_exchange = MagicMock()
+        mock_exchange.create_order.side_effect = ccxt.RequestTimeout("Timeout")
+        # The first lookup is lost as well; the second one finds the order the timed out request placed.
+        mock_exchange.fetch_order.side_effect = [ccxt.NetworkError("Reset"), {'id': '8', 'status': 'open'}]
+        mock_binance_constructor.return_value = mock_exchange
+
+        order = self._retrying_logic().place_order(
+            self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.FUTURES_TESTNET,
+            'BTC/USDT', ui_strings.ORDER_TYPE_LIMIT, ui_strings.SIDE_BUY, 1.0, 30000.0, client_order_id="dca-run-1"
+        )
+
+        self.assertEqual(order['id'], '8')
+        mock_exchange.create_order.assert_called_once()
+        self.assertEqual(mock_exchange.fetch_order.call_count, 2)
+
+    @patch('src.app_logic.ccxt.binance')
+    def test_place_order_gives_up_after_max_retries(self, mock_binance_constructor):
+        mock_exchange = MagicMock()
+        mock_exchange.create_order.side_effect = ccxt.RequestTimeout("Timeout")
+        mock_exchange.fetch_order.side_effect = ccxt.OrderNotFound("Order does not exist.")
+        mock_binance_constructor.return_value = mock_exchange
+
+        with self.assertRaises(CustomNetworkError):
+            self._retrying_logic(max_retries=2).place_order(
+                self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.SPOT,
+                'BTC/USDT', ui_strings.ORDER_TYPE_LIMIT, ui_strings.SIDE_BUY, 1.0, 30000.0, client_order_id="dca-run-2"
+            )
+        self.assertEqual(mock_exchange.create_order.call_count, 3)
+        self.assertEqual(mock_exchange.fetch_order.call_count, 2)
+
+    @patch('src.app_logic.ccxt.binance')
+    def test_place_orders_batch_resends_only_orders_the_exchange_lacks(self, mock_binance_constructor):
+        mock_exchange = MagicMock()
+        mock_exchange.create_orders.side_effect = [ccxt.RequestTimeout("Timeout"), [{'id': '2', 'status': 'open'}]]
+        mock_exchange.fetch_order.side_effect = [{'id': '1', 'status': 'open'}, ccxt.OrderNotFound("Unknown order")]
+        mock_binance_constructor.return_value = mock_exchange
+        orders = self._batch_orders(2)
+        for i, order in enumerate(orders):
+            order['client_order_id'] = f"dca-run-{i}"
+
+        results = self._retrying_logic().place_orders_batch(
+            self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.FUTURES_LIVE, 'BTC/USDT', orders
+        )
+
+        self.assertEqual([(success, payload['id']) for success, payload in results], [(True, '1'), (True, '2')])
+        first, second = [call[0][0] for call in mock_exchange.create_orders.call_args_list]
+        self.assertEqual([r['params'] for r in first], [{'newClientOrderId': "dca-run-0"}, {'newClientOrderId': "dca-run-1"}])
+        self.assertEqual([r['params'] for r in second], [{'newClientOrderId': "dca-run-1"}])
+
+    # --- Tests for cancel_orders ---
+
+    @patch('src.app_logic.ccxt.binance')
+    def test_cancel_orders_futures_uses_cancel_multiple(self, mock_binance_constructor):
+        mock_exchange = MagicMock()
+        mock_exchange.has = {'cancelOrders': True}
+        mock_exchange.cancel_orders.side_effect = lambda ids, symbol: [{'id': i, 'status': 'canceled'} for i in ids]
+        mock_exchange.fetch_open_orders.return_value = [{'id': 'other'}]
+        mock_binance_constructor.return_value = mock_exchange
+        order_ids = [str(i) for i in range(12)]
+
+        report = self.logic.cancel_orders(
+            self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.FUTURES_LIVE, 'BTC/USDT', order_ids
+        )
+
+        self.assertEqual(mock_exchange.cancel_orders.call_count, 2)
+        mock_exchange.cancel_order.assert_not_called()
+        mock_exchange.cancel_all_orders.assert_not_called()
+        self.assertEqual(sorted(report.cancelled, key=int), order_ids)
+        self.assertEqual(report.still_open, [])
+        self.assertTrue(report.success)
+
+    @patch('src.app_logic.ccxt.binance')
+    def test_cancel_orders_spot_cancels_individually_and_reports_failures(self, mock_binance_constructor):
+        mock_exchange = MagicMock()
+
+        def cancel_order(order_id, symbol):
+            if order_id == '2':
+                raise ccxt.OrderNotFound("Unknown order sent.")
+            return {'id': order_id, 'status': 'canceled'}
+
+        mock_exchange.cancel_order.side_effect = cancel_order
+        mock_exchange.fetch_open_orders.return_value = []
+        mock_binance_constructor.return_value = mock_exchange
+
+        report = self.logic.cancel_orders(
+            self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.SPOT, 'BTC/USDT', ['1', '2', '3']
+        )
+
+        mock_exchange.cancel_orders.assert_not_called()
+        self.assertEqual(sorted(report.cancelled), ['1', '3'])
+        self.assertIn('2', report.failed)
+        self.assertTrue(report.verified)
+        self.assertTrue(report.success)
+
+    @patch('src.app_logic.ccxt.binance')
+    def test_cancel_orders_retries_orders_still_open(self, mock_binance_constructor):
+        mock_exchange = MagicMock()
+        mock_exchange.has = {'cancelOrders': True}
+        mock_exchange.cancel_orders.return_value = [
+            {'id': '1', 'status': 'canceled'},
+            {'info': {'code': -1000, 'msg': 'Internal error'}, 'status': 'rejected'},
+        ]
+        mock_exchange.fetch_open_orders.side_effect = [[{'id': '2'}], []]
+        mock_binance_constructor.return_value = mock_exchange
+
+        report = self.logic.cancel_orders(
+            self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.FUTURES_LIVE, 'BTC/USDT', ['1', '2']
+        )
+
+        mock_exchange.cancel_order.assert_called_once_with('2', 'BTC/USDT')
+        self.assertEqual(report.failed, {})
+        self.assertEqual(report.still_open, [])
+        self.assertTrue(report.success)
+
+    @patch('src.app_logic.ccxt.binance')
+    def test_cancel_orders_unverified_when_open_orders_unavailable(self, mock_binance_constructor):
+        mock_exchange = MagicMock()
+        mock_exchange.fetch_open_orders.side_effect = ccxt.NetworkError("Timeout")
+        mock_binance_constructor.return_value = mock_exchange
+
+        report = self.logic.cancel_orders(
+            self.dummy_api_key, self.dummy_secret_key, MarketEnvironment.SPOT, 'BTC/USDT', ['1']
+        )
+
+        self.assertFalse(report.verified)
+        self.assertFalse(report.success)
+        self.assertIn("Timeout", report.summary())
+
 if __name__ == '__main__':
     unittest.main()
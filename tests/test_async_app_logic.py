@@ -0,0 +1,234 @@
+import asyncio
+import sys
+import time
+import unittest
+from unittest.mock import patch, MagicMock, AsyncMock
+import ccxt
+from PyQt5.QtCore import QCoreApplication
+from src.async_app_logic import AsyncBinanceLogic
+from src.app_logic import (BinanceLogic, CustomNetworkError, InvalidOrderParamsError, MarketEnvironment,
+                           OrderPlacementError)
+from src.controllers.async_worker_controller import AsyncWorkerController
+from src.models.rollback_report import RollbackReport
+from src.services.async_runner import AsyncLoopThread
+from src.services.dca_ladder import AsyncDcaLadder
+from src.services.exchange_factory import AsyncExchangePool
+from src.services.futures_config_cache import FuturesConfigCache
+from src.services.market_index import MarketIndex
+from src.services.order_journal import OrderJournal
+from src.services.rate_limiter import RateLimiter
+from src.services.retry_policy import RetryPolicy
+
+
+def make_exchange():
+    exchange = MagicMock()
+    exchange.has = {'cancelOrders': True}
+    exchange.last_response_headers = {}
+    for name in ('fetch_balance', 'create_order', 'create_orders', 'set_margin_mode', 'set_leverage',
+                 'cancel_order', 'cancel_orders', 'fetch_open_orders', 'close'):
+        setattr(exchange, name, AsyncMock())
+    return exchange
+
+
+class TestAsyncBinanceLogic(unittest.TestCase):
+    def setUp(self):
+        self.exchange = make_exchange()
+        patcher = patch('src.services.exchange_factory.ccxt_async.binance', return_value=self.exchange)
+        self.mock_constructor = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.logic = AsyncBinanceLogic(rate_limiter=RateLimiter(), market_index=MarketIndex(cache_dir=None),
+                                       futures_config=FuturesConfigCache())
+
+    def test_get_balance_reuses_one_client(self):
+        self.exchange.fetch_balance.return_value = {'total': {'USDT': 42.0}}
+
+        async def scenario():
+            balances = await asyncio.gather(*(self.logic.get_balance("key", "secret", MarketEnvironment.SPOT)
+                                              for _ in range(10)))
+            await self.logic.close()
+            return balances
+
+        self.assertEqual(asyncio.run(scenario()), [42.0] * 10)
+        self.mock_constructor.assert_called_once()
+        self.exchange.close.assert_awaited()
+
+    def test_get_balance_maps_network_error(self):
+        self.exchange.fetch_balance.side_effect = ccxt.NetworkError("down")
+        with self.assertRaises(CustomNetworkError):
+            asyncio.run(self.logic.get_balance("key", "secret", MarketEnvironment.SPOT))
+
+    def test_place_order_validates_and_passes_empty_params(self):
+        self.exchange.create_order.return_value = {'id': '1'}
+        with self.assertRaises(InvalidOrderParamsError):
+            asyncio.run(self.logic.place_order("key", "secret", MarketEnvironment.SPOT, "BTC/USDT", "LIMIT", "BUY", 1, None))
+
+        result = asyncio.run(self.logic.place_order("key", "secret", MarketEnvironment.FUTURES_LIVE, "BTC/USDT",
+                                                    "LIMIT", "BUY", 1, 100.0, margin_mode="Isolé", leverage=5))
+        self.assertEqual(result, {'id': '1'})
+        self.exchange.set_margin_mode.assert_awaited_once()
+        self.exchange.set_leverage.assert_awaited_once()
+        self.exchange.create_order.assert_awaited_with("BTC/USDT", "limit", "buy", 1, 100.0, {})
+
+    def test_place_orders_batch_flags_rejected_orders(self):
+        self.exchange.create_orders.return_value = [{'id': '1'}, {'status': 'rejected', 'info': {'code': -2019, 'msg': 'margin'}}]
+        orders = [{'order_type': 'LIMIT', 'side': 'BUY', 'amount': 1, 'price': 100.0},
+                  {'order_type': 'LIMIT', 'side': 'BUY', 'amount': 1, 'price': 90.0}]
+        results = asyncio.run(self.logic.place_orders_batch("key", "secret", MarketEnvironment.FUTURES_TESTNET,
+                                                            "BTC/USDT", orders))
+        self.assertEqual(results[0], (True, {'id': '1'}))
+        self.assertFalse(results[1][0])
+        self.assertIn("-2019", str(results[1][1]))
+
+    def test_cancel_orders_runs_chunks_concurrently_and_verifies(self):
+        in_flight = []
+        peak = []
+
+        async def cancel_chunk(ids, symbol):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return [{'id': order_id} for order_id in ids]
+
+        self.exchange.cancel_orders.side_effect = cancel_chunk
+        self.exchange.fetch_open_orders.return_value = []
+        ids = [str(i) for i in range(25)]
+
+        report = asyncio.run(self.logic.cancel_orders("key", "secret", MarketEnvironment.FUTURES_LIVE, "BTC/USDT", ids))
+
+        self.assertEqual(self.exchange.cancel_orders.await_count, 3)
+        self.assertEqual(max(peak), 3)
+        self.assertEqual(sorted(report.cancelled, key=int), ids)
+        self.assertTrue(report.success)
+
+    def test_spot_cancel_retries_orders_still_open(self):
+        self.exchange.fetch_open_orders.side_effect = [[{'id': '2'}], []]
+        report = asyncio.run(self.logic.cancel_orders("key", "secret", MarketEnvironment.SPOT, "BTC/USDT", ['1', '2']))
+        self.assertEqual(self.exchange.cancel_order.await_count, 3)
+        self.assertTrue(report.success)
+
+    def test_batch_resends_only_orders_missing_after_network_error(self):
+        self.logic.retry_policy = RetryPolicy(base_delay=0)
+        self.exchange.create_orders.side_effect = [ccxt.NetworkError("timeout"), [{'id': '2'}]]
+
+        async def fetch_order(order_id, symbol, params):
+            if params['origClientOrderId'] == "a":
+                return {'id': '1'}
+            raise ccxt.OrderNotFound("unknown")
+
+        self.exchange.fetch_order = AsyncMock(side_effect=fetch_order)
+        orders = [{'order_type': 'LIMIT', 'side': 'BUY', 'amount': 1, 'price': 100.0, 'client_order_id': "a"},
+                  {'order_type': 'LIMIT', 'side': 'BUY', 'amount': 1, 'price': 90.0, 'client_order_id': "b"}]
+
+        results = asyncio.run(self.logic.place_orders_batch("key", "secret", MarketEnvironment.FUTURES_TESTNET,
+                                                            "BTC/USDT", orders))
+
+        self.assertEqual(results, [(True, {'id': '1'}), (True, {'id': '2'})])
+        resent = self.exchange.create_orders.await_args_list[1][0][0]
+        self.assertEqual([request['params'] for request in resent], [{'newClientOrderId': "b"}])
+
+    def test_margin_mode_already_set_is_not_an_error(self):
+        self.exchange.set_margin_mode.side_effect = ccxt.ExchangeError('{"code":-4046,"msg":"No need to change"}')
+        self.exchange.set_leverage.side_effect = ccxt.ExchangeError("leverage not valid")
+
+        asyncio.run(self.logic.configure_futures_symbol("key", "secret", MarketEnvironment.FUTURES_LIVE,
+                                                        "BTC/USDT", "Isolé", 0))
+        with self.assertRaisesRegex(OrderPlacementError, "Failed to set leverage to 5"):
+            asyncio.run(self.logic.configure_futures_symbol("key", "secret", MarketEnvironment.FUTURES_LIVE,
+                                                            "BTC/USDT", "Isolé", 5))
+        self.assertIsNone(self.logic.futures_config.get("key", MarketEnvironment.FUTURES_LIVE, "BTC/USDT"))
+
+    def test_async_ladder_rolls_back_after_a_failed_level(self):
+        logic = MagicMock()
+        logic.max_batch_size.side_effect = BinanceLogic.max_batch_size
+        logic.prepare_orders = AsyncMock(side_effect=lambda *args: [(True, order) for order in args[-1]])
+        logic.margin_brackets = AsyncMock(return_value=None)
+        logic.configure_futures_symbol = AsyncMock()
+        logic.place_orders_batch = AsyncMock(side_effect=lambda **kwargs: [
+            (True, {'id': '1'}), (False, OrderPlacementError("rejected"))])
+        logic.cancel_orders = AsyncMock(return_value=RollbackReport(symbol="BTC/USDT", requested=['1'],
+                                                                    cancelled=['1'], verified=True))
+        errors = []
+        ladder = AsyncDcaLadder(logic, "key", "secret", MarketEnvironment.FUTURES_TESTNET, "BTC/USDT",
+                                [{'price': 100.0, 'amount': 1.0}, {'price': 90.0, 'amount': 1.0}], "Croisé", 2,
+                                journal=OrderJournal(path=None), on_error=errors.append)
+
+        asyncio.run(ladder.run())
+
+        logic.cancel_orders.assert_awaited_once_with("key", "secret", MarketEnvironment.FUTURES_TESTNET,
+                                                     "BTC/USDT", ['1'])
+        self.assertIn("l'ordre 2", errors[0])
+        self.assertIn("Tous les ordres ont été annulés.", errors[0])
+        self.assertIsNone(asyncio.run(ladder.rollback()))
+
+    def test_secret_rotation_replaces_client(self):
+        pool = AsyncExchangePool()
+        first = pool.get("key", "secret", MarketEnvironment.SPOT)
+        self.mock_constructor.return_value = make_exchange()
+        second = pool.get("key", "other", MarketEnvironment.SPOT)
+        self.assertIsNot(first, second)
+        asyncio.run(pool.close())
+        first.close.assert_awaited_once()
+
+    def test_acquire_async_waits_without_blocking(self):
+        limiter = RateLimiter(limits={MarketEnvironment.SPOT: [('weight', 1, 0.05, 'x')]}, headroom=1.0)
+
+        async def scenario():
+            await limiter.acquire_async(MarketEnvironment.SPOT)
+            ticks = []
+
+            async def ticker():
+                for _ in range(3):
+                    ticks.append(1)
+                    await asyncio.sleep(0)
+
+            waited, _ = await asyncio.gather(limiter.acquire_async(MarketEnvironment.SPOT), ticker())
+            return waited, ticks
+
+        waited, ticks = asyncio.run(scenario())
+        self.assertGreater(waited, 0)
+        self.assertEqual(len(ticks), 3)
+
+
+class TestAsyncWorkerController(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    def _wait_for(self, predicate, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not predicate() and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+        self.app.processEvents()
+
+    def test_signals_are_delivered_like_the_thread_controller(self):
+        exchange = make_exchange()
+        exchange.fetch_balance.return_value = {'total': {'USDT': 7.0}}
+        exchange.create_orders.return_value = [{'id': '1'}, {'id': '2'}]
+        runner = AsyncLoopThread()
+        with patch('src.services.exchange_factory.ccxt_async.binance', return_value=exchange):
+            controller = AsyncWorkerController(BinanceLogic(rate_limiter=RateLimiter()), runner=runner,
+                                               journal=OrderJournal(path=None))
+            balances, finished, attempts, done = [], [], [], []
+            controller.balance_success.connect(balances.append)
+            controller.balance_finished.connect(lambda: finished.append(True))
+            controller.dca_order_attempt_finished.connect(lambda *args: attempts.append(args))
+            controller.dca_batch_finished.connect(done.append)
+
+            controller.start_fetch_balance("key", "secret", MarketEnvironment.SPOT)
+            controller.start_place_dca_orders("key", "secret", MarketEnvironment.FUTURES_TESTNET, "BTC/USDT",
+                                              [{'price': 100.0, 'amount': 1.0}, {'price': 90.0, 'amount': 1.0}],
+                                              "Croisé", 10)
+            self._wait_for(lambda: finished and done)
+            controller.stop_all_workers()
+
+        self.assertEqual(balances, [7.0])
+        self.assertEqual([attempt[0] for attempt in attempts], [0, 1])
+        self.assertEqual(done, ["Traitement DCA terminé avec succès."])
+        self.assertFalse(runner.is_running())
+        exchange.close.assert_awaited()
+
+
+if __name__ == '__main__':
+    unittest.main()
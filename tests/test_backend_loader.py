@@ -0,0 +1,54 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import keyring.errors
+from src.controllers.backend_loader import BackendLoader
+from src.models.market_environment import MarketEnvironment
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class TestBackendLoader(unittest.TestCase):
+    def _load(self, market_env=MarketEnvironment.SPOT):
+        loader = BackendLoader(market_env)
+        states = []
+        loader.ready.connect(states.append)
+        loader.run()
+        self.assertEqual(len(states), 1)
+        return states[0]
+
+    def test_main_window_module_does_not_import_exchange_code(self):
+        script = ("import sys\n"
+                  "import src.main_pyqt\n"
+                  "print(','.join(m for m in ('ccxt', 'keyring', 'aiohttp', 'numpy') if m in sys.modules))")
+        result = subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT, capture_output=True, text=True,
+                                timeout=60, env={"QT_QPA_PLATFORM": "offscreen", "PATH": ""})
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "")
+
+    def test_loads_credentials_of_the_selected_environment(self):
+        with patch("keyring.get_keyring"), \
+                patch("src.keyring_utils.load_creds", return_value=("key", "secret")) as load_creds:
+            state = self._load()
+
+        load_creds.assert_called_once_with("SPOT")
+        self.assertTrue(state.keyring_available)
+        self.assertEqual(state.credentials, ("key", "secret"))
+        self.assertIsNone(state.error)
+        self.assertIn("ccxt", sys.modules)
+
+    def test_missing_keyring_backend_is_reported(self):
+        with patch("keyring.get_keyring", side_effect=keyring.errors.NoKeyringError()), \
+                patch("src.keyring_utils.load_creds") as load_creds:
+            state = self._load()
+
+        load_creds.assert_not_called()
+        self.assertFalse(state.keyring_available)
+        self.assertEqual(state.credentials, (None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
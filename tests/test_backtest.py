@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.backtest import (BacktestError, BlocBougies, EchelleDca, MoteurBacktest, backtester, backtester_symboles,
+                          lire_bougies)
+from src.backtest import data as backtest_data
+from src.simulation_logic import calculer_iterations
+
+# (timestamp, open, high, low, close, volume)
+CANDLES = [
+    (0, 100.0, 101.0, 99.0, 100.0, 1.0),   # niveau 1 (100) exécuté
+    (1, 100.0, 100.0, 85.0, 88.0, 1.0),    # niveau 2 (90) exécuté
+    (2, 88.0, 89.0, 86.0, 88.0, 1.0),
+    (3, 88.0, 98.0, 88.0, 97.0, 1.0),      # take-profit à 95 * 1.02 = 96.9
+    (4, 97.0, 98.0, 96.0, 96.5, 1.0),      # réancrage à 97 : niveau 1 exécuté
+]
+
+
+def bloc(rows):
+    return BlocBougies.depuis_colonnes(np.array(rows, dtype=np.float64).T)
+
+
+class TestBacktest(unittest.TestCase):
+
+    def setUp(self):
+        self.echelle = EchelleDca(ratios=[1.0, 0.9, 0.8], montants=[100.0, 90.0, 80.0])
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write_csv(self, rows, header=True):
+        path = os.path.join(self.tmpdir.name, "candles.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            if header:
+                f.write("timestamp,open,high,low,close,volume\n")
+            for row in rows:
+                f.write(",".join(str(value) for value in row) + "\n")
+        return path
+
+    def test_fills_take_profit_and_restart(self):
+        result = backtester([bloc(CANDLES)], self.echelle, take_profit_percent=2.0, frais=0.0)
+
+        self.assertEqual(len(result.cycles), 1)
+        cycle = result.cycles[0]
+        self.assertEqual((cycle.debut, cycle.fin, cycle.niveaux_executes), (0, 3, 2))
+        self.assertAlmostEqual(cycle.prix_moyen, 95.0)
+        self.assertAlmostEqual(cycle.prix_sortie, 96.9)
+        self.assertAlmostEqual(cycle.pnl, 2 * 96.9 - 190.0)
+        self.assertEqual(result.niveaux_executes, 3)
+        self.assertAlmostEqual(result.quantite_finale, 100.0 / 97.0)
+        self.assertAlmostEqual(result.prix_moyen_final, 97.0)
+        self.assertAlmostEqual(result.pnl_latent, (100.0 / 97.0) * 96.5 - 100.0)
+        # Pire point : 2 unités à 85 pour 190 investis.
+        self.assertAlmostEqual(result.perte_latente_max, 190.0 - 170.0)
+
+    def test_fees_are_applied_to_entries_and_exits(self):
+        result = backtester([bloc(CANDLES[:4])], self.echelle, take_profit_percent=2.0, frais=0.001,
+                            relancer=False)
+        cycle = result.cycles[0]
+        self.assertAlmostEqual(cycle.prix_moyen, 95.0 * 1.001)
+        self.assertAlmostEqual(result.frais_total, 0.19 + cycle.prix_sortie * 2 * 0.001)
+        self.assertAlmostEqual(result.equity_finale, result.balance_initiale + result.pnl_realise)
+
+    def test_gap_down_fills_at_open(self):
+        rows = [(0, 100.0, 100.0, 100.0, 100.0, 1.0), (1, 70.0, 75.0, 70.0, 72.0, 1.0)]
+        result = backtester([bloc(rows)], self.echelle, frais=0.0)
+        self.assertEqual(result.niveaux_executes, 3)
+        self.assertAlmostEqual(result.prix_moyen_final * result.quantite_finale, 100.0 + 70.0 + 70.0)
+
+    def test_drawdown_compares_each_low_with_the_earlier_peak(self):
+        rows = [(0, 100.0, 100.0, 99.0, 100.0, 1.0), (1, 100.0, 150.0, 100.0, 150.0, 1.0)]
+        result = backtester([bloc(rows)], EchelleDca(ratios=[1.0], montants=[100.0]), frais=0.0)
+        self.assertAlmostEqual(result.drawdown_max_percent, 1.0)
+
+    def test_results_do_not_depend_on_chunking(self):
+        rng = np.random.default_rng(1)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 5000)))
+        opens = np.r_[100.0, close[:-1]]
+        rows = np.c_[np.arange(5000), opens, np.maximum(opens, close) * 1.002, np.minimum(opens, close) * 0.998,
+                     close, np.ones(5000)]
+        whole = backtester([bloc(rows)], self.echelle, take_profit_percent=1.5)
+        chunked = backtester([bloc(rows[i:i + 37]) for i in range(0, 5000, 37)], self.echelle,
+                             take_profit_percent=1.5)
+        self.assertGreater(len(whole.cycles), 0)
+        self.assertEqual(whole, chunked)
+
+    def test_csv_is_read_in_chunks_with_or_without_header(self):
+        for header in (True, False):
+            path = self._write_csv(CANDLES, header=header)
+            blocs = list(lire_bougies(path, taille_bloc=2))
+            self.assertEqual([len(b) for b in blocs], [2, 2, 1])
+            self.assertEqual(blocs[2].timestamp.tolist(), [4])
+            self.assertEqual(blocs[0].low.tolist(), [99.0, 85.0])
+
+    def test_csv_with_unknown_columns_raises(self):
+        path = os.path.join(self.tmpdir.name, "bad.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("date,price\n1,2\n")
+        with self.assertRaises(BacktestError):
+            list(lire_bougies(path))
+
+    @unittest.skipIf(backtest_data.pq is None, "pyarrow non installé")
+    def test_parquet_matches_csv(self):
+        import pyarrow as pa
+        columns = list(zip(*CANDLES))
+        path = os.path.join(self.tmpdir.name, "candles.parquet")
+        backtest_data.pq.write_table(pa.table({name: list(values) for name, values in
+                                               zip(["open_time", "open", "high", "low", "close", "volume"], columns)}),
+                                     path)
+        from_parquet = backtester(path, self.echelle, take_profit_percent=2.0, taille_bloc=3)
+        from_csv = backtester(self._write_csv(CANDLES), self.echelle, take_profit_percent=2.0)
+        self.assertEqual(from_parquet, from_csv)
+
+    def test_ladder_from_simulation(self):
+        echelle = EchelleDca.depuis_simulation(calculer_iterations(1000, 40, 4, 50, avec_details=False))
+        np.testing.assert_allclose(echelle.ratios, [1, 0.5, 0.25, 0.125, 0.0625])
+        np.testing.assert_allclose(echelle.montants, [200.0] * 5)
+        self.assertEqual(MoteurBacktest(echelle).balance_initiale, 1000.0)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(BacktestError):
+            EchelleDca(ratios=[0.0], montants=[10.0])
+        with self.assertRaises(BacktestError):
+            MoteurBacktest(self.echelle, frais=1.5)
+
+    def test_backtest_several_symbols(self):
+        paths = {"AAA/USDT": self._write_csv(CANDLES)}
+        results = backtester_symboles(paths, self.echelle, max_workers=1, take_profit_percent=2.0, frais=0.0)
+        self.assertEqual(len(results["AAA/USDT"].cycles), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+import unittest
+from unittest.mock import MagicMock
+from src.workers.batch_dca_worker import BatchDcaOrderWorker
+from src.app_logic import BinanceLogic, CustomNetworkError, InvalidOrderParamsError, OrderPlacementError
+from src.models.rollback_report import RollbackReport
+from src.models.market_environment import MarketEnvironment
+from src.models.journal_entry import STATE_ACKED, STATE_CANCELED, STATE_FAILED, STATE_PENDING
+from src.services.order_journal import OrderJournal
+
+
+class TestBatchDcaOrderWorker(unittest.TestCase):
+    def setUp(self):
+        """Set up for test methods."""
+        self.binance_logic = MagicMock()
+        self.binance_logic.max_batch_size.side_effect = BinanceLogic.max_batch_size
+        self.binance_logic.prepare_orders.side_effect = lambda *args: [(True, order) for order in args[-1]]
+        self.levels = [{'price': 100.0 - i, 'amount': 1.0} for i in range(7)]
+        self.journal = OrderJournal(path=None)
+
+    def _make_worker(self, levels=None, market_env=MarketEnvironment.FUTURES_TESTNET, **kwargs):
+        worker = BatchDcaOrderWorker(
+            self.binance_logic, "key", "secret", market_env,
+            "BTC/USDT", self.levels if levels is None else levels, "Croisé", 10, journal=self.journal, **kwargs
+        )
+        self.attempts = []
+        self.finished = []
+        self.errors = []
+        worker.order_attempt_finished.connect(lambda *args: self.attempts.append(args))
+        worker.batch_processing_finished.connect(self.finished.append)
+        worker.batch_error.connect(self.errors.append)
+        return worker
+
+    @staticmethod
+    def _accept_all(api_key, secret_key, market_environment, symbol, orders, margin_mode, leverage):
+        return [(True, {'id': str(order['price'])}) for order in orders]
+
+    def test_batched_run_groups_levels(self):
+        self.binance_logic.place_orders_batch.side_effect = self._accept_all
+        worker = self._make_worker()
+
+        worker.run()
+
+        self.assertEqual(self.binance_logic.place_orders_batch.call_count, 2)
+        sizes = [len(call.kwargs['orders']) for call in self.binance_logic.place_orders_batch.call_args_list]
+        self.assertEqual(sizes, [5, 2])
+        self.binance_logic.place_order.assert_not_called()
+        self.assertEqual([attempt[0] for attempt in self.attempts], list(range(7)))
+        self.assertTrue(all(attempt[2] for attempt in self.attempts))
+        self.assertEqual([entry.order_id for entry in worker.placed_entries()], [str(100.0 - i) for i in range(7)])
+        self.assertEqual(self.attempts[0][3].order_id, '100.0')
+        self.assertEqual(len(self.finished), 1)
+        self.assertEqual(self.errors, [])
+
+    def test_partial_batch_failure_rolls_back_placed_orders(self):
+        def partial(api_key, secret_key, market_environment, symbol, orders, margin_mode, leverage):
+            results = [(True, {'id': str(order['price'])}) for order in orders]
+            results[2] = (False, OrderPlacementError("rejected"))
+            return results
+
+        self.binance_logic.place_orders_batch.side_effect = partial
+        report = RollbackReport(symbol="BTC/USDT", requested=['100.0', '99.0', '97.0', '96.0'],
+                                cancelled=['100.0', '99.0', '97.0', '96.0'], verified=True)
+        self.binance_logic.cancel_orders.return_value = report
+        worker = self._make_worker()
+        reports = []
+        worker.rollback_finished.connect(reports.append)
+
+        worker.run()
+
+        self.binance_logic.place_orders_batch.assert_called_once()
+        self.assertEqual([attempt[2] for attempt in self.attempts], [True, True, False, True, True])
+        cancelled_ids = self.binance_logic.cancel_orders.call_args[0][4]
+        self.assertEqual(cancelled_ids, ['100.0', '99.0', '97.0', '96.0'])
+        self.assertEqual(reports, [report])
+        self.assertEqual(len(self.errors), 1)
+        self.assertIn("l'ordre 3", self.errors[0])
+        self.assertIn("Tous les ordres ont été annulés.", self.errors[0])
+        self.assertEqual(self.finished, [])
+        states = [entry.state for entry in self.journal.run_entries(worker.run_id)]
+        self.assertEqual(states, [STATE_CANCELED, STATE_CANCELED, STATE_FAILED, STATE_CANCELED, STATE_CANCELED])
+        self.assertEqual(worker.placed_entries(), [])
+
+    def test_symbol_is_configured_once_before_the_first_batch(self):
+        self.binance_logic.place_orders_batch.side_effect = self._accept_all
+        worker = self._make_worker()
+
+        worker.run()
+
+        self.binance_logic.configure_futures_symbol.assert_called_once_with(
+            "key", "secret", MarketEnvironment.FUTURES_TESTNET, "BTC/USDT", "Croisé", 10)
+        self.assertEqual(self.binance_logic.place_orders_batch.call_count, 2)
+
+    def test_configuration_failure_places_nothing(self):
+        self.binance_logic.configure_futures_symbol.side_effect = OrderPlacementError("Failed to set leverage")
+        worker = self._make_worker()
+
+        worker.run()
+
+        self.binance_logic.place_orders_batch.assert_not_called()
+        self.binance_logic.cancel_orders.assert_not_called()
+        self.assertEqual(len(self.errors), 1)
+        self.assertIn("Failed to set leverage", self.errors[0])
+        self.assertIn("Aucun ordre n'a été placé.", self.errors[0])
+        self.assertEqual(self.finished, [])
+
+    def test_incomplete_rollback_is_reported(self):
+        self.binance_logic.place_orders_batch.return_value = [(True, {'id': '1'}), (False, OrderPlacementError("x"))]
+        self.binance_logic.cancel_orders.return_value = RollbackReport(
+            symbol="BTC/USDT", requested=['1'], still_open=['1'], verified=True)
+        worker = self._make_worker(self.levels[:2])
+
+        worker.run()
+
+        self.assertIn("ATTENTION", self.errors[0])
+        self.assertIn("encore ouverts: 1", self.errors[0])
+
+    def test_invalid_levels_are_reported_and_skipped(self):
+        self.binance_logic.place_orders_batch.side_effect = self._accept_all
+        levels = [{'price': 100.0, 'amount': 1.0}, {'price': 0.0, 'amount': 1.0}, {'price': 90.0, 'amount': 1.0}]
+        worker = self._make_worker(levels)
+
+        worker.run()
+
+        self.assertEqual(self.attempts[0][0], 1)
+        self.assertFalse(self.attempts[0][2])
+        sent = self.binance_logic.place_orders_batch.call_args.kwargs['orders']
+        self.assertEqual([order['price'] for order in sent], [100.0, 90.0])
+        self.assertEqual(len(self.finished), 1)
+
+    def test_levels_rejected_by_symbol_filters_are_skipped_without_rollback(self):
+        self.binance_logic.place_orders_batch.side_effect = self._accept_all
+        self.binance_logic.prepare_orders.side_effect = lambda *args: [
+            (True, {**args[-1][0], 'price': 99.9}),
+            (False, InvalidOrderParamsError("notional too small")),
+            (True, args[-1][2]),
+        ]
+        worker = self._make_worker(self.levels[:3])
+
+        worker.run()
+
+        sent = self.binance_logic.place_orders_batch.call_args.kwargs['orders']
+        self.assertEqual([order['price'] for order in sent], [99.9, 98.0])
+        self.assertEqual(self.attempts[0], (1, "BTC/USDT", False, "notional too small"))
+        self.binance_logic.cancel_orders.assert_not_called()
+        self.assertEqual(self.errors, [])
+        self.assertEqual(len(self.finished), 1)
+
+    def test_level_by_level_mode_uses_place_order(self):
+        self.binance_logic.place_order.return_value = {'id': '1'}
+        worker = self._make_worker(self.levels[:2], use_batch_orders=False)
+
+        worker.run()
+
+        self.assertEqual(self.binance_logic.place_order.call_count, 2)
+        self.binance_logic.place_orders_batch.assert_not_called()
+        self.assertEqual(len(self.finished), 1)
+
+
+    def test_each_level_is_sent_with_a_deterministic_client_order_id(self):
+        self.binance_logic.place_orders_batch.side_effect = self._accept_all
+        worker = self._make_worker(self.levels[:2])
+
+        worker.run()
+
+        sent = self.binance_logic.place_orders_batch.call_args.kwargs['orders']
+        expected = [f"dca-{worker.run_id}-{i}" for i in range(2)]
+        self.assertEqual([order['client_order_id'] for order in sent], expected)
+        self.assertEqual([entry.client_order_id for entry in worker.placed_entries()], expected)
+
+    def test_unresolved_network_failure_stays_pending_for_reconciliation(self):
+        self.binance_logic.place_order.side_effect = [{'id': '1'}, CustomNetworkError("Timeout")]
+        self.binance_logic.cancel_orders.return_value = RollbackReport(
+            symbol="BTC/USDT", requested=['1'], cancelled=['1'], verified=True)
+        worker = self._make_worker(self.levels[:2], use_batch_orders=False)
+
+        worker.run()
+
+        self.assertEqual(self.binance_logic.place_order.call_args.kwargs['client_order_id'], f"dca-{worker.run_id}-1")
+        states = [entry.state for entry in self.journal.run_entries(worker.run_id)]
+        self.assertEqual(states, [STATE_CANCELED, STATE_PENDING])
+        self.assertEqual(len(self.errors), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import contextlib
+import io
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from src import cli
+from src.app_logic import BinanceLogic, InsufficientFundsError
+from src.models.market_environment import MarketEnvironment
+from src.services.order_journal import OrderJournal
+
+SIMULATION_ARGS = ['--balance', '1000', '--prix-entree', '40', '--prix-catastrophique', '5', '--drop', '30']
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.logic = MagicMock()
+        self.logic.max_batch_size.side_effect = BinanceLogic.max_batch_size
+        self.logic.prepare_orders.side_effect = lambda *args: [(True, order) for order in args[-1]]
+        self.journal = OrderJournal(path=None)
+        self.env = patch.dict('os.environ', {cli.ENV_API_KEY: "key", cli.ENV_SECRET_KEY: "secret"})
+        self.env.start()
+        self.addCleanup(self.env.stop)
+
+    def _run(self, argv):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            code = cli.main(argv, logic_factory=lambda: self.logic, journal=self.journal)
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def test_runs_without_pyqt5(self):
+        script = ("import sys; sys.modules['PyQt5'] = None\n"
+                  "from src import cli\n"
+                  f"sys.exit(cli.main(['simulate'] + {SIMULATION_ARGS!r}))")
+        result = subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT, capture_output=True, text=True,
+                                timeout=60)
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("Nombre total de niveaux de DCA: 7", result.stdout)
+        self.assertNotIn("PyQt5", result.stderr)
+
+    def test_simulate_does_not_load_the_exchange_layer(self):
+        script = ("import sys\n"
+                  "from src import cli\n"
+                  "imported = [m for m in ('ccxt', 'keyring', 'src.app_logic') if m in sys.modules]\n"
+                  f"cli.main(['simulate'] + {SIMULATION_ARGS!r})\n"
+                  "imported += [m for m in ('ccxt', 'keyring') if m in sys.modules]\n"
+                  "print('loaded:' + ','.join(imported))")
+        result = subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT, capture_output=True, text=True,
+                                timeout=60)
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], "loaded:")
+
+    def test_balance_uses_environment_keys(self):
+        self.logic.get_balance.return_value = 1234.5
+
+        code, out, _ = self._run(['balance', '--env', 'SPOT'])
+
+        self.assertEqual(code, 0)
+        self.logic.get_balance.assert_called_once_with("key", "secret", MarketEnvironment.SPOT)
+        self.assertIn("1234.50", out)
+
+    def test_order_error_sets_exit_code(self):
+        self.logic.place_order.side_effect = InsufficientFundsError("not enough")
+
+        code, _, err = self._run(['order', '--symbol', 'BTC/USDT', '--side', 'buy', '--amount', '1',
+                                  '--price', '100', '--margin-mode', 'isolated', '--leverage', '2'])
+
+        self.assertEqual(code, 1)
+        self.assertIn("not enough", err)
+        args = self.logic.place_order.call_args.args
+        self.assertEqual(args[4:], ("LIMIT", "BUY", 1.0, 100.0, "Isolé", 2))
+
+    def test_dca_deploy_places_simulated_levels_with_leverage(self):
+        self.logic.place_orders_batch.side_effect = lambda **kwargs: [
+            (True, {'id': str(i)}) for i, _ in enumerate(kwargs['orders'])]
+
+        code, out, _ = self._run(['dca-deploy', '--symbol', 'BTC/USDT', '--leverage', '3'] + SIMULATION_ARGS)
+
+        self.assertEqual(code, 0)
+        orders = [order for call in self.logic.place_orders_batch.call_args_list for order in call.kwargs['orders']]
+        self.assertEqual(len(orders), 7)
+        self.assertAlmostEqual(orders[0]['amount'], 1000 / 7 / 40 * 3)
+        self.assertEqual(self.logic.place_orders_batch.call_args.kwargs['margin_mode'], "Croisé")
+        self.assertIn("Traitement DCA terminé avec succès.", out)
+        self.assertEqual(out.count("placé"), 7)
+        self.assertEqual(len(self.journal.unresolved(MarketEnvironment.FUTURES_TESTNET, "BTC/USDT")), 7)
+
+    def test_dca_deploy_uses_the_ladder_shape(self):
+        self.logic.place_orders_batch.side_effect = lambda **kwargs: [
+            (True, {'id': str(i)}) for i, _ in enumerate(kwargs['orders'])]
+
+        code, _, err = self._run(['dca-deploy', '--symbol', 'BTC/USDT', '--repartition', 'martingale',
+                                  '--montant-initial', '50'] + SIMULATION_ARGS)
+
+        self.assertEqual(code, 0, err)
+        orders = [order for call in self.logic.place_orders_batch.call_args_list for order in call.kwargs['orders']]
+        self.assertEqual(len(orders), 7)
+        self.assertAlmostEqual(orders[0]['amount'], 50 / 40)
+        self.assertAlmostEqual(sum(order['amount'] * order['price'] for order in orders), 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
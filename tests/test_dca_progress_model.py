@@ -0,0 +1,87 @@
+import time
+import unittest
+from PyQt5.QtCore import QCoreApplication, Qt
+from src.constants import ui_strings
+from src.models.journal_entry import JournalEntry
+from src.models.order_state import OrderState
+from src.viewmodels.dca_progress_model import (DcaProgressModel, COLUMN_DETAIL, COLUMN_FILLED, COLUMN_ORDER,
+                                               COLUMN_PRICE, COLUMN_STATUS, COLUMN_SYMBOL)
+
+
+def placed_entry(level, order_id):
+    entry = JournalEntry("intent", "run", "FUTURES_TESTNET", "BTC/USDT", level, "buy", "limit", 100.0, 1.0)
+    entry.acknowledge({'id': order_id, 'status': 'open'})
+    return entry
+
+
+class TestDcaProgressModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        self.model = DcaProgressModel()
+        self.levels = [{'price': 100.0 - i, 'amount': 1.0} for i in range(1000)]
+        self.model.load([("BTC/USDT", self.levels)])
+        self.changes, self.inserts, self.progress = [], [], []
+        self.model.dataChanged.connect(lambda first, last: self.changes.append((first.row(), last.row())))
+        self.model.rowsInserted.connect(lambda parent, first, last: self.inserts.append((first, last)))
+        self.model.progress_changed.connect(lambda *args: self.progress.append(args))
+
+    def _text(self, row, column):
+        return self.model.data(self.model.index(row, column), Qt.DisplayRole)
+
+    def test_loaded_levels_are_waiting(self):
+        self.assertEqual(self.model.rowCount(), 1000)
+        self.assertEqual(self._text(1, COLUMN_SYMBOL), "BTC/USDT")
+        self.assertEqual(self._text(1, COLUMN_PRICE), "99.00")
+        self.assertEqual(self._text(1, COLUMN_STATUS), ui_strings.DCA_PROGRESS_STATUS_WAITING)
+        self.assertEqual(self.model.progress(), (0, 0, 1000))
+
+    def test_updates_are_coalesced_until_flush(self):
+        for level in range(10, 20):
+            self.model.record_attempt(level, "BTC/USDT", True, placed_entry(level, str(level)))
+        self.model.record_attempt(20, "BTC/USDT", False, "Margin is insufficient.")
+        self.assertEqual(self.changes, [])
+
+        self.model.flush()
+
+        self.assertEqual(self.changes, [(10, 20)])
+        self.assertEqual(self.progress, [(10, 1, 1000)])
+        self.assertEqual(self._text(12, COLUMN_ORDER), "12")
+        self.assertEqual(self._text(12, COLUMN_STATUS), f"{ui_strings.DCA_PROGRESS_STATUS_PLACED} (open)")
+        self.assertEqual(self._text(20, COLUMN_DETAIL), "Margin is insufficient.")
+        self.assertIsNotNone(self.model.data(self.model.index(20, 0), Qt.ForegroundRole))
+        self.assertEqual(self.model.latest_row, 20)
+
+    def test_order_state_updates_keep_the_outcome(self):
+        self.model.record_attempt(3, "BTC/USDT", True, placed_entry(3, "42"))
+        state = OrderState("BTCUSDT", "42", "dca-run-3", "BUY", "PARTIALLY_FILLED", 97.0, 1.0, filled=0.25)
+        self.model.record_state(3, "BTC/USDT", state)
+        self.model.flush()
+
+        self.assertEqual(self._text(3, COLUMN_STATUS), "PARTIALLY_FILLED")
+        self.assertEqual(self._text(3, COLUMN_FILLED), "0.25")
+        self.assertEqual(self._text(3, COLUMN_ORDER), "42")
+        self.assertEqual(self.model.progress(), (1, 0, 1000))
+
+    def test_unknown_levels_are_appended_in_one_insert(self):
+        for level in range(3):
+            self.model.record_attempt(level, "ETH/USDT", True, placed_entry(level, f"e{level}"))
+        self.model.flush()
+
+        self.assertEqual(self.inserts, [(1000, 1002)])
+        self.assertEqual(self._text(1001, COLUMN_SYMBOL), "ETH/USDT")
+        self.assertEqual(self.model.progress(), (3, 0, 1003))
+
+    def test_timer_applies_pending_updates(self):
+        self.model.record_attempt(0, "BTC/USDT", True, placed_entry(0, "1"))
+        deadline = time.monotonic() + 2
+        while not self.changes and time.monotonic() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.005)
+        self.assertEqual(self.changes, [(0, 0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
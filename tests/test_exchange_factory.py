@@ -0,0 +1,130 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import ccxt
+from src.services.exchange_factory import ExchangeFactory, ExchangePool
+from src.models.market_environment import MarketEnvironment
+from tests.helpers import FakeClock
+
+
+class TestExchangeFactory(unittest.TestCase):
+    def test_build_config_spot(self):
+        config = ExchangeFactory.build_config("key", "secret", MarketEnvironment.SPOT)
+        self.assertEqual(config['apiKey'], "key")
+        self.assertEqual(config['secret'], "secret")
+        self.assertTrue(config['options']['adjustForTimeDifference'])
+        self.assertNotIn('defaultType', config['options'])
+
+    def test_build_config_futures(self):
+        config = ExchangeFactory.build_config("key", "secret", MarketEnvironment.FUTURES_LIVE)
+        self.assertEqual(config['options']['defaultType'], 'future')
+
+    def test_build_config_disables_ccxt_throttle(self):
+        for market_env in MarketEnvironment:
+            config = ExchangeFactory.build_config("key", "secret", market_env)
+            self.assertIs(config['enableRateLimit'], False)
+
+
+@patch('src.services.exchange_factory.ccxt.binance')
+class TestExchangePool(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.pool = ExchangePool(idle_timeout=60.0, clock=self.clock)
+
+    def test_lease_reuses_client(self, mock_binance_constructor):
+        mock_binance_constructor.side_effect = lambda config: MagicMock()
+
+        with self.pool.lease("key", "secret", MarketEnvironment.SPOT) as first:
+            pass
+        with self.pool.lease("key", "secret", MarketEnvironment.SPOT) as second:
+            pass
+
+        self.assertIs(first, second)
+        mock_binance_constructor.assert_called_once()
+
+    def test_concurrent_leases_get_distinct_clients(self, mock_binance_constructor):
+        mock_binance_constructor.side_effect = lambda config: MagicMock()
+
+        with self.pool.lease("key", "secret", MarketEnvironment.SPOT) as first:
+            with self.pool.lease("key", "secret", MarketEnvironment.SPOT) as second:
+                self.assertIsNot(first, second)
+        self.assertEqual(self.pool.idle_count("key", MarketEnvironment.SPOT), 2)
+
+    def test_environments_are_pooled_separately(self, mock_binance_constructor):
+        mock_binance_constructor.side_effect = lambda config: MagicMock()
+
+        with self.pool.lease("key", "secret", MarketEnvironment.SPOT) as spot:
+            pass
+        with self.pool.lease("key", "secret", MarketEnvironment.FUTURES_LIVE) as futures:
+            pass
+
+        self.assertIsNot(spot, futures)
+        self.assertEqual(mock_binance_constructor.call_count, 2)
+
+    def test_secret_rotation_replaces_client(self, mock_binance_constructor):
+        mock_binance_constructor.side_effect = lambda config: MagicMock()
+
+        with self.pool.lease("key", "old_secret", MarketEnvironment.SPOT) as old:
+            pass
+        with self.pool.lease("key", "new_secret", MarketEnvironment.SPOT) as new:
+            pass
+
+        self.assertIsNot(old, new)
+        old.close.assert_called_once()
+        self.assertEqual(mock_binance_constructor.call_args[0][0]['secret'], "new_secret")
+
+    def test_client_leased_before_rotation_is_not_returned(self, mock_binance_constructor):
+        mock_binance_constructor.side_effect = lambda config: MagicMock()
+
+        with self.pool.lease("key", "old_secret", MarketEnvironment.SPOT) as old:
+            with self.pool.lease("key", "new_secret", MarketEnvironment.SPOT):
+                pass
+
+        old.close.assert_called_once()
+        self.assertEqual(self.pool.idle_count("key", MarketEnvironment.SPOT), 1)
+
+    def test_idle_clients_are_evicted(self, mock_binance_constructor):
+        mock_binance_constructor.side_effect = lambda config: MagicMock()
+
+        with self.pool.lease("key", "secret", MarketEnvironment.SPOT) as first:
+            pass
+        self.clock.now += 61.0
+        self.assertEqual(self.pool.evict_idle(), 1)
+        first.close.assert_called_once()
+
+        with self.pool.lease("key", "secret", MarketEnvironment.SPOT) as second:
+            pass
+        self.assertIsNot(first, second)
+
+    def test_network_error_discards_client(self, mock_binance_constructor):
+        mock_binance_constructor.side_effect = lambda config: MagicMock()
+
+        with self.assertRaises(ccxt.NetworkError):
+            with self.pool.lease("key", "secret", MarketEnvironment.SPOT) as broken:
+                raise ccxt.NetworkError("reset by peer")
+
+        broken.close.assert_called_once()
+        self.assertEqual(self.pool.idle_count("key", MarketEnvironment.SPOT), 0)
+
+    def test_exchange_error_keeps_client(self, mock_binance_constructor):
+        mock_binance_constructor.side_effect = lambda config: MagicMock()
+
+        with self.assertRaises(ccxt.ExchangeError):
+            with self.pool.lease("key", "secret", MarketEnvironment.SPOT):
+                raise ccxt.ExchangeError("Invalid symbol")
+
+        self.assertEqual(self.pool.idle_count("key", MarketEnvironment.SPOT), 1)
+
+    def test_new_client_is_warmed_from_loaded_one(self, mock_binance_constructor):
+        mock_binance_constructor.side_effect = lambda config: MagicMock()
+
+        with self.pool.lease("key", "secret", MarketEnvironment.SPOT) as warm:
+            warm.markets = {'BTC/USDT': {}}
+            warm.options = {'timeDifference': 42}
+        with self.pool.lease("key", "secret", MarketEnvironment.SPOT):
+            with self.pool.lease("key", "secret", MarketEnvironment.SPOT) as cold:
+                cold.set_markets_from_exchange.assert_called_once_with(warm)
+                cold.options.__setitem__.assert_called_with('timeDifference', 42)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import asyncio
+import itertools
+import unittest
+from scripts.bench_latency import measure, overhead_warnings
+from scripts.fake_binance import FakeBinanceServer, FUTURES, SPOT
+from src.app_logic import BinanceLogic
+from src.constants import ui_strings
+from src.models.market_environment import MarketEnvironment
+from src.services.dca_ladder import DcaLadder
+from src.services.exchange_factory import ExchangeFactory
+from src.services.futures_config_cache import FuturesConfigCache
+from src.services.leverage_brackets import LeverageBracketIndex
+from src.services.market_index import MarketIndex
+from src.services.order_journal import OrderJournal
+from src.services.order_store import OrderStateStore
+from src.services.rate_limiter import RateLimiter
+from src.services.retry_policy import RetryPolicy
+from src.services.user_data_stream import ListenKeyClient, UserDataStream
+
+FUTURES_ENV = MarketEnvironment.FUTURES_TESTNET
+
+
+class TestAgainstFakeBinance(unittest.TestCase):
+    """End-to-end request paths: real ccxt clients talking HTTP to the local stand-in server."""
+
+    def setUp(self):
+        self.server = FakeBinanceServer(balance=1e6).start()
+        self.addCleanup(self.server.stop)
+        ExchangeFactory.api_base_url = self.server.url
+        self.addCleanup(setattr, ExchangeFactory, 'api_base_url', None)
+        self.logic = BinanceLogic(rate_limiter=RateLimiter(), market_index=MarketIndex(cache_dir=None),
+                                  retry_policy=RetryPolicy(base_delay=0), futures_config=FuturesConfigCache(),
+                                  leverage_brackets=LeverageBracketIndex(cache_dir=None))
+        self.ids = itertools.count()
+
+    def _limit_order(self, market_env, client_order_id, price=50000.0):
+        return self.logic.place_order("key", "secret", market_env, "BTC/USDT", ui_strings.ORDER_TYPE_LIMIT, "BUY",
+                                      0.001, price, ui_strings.MERGE_MODE_CROSS, 5, client_order_id=client_order_id)
+
+    def test_balance_order_and_cancel_round_trip(self):
+        self.assertEqual(self.logic.get_balance("key", "secret", FUTURES_ENV), 1e6)
+
+        first = self._limit_order(FUTURES_ENV, "e2e-1")
+        second = self._limit_order(FUTURES_ENV, "e2e-2", price=49000.0)
+        self.assertEqual(len(self.server.open_orders(FUTURES)), 2)
+
+        report = self.logic.cancel_orders("key", "secret", FUTURES_ENV, "BTC/USDT", [first['id'], second['id']])
+
+        self.assertTrue(report.success)
+        self.assertEqual(self.server.open_orders(FUTURES), [])
+
+    def test_client_overhead_is_negligible_without_latency(self):
+        self.logic.get_balance("key", "secret", FUTURES_ENV)
+        self._limit_order(FUTURES_ENV, "overhead-warmup")
+        results = {
+            "balance": measure(10, lambda: self.logic.get_balance("key", "secret", FUTURES_ENV) and 0),
+            "order": measure(10, lambda: bool(self._limit_order(FUTURES_ENV, f"overhead-{next(self.ids)}"))),
+        }
+
+        self.assertEqual(overhead_warnings(results), [])
+
+    def test_orders_are_looked_up_by_client_id_after_they_leave_the_book(self):
+        order = self._limit_order(FUTURES_ENV, "lookup-0")
+        self.logic.cancel_orders("key", "secret", FUTURES_ENV, "BTC/USDT", [order['id']])
+
+        found = self.logic.fetch_orders_by_client_id("key", "secret", FUTURES_ENV, "BTC/USDT",
+                                                     ["lookup-0", "lookup-missing"])
+
+        self.assertEqual(found["lookup-0"]['status'], 'canceled')
+        self.assertIsNone(found["lookup-missing"])
+
+    def test_order_is_retried_once_after_a_server_error(self):
+        self._limit_order(MarketEnvironment.SPOT, "retry-0")
+        self.server.fail_next(1)
+
+        order = self._limit_order(MarketEnvironment.SPOT, "retry-1", price=49000.0)
+
+        self.assertEqual(order['clientOrderId'], "retry-1")
+        self.assertEqual(sorted(o['clientOrderId'] for o in self.server.open_orders(SPOT)), ["retry-0", "retry-1"])
+        self.assertEqual(self.server.count("POST", "/api/v3/order"), 3)
+
+    def test_dca_ladder_is_sent_in_batches(self):
+        placed = []
+        levels = [{'amount': 0.001, 'price': 50000.0 - i * 10} for i in range(12)]
+        ladder = DcaLadder(self.logic, "key", "secret", FUTURES_ENV, "BTC/USDT", levels,
+                           ui_strings.MERGE_MODE_CROSS, 5, journal=OrderJournal(path=None),
+                           on_attempt=lambda index, symbol, ok, result: placed.append(ok))
+
+        ladder.run()
+
+        self.assertEqual(placed, [True] * 12)
+        self.assertEqual(len(self.server.open_orders(FUTURES)), 12)
+        self.assertEqual(self.server.count("POST", "/fapi/v1/batchOrders"), 3)
+        self.assertEqual(self.server.count("GET", "/fapi/v2/positionRisk"), 1)
+        self.assertEqual(self.server.count("POST", "/fapi/v1/leverage"), 1)
+        self.assertEqual(self.server.count("POST", "/fapi/v1/marginType"), 0)
+        self.assertEqual(self.server.count("GET", "/fapi/v1/leverageBracket"), 1)
+
+    def test_dca_ladder_liquidated_before_its_last_level_is_not_sent(self):
+        errors = []
+        levels = [{'amount': 0.01, 'price': 50000.0 * 0.9 ** i} for i in range(6)]
+        ladder = DcaLadder(self.logic, "key", "secret", FUTURES_ENV, "BTC/USDT", levels,
+                           ui_strings.MERGE_MODE_ISOLATED, 50, journal=OrderJournal(path=None),
+                           on_error=errors.append)
+
+        ladder.run()
+
+        self.assertIn("refusée avant envoi", errors[0])
+        self.assertEqual(self.server.open_orders(FUTURES), [])
+        self.assertEqual(self.server.count("POST", "/fapi/v1/batchOrders"), 0)
+        self.assertEqual(self.server.count("POST", "/fapi/v1/leverage"), 0)
+
+    def test_user_data_stream_receives_order_updates(self):
+        store = OrderStateStore()
+
+        async def scenario():
+            exchange = ExchangeFactory.create_async("key", "secret", FUTURES_ENV)
+            stream = UserDataStream(ListenKeyClient(exchange, FUTURES_ENV, RateLimiter()), store, FUTURES_ENV,
+                                    ws_base_url=self.server.ws_url(FUTURES))
+            task = asyncio.create_task(stream.run())
+            try:
+                await asyncio.wait_for(stream.connected.wait(), 10)
+                await asyncio.to_thread(self._limit_order, FUTURES_ENV, "stream-1")
+                for _ in range(100):
+                    if store.by_client_id("stream-1") is not None:
+                        break
+                    await asyncio.sleep(0.02)
+            finally:
+                await stream.stop()
+                await asyncio.wait_for(task, 10)
+                await exchange.close()
+
+        asyncio.run(scenario())
+
+        state = store.by_client_id("stream-1")
+        self.assertIsNotNone(state)
+        self.assertEqual(state.status, "NEW")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,24 +1,40 @@
 import unittest
 from unittest.mock import MagicMock, patch
-from PyQt5.QtCore import QCoreApplication
+from PyQt5.QtCore import QCoreApplication, QObject, pyqtSignal
 from src.viewmodels.main_viewmodel import MainViewModel
 from src.models.market_environment import MarketEnvironment
 
+
+class FakeWorker(QObject):
+    """Stands in for a pooled worker: real signals, recorded start/stop."""
+    success = pyqtSignal(object)
+    error = pyqtSignal(str)
+    finished = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self.start = MagicMock()
+        self.stop = MagicMock()
+
+
+class FakeBalanceWorker(FakeWorker):
+    success = pyqtSignal(float)
+
+
 class TestMainViewModel(unittest.TestCase):
     def setUp(self):
         """Set up for test methods."""
-        self.app = QCoreApplication([])
+        self.app = QCoreApplication.instance() or QCoreApplication([])
         self.viewmodel = MainViewModel()
 
     def tearDown(self):
         """Clean up after test methods."""
         self.viewmodel.cleanup()
-        self.app.quit()
 
     def test_fetch_balance_success(self):
         """Test successful balance fetch."""
         # Mock the worker
-        mock_worker = MagicMock()
+        mock_worker = FakeBalanceWorker()
         with patch('src.viewmodels.main_viewmodel.BalanceWorker', return_value=mock_worker):
             # Connect to signals
             balance_received = []
@@ -42,7 +58,7 @@ class TestMainViewModel(unittest.TestCase):
     def test_fetch_balance_error(self):
         """Test balance fetch with error."""
         # Mock the worker
-        mock_worker = MagicMock()
+        mock_worker = FakeBalanceWorker()
         with patch('src.viewmodels.main_viewmodel.BalanceWorker', return_value=mock_worker):
             # Connect to signals
             balance_received = []
@@ -63,7 +79,7 @@ class TestMainViewModel(unittest.TestCase):
     def test_place_order_success(self):
         """Test successful order placement."""
         # Mock the worker
-        mock_worker = MagicMock()
+        mock_worker = FakeWorker()
         with patch('src.viewmodels.main_viewmodel.OrderPlacementWorker', return_value=mock_worker):
             # Connect to signals
             order_received = []
@@ -87,7 +103,7 @@ class TestMainViewModel(unittest.TestCase):
     def test_place_order_error(self):
         """Test order placement with error."""
         # Mock the worker
-        mock_worker = MagicMock()
+        mock_worker = FakeWorker()
         with patch('src.viewmodels.main_viewmodel.OrderPlacementWorker', return_value=mock_worker):
             # Connect to signals
             order_received = []
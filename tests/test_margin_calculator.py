@@ -0,0 +1,109 @@
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+from src.constants import ui_strings
+from src.models.market_environment import MarketEnvironment
+from src.services.dca_ladder import DcaLadder
+from src.services.leverage_brackets import LeverageBracketIndex, parse_leverage_brackets
+from src.services.margin_calculator import ladder_margin, ladder_problem, leverage_sweep
+from src.services.market_index import RETRY_INTERVAL
+from src.services.order_journal import OrderJournal
+from tests.helpers import FakeClock
+
+FUTURES_ENV = MarketEnvironment.FUTURES_TESTNET
+
+BRACKET_ROWS = [{'symbol': 'BTCUSDT', 'brackets': [
+    {'bracket': 2, 'initialLeverage': 100, 'notionalCap': 250000, 'notionalFloor': 50000,
+     'maintMarginRatio': 0.005, 'cum': 50.0},
+    {'bracket': 1, 'initialLeverage': 125, 'notionalCap': 50000, 'notionalFloor': 0,
+     'maintMarginRatio': 0.004, 'cum': 0.0},
+    {'bracket': 3, 'initialLeverage': 50, 'notionalCap': 1000000, 'notionalFloor': 250000,
+     'maintMarginRatio': 0.01, 'cum': 1300.0},
+]}]
+BTC = parse_leverage_brackets(BRACKET_ROWS)['BTCUSDT']
+
+
+class TestMarginCalculator(unittest.TestCase):
+
+    def test_brackets_are_sorted_by_notional(self):
+        self.assertEqual(BTC.notional_floors, [0.0, 50000.0, 250000.0])
+        self.assertEqual(BTC.max_leverage(60000), 100)
+        self.assertAlmostEqual(BTC.maintenance_margin(100000), 450.0)
+        self.assertEqual(parse_leverage_brackets(BRACKET_ROWS[0]), {'BTCUSDT': BTC})
+        self.assertEqual(parse_leverage_brackets([{'symbol': 'X', 'brackets': [{'bracket': 1}]}]), {})
+
+    def test_isolated_position_matches_the_equity_at_liquidation(self):
+        margin = ladder_margin([50000.0, 45000.0], [1.0, 1.0], BTC, 20)
+
+        np.testing.assert_allclose(margin.average_entry, [[50000.0, 47500.0]])
+        np.testing.assert_allclose(margin.initial_margin, [[2500.0, 4750.0]])
+        for k in range(2):
+            price, quantity = margin.liquidation_price[0, k], margin.quantity[0, k]
+            equity = margin.initial_margin[0, k] + quantity * (price - margin.average_entry[0, k])
+            self.assertAlmostEqual(equity, BTC.maintenance_margin(quantity * price), places=6)
+        # Le notionnel de 95 000 passe au palier 2, mais la liquidation tombe dans le palier 2 aussi.
+        self.assertGreater(margin.quantity[0, 1] * margin.liquidation_price[0, 1], 50000.0)
+
+    def test_cross_wallet_defaults_to_the_ladder_margin(self):
+        prices, amounts = [50000.0, 45000.0, 40000.0], [0.1, 0.2, 0.3]
+        default = ladder_margin(prices, amounts, BTC, 10, isolated=False)
+        explicit = ladder_margin(prices, amounts, BTC, 10, isolated=False,
+                                 wallet_balance=default.initial_margin[0, -1])
+        richer = ladder_margin(prices, amounts, BTC, 10, isolated=False, wallet_balance=1e6)
+
+        np.testing.assert_allclose(default.liquidation_price, explicit.liquidation_price)
+        np.testing.assert_array_equal(richer.liquidation_price, 0.0)
+
+    def test_leverage_sweep_flags_each_leverage(self):
+        prices = 50000.0 * 0.9 ** np.arange(6)
+        sweep = leverage_sweep(prices, np.full(6, 0.01), BTC, [1, 2, 20, 150], isolated=True)
+
+        self.assertEqual(sweep.liquidation_price.shape, (4, 6))
+        np.testing.assert_array_equal(sweep.liquidation_price[0], 0.0)
+        np.testing.assert_array_equal(sweep.first_unsafe_level(), [-1, -1, 0, 0])
+        np.testing.assert_array_equal(sweep.leverage_allowed(), [True, True, True, False])
+
+    def test_ladder_problem_describes_the_first_failure(self):
+        prices, amounts = [50000.0, 45000.0, 40000.0], [1.0, 1.0, 1.0]
+
+        self.assertIsNone(ladder_problem(prices, amounts, BTC, 2))
+        self.assertIn("avant le niveau 2", ladder_problem(prices, amounts, BTC, 20))
+        self.assertIn("maximum x100", ladder_problem(prices, amounts, BTC, 125))
+
+    def test_index_persists_and_waits_after_a_failure(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            clock = FakeClock()
+            index = LeverageBracketIndex(cache_dir=cache_dir, clock=clock)
+            fetch = MagicMock(return_value=BRACKET_ROWS)
+
+            self.assertEqual(index.brackets(FUTURES_ENV, "BTC/USDT", fetch), BTC)
+            self.assertEqual(index.brackets(FUTURES_ENV, "BTCUSDT", fetch), BTC)
+            self.assertEqual(fetch.call_count, 1)
+            self.assertEqual(LeverageBracketIndex(cache_dir=cache_dir, clock=clock).get(FUTURES_ENV, "BTC/USDT"), BTC)
+
+            clock.now += RETRY_INTERVAL
+            fetch.side_effect = OSError("down")
+            self.assertIsNone(index.brackets(FUTURES_ENV, "ETH/USDT", fetch))
+            self.assertIsNone(index.brackets(FUTURES_ENV, "ETH/USDT", fetch))
+            self.assertEqual(fetch.call_count, 2)
+
+    def test_unsafe_ladder_is_rejected_before_configuration(self):
+        logic = MagicMock()
+        logic.prepare_orders.side_effect = lambda *args: [(True, order) for order in args[-1]]
+        logic.margin_brackets.return_value = BTC
+        errors = []
+        levels = [{'amount': 1.0, 'price': 50000.0}, {'amount': 1.0, 'price': 45000.0}]
+        ladder = DcaLadder(logic, "key", "secret", FUTURES_ENV, "BTC/USDT", levels, ui_strings.MERGE_MODE_ISOLATED,
+                           20, journal=OrderJournal(path=None), on_error=errors.append)
+
+        ladder.run()
+
+        self.assertEqual(len(errors), 1)
+        self.assertIn("Échelle BTC/USDT refusée avant envoi", errors[0])
+        logic.configure_futures_symbol.assert_not_called()
+        logic.place_orders_batch.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
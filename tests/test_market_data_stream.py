@@ -0,0 +1,188 @@
+import asyncio
+import json
+import socket
+import time
+import unittest
+from unittest.mock import patch
+from aiohttp import web
+from src.controllers.market_data_controller import MarketDataController
+from src.models.market_environment import MarketEnvironment
+from src.models.ticker import Ticker
+from src.services.market_data_stream import MarketDataStream, TickerCache
+from src.services.order_book import OrderBook
+
+
+def depth(first_id, final_id, bids=(), asks=(), previous_id=None, symbol='BTCUSDT'):
+    event = {'e': 'depthUpdate', 'E': final_id, 's': symbol, 'U': first_id, 'u': final_id,
+             'b': [[str(p), str(q)] for p, q in bids], 'a': [[str(p), str(q)] for p, q in asks]}
+    if previous_id is not None:
+        event['pu'] = previous_id
+    return event
+
+
+# Excerpt of a recorded @depth feed: the third diff skips update ids (105 -> 110).
+RECORDED_FEED = [
+    depth(95, 102, bids=[(99.0, 1.0)]),
+    depth(103, 105, asks=[(101.0, 0.0), (102.0, 3.0)]),
+    depth(110, 112, bids=[(99.5, 2.0)]),
+    depth(190, 201, bids=[(99.8, 1.5)]),
+    depth(202, 203, asks=[(100.5, 0.7)]),
+]
+SNAPSHOTS = [
+    {'lastUpdateId': 100, 'bids': [['99.0', '2.0'], ['98.0', '1.0']], 'asks': [['101.0', '1.0'], ['103.0', '4.0']]},
+    {'lastUpdateId': 200, 'bids': [['99.5', '2.0'], ['98.0', '1.0']], 'asks': [['102.0', '3.0']]},
+]
+
+
+class FakeSnapshots:
+    def __init__(self, snapshots):
+        self.snapshots = list(snapshots)
+        self.requests = []
+
+    async def fetch(self, market_id):
+        self.requests.append(market_id)
+        return self.snapshots.pop(0) if len(self.snapshots) > 1 else self.snapshots[0]
+
+
+class ReplayServer:
+    """Stand-in for the Binance combined stream: replays a recorded feed to each connection."""
+
+    def __init__(self, events):
+        self.events = events
+        self.requested_streams = []
+        self.sockets = []
+
+    async def handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.requested_streams.append(request.query['streams'])
+        self.sockets.append(ws)
+        for event in self.events:
+            await ws.send_str(json.dumps({'stream': 'btcusdt@depth@100ms', 'data': event}))
+        async for _ in ws:
+            pass
+        return ws
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get('/stream', self.handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/stream"
+        return self
+
+    async def __aexit__(self, *exc):
+        for ws in self.sockets:
+            await ws.close()
+        await self.runner.cleanup()
+
+
+async def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.005)
+
+
+class TestOrderBook(unittest.TestCase):
+    def setUp(self):
+        self.book = OrderBook('BTCUSDT')
+        self.book.load_snapshot(100, SNAPSHOTS[0]['bids'], SNAPSHOTS[0]['asks'])
+
+    def test_diffs_update_best_levels(self):
+        self.assertTrue(self.book.apply_diff(depth(90, 100, bids=[(500.0, 1.0)])))  # already in the snapshot
+        self.assertEqual(self.book.best_bid(), (99.0, 2.0))
+        self.assertTrue(self.book.apply_diff(depth(95, 102, bids=[(99.0, 0.0)], asks=[(100.5, 2.0)])))
+        self.assertTrue(self.book.apply_diff(depth(103, 103, asks=[(100.5, 0.0)])))
+        self.assertEqual(self.book.best_bid(), (98.0, 1.0))
+        self.assertEqual(self.book.best_ask(), (101.0, 1.0))
+        self.assertEqual(self.book.asks(), [(101.0, 1.0), (103.0, 4.0)])
+        self.assertEqual(self.book.last_update_id, 103)
+
+    def test_sequence_gaps_are_rejected(self):
+        self.assertFalse(self.book.apply_diff(depth(102, 104)))  # does not cover 101
+        self.assertTrue(self.book.apply_diff(depth(101, 102)))
+        self.assertFalse(self.book.apply_diff(depth(104, 105, bids=[(99.9, 1.0)])))
+        self.assertEqual(self.book.best_bid(), (99.0, 2.0))
+        # Futures: continuity is given by 'pu', the previous event's final id.
+        self.assertTrue(self.book.apply_diff(depth(100, 110, previous_id=102)))
+        self.assertFalse(self.book.apply_diff(depth(112, 115, previous_id=111)))
+
+    def test_ticker_cache_notifies_top_of_book_changes_only(self):
+        cache = TickerCache()
+        seen = []
+        cache.subscribe(seen.append)
+        cache.update(Ticker('BTCUSDT', 99.0, 1.0, 101.0, 1.0, update_id=1))
+        cache.update(Ticker('BTCUSDT', 99.0, 1.0, 101.0, 1.0, update_id=2))
+        cache.update(Ticker('BTCUSDT', 99.0, 1.0, 101.0, 1.0, mark_price=100.2, update_id=3))
+        self.assertEqual(len(seen), 2)
+        self.assertEqual(cache.get('BTC/USDT:USDT').update_id, 3)
+        self.assertEqual(cache.get('BTC/USDT').reference_price, 100.2)
+
+
+class TestMarketDataStream(unittest.TestCase):
+    def test_replayed_feed_resyncs_after_gap(self):
+        async def scenario():
+            async with ReplayServer(RECORDED_FEED) as server:
+                cache = TickerCache()
+                snapshots = FakeSnapshots(SNAPSHOTS)
+                stream = MarketDataStream(['BTC/USDT'], snapshots, cache, MarketEnvironment.SPOT,
+                                          ws_base_url=server.url, resync_delay=0.01)
+                task = asyncio.create_task(stream.run())
+                await wait_until(lambda: cache.get('BTCUSDT') is not None and cache.get('BTCUSDT').update_id == 203)
+                await stream.stop()
+                await task
+                return server, stream, snapshots, cache
+
+        server, stream, snapshots, cache = asyncio.run(scenario())
+        self.assertEqual(server.requested_streams, ['btcusdt@depth@100ms'])
+        self.assertEqual(snapshots.requests, ['BTCUSDT', 'BTCUSDT'])
+        self.assertEqual(stream.resyncs, 2)
+        ticker = cache.get('BTCUSDT')
+        self.assertEqual((ticker.bid, ticker.bid_qty, ticker.ask, ticker.ask_qty), (99.8, 1.5, 100.5, 0.7))
+        self.assertAlmostEqual(ticker.reference_price, 100.15)
+
+    def test_futures_stream_tracks_mark_price(self):
+        stream = MarketDataStream(['ETHUSDT'], FakeSnapshots(SNAPSHOTS), TickerCache(), MarketEnvironment.FUTURES_LIVE)
+        self.assertEqual(stream.stream_names, ['ethusdt@depth@100ms', 'ethusdt@markPrice@1s'])
+        stream.books['ETHUSDT'].load_snapshot(10, [['9', '1']], [['11', '1']])
+        stream.handle_message(json.dumps({'e': 'markPriceUpdate', 's': 'ETHUSDT', 'p': '10.25'}))
+        self.assertEqual(stream.cache.get('ETHUSDT').reference_price, 10.25)
+
+
+
+class TestMarketDataController(unittest.TestCase):
+    def test_switching_symbols_does_not_wait_for_a_hung_connection(self):
+        # A listening socket that never accepts: ws_connect hangs on the upgrade.
+        hung = socket.socket()
+        hung.bind(("127.0.0.1", 0))
+        hung.listen()
+        self.addCleanup(hung.close)
+        urls = {MarketEnvironment.SPOT: f"ws://127.0.0.1:{hung.getsockname()[1]}/stream"}
+        with patch.dict('src.services.market_data_stream.STREAM_BASE_URLS', urls), \
+                patch('src.controllers.market_data_controller.STOP_TIMEOUT', 0.2):
+            controller = MarketDataController()
+            try:
+                controller.watch(MarketEnvironment.SPOT, ['BTC/USDT'])
+                hung_future = controller._future
+
+                start = time.monotonic()
+                controller.watch(MarketEnvironment.SPOT, ['ETH/USDT'])
+                elapsed = time.monotonic() - start
+
+                self.assertTrue(controller.is_running())
+                deadline = time.monotonic() + 5
+                while not hung_future.done() and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            finally:
+                controller.stop()
+        self.assertLess(elapsed, 0.1)
+        self.assertTrue(hung_future.cancelled())
+
+
+if __name__ == '__main__':
+    unittest.main()
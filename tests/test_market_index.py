@@ -0,0 +1,136 @@
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from src.app_logic import BinanceLogic, InvalidOrderParamsError
+from src.models.market_environment import MarketEnvironment
+from src.models.symbol_rules import SymbolRules
+from src.services.market_index import MarketIndex, RETRY_INTERVAL, parse_market
+from tests.helpers import FakeClock
+
+
+def spot_market(symbol="BTC/USDT", tick="0.01", step="0.00001", min_notional="5", max_orders="200"):
+    return {
+        'symbol': symbol, 'spot': True, 'linear': None, 'swap': False,
+        'info': {'filters': [
+            {'filterType': 'PRICE_FILTER', 'tickSize': tick, 'minPrice': '0.01', 'maxPrice': '1000000'},
+            {'filterType': 'LOT_SIZE', 'stepSize': step, 'minQty': step, 'maxQty': '9000'},
+            {'filterType': 'NOTIONAL', 'minNotional': min_notional},
+            {'filterType': 'MAX_NUM_ORDERS', 'maxNumOrders': max_orders},
+        ]},
+    }
+
+
+class TestSymbolRules(unittest.TestCase):
+    def test_snapping_and_violations(self):
+        rules = SymbolRules("BTC/USDT", tick_size=0.1, step_size=0.001, min_qty=0.001, min_notional=5.0)
+
+        self.assertEqual(rules.snap_price(100.27, "BUY"), 100.2)
+        self.assertEqual(rules.snap_price(100.21, "SELL"), 100.3)
+        self.assertEqual(rules.snap_amount(0.0129), 0.012)
+        self.assertIsNone(rules.violation(0.1, 100.0))
+        self.assertIn("notionnel", rules.violation(0.01, 100.0))
+        self.assertIn("quantité nulle", rules.violation(0.0, 100.0))
+
+
+class TestMarketIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.clock = FakeClock()
+        self.index = MarketIndex(cache_dir=self.tmp.name, ttl=3600, clock=self.clock)
+
+    def test_parse_market_reads_filters_and_keys_futures_by_base_quote(self):
+        symbol, rules = parse_market(spot_market(), MarketEnvironment.SPOT)
+        self.assertEqual(symbol, "BTC/USDT")
+        self.assertEqual((rules.tick_size, rules.step_size, rules.min_notional, rules.max_num_orders),
+                         (0.01, 0.00001, 5.0, 200))
+
+        futures = {'symbol': 'BTC/USDT:USDT', 'base': 'BTC', 'quote': 'USDT', 'linear': True, 'swap': True,
+                   'info': {'filters': [{'filterType': 'MIN_NOTIONAL', 'notional': '100'}]},
+                   'precision': {'price': 0.1, 'amount': 0.001}}
+        symbol, rules = parse_market(futures, MarketEnvironment.FUTURES_LIVE)
+        self.assertEqual(symbol, "BTC/USDT")
+        self.assertEqual((rules.tick_size, rules.step_size, rules.min_notional), (0.1, 0.001, 100.0))
+        self.assertIsNone(parse_market(spot_market(), MarketEnvironment.FUTURES_LIVE))
+
+    def test_markets_are_fetched_once_and_reloaded_from_disk(self):
+        fetch = MagicMock(return_value=[spot_market()])
+
+        self.assertEqual(self.index.rules(MarketEnvironment.SPOT, "BTC/USDT", fetch).tick_size, 0.01)
+        self.index.rules(MarketEnvironment.SPOT, "BTC/USDT", fetch)
+        fetch.assert_called_once()
+
+        restarted = MarketIndex(cache_dir=self.tmp.name, ttl=3600, clock=self.clock)
+        other_fetch = MagicMock()
+        self.assertEqual(restarted.rules(MarketEnvironment.SPOT, "BTC/USDT", other_fetch).min_notional, 5.0)
+        other_fetch.assert_not_called()
+        self.assertIsNone(restarted.get(MarketEnvironment.FUTURES_LIVE, "BTC/USDT"))
+
+    def test_stale_index_is_kept_when_refresh_fails(self):
+        self.index.update(MarketEnvironment.SPOT, [spot_market()])
+        self.clock.now += 7200
+        self.assertTrue(self.index.needs_refresh(MarketEnvironment.SPOT, "BTC/USDT"))
+
+        failing = MagicMock(side_effect=Exception("down"))
+        self.assertEqual(self.index.rules(MarketEnvironment.SPOT, "BTC/USDT", failing).tick_size, 0.01)
+        self.assertFalse(self.index.needs_refresh(MarketEnvironment.SPOT, "BTC/USDT"))
+
+        self.clock.now += RETRY_INTERVAL
+        self.assertTrue(self.index.needs_refresh(MarketEnvironment.SPOT, "BTC/USDT"))
+
+    def test_refresh_merges_changes_and_ignores_empty_results(self):
+        self.index.update(MarketEnvironment.SPOT, [spot_market(), spot_market("ETH/USDT")])
+        self.assertEqual(self.index.update(MarketEnvironment.SPOT, []), 0)
+        self.assertIsNotNone(self.index.get(MarketEnvironment.SPOT, "ETH/USDT"))
+
+        changed = self.index.update(MarketEnvironment.SPOT, [spot_market(tick="0.1"), spot_market("ETH/USDT")])
+        self.assertEqual(changed, 1)
+        self.assertEqual(self.index.get(MarketEnvironment.SPOT, "BTC/USDT").tick_size, 0.1)
+
+    def test_unknown_symbol_triggers_rate_limited_reload(self):
+        self.index.update(MarketEnvironment.SPOT, [spot_market()])
+        self.clock.now += RETRY_INTERVAL
+        fetch = MagicMock(return_value=[spot_market()])
+
+        self.assertIsNone(self.index.rules(MarketEnvironment.SPOT, "NEW/USDT", fetch))
+        self.assertIsNone(self.index.rules(MarketEnvironment.SPOT, "NEW/USDT", fetch))
+        fetch.assert_called_once()
+
+
+class TestBinanceLogicPreValidation(unittest.TestCase):
+    def setUp(self):
+        self.index = MarketIndex(cache_dir=None)
+        self.index.update(MarketEnvironment.SPOT, [spot_market(max_orders="2")])
+        self.logic = BinanceLogic(market_index=self.index)
+        self.exchange = MagicMock()
+        self.exchange.create_order.return_value = {'id': '1'}
+        patcher = patch('src.app_logic.ccxt.binance', return_value=self.exchange)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_place_order_sends_snapped_values(self):
+        self.logic.place_order("key", "secret", MarketEnvironment.SPOT, "BTC/USDT", "LIMIT", "BUY",
+                               0.0123456, 30123.456)
+        self.exchange.create_order.assert_called_once_with("BTC/USDT", "limit", "buy", 0.01234, 30123.45, {})
+        self.exchange.fetch_markets.assert_not_called()
+
+    def test_infeasible_order_is_rejected_before_any_request(self):
+        with self.assertRaises(InvalidOrderParamsError):
+            self.logic.place_order("key", "secret", MarketEnvironment.SPOT, "BTC/USDT", "LIMIT", "BUY", 0.0001, 100.0)
+        self.exchange.create_order.assert_not_called()
+
+    def test_prepare_orders_enforces_filters_and_max_orders(self):
+        orders = [{'order_type': 'LIMIT', 'side': 'BUY', 'amount': 0.001, 'price': 100.0},
+                  {'order_type': 'LIMIT', 'side': 'BUY', 'amount': 0.1, 'price': 100.009},
+                  {'order_type': 'LIMIT', 'side': 'BUY', 'amount': 0.1, 'price': 90.0},
+                  {'order_type': 'LIMIT', 'side': 'BUY', 'amount': 0.1, 'price': 80.0}]
+
+        results = self.logic.prepare_orders("key", "secret", MarketEnvironment.SPOT, "BTC/USDT", orders)
+
+        self.assertEqual([success for success, _ in results], [False, True, True, False])
+        self.assertEqual(results[1][1]['price'], 100.0)
+        self.assertIn("2 ordres", str(results[3][1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
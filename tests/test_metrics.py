@@ -0,0 +1,166 @@
+import socket
+import tempfile
+import time
+import unittest
+import urllib.request
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+import ccxt
+from src.app_logic import BinanceLogic
+from src.constants import ui_strings
+from src.models.market_environment import MarketEnvironment
+from src.services.futures_config_cache import FuturesConfigCache
+from src.services.market_index import MarketIndex
+from src.services.metrics import (Metrics, MetricsExporter, METRICS_FILE_ENV_VAR, METRICS_PORT_ENV_VAR,
+                                  render_prometheus)
+from src.services.rate_limiter import RateLimiter
+from src.services.retry_policy import RetryPolicy
+from tests.helpers import FakeClock
+
+
+class TestMetrics(unittest.TestCase):
+    def test_span_records_durations_and_errors(self):
+        clock = FakeClock(0.0)
+        metrics = Metrics(clock=clock)
+        for duration in (0.010, 0.020, 0.030):
+            with metrics.span("logic.get_balance", env="SPOT"):
+                clock.now += duration
+        with self.assertRaises(ValueError):
+            with metrics.span("logic.get_balance", env="SPOT"):
+                clock.now += 0.5
+                raise ValueError("boom")
+
+        summary, = metrics.spans()
+        self.assertEqual((summary.name, summary.labels), ("logic.get_balance", (("env", "SPOT"),)))
+        self.assertEqual((summary.count, summary.errors), (4, 1))
+        self.assertAlmostEqual(summary.p50, 0.030)
+        self.assertAlmostEqual(summary.p99, 0.5)
+        self.assertAlmostEqual(summary.max, 0.5)
+        self.assertAlmostEqual(summary.total, 0.56)
+
+    def test_prometheus_text(self):
+        metrics = Metrics()
+        metrics.observe("exchange.create_order", 0.25)
+        metrics.increment("rate_limit_waits", env="SPOT")
+        metrics.increment("rate_limit_waits", env="SPOT")
+
+        text = render_prometheus(metrics)
+
+        self.assertIn('binance_multiapp_span_seconds{span="exchange.create_order",quantile="0.99"} 0.250000', text)
+        self.assertIn('binance_multiapp_span_seconds_count{span="exchange.create_order"} 1', text)
+        self.assertIn("# TYPE binance_multiapp_rate_limit_waits_total counter", text)
+        self.assertIn('binance_multiapp_rate_limit_waits_total{env="SPOT"} 2', text)
+
+    def test_exporter_serves_endpoint_and_writes_file(self):
+        metrics = Metrics()
+        metrics.increment("order_retries")
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "metrics.prom"
+            exporter = MetricsExporter(metrics, path=path, port=0, interval=60).start()
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/metrics", timeout=5) as response:
+                    body = response.read().decode("utf-8")
+            finally:
+                exporter.stop()
+
+            self.assertIn("binance_multiapp_order_retries_total 1", body)
+            self.assertEqual(path.read_text(encoding="utf-8"), render_prometheus(metrics))
+
+    def test_file_export_survives_write_errors(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "metrics.prom"
+            exporter = MetricsExporter(Metrics(), path=path, interval=0.01)
+            real_write = exporter.write
+            calls = []
+
+            def flaky_write():
+                calls.append(1)
+                if len(calls) <= 2:
+                    raise OSError("No space left on device")
+                real_write()
+
+            exporter.write = flaky_write
+            with self.assertLogs("src.services.metrics", level="WARNING"):
+                exporter.start()
+                deadline = time.monotonic() + 5
+                while len(calls) < 4 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            exporter.stop()
+
+            self.assertGreaterEqual(len(calls), 4)
+            self.assertTrue(path.exists())
+
+    def test_invalid_port_is_ignored(self):
+        with patch.dict('os.environ', {METRICS_PORT_ENV_VAR: "metrics", METRICS_FILE_ENV_VAR: ""}):
+            with self.assertLogs("src.services.metrics", level="WARNING") as logs:
+                self.assertIsNone(MetricsExporter.from_environment(Metrics()))
+        self.assertIn(METRICS_PORT_ENV_VAR, logs.output[0])
+        with patch.dict('os.environ', {METRICS_PORT_ENV_VAR: "70000", METRICS_FILE_ENV_VAR: "/tmp/m.prom"}):
+            with self.assertLogs("src.services.metrics", level="WARNING"):
+                exporter = MetricsExporter.from_environment(Metrics())
+        self.assertIsNone(exporter.port)
+        self.assertEqual(exporter.path, Path("/tmp/m.prom"))
+
+    def test_port_in_use_keeps_the_file_export(self):
+        with socket.socket() as taken, tempfile.TemporaryDirectory() as tmp:
+            taken.bind(("127.0.0.1", 0))
+            taken.listen()
+            path = Path(tmp) / "metrics.prom"
+            exporter = MetricsExporter(Metrics(), path=path, port=taken.getsockname()[1], interval=0.01)
+            with self.assertLogs("src.services.metrics", level="WARNING") as logs:
+                exporter.start()
+            try:
+                deadline = time.monotonic() + 5
+                while not path.exists() and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            finally:
+                exporter.stop()
+            self.assertIsNone(exporter.port)
+            self.assertIn("/metrics", logs.output[0])
+            self.assertTrue(path.exists())
+
+
+class TestBinanceLogicInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics()
+        self.logic = BinanceLogic(market_index=MarketIndex(cache_dir=None), rate_limiter=RateLimiter(),
+                                  retry_policy=RetryPolicy(base_delay=0.0), metrics=self.metrics,
+                                  futures_config=FuturesConfigCache())
+
+    def _span_counts(self):
+        return {summary.name: summary.count for summary in self.metrics.spans()}
+
+    @patch('src.app_logic.ccxt.binance')
+    def test_place_order_phases_are_timed(self, mock_binance_constructor):
+        mock_exchange = MagicMock()
+        mock_exchange.create_order.return_value = {'id': '1', 'status': 'open'}
+        mock_binance_constructor.return_value = mock_exchange
+
+        self.logic.place_order("key", "secret", MarketEnvironment.FUTURES_LIVE, 'BTC/USDT',
+                               ui_strings.ORDER_TYPE_LIMIT, ui_strings.SIDE_BUY, 1.0, 30000.0,
+                               margin_mode=ui_strings.MERGE_MODE_CROSS, leverage=5)
+
+        counts = self._span_counts()
+        for name in ("logic.place_order", "exchange_pool.checkout", "exchange.construct", "place_order.market_rules",
+                     "place_order.configure", "place_order.submit", "exchange.set_margin_mode",
+                     "exchange.set_leverage", "exchange.create_order"):
+            self.assertEqual(counts.get(name), 1, name)
+
+    @patch('src.app_logic.ccxt.binance')
+    def test_retries_are_counted(self, mock_binance_constructor):
+        mock_exchange = MagicMock()
+        mock_exchange.create_order.side_effect = [ccxt.RequestTimeout("Timeout"), {'id': '7', 'status': 'open'}]
+        mock_exchange.fetch_order.side_effect = ccxt.OrderNotFound("Order does not exist.")
+        mock_binance_constructor.return_value = mock_exchange
+
+        self.logic.place_order("key", "secret", MarketEnvironment.SPOT, 'BTC/USDT', ui_strings.ORDER_TYPE_LIMIT,
+                               ui_strings.SIDE_BUY, 1.0, 30000.0, client_order_id="dca-run-0")
+
+        self.assertEqual(self.metrics.counter("order_retries"), 1)
+        errors = {summary.name: summary.errors for summary in self.metrics.spans()}
+        self.assertEqual(errors["exchange.create_order"], 1)
+        self.assertEqual(errors["logic.place_order"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import math
+import unittest
+import numpy as np
+from src.backtest import (BacktestError, BlocBougies, GenerateurBootstrap, GenerateurGbm, ResultatMonteCarlo,
+                          simuler_risque)
+from src.simulation_logic import calculer_iterations
+
+# 1000 sur 23 niveaux de 40 à 4, 10 % de baisse par niveau.
+RESULTATS = calculer_iterations(1000, 40, 4, 10, avec_details=False)
+
+
+class TestMonteCarlo(unittest.TestCase):
+
+    def test_steady_crash_fills_every_level(self):
+        # Volatilité nulle : chaque chemin perd 15 % par pas et ne remonte jamais.
+        risque = simuler_risque(RESULTATS, GenerateurGbm(0.0, math.log(0.85)), nombre_chemins=50, horizon=30,
+                                leviers=(1, 10), graine=1)
+
+        self.assertEqual(risque.nombre_chemins, 50)
+        self.assertEqual(risque.profondeurs[23], 50)
+        self.assertEqual(risque.probabilite_catastrophe, 1.0)
+        self.assertEqual(risque.probabilite_recuperation, 0.0)
+        self.assertIsNone(risque.temps_recuperation_moyen)
+        self.assertIsNone(risque.quantile_recuperation(0.5))
+        self.assertEqual(risque.liquidations, {1: 0, 10: 50})
+
+    def test_rising_returns_exit_at_the_first_step(self):
+        generateur = GenerateurBootstrap(np.full(10, 0.01))
+        risque = simuler_risque(RESULTATS, generateur, nombre_chemins=20, horizon=100, take_profit_percent=0.5)
+
+        self.assertEqual(risque.profondeurs[1], 20)
+        self.assertEqual(risque.recuperations[1], 20)
+        self.assertEqual(risque.temps_recuperation_moyen, 1.0)
+        self.assertEqual(risque.quantile_profondeur(0.95), 1)
+
+    def test_aggregates_do_not_depend_on_process_count(self):
+        options = dict(nombre_chemins=3_000, horizon=400, leviers=(1, 5), graine=7, chemins_par_tache=1_000)
+        en_ligne = simuler_risque(RESULTATS, GenerateurGbm(0.03), max_workers=1, **options)
+        pool = simuler_risque(RESULTATS, GenerateurGbm(0.03), max_workers=2, **options)
+
+        np.testing.assert_array_equal(en_ligne.profondeurs, pool.profondeurs)
+        np.testing.assert_array_equal(en_ligne.recuperations, pool.recuperations)
+        self.assertEqual(en_ligne.liquidations, pool.liquidations)
+        self.assertEqual(en_ligne.profondeurs.sum(), 3_000)
+
+    def test_bootstrap_reads_returns_across_blocks(self):
+        clotures = [100.0, 110.0, 99.0, 99.0]
+        blocs = [BlocBougies.depuis_colonnes(np.array([[i, c, c, c, c, 1.0] for i, c in enumerate(partie)]).T)
+                 for partie in (clotures[:2], clotures[2:])]
+        generateur = GenerateurBootstrap.depuis_bougies(blocs)
+
+        np.testing.assert_allclose(generateur.rendements, np.diff(np.log(clotures)))
+        tirages = generateur.generer(np.random.default_rng(0), 4, 7)
+        self.assertEqual(tirages.shape, (4, 7))
+        self.assertTrue(np.isin(tirages, generateur.rendements).all())
+
+    def test_merge_adds_streamed_aggregates(self):
+        a = ResultatMonteCarlo.vide(2, 3, (1,))
+        b = ResultatMonteCarlo(4, 3, np.array([0, 3, 1]), np.array([0, 2, 1, 0]), 1, {1: 1})
+        a.fusionner(b).fusionner(b)
+
+        self.assertEqual(a.nombre_chemins, 8)
+        np.testing.assert_array_equal(a.profondeurs, [0, 6, 2])
+        self.assertEqual(a.probabilite_liquidation(1), 0.25)
+        self.assertAlmostEqual(a.temps_recuperation_moyen, 4 / 3)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(BacktestError):
+            GenerateurGbm(-0.1)
+        with self.assertRaises(BacktestError):
+            GenerateurBootstrap(np.array([0.01]), longueur_bloc=2)
+        with self.assertRaises(BacktestError):
+            simuler_risque(RESULTATS, GenerateurGbm(0.01), leviers=(0,))
+        with self.assertRaises(BacktestError):
+            simuler_risque(RESULTATS, GenerateurGbm(0.01), horizon=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, AsyncMock
+from PyQt5.QtCore import QCoreApplication
+from src.workers.multi_symbol_dca_worker import MultiSymbolDcaWorker
+from src.workers.async_jobs import AsyncMultiSymbolDcaJob
+from src.app_logic import BinanceLogic, OrderPlacementError
+from src.models.dca_deployment import DcaDeployment
+from src.models.market_environment import MarketEnvironment
+from src.models.rollback_report import RollbackReport
+from src.services.order_journal import OrderJournal
+
+
+def passthrough(*args):
+    return [(True, order) for order in args[-1]]
+
+
+class TestMultiSymbolDcaWorker(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        """Set up for test methods."""
+        self.binance_logic = MagicMock()
+        self.binance_logic.max_batch_size.side_effect = BinanceLogic.max_batch_size
+        self.binance_logic.prepare_orders.side_effect = passthrough
+        self.binance_logic.cancel_orders.side_effect = lambda key, secret, env, symbol, ids: RollbackReport(
+            symbol=symbol, requested=ids, cancelled=ids, verified=True)
+        levels = [{'price': 100.0 - i, 'amount': 1.0} for i in range(3)]
+        self.deployments = [DcaDeployment(symbol, levels, "Croisé", 5 + i)
+                            for i, symbol in enumerate(["BTC/USDT", "ETH/USDT", "SOL/USDT", "XRP/USDT"])]
+
+    def _run(self, worker):
+        attempts, symbols, deployments = [], [], []
+        worker.order_attempt_finished.connect(lambda *args: attempts.append(args))
+        worker.symbol_finished.connect(symbols.append)
+        worker.deployment_finished.connect(deployments.append)
+        worker.run()
+        self.app.processEvents()  # Deliver signals emitted from the pool threads
+        return attempts, symbols, deployments
+
+    def test_symbols_run_in_parallel_with_bounded_concurrency(self):
+        lock = threading.Lock()
+        in_flight, peak = [0], [0]
+
+        def place(api_key, secret_key, market_environment, symbol, orders, margin_mode, leverage):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.05)
+            with lock:
+                in_flight[0] -= 1
+            return [(True, {'id': f"{symbol}-{order['price']}"}) for order in orders]
+
+        self.binance_logic.place_orders_batch.side_effect = place
+        worker = MultiSymbolDcaWorker(self.binance_logic, "key", "secret", MarketEnvironment.FUTURES_TESTNET,
+                                      self.deployments, max_parallel_symbols=2, journal=OrderJournal(path=None))
+
+        attempts, symbols, deployments = self._run(worker)
+
+        self.assertEqual(peak[0], 2)
+        self.assertEqual(len(attempts), 12)
+        self.assertEqual({outcome.symbol for outcome in symbols}, {d.symbol for d in self.deployments})
+        outcomes = deployments[0]
+        self.assertEqual([outcome.symbol for outcome in outcomes], [d.symbol for d in self.deployments])
+        self.assertTrue(all(outcome.success and len(outcome.placed) == 3 for outcome in outcomes))
+        leverages = {call.kwargs['symbol']: call.kwargs['leverage']
+                     for call in self.binance_logic.place_orders_batch.call_args_list}
+        self.assertEqual(leverages, {"BTC/USDT": 5, "ETH/USDT": 6, "SOL/USDT": 7, "XRP/USDT": 8})
+
+    def test_failed_symbol_only_rolls_back_its_own_orders(self):
+        def place(api_key, secret_key, market_environment, symbol, orders, margin_mode, leverage):
+            results = [(True, {'id': f"{symbol}-{order['price']}"}) for order in orders]
+            if symbol == "ETH/USDT":
+                results[2] = (False, OrderPlacementError("rejected"))
+            return results
+
+        self.binance_logic.place_orders_batch.side_effect = place
+        worker = MultiSymbolDcaWorker(self.binance_logic, "key", "secret", MarketEnvironment.FUTURES_TESTNET,
+                                      self.deployments[:2], journal=OrderJournal(path=None))
+
+        _, _, deployments = self._run(worker)
+
+        self.binance_logic.cancel_orders.assert_called_once()
+        self.assertEqual(self.binance_logic.cancel_orders.call_args[0][3], "ETH/USDT")
+        btc, eth = deployments[0]
+        self.assertTrue(btc.success)
+        self.assertIsNone(btc.rollback)
+        self.assertFalse(eth.success)
+        self.assertIn("l'ordre 3", eth.message)
+        self.assertTrue(eth.rollback.success)
+
+
+class TestAsyncMultiSymbolDcaJob(unittest.TestCase):
+    def test_symbols_share_the_loop_with_bounded_concurrency(self):
+        in_flight, peak = [0], [0]
+
+        async def place(api_key, secret_key, market_environment, symbol, orders, margin_mode, leverage):
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+            return [(True, {'id': f"{symbol}-{order['price']}"}) for order in orders]
+
+        async_logic = MagicMock()
+        async_logic.max_batch_size.side_effect = BinanceLogic.max_batch_size
+        async_logic.prepare_orders = AsyncMock(side_effect=passthrough)
+        async_logic.configure_futures_symbol = AsyncMock()
+        async_logic.place_orders_batch = AsyncMock(side_effect=place)
+        deployments = [DcaDeployment(f"S{i}/USDT", [{'price': 10.0, 'amount': 1.0}], "Croisé", 5) for i in range(5)]
+        job = AsyncMultiSymbolDcaJob(async_logic, "key", "secret", MarketEnvironment.FUTURES_TESTNET,
+                                     deployments, max_parallel_symbols=3, journal=OrderJournal(path=None))
+        results = []
+        job.deployment_finished.connect(results.append)
+
+        asyncio.run(job.run())
+
+        self.assertEqual(peak[0], 3)
+        self.assertEqual([outcome.symbol for outcome in results[0]], [d.symbol for d in deployments])
+        self.assertTrue(all(outcome.success for outcome in results[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
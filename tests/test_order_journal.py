@@ -0,0 +1,109 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+from src.models.journal_entry import STATE_ACKED, STATE_CLOSED, STATE_NOT_FOUND, STATE_PENDING
+from src.models.market_environment import MarketEnvironment
+from src.services.order_journal import OrderJournal
+from src.workers.journal_reconcile_worker import JournalReconcileWorker
+
+
+def level(price, amount=1.0):
+    return {'order_type': "LIMIT", 'side': "BUY", 'price': price, 'amount': amount}
+
+
+class TestOrderJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "journal.sqlite3"
+        self.journal = OrderJournal(path=self.path)
+        self.env = MarketEnvironment.FUTURES_TESTNET
+
+    def tearDown(self):
+        self.journal.close()
+        self.tmp.cleanup()
+
+    def test_intents_survive_a_restart_and_acks_are_grouped(self):
+        run_id = OrderJournal.new_run_id()
+        entries = [self.journal.new_intent(run_id, self.env, "BTC/USDT", i, level(100.0 - i)) for i in range(3)]
+        self.assertEqual(self.journal.flush(), 3)
+        entries[0].acknowledge({'id': 11, 'status': 'open'})
+        self.journal.record(entries[0])
+        self.journal.record(entries[0])
+
+        # A second process (here: a second connection) sees the intents written before submission.
+        reopened = OrderJournal(path=self.path)
+        self.assertEqual(reopened._db.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual([e.state for e in reopened.run_entries(run_id)], [STATE_PENDING] * 3)
+        self.assertEqual(self.journal.flush(), 1)
+        self.assertEqual([e.order_id for e in reopened.placed(run_id)], ["11"])
+        reopened.close()
+
+    def test_recording_costs_microseconds_per_order(self):
+        run_id = OrderJournal.new_run_id()
+        started = time.perf_counter()
+        for start in range(0, 1000, 5):
+            entries = [self.journal.new_intent(run_id, self.env, "BTC/USDT", i, level(100.0))
+                       for i in range(start, start + 5)]
+            self.journal.flush()
+            for entry in entries:
+                entry.acknowledge({'id': entry.level_index})
+                self.journal.record(entry)
+        self.journal.flush()
+        per_order = (time.perf_counter() - started) / 1000
+        self.assertLess(per_order, 0.001)
+        self.assertEqual(len(self.journal.placed(run_id)), 1000)
+
+    def test_reconcile_matches_orders_by_client_id(self):
+        run_id = OrderJournal.new_run_id()
+        acked_open, acked_gone, pending_open, pending_filled, pending_lost, pending_unchecked = [
+            self.journal.new_intent(run_id, self.env, "BTC/USDT", i, level(100.0 - i)) for i in range(6)]
+        acked_open.acknowledge({'id': '1'})
+        acked_gone.acknowledge({'id': '2'})
+        self.journal.record_all([acked_open, acked_gone])
+        # L'ordre manuel a le même côté, prix et quantité que pending_lost : il ne doit pas lui être rattaché.
+        open_orders = [{'id': '1', 'side': 'buy', 'price': 100.0, 'amount': 1.0},
+                       {'id': '3', 'clientOrderId': pending_open.client_order_id, 'status': 'open'},
+                       {'id': '99', 'clientOrderId': 'manual', 'side': 'buy', 'price': 96.0, 'amount': 1.0}]
+
+        needed = self.journal.lookups_needed(self.env, "BTC/USDT", open_orders)
+        self.assertEqual(needed, [pending_filled.client_order_id, pending_lost.client_order_id,
+                                  pending_unchecked.client_order_id])
+        looked_up = {pending_filled.client_order_id: {'id': '4', 'status': 'closed'},
+                     pending_lost.client_order_id: None}
+        report = self.journal.reconcile(self.env, "BTC/USDT", open_orders, looked_up)
+
+        self.assertEqual([e.order_id for e in report.still_open], ['1', '3'])
+        self.assertEqual([e.level_index for e in report.closed], [1, 3])
+        self.assertEqual([e.level_index for e in report.not_found], [4])
+        states = {e.level_index: e.state for e in self.journal.run_entries(run_id)}
+        self.assertEqual(states, {0: STATE_ACKED, 1: STATE_CLOSED, 2: STATE_ACKED, 3: STATE_CLOSED,
+                                  4: STATE_NOT_FOUND, 5: STATE_PENDING})
+        self.assertEqual(self.journal.run_entries(run_id)[3].order_id, '4')
+
+    def test_reconcile_worker_checks_each_unresolved_symbol(self):
+        run_id = OrderJournal.new_run_id()
+        intents = [self.journal.new_intent(run_id, self.env, symbol, i, level(10.0))
+                   for i, symbol in enumerate(["BTC/USDT", "ETH/USDT"])]
+        logic = MagicMock()
+        logic.fetch_open_orders.side_effect = lambda key, secret, env, symbol: (
+            [{'id': '9', 'clientOrderId': intents[1].client_order_id, 'status': 'open'}]
+            if symbol == "ETH/USDT" else [])
+        logic.fetch_orders_by_client_id.side_effect = lambda key, secret, env, symbol, ids: {i: None for i in ids}
+        worker = JournalReconcileWorker(logic, "key", "secret", self.env, journal=self.journal)
+        results = []
+        worker.reconcile_finished.connect(results.append)
+
+        worker.run()
+
+        reports = results[0]
+        self.assertEqual([r.symbol for r in reports], ["BTC/USDT", "ETH/USDT"])
+        self.assertEqual((len(reports[0].not_found), len(reports[1].still_open)), (1, 1))
+        self.assertEqual([e.symbol for e in self.journal.unresolved(self.env)], ["ETH/USDT"])
+        logic.fetch_orders_by_client_id.assert_called_once_with("key", "secret", self.env, "BTC/USDT",
+                                                                [intents[0].client_order_id])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from src.services.rate_limiter import RateLimiter, RateLimitTimeoutError
+from src.models.market_environment import MarketEnvironment
+from src.app_logic import BinanceLogic
+
+
+class FakeTime:
+    """Horloge et sommeil simulés : dormir avance l'horloge."""
+
+    def __init__(self, start=1_000_040.0):
+        self.now = start
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.time = FakeTime()
+        limits = {
+            MarketEnvironment.SPOT: [('weight', 10, 60, 'x-mbx-used-weight-1m'),
+                                     ('orders', 3, 10, 'x-mbx-order-count-10s')],
+            MarketEnvironment.FUTURES_LIVE: [('weight', 10, 60, 'x-mbx-used-weight-1m')],
+        }
+        self.limiter = RateLimiter(limits=limits, headroom=1.0, clock=self.time.clock, sleep=self.time.sleep)
+
+    def test_acquire_within_budget_does_not_wait(self):
+        for _ in range(10):
+            self.assertEqual(self.limiter.acquire(MarketEnvironment.SPOT, weight=1), 0.0)
+        self.assertEqual(self.time.sleeps, [])
+
+    def test_acquire_waits_for_window_reset(self):
+        self.limiter.acquire(MarketEnvironment.SPOT, weight=10)
+        waited = self.limiter.acquire(MarketEnvironment.SPOT, weight=1)
+        # L'horloge démarre 20 s après le début d'une minute.
+        self.assertAlmostEqual(waited, 40.0)
+
+    def test_order_window_is_independent_of_weight(self):
+        for _ in range(3):
+            self.limiter.acquire(MarketEnvironment.SPOT, weight=1, orders=1)
+        waited = self.limiter.acquire(MarketEnvironment.SPOT, weight=1, orders=1)
+        self.assertAlmostEqual(waited, 10.0)
+
+    def test_environments_have_separate_budgets(self):
+        self.limiter.acquire(MarketEnvironment.SPOT, weight=10)
+        self.assertEqual(self.limiter.acquire(MarketEnvironment.FUTURES_LIVE, weight=10), 0.0)
+
+    def test_headers_raise_local_usage(self):
+        self.limiter.update_from_headers(MarketEnvironment.SPOT, {'X-MBX-USED-WEIGHT-1M': '9'})
+        self.assertEqual(self.limiter.usage(MarketEnvironment.SPOT)['x-mbx-used-weight-1m'], 9)
+        self.assertGreater(self.limiter.acquire(MarketEnvironment.SPOT, weight=2), 0.0)
+
+    def test_retry_after_blocks_environment(self):
+        self.limiter.update_from_headers(MarketEnvironment.SPOT, {'Retry-After': '5'})
+        self.assertAlmostEqual(self.limiter.acquire(MarketEnvironment.SPOT, weight=1), 5.0)
+
+    def test_non_mapping_headers_are_ignored(self):
+        self.limiter.update_from_headers(MarketEnvironment.SPOT, MagicMock())
+        self.limiter.update_from_headers(MarketEnvironment.SPOT, None)
+        self.assertEqual(self.limiter.usage(MarketEnvironment.SPOT)['x-mbx-used-weight-1m'], 0)
+
+    def test_timeout(self):
+        self.limiter.acquire(MarketEnvironment.SPOT, weight=10)
+        with self.assertRaises(RateLimitTimeoutError):
+            self.limiter.acquire(MarketEnvironment.SPOT, weight=1, timeout=1.0)
+
+    def test_shared_instance_is_process_wide(self):
+        self.assertIs(RateLimiter.shared(), RateLimiter.shared())
+        self.assertIs(BinanceLogic().rate_limiter, RateLimiter.shared())
+
+    @patch('src.app_logic.ccxt.binance')
+    def test_binance_logic_acquires_and_reads_headers(self, mock_binance_constructor):
+        mock_exchange = MagicMock()
+        mock_exchange.fetch_balance.return_value = {'total': {'USDT': 1.0}}
+        mock_exchange.last_response_headers = {'X-MBX-USED-WEIGHT-1M': '7'}
+        mock_binance_constructor.return_value = mock_exchange
+        logic = BinanceLogic(rate_limiter=self.limiter)
+
+        logic.get_balance("key", "secret", MarketEnvironment.FUTURES_LIVE)
+
+        self.assertEqual(self.limiter.usage(MarketEnvironment.FUTURES_LIVE)['x-mbx-used-weight-1m'], 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,8 @@
 import unittest
-from src.simulation_logic import calculer_iterations, SimulationError
+from src.simulation_logic import (calculer_iterations, calculer_niveaux, formater_details, SimulationError,
+                                  SimulationCache, MAX_ITERATIONS_CAP, FormeEchelle, resoudre_multiplicateur,
+                                  ESPACEMENT_ACCELERE, ESPACEMENT_LINEAIRE, REPARTITION_LINEAIRE,
+                                  REPARTITION_MARTINGALE, REPARTITION_PERSONNALISEE)
 from src.constants import error_messages
 import re 
 
@@ -127,6 +130,128 @@ class TestSimulationLogic(unittest.TestCase):
                          results["inputs"]["prix_entree"] * (1 - results["inputs"]["drop_percent"]/100) <= results["inputs"]["prix_catastrophique"])
                         )
 
+    def test_details_are_optional_and_formatted_separately(self):
+        with_details = calculer_iterations(balance=234, prix_entree=0.00000650, prix_catastrophique=0.00000010, drop_percent=10)
+        without_details = calculer_iterations(balance=234, prix_entree=0.00000650, prix_catastrophique=0.00000010,
+                                              drop_percent=10, avec_details=False)
+        self.assertEqual(without_details["details_text"], [])
+        self.assertEqual(without_details["prix_iterations"], with_details["prix_iterations"])
+        self.assertEqual(without_details["quantites_par_iteration"], with_details["quantites_par_iteration"])
+        self.assertEqual(formater_details(without_details), with_details["details_text"])
+
+    def test_core_matches_successive_multiplication(self):
+        prix, quantites, montant = calculer_niveaux(balance=234, prix_entree=0.00000650,
+                                                    prix_catastrophique=0.00000010, drop_percent=10)
+        expected = [0.00000650]
+        for _ in range(len(prix) - 1):
+            expected.append(expected[-1] * (1 - 10 / 100))
+        self.assertEqual(prix.tolist(), expected)
+        self.assertEqual(quantites.tolist(), [montant / p for p in expected])
+
+    def test_iteration_cap(self):
+        results = calculer_iterations(balance=100, prix_entree=5, prix_catastrophique=0, drop_percent=0.5,
+                                      avec_details=False)
+        self.assertEqual(results["nombre_total_iterations"], MAX_ITERATIONS_CAP)
+
+    def test_tiny_price_stops_ladder(self):
+        results = calculer_iterations(balance=100, prix_entree=10, prix_catastrophique=0, drop_percent=50)
+        self.assertGreaterEqual(min(results["prix_iterations"]), 0.00000001)
+        self.assertLess(results["prix_iterations"][-1] * 0.5, 0.00000001)
+
+
+class TestFormeEchelle(unittest.TestCase):
+    def test_default_shape_matches_the_even_ladder(self):
+        results = calculer_iterations(balance=234, prix_entree=0.00000650, prix_catastrophique=0.00000010,
+                                      drop_percent=10, forme=FormeEchelle())
+        prix, quantites, montant = calculer_niveaux(balance=234, prix_entree=0.00000650,
+                                                    prix_catastrophique=0.00000010, drop_percent=10)
+        self.assertEqual(results["prix_iterations"], prix.tolist())
+        self.assertEqual(results["quantites_par_iteration"], quantites.tolist())
+        self.assertEqual(results["montants_par_iteration"], [montant] * len(prix))
+
+    def test_martingale_first_amount_exhausts_the_balance(self):
+        forme = FormeEchelle(repartition=REPARTITION_MARTINGALE, montant_initial=20)
+        results = calculer_iterations(1000, 40, 4, 10, forme=forme)
+        montants = results["montants_par_iteration"]
+        m = results["multiplicateur"]
+
+        self.assertAlmostEqual(montants[0], 20)
+        self.assertAlmostEqual(sum(montants), 1000)
+        self.assertAlmostEqual(montants[5] / montants[4], m)
+        self.assertAlmostEqual(sum(20 * m ** j for j in range(len(montants))), 1000, places=6)
+        self.assertLessEqual(results["prix_iterations"][-1], 4)
+        for quantite, prix, montant in zip(results["quantites_par_iteration"], results["prix_iterations"], montants):
+            self.assertAlmostEqual(quantite * prix, montant)
+
+    def test_linear_solver_and_its_bounds(self):
+        m = resoudre_multiplicateur(1000, 30, 23, REPARTITION_LINEAIRE)
+        self.assertAlmostEqual(sum(30 * (1 + (m - 1) * j) for j in range(23)), 1000, places=6)
+        with self.assertRaisesRegex(SimulationError, error_messages.SIM_ERROR_FIRST_AMOUNT_UNREACHABLE):
+            resoudre_multiplicateur(1000, 100, 23, REPARTITION_LINEAIRE)
+        with self.assertRaisesRegex(SimulationError, error_messages.SIM_ERROR_FIRST_AMOUNT_UNREACHABLE):
+            resoudre_multiplicateur(1000, 1000, 5, REPARTITION_MARTINGALE)
+
+    def test_price_spacings(self):
+        lineaire = calculer_iterations(1000, 40, 0, 10, avec_details=False,
+                                       forme=FormeEchelle(espacement=ESPACEMENT_LINEAIRE))
+        self.assertEqual(lineaire["prix_iterations"], [40 - 4 * j for j in range(10)])
+
+        accelere = calculer_iterations(1000, 40, 4, 5, avec_details=False,
+                                       forme=FormeEchelle(espacement=ESPACEMENT_ACCELERE, acceleration=1.5))
+        prix = accelere["prix_iterations"]
+        baisses = [1 - b / a for a, b in zip(prix, prix[1:])]
+        for j, baisse in enumerate(baisses):
+            self.assertAlmostEqual(baisse, min(0.05 * 1.5 ** j, 1))
+        self.assertLessEqual(prix[-1], 4)
+        self.assertGreater(prix[-2], 4)
+
+    def test_custom_weight_curve_is_interpolated(self):
+        results = calculer_iterations(900, 40, 4, 50, forme=FormeEchelle(repartition=REPARTITION_PERSONNALISEE,
+                                                                         poids=(1, 3, 5)))
+        self.assertEqual(results["nombre_total_iterations"], 5)
+        for montant, attendu in zip(results["montants_par_iteration"], [60, 120, 180, 240, 300]):
+            self.assertAlmostEqual(montant, attendu)
+        self.assertIn("Niveau 5: 300.00 / 2.50000000 = 120.00000000 (quantité)", results["details_text"])
+
+    def test_invalid_shapes_raise(self):
+        with self.assertRaisesRegex(SimulationError, error_messages.SIM_ERROR_INVALID_WEIGHTS):
+            calculer_iterations(1000, 40, 4, 10, forme=FormeEchelle(repartition=REPARTITION_PERSONNALISEE))
+        with self.assertRaisesRegex(SimulationError, error_messages.SIM_ERROR_FIRST_AMOUNT_MODE):
+            calculer_iterations(1000, 40, 4, 10, forme=FormeEchelle(montant_initial=10))
+        with self.assertRaisesRegex(SimulationError, error_messages.SIM_ERROR_LINEAR_WEIGHTS):
+            calculer_iterations(1000, 40, 4, 10, forme=FormeEchelle(repartition=REPARTITION_LINEAIRE,
+                                                                    multiplicateur=0.5))
+
+
+class TestSimulationCache(unittest.TestCase):
+    def test_equivalent_inputs_share_one_result(self):
+        cache = SimulationCache()
+        first = cache.calculer_iterations(1000, 40, 4, 50)
+        again = cache.calculer_iterations(1000.0, 40.000, 4e0, 50.0)
+
+        self.assertIs(again, first)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(first["details_text"], calculer_iterations(1000.0, 40.0, 4.0, 50.0)["details_text"])
+
+    def test_least_recently_used_result_is_evicted(self):
+        cache = SimulationCache(taille=2)
+        a = cache.calculer_iterations(1000, 40, 4, 50)
+        cache.calculer_iterations(1000, 40, 4, 25)
+        cache.calculer_iterations(1000, 40, 4, 50)
+        cache.calculer_iterations(1000, 40, 4, 10)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.calculer_iterations(1000, 40, 4, 50), a)
+        cache.calculer_iterations(1000, 40, 4, 25)
+        self.assertEqual(cache.misses, 4)
+
+    def test_invalid_inputs_are_not_cached(self):
+        cache = SimulationCache()
+        for _ in range(2):
+            with self.assertRaises(SimulationError):
+                cache.calculer_iterations(1000, 4, 40, 50)
+        self.assertEqual(len(cache), 0)
+
 
 if __name__ == '__main__':
     unittest.main()
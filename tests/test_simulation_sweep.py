@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+from src.simulation_logic import calculer_iterations, SimulationError, MAX_ITERATIONS_CAP
+from src.simulation_sweep import simuler_grille, plage
+
+
+class TestSimulationSweep(unittest.TestCase):
+
+    def test_grid_matches_single_simulation(self):
+        grille = simuler_grille([234, 1000], [0.00000650, 40], plage(0, 5, 0.5), [0.5, 10, 50, 99])
+        self.assertEqual(grille.shape, (2, 2, 11, 4))
+        for index in np.ndindex(grille.shape):
+            params = [grille.axes[nom][i] for nom, i in zip(grille.axes, index)]
+            try:
+                results = calculer_iterations(*params, avec_details=False)
+            except SimulationError:
+                self.assertFalse(grille.valide[index])
+                self.assertEqual(grille.nombre_niveaux[index], 0)
+                self.assertTrue(np.isnan(grille.prix_moyen[index]))
+                continue
+            self.assertTrue(grille.valide[index])
+            self.assertEqual(grille.nombre_niveaux[index], results["nombre_total_iterations"])
+            self.assertAlmostEqual(grille.montant_par_niveau[index], results["montant_par_iteration"])
+            quantite = sum(results["quantites_par_iteration"])
+            self.assertTrue(np.isclose(grille.quantite_totale[index], quantite))
+
+    def test_average_entry_and_drawdown(self):
+        grille = simuler_grille(1000, 40, 4, 50)
+        # Niveaux [40, 20, 10, 5, 2.5] à 200 chacun : quantité 155, soit 1000 / 155 de prix moyen.
+        self.assertEqual(grille.nombre_niveaux[0, 0, 0, 0], 5)
+        self.assertAlmostEqual(grille.quantite_totale[0, 0, 0, 0], 155.0)
+        self.assertAlmostEqual(grille.prix_moyen[0, 0, 0, 0], 1000 / 155)
+        self.assertAlmostEqual(grille.perte_max[0, 0, 0, 0], 1000 - 155 * 4)
+        self.assertAlmostEqual(grille.drawdown_max_percent[0, 0, 0, 0], 38.0)
+
+    def test_iteration_cap_is_applied(self):
+        grille = simuler_grille(100, 5, 0, 0.5)
+        self.assertEqual(grille.nombre_niveaux.item(), MAX_ITERATIONS_CAP)
+
+    def test_lignes_flatten_the_grid(self):
+        lignes = list(simuler_grille(1000, 40, [4, 50], 50).lignes())
+        self.assertEqual(len(lignes), 2)
+        self.assertTrue(lignes[0]["valide"])
+        self.assertFalse(lignes[1]["valide"])
+
+    def test_plage_is_inclusive(self):
+        np.testing.assert_allclose(plage(1, 2, 0.25), [1, 1.25, 1.5, 1.75, 2])
+        with self.assertRaises(ValueError):
+            plage(1, 2, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
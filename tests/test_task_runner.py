@@ -0,0 +1,114 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from PyQt5.QtCore import QCoreApplication, QThread
+from src.controllers.worker_controller import WorkerController
+from src.models.market_environment import MarketEnvironment
+from src.workers.task_runner import (CancellationToken, TaskRunner, PRIORITY_CANCEL, PRIORITY_REFRESH)
+
+
+def process_events_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+
+class TestTaskRunner(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        self.runner = TaskRunner(max_workers=1)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.runner.wait_for_done(5000)
+
+    def test_cancels_jump_ahead_of_queued_refreshes(self):
+        ran = []
+        self.runner.submit(self.release.wait, 5)
+        self.runner.submit(ran.append, "refresh", priority=PRIORITY_REFRESH)
+        self.runner.submit(ran.append, "cancel", priority=PRIORITY_CANCEL)
+
+        self.release.set()
+
+        self.assertTrue(self.runner.wait_for_done(5000))
+        self.assertEqual(ran, ["cancel", "refresh"])
+
+    def test_results_are_delivered_on_the_qt_thread(self):
+        runner = TaskRunner(max_workers=2)
+        received, failures, threads = [], [], []
+        ok = runner.submit(lambda: 6 * 7)
+        ok.succeeded.connect(lambda value: (received.append(value), threads.append(QThread.currentThread())))
+        broken = runner.submit(lambda: 1 / 0)
+        broken.failed.connect(failures.append)
+
+        self.assertTrue(process_events_until(lambda: received and failures))
+        self.assertEqual(received, [42])
+        self.assertIs(threads[0], self.app.thread())
+        self.assertIsInstance(failures[0], ZeroDivisionError)
+        self.assertEqual(ok.result(1), 42)
+        self.assertTrue(process_events_until(lambda: runner.pending() == 0))
+
+    def test_group_queues_requests_instead_of_dropping_them(self):
+        runner = TaskRunner(max_workers=2)
+        log = []
+
+        def task(name):
+            log.append(f"start {name}")
+            self.release.wait(5)
+            log.append(f"end {name}")
+
+        runner.submit(task, "a", group="balance")
+        runner.submit(task, "b", group="balance")
+        time.sleep(0.05)
+        self.assertEqual(log, ["start a"])
+
+        self.release.set()
+        self.assertTrue(runner.wait_for_done(5000))
+        self.assertEqual(log, ["start a", "end a", "start b", "end b"])
+
+    def test_cancelled_task_never_starts_but_still_finishes(self):
+        token = CancellationToken()
+        stopped = []
+        token.add_callback(lambda: stopped.append(True))
+        ran, finished = [], []
+        self.runner.submit(self.release.wait, 5)
+        future = self.runner.submit(ran.append, "x", token=token)
+        future.finished.connect(lambda: finished.append(True))
+
+        future.cancel()
+        self.release.set()
+
+        self.assertTrue(process_events_until(lambda: finished))
+        self.assertEqual(ran, [])
+        self.assertTrue(future.cancelled())
+        self.assertEqual(stopped, [True])
+
+
+class TestWorkerControllerQueue(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def test_second_request_is_queued_and_both_complete(self):
+        logic = MagicMock()
+        logic.get_balance.side_effect = [10.0, 20.0]
+        controller = WorkerController(logic, task_runner=TaskRunner(max_workers=2))
+        balances = []
+        controller.balance_success.connect(balances.append)
+
+        controller.start_fetch_balance("key", "secret", MarketEnvironment.SPOT)
+        controller.start_fetch_balance("key", "secret", MarketEnvironment.SPOT)
+
+        self.assertTrue(process_events_until(lambda: len(balances) == 2 and not controller.active_workers()))
+        self.assertEqual(balances, [10.0, 20.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+import asyncio
+import json
+import socket
+import time
+import unittest
+from unittest.mock import patch
+from aiohttp import web
+from scripts.fake_binance import FakeBinanceServer
+from src.controllers.user_data_controller import UserDataController
+from src.models.market_environment import MarketEnvironment
+from src.models.order_state import OrderState
+from src.services.exchange_factory import ExchangeFactory
+from src.services.order_store import OrderStateStore
+from src.services.user_data_stream import UserDataStream, parse_order_event, parse_balance_event
+
+
+def execution_report(order_id=1, status="NEW", filled="0", quote="0", event_time=None):
+    now = int(time.time() * 1000)
+    return {'e': 'executionReport', 'E': event_time or now, 's': 'BTCUSDT', 'c': 'dca-1', 'S': 'BUY',
+            'p': '100.0', 'q': '2.0', 'X': status, 'i': order_id, 'z': filled, 'Z': quote, 'T': event_time or now}
+
+
+class FakeListenKeys:
+    def __init__(self):
+        self.created = 0
+        self.keepalives = []
+        self.closed = []
+
+    async def create(self):
+        self.created += 1
+        return f"key{self.created}"
+
+    async def keepalive(self, listen_key):
+        self.keepalives.append(listen_key)
+
+    async def close(self, listen_key):
+        self.closed.append(listen_key)
+
+
+class LocalUserDataServer:
+    """Stand-in for the Binance user-data WebSocket: sends the queued events to each new connection."""
+
+    def __init__(self):
+        self.sessions = []  # (events to send, close after sending), one per connection
+        self.connected_keys = []
+        self.sockets = []
+
+    async def handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connected_keys.append(request.match_info['key'])
+        self.sockets.append(ws)
+        events, close_after = self.sessions.pop(0) if self.sessions else ([], False)
+        for event in events:
+            await ws.send_str(json.dumps(event))
+        if close_after:
+            await ws.close()
+            return ws
+        async for _ in ws:
+            pass
+        return ws
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get('/ws/{key}', self.handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/ws"
+        return self
+
+    async def __aexit__(self, *exc):
+        for ws in self.sockets:
+            await ws.close()
+        await self.runner.cleanup()
+
+
+async def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.005)
+
+
+class TestOrderStateStore(unittest.TestCase):
+    def test_stale_and_duplicate_updates_are_ignored(self):
+        store = OrderStateStore()
+        seen = []
+        store.subscribe(seen.append)
+
+        partial = parse_order_event(execution_report(status="PARTIALLY_FILLED", filled="1", quote="100"), 0)
+        filled = parse_order_event(execution_report(status="FILLED", filled="2", quote="199"), 0)
+        self.assertTrue(store.apply(partial))
+        self.assertTrue(store.apply(filled))
+        self.assertFalse(store.apply(partial))
+        self.assertFalse(store.apply(filled))
+
+        state = store.get("BTC/USDT:USDT", 1)
+        self.assertEqual((state.status, state.filled, state.average_price), ("FILLED", 2.0, 99.5))
+        self.assertIs(store.by_client_id("dca-1"), state)
+        self.assertEqual(store.open_orders("BTC/USDT"), [])
+        self.assertEqual(len(seen), 2)
+
+    def test_futures_events_are_parsed(self):
+        event = {'e': 'ORDER_TRADE_UPDATE', 'E': 1000, 'T': 999,
+                 'o': {'s': 'ETHUSDT', 'c': 'x', 'S': 'BUY', 'q': '1', 'p': '10', 'ap': '9.5', 'X': 'FILLED',
+                       'i': 7, 'z': '1', 'T': 999}}
+        state = parse_order_event(event, 1004.0)
+        self.assertEqual((state.market_id, state.order_id, state.average_price, state.latency_ms),
+                         ("ETHUSDT", "7", 9.5, 4.0))
+        balances = parse_balance_event({'e': 'ACCOUNT_UPDATE', 'a': {'B': [{'a': 'USDT', 'wb': '12.5', 'cw': '12'}]}})
+        self.assertEqual(balances, {'USDT': 12.5})
+        self.assertIsInstance(state, OrderState)
+
+
+class TestUserDataStream(unittest.TestCase):
+    def test_fills_reach_the_store_within_milliseconds(self):
+        async def scenario():
+            async with LocalUserDataServer() as server:
+                server.sessions.append(([
+                    execution_report(status="NEW"),
+                    execution_report(status="FILLED", filled="2", quote="200"),
+                    {'e': 'outboundAccountPosition', 'B': [{'a': 'USDT', 'f': '10', 'l': '5'}]},
+                ], False))
+                store = OrderStateStore()
+                stream = UserDataStream(FakeListenKeys(), store, MarketEnvironment.SPOT, ws_base_url=server.url)
+                task = asyncio.create_task(stream.run())
+                await wait_until(lambda: store.balance('USDT') is not None)
+                await stream.stop()
+                await task
+                return store, stream
+
+        store, stream = asyncio.run(scenario())
+        state = store.get("BTC/USDT", 1)
+        self.assertEqual(state.status, "FILLED")
+        self.assertLess(state.latency_ms, 500)
+        self.assertEqual(store.balance('USDT'), 15.0)
+        self.assertEqual(stream.listen_keys.closed, ["key1"])
+
+    def test_expired_listen_key_is_replaced_and_stream_reconnects(self):
+        async def scenario():
+            async with LocalUserDataServer() as server:
+                server.sessions.append(([{'e': 'listenKeyExpired', 'E': 0}], False))
+                server.sessions.append(([execution_report(order_id=2, status="CANCELED")], False))
+                store = OrderStateStore()
+                listen_keys = FakeListenKeys()
+                stream = UserDataStream(listen_keys, store, MarketEnvironment.FUTURES_TESTNET,
+                                        ws_base_url=server.url, keepalive_interval=0.01,
+                                        reconnect_delays=(0.01,))
+                task = asyncio.create_task(stream.run())
+                await wait_until(lambda: store.get("BTCUSDT", 2) is not None and listen_keys.keepalives)
+                await stream.stop()
+                await task
+                return server, listen_keys
+
+        server, listen_keys = asyncio.run(scenario())
+        self.assertEqual(server.connected_keys, ["key1", "key2"])
+        self.assertIn("key2", listen_keys.keepalives)
+
+
+
+class TestUserDataController(unittest.TestCase):
+    def test_changing_keys_does_not_wait_for_a_hung_connection(self):
+        server = FakeBinanceServer().start()
+        self.addCleanup(server.stop)
+        ExchangeFactory.api_base_url = server.url
+        self.addCleanup(setattr, ExchangeFactory, 'api_base_url', None)
+        # A listening socket that never accepts: ws_connect hangs on the upgrade.
+        hung = socket.socket()
+        hung.bind(("127.0.0.1", 0))
+        hung.listen()
+        self.addCleanup(hung.close)
+        urls = {MarketEnvironment.SPOT: f"ws://127.0.0.1:{hung.getsockname()[1]}/ws"}
+        with patch.dict('src.services.user_data_stream.WS_BASE_URLS', urls), \
+                patch('src.controllers.user_data_controller.STOP_TIMEOUT', 0.2):
+            controller = UserDataController()
+            try:
+                controller.start("key-1", "secret", MarketEnvironment.SPOT)
+                hung_future = controller._future
+
+                start = time.monotonic()
+                controller.start("key-2", "secret", MarketEnvironment.SPOT)
+                elapsed = time.monotonic() - start
+
+                self.assertTrue(controller.is_running())
+                deadline = time.monotonic() + 5
+                while not hung_future.done() and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            finally:
+                controller.stop()
+        self.assertLess(elapsed, 0.1)
+        self.assertTrue(hung_future.cancelled())
+
+
+if __name__ == '__main__':
+    unittest.main()